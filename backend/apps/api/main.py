@@ -34,7 +34,7 @@ from apps.api.routers import tokens as tokens_router
 from apps.api.routers import candles, logs, settings, signals, state, stream, ai, backtest, trades, account, watchlist, orders_manual, bot, worker, metrics, risk, trace, tbank, symbol_profiles, event_regimes, paper, validation, forensics, ml, ui, sentiment
 from core.config import get_token, settings as config
 from core.logging import configure_logging
-from core.metrics import setup_metrics_endpoint
+from core.metrics import monitor_event_loop_lag, setup_metrics_endpoint
 from core.version import __version__
 
 # Configure logging once at import time (uvicorn calls this module first)
@@ -73,6 +73,36 @@ _HEAVY_READ_REQUESTS = 0
 _RECYCLE_ARMED = False
 
 
+async def _settings_invalidation_listener() -> None:
+    """Drop this process' cached settings snapshot when another process updates settings."""
+    import orjson
+    from core.events.bus import SETTINGS_UPDATED_CHANNEL, bus
+    from core.storage.repos import settings as settings_repo
+
+    while True:
+        pubsub = bus.redis.pubsub()
+        try:
+            await pubsub.subscribe(SETTINGS_UPDATED_CHANNEL)
+            async for msg in pubsub.listen():
+                if msg.get("type") != "message":
+                    continue
+                try:
+                    version = orjson.loads(msg["data"]).get("version")
+                except Exception:
+                    version = None
+                settings_repo.invalidate_settings_snapshot(version)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("settings invalidation listener error: %s — retrying in 5s", e)
+            await asyncio.sleep(5)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
 # ── P3-08: Lifespan ───────────────────────────────────────────────────────────
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -98,8 +128,23 @@ async def lifespan(app: FastAPI):
         )
         raise RuntimeError("AUTH_TOKEN required in production mode")
 
+    settings_listener = asyncio.create_task(_settings_invalidation_listener(), name="settings-invalidation")
+    loop_lag_monitor = asyncio.create_task(monitor_event_loop_lag(), name="event-loop-lag")
+
     yield
     logger.info("API shutdown — closing resources")
+    settings_listener.cancel()
+    loop_lag_monitor.cancel()
+    try:
+        from apps.api.sse_hub import hub
+        await hub.stop()
+    except Exception as e:
+        logger.warning("SSE hub stop error on shutdown: %s", e)
+    try:
+        from core.services.backtest_jobs import backtest_jobs
+        await backtest_jobs.shutdown()
+    except Exception as e:
+        logger.warning("Backtest job service stop error on shutdown: %s", e)
     loop.set_exception_handler(previous_exception_handler)
     try:
         from core.events.bus import bus
@@ -119,6 +164,12 @@ app = FastAPI(
 
 
 def _exit_worker_soon() -> None:
+    from core.services.backtest_jobs import backtest_jobs
+
+    if backtest_jobs.active_count():
+        # Recycling would orphan running backtest jobs; retry once they finish.
+        threading.Timer(5.0, _exit_worker_soon).start()
+        return
     logger.warning("Recycling API worker after heavy read limit to cap RSS growth")
     os._exit(0)
 
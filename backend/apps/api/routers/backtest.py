@@ -1,8 +1,15 @@
 """
 P5-07: Backtest API — запуск бэктеста через API.
 
-POST /api/v1/backtest   — запустить бэктест (синхронно, candles передаются в теле)
+POST /api/v1/backtest   — запустить бэктест и дождаться результата (candles передаются в теле)
 GET  /api/v1/backtest/strategies — список доступных стратегий
+
+Asynchronous jobs (core.services.backtest_jobs, progress as `backtest_job` events):
+POST /api/v1/backtest/jobs               — поставить бэктест в очередь
+GET  /api/v1/backtest/jobs/{id}          — статус и прогресс
+GET  /api/v1/backtest/jobs/{id}/result   — результат завершённой задачи
+POST /api/v1/backtest/jobs/{id}/cancel   — отменить задачу
+POST /api/v1/backtest/sweep              — поставить в очередь перебор параметров стратегии
 """
 from __future__ import annotations
 
@@ -13,9 +20,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
-from apps.backtest.engine import BacktestEngine
+from apps.backtest.sweep import build_combinations
 from core.strategy.selector import StrategySelector
 from apps.api.deps import verify_token
+from core.services.backtest_jobs import GENERIC_ERROR, JobQueueFull, backtest_jobs, job_payload
 from core.storage.session import get_db
 from core.storage.repos import candles as candle_repo
 from core.storage.repos import settings as settings_repo
@@ -49,6 +57,24 @@ class BacktestRequest(BaseModel):
     mode: str = Field("single")
     folds: int = Field(4, ge=2, le=8)
     strategies: list[str] | None = None
+    vectorized: bool = True   # prefiltered engine mode; results identical to the per-bar loop
+
+
+class SweepRequest(BaseModel):
+    instrument_id: str = "TQBR:SBER"
+    strategy: str = "breakout"
+    candles: list[CandleIn] | None = None
+    timeframe: str = Field("1m")
+    history_limit: int = Field(2000, ge=320, le=20000)
+    grid: dict[str, list[Any]] | None = None       # exhaustive: {"lookback": [10, 20, 30], "sl_atr": [1.5, 2.0]}
+    space: dict[str, Any] | None = None            # random: {"lookback": {"min": 10, "max": 40}, "tp_atr": [2, 3, 4]}
+    samples: int = Field(100, ge=1, le=2000)
+    seed: int = 0
+    folds: int = Field(4, ge=2, le=8)
+    top: int = Field(50, ge=1, le=2000)
+    initial_balance: float = 100_000.0
+    risk_pct: float = Field(1.0, ge=0.1, le=10.0)
+    commission_pct: float = Field(0.03, ge=0.0, le=1.0)
 
 
 class BacktestResponse(BaseModel):
@@ -70,71 +96,103 @@ class BacktestResponse(BaseModel):
     walk_forward: dict[str, Any] | None = None
 
 
-@router.post("", response_model=BacktestResponse)
-async def run_backtest(req: BacktestRequest, db: Session = Depends(get_db)):
-    """
-    Run a walk-forward backtest on supplied candles.
+def _job_spec(req: BacktestRequest, db: Session) -> dict[str, Any]:
+    spec = req.model_dump(exclude={"candles", "history_limit", "source"})
+    if req.use_decision_engine:
+        # Decision-engine runs depend on the active settings; a settings change must miss the cache.
+        spec["settings_version"] = int(getattr(settings_repo.get_settings_snapshot(db), "version", 0) or 0)
+    return spec
 
-    Candles must be sorted oldest → newest.
-    Returns equity curve, per-trade log, and aggregate metrics.
-    """
+
+async def _submit(req: BacktestRequest | SweepRequest, db: Session, spec: dict[str, Any] | None = None) -> dict[str, Any]:
     strategy = _selector.get(req.strategy)
 
     if req.candles:
         candle_dicts = [c.model_dump() for c in req.candles]
     else:
-        candle_dicts = candle_repo.list_candles(db, req.instrument_id, req.timeframe, limit=req.history_limit)
+        candle_dicts = candle_repo.load_candle_history(db, req.instrument_id, req.timeframe, limit=req.history_limit)
 
     if len(candle_dicts) < strategy.lookback + 10:
         raise HTTPException(
             status_code=422,
             detail=f"Need at least {strategy.lookback + 10} candles for strategy '{req.strategy}' (got {len(candle_dicts)})"
         )
+    try:
+        return await backtest_jobs.submit(db, spec or _job_spec(req, db), candle_dicts)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
 
-    runtime_settings = settings_repo.get_settings(db) if req.use_decision_engine else None
-    engine = BacktestEngine(
-        strategy=strategy,
-        settings=runtime_settings,
-        initial_balance=req.initial_balance,
-        risk_pct=req.risk_pct,
-        commission_pct=req.commission_pct,
-        use_decision_engine=req.use_decision_engine,
-    )
+def _get_job(db: Session, job_id: str):
+    job = backtest_jobs.get(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return job
 
+
+@router.post("", response_model=BacktestResponse)
+async def run_backtest(req: BacktestRequest, db: Session = Depends(get_db)):
+    """
+    Run a walk-forward backtest on supplied candles and wait for the result.
+
+    Candles must be sorted oldest → newest.
+    Returns equity curve, per-trade log, and aggregate metrics.
+    The run goes through the job pool, so the API process stays responsive.
+    """
+    job = await _submit(req, db)
+    await backtest_jobs.wait(job["id"])
+    db.expire_all()
+    row = _get_job(db, job["id"])
+    if row.status == "failed":
+        raise HTTPException(status_code=500 if row.error == GENERIC_ERROR else 422, detail=row.error or GENERIC_ERROR)
+    if row.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Backtest job {row.status}")
+    return BacktestResponse(**row.result)
+
+
+@router.post("/jobs", status_code=202)
+async def submit_backtest_job(req: BacktestRequest, db: Session = Depends(get_db)):
+    """Queue a backtest; an identical completed run is returned at once with `cached: true`."""
+    return await _submit(req, db)
+
+
+@router.get("/jobs/{job_id}")
+async def get_backtest_job(job_id: str, db: Session = Depends(get_db)):
+    return job_payload(_get_job(db, job_id))
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_backtest_job_result(job_id: str, db: Session = Depends(get_db)):
+    """BacktestResponse for backtest jobs; the ranked sweep table for `sweep` jobs."""
+    job = _get_job(db, job_id)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Backtest job is {job.status}")
+    if job.mode == "sweep":
+        return job.result
+    return BacktestResponse(**job.result)
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_backtest_job(job_id: str, db: Session = Depends(get_db)):
+    job = await backtest_jobs.cancel(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return job_payload(job)
+
+
+@router.post("/sweep", status_code=202)
+async def submit_parameter_sweep(req: SweepRequest, db: Session = Depends(get_db)):
+    """
+    Queue a parameter sweep (apps.backtest.sweep) as a backtest job.
+    Give `grid` for an exhaustive sweep or `space` + `samples` for a random search.
+    """
     try:
-        result = engine.run(req.instrument_id, candle_dicts)
-        walk_forward = None
-        if req.mode == 'walk_forward':
-            strategies = [
-                _selector.get(name)
-                for name in (req.strategies or StrategySelector.available())
-            ]
-            walk_forward = engine.run_walk_forward(req.instrument_id, candle_dicts, strategies=strategies, folds=req.folds)
-            result.walk_forward = walk_forward
+        build_combinations(req.strategy, grid=req.grid, space=req.space, samples=req.samples, seed=req.seed)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
-    except Exception as e:
-        logger.exception("Backtest error: %s", e)
-        raise HTTPException(status_code=500, detail="Backtest failed")
-
-    return BacktestResponse(
-        instrument_id    = result.instrument_id,
-        strategy_name    = result.strategy_name,
-        from_ts          = result.from_ts,
-        to_ts            = result.to_ts,
-        initial_balance  = result.initial_balance,
-        final_balance    = result.final_balance,
-        total_return_pct = result.total_return_pct,
-        max_drawdown_pct = result.max_drawdown_pct,
-        sharpe_ratio     = result.sharpe_ratio,
-        win_rate         = result.win_rate,
-        profit_factor    = result.profit_factor,
-        total_trades     = result.total_trades,
-        avg_trade_pct    = result.avg_trade_pct,
-        equity_curve     = result.equity_curve,
-        trades           = result.trades,
-        walk_forward     = result.walk_forward,
-    )
+    spec = req.model_dump(exclude={"candles", "history_limit"})
+    spec["mode"] = "sweep"
+    return await _submit(req, db, spec)
 
 
 @router.get("/strategies")
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from apps.api.deps import verify_token
 from apps.api.status import build_bot_status, live_capable_for, normalize_trade_mode
+from core.events.bus import bus
 from core.services.runtime_tokens import load_runtime_tokens
 from core.storage.repos import settings as settings_repo
 from core.storage.models import Settings
@@ -20,6 +21,12 @@ class StartBotPayload(BaseModel):
     mode: Literal["review", "auto_paper", "auto_live", "paper", "live"] | None = None
 
 
+async def _announce_settings_updated(settings: Settings) -> None:
+    version = int(getattr(settings, "updated_ts", 0) or 0)
+    settings_repo.invalidate_settings_snapshot(version)
+    await bus.publish_settings_updated(version)
+
+
 @router.get("/status")
 async def get_bot_status(db: Session = Depends(get_db)):
     return await build_bot_status(db)
@@ -46,6 +53,7 @@ async def start_bot(payload: StartBotPayload | None = None, db: Session = Depend
     settings.bot_enabled = True
     db.commit()
     db.refresh(settings)
+    await _announce_settings_updated(settings)
     return await build_bot_status(db)
 
 
@@ -58,4 +66,5 @@ async def stop_bot(db: Session = Depends(get_db)):
     settings.bot_enabled = False
     db.commit()
     db.refresh(settings)
+    await _announce_settings_updated(settings)
     return await build_bot_status(db)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import io
 import time
 
 from fastapi import APIRouter, Depends, Query
@@ -8,7 +7,8 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from apps.api.deps import verify_token
-from core.services.forensic_export import build_forensic_export
+from core.services.forensic_export import build_forensic_summary, iter_forensic_export
+from core.services.streaming_export import stream_with_session
 from core.storage.session import get_db
 
 router = APIRouter(dependencies=[Depends(verify_token)])
@@ -20,7 +20,7 @@ async def export_forensics(
     instrument_id: str | None = Query(None),
     db: Session = Depends(get_db),
 ):
-    payload, summary = build_forensic_export(db, days=days, instrument_id=instrument_id)
+    summary = build_forensic_summary(db, days=days, instrument_id=instrument_id)
     stamp = time.strftime('%Y%m%d_%H%M%S')
     suffix = instrument_id.replace(':', '_') if instrument_id else 'all'
     filename = f'spatial_pinwheel_forensics_{suffix}_{stamp}.zip'
@@ -28,4 +28,6 @@ async def export_forensics(
         'Content-Disposition': f'attachment; filename="{filename}"',
         'X-Forensic-Summary': str(summary.get('counts', {})),
     }
-    return StreamingResponse(io.BytesIO(payload), media_type='application/zip', headers=headers)
+    # The archive is produced while it is sent, on a session owned by the stream.
+    stream = stream_with_session(iter_forensic_export, days=days, instrument_id=instrument_id, summary=summary)
+    return StreamingResponse(stream, media_type='application/zip', headers=headers)
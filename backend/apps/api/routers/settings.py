@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import time
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from pydantic import ValidationError
 from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
@@ -24,6 +24,7 @@ from typing import Any
 from core.storage.models import CandleCache, SymbolEventRegime, DecisionLog
 from core.storage.decision_log_utils import append_decision_log_best_effort
 from core.services import settings_presets as presets_service
+from core.events.bus import bus
 
 router = APIRouter(dependencies=[Depends(verify_token)])
 
@@ -383,9 +384,15 @@ def get_settings(db: Session = Depends(get_db)):
     return _settings_to_schema(settings_db)
 
 
+def _announce_settings_updated(background_tasks: BackgroundTasks, settings_db) -> None:
+    # Sync endpoints run in the threadpool; the publish is scheduled on the event loop after the response.
+    background_tasks.add_task(bus.publish_settings_updated, int(getattr(settings_db, 'updated_ts', 0) or 0))
+
+
 @router.put("", response_model=schemas.RiskSettings)
-def update_settings(update_data: schemas.RiskSettings, db: Session = Depends(get_db)):
+def update_settings(update_data: schemas.RiskSettings, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     settings_db = repo.update_settings(db, update_data)
+    _announce_settings_updated(background_tasks, settings_db)
     return _settings_to_schema(settings_db)
 
 
@@ -478,7 +485,7 @@ def delete_settings_preset(preset_id: str, db: Session = Depends(get_db)):
 
 
 @router.post('/presets/{preset_id}/apply', response_model=schemas.SettingsPresetApplyResponse)
-def apply_settings_preset(preset_id: str, db: Session = Depends(get_db)):
+def apply_settings_preset(preset_id: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     _ensure_system_presets(db)
     row = repo.get_preset(db, preset_id)
     if row is None:
@@ -497,6 +504,7 @@ def apply_settings_preset(preset_id: str, db: Session = Depends(get_db)):
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     updated = repo.update_settings(db, merged_schema)
+    _announce_settings_updated(background_tasks, updated)
     watchlist_diff = presets_service.apply_watchlist_snapshot(db, snapshot.get('watchlist')) if 'watchlist' in snapshot else {'added': [], 'removed': [], 'kept': []}
     diff = presets_service.build_diff_summary(current_snapshot, snapshot)
     diff['watchlist'] = watchlist_diff
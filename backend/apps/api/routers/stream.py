@@ -6,10 +6,12 @@ import logging
 import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
+
 from redis.exceptions import RedisError
 
+from apps.api.sse_hub import SSESubscriber, frame_for, hub, render_frame
 from core.config import settings
-from core.events.bus import bus
+from core.events.bus import bus, stream_id_key
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -23,73 +25,71 @@ async def verify_stream_token(token: str = Query(default="")):
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
-async def event_generator(request: Request):
-    local_bus = None
-    redis_available = True
-    last_ping = 0.0
-
+async def replay_frames(client: SSESubscriber, last_event_id: str):
+    """
+    Frames missed since `last_event_id` (streams backend). When the gap can't
+    be replayed (trimmed, unknown id, too long) a `resync` event tells the UI
+    to reload full state instead.
+    """
     try:
-        local_bus = bus.redis.pubsub()
-        await local_bus.subscribe(bus.channel)
-        logger.debug("SSE subscribed to redis channel=%s", bus.channel)
+        entries, complete = await bus.replay_events(last_event_id, limit=max(1, int(settings.SSE_REPLAY_LIMIT or 2000)))
     except RedisError as exc:
-        redis_available = False
-        logger.warning("SSE Redis subscribe failed: %s", exc, exc_info=True)
-        if not settings.ALLOW_NO_REDIS:
-            raise
+        logger.warning("SSE replay failed: %s", exc)
+        entries, complete = [], False
+    if not complete:
+        yield render_frame("resync", orjson.dumps({"last_event_id": last_event_id}).decode("utf-8"))
+        return
+    for event_id, raw in entries:
+        rendered = frame_for(raw, event_id)
+        if rendered is not None:
+            yield rendered[0]
+    client.resume_after = stream_id_key(entries[-1][0] if entries else last_event_id)
+    logger.debug("SSE replayed %d event(s) after %s", len(entries), last_event_id)
+
+
+async def event_generator(request: Request, last_event_id: str | None = None):
+    # Register first: live events arriving during the replay are buffered and de-duplicated.
+    client = hub.register()
+    keepalive = max(2, int(settings.SSE_KEEPALIVE_SECONDS or 5))
+    loop = asyncio.get_running_loop()
+    last_ping = 0.0
 
     try:
+        if last_event_id and bus.streams_enabled:
+            async for frame in replay_frames(client, last_event_id):
+                yield frame
+
         while True:
             if await request.is_disconnected():
                 logger.debug("SSE client disconnected")
                 break
 
-            if redis_available and local_bus is not None:
-                try:
-                    message = await local_bus.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                except RedisError as exc:
-                    logger.warning("SSE Redis read failed: %s", exc, exc_info=True)
-                    if not settings.ALLOW_NO_REDIS:
-                        raise
-                    redis_available = False
-                    message = None
-                if message:
-                    payload_raw = message.get("data")
-                    payload_str = payload_raw if isinstance(payload_raw, str) else str(payload_raw)
-                    try:
-                        payload = orjson.loads(payload_str)
-                        event_type = payload.get("type", "message")
-                        yield f"event: {event_type}\ndata: {payload_str}\n\n"
-                    except orjson.JSONDecodeError:
-                        logger.warning("SSE dropped malformed payload: %r", payload_str)
-
-            now = asyncio.get_running_loop().time()
-            if now - last_ping >= max(2, int(settings.SSE_KEEPALIVE_SECONDS or 5)):
+            now = loop.time()
+            if now - last_ping >= keepalive:
                 heartbeat = orjson.dumps({"ts": int(now * 1000)}).decode("utf-8")
-                yield f"event: heartbeat\ndata: {heartbeat}\n\n"
+                yield render_frame("heartbeat", heartbeat)
                 last_ping = now
 
-            await asyncio.sleep(0.1)
+            # Wake on the next event; the 1s cap keeps disconnect detection as before.
+            frame = await client.next(timeout=min(1.0, max(0.0, last_ping + keepalive - loop.time())))
+            if frame is not None:
+                yield frame
     except asyncio.CancelledError:
         logger.debug("SSE task cancelled")
         raise
     finally:
-        if local_bus is not None:
-            try:
-                await local_bus.unsubscribe(bus.channel)
-            except Exception:
-                logger.debug("SSE unsubscribe skipped", exc_info=True)
-            try:
-                await local_bus.aclose()
-            except Exception:
-                logger.debug("SSE pubsub close skipped", exc_info=True)
+        hub.unregister(client)
+        if client.dropped:
+            logger.info("SSE client closed: delivered=%d dropped=%d", client.delivered, client.dropped)
 
 
 @router.get("/stream", dependencies=[Depends(verify_stream_token)])
-async def sse_stream(request: Request):
+async def sse_stream(request: Request, last_event_id: str | None = Query(default=None)):
     headers = {
         "Cache-Control": "no-cache, no-transform",
         "Connection": "keep-alive",
         "X-Accel-Buffering": "no",
     }
-    return StreamingResponse(event_generator(request), media_type="text/event-stream", headers=headers)
+    # EventSource sends Last-Event-ID on its own reconnects; the query param covers manual reconnects.
+    resume_from = request.headers.get("last-event-id") or last_event_id
+    return StreamingResponse(event_generator(request, resume_from), media_type="text/event-stream", headers=headers)
@@ -0,0 +1,209 @@
+"""
+Per-process SSE fan-out.
+
+One background task subscribes to the unified event channel, decodes each
+event once and hands the pre-rendered SSE frame to every connected client.
+Each client has a bounded buffer: `kline` events are coalesced to the latest
+candle per instrument/timeframe, and when the buffer is still full the
+oldest frame is dropped (counted in `dropped`) so a slow dashboard never
+holds up the others. `kline_batch` events from the worker's batching mode
+are passed through as ordinary frames.
+
+With the Redis Streams bus backend the hub reads the stream with XREAD and
+frames carry the stream id as SSE `id:`, which `/stream` uses to replay the
+gap after `Last-Event-ID` on reconnect.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any
+
+import orjson
+
+from core.events.bus import bus, stream_id_key
+
+logger = logging.getLogger(__name__)
+
+_RECONNECT_MAX_SEC = 5.0
+
+
+def render_frame(event_type: str, data: str, event_id: str | None = None) -> str:
+    if event_id:
+        return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+    return f"event: {event_type}\ndata: {data}\n\n"
+
+
+def frame_for(raw: Any, event_id: str | None = None) -> tuple[str, tuple | None] | None:
+    """SSE frame and kline coalesce key for a raw bus payload; None when malformed."""
+    payload_str = raw if isinstance(raw, str) else raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)
+    try:
+        payload = orjson.loads(payload_str)
+    except orjson.JSONDecodeError:
+        logger.warning("SSE dropped malformed payload: %r", payload_str)
+        return None
+    event_type = payload.get("type", "message") if isinstance(payload, dict) else "message"
+    coalesce_key = None
+    if event_type == "kline":
+        data = payload.get("data") or {}
+        coalesce_key = ("kline", data.get("instrument_id"), data.get("tf"))
+    return render_frame(event_type, payload_str, event_id), coalesce_key
+
+
+class SSESubscriber:
+    __slots__ = ("max_pending", "dropped", "delivered", "resume_after", "_frames", "_coalesced", "_ready")
+
+    def __init__(self, max_pending: int = 256):
+        self.max_pending = max(1, int(max_pending))
+        self.dropped = 0
+        self.delivered = 0
+        # Stream id key of the last replayed event; live frames up to it were already sent.
+        self.resume_after: tuple[int, int] | None = None
+        self._frames: deque[tuple[str | None, str | None, tuple | None]] = deque()  # (event_id, frame, coalesce_key)
+        self._coalesced: dict[tuple, tuple[str | None, str]] = {}
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def offer(self, frame: str, coalesce_key: tuple | None = None, event_id: str | None = None) -> None:
+        if coalesce_key is not None:
+            if coalesce_key not in self._coalesced:
+                self._frames.append((None, None, coalesce_key))
+            self._coalesced[coalesce_key] = (event_id, frame)
+        else:
+            self._frames.append((event_id, frame, None))
+        while len(self._frames) > self.max_pending:
+            _, _, key = self._frames.popleft()
+            if key is not None:
+                self._coalesced.pop(key, None)
+            self.dropped += 1
+        self._ready.set()
+
+    def _already_replayed(self, event_id: str | None) -> bool:
+        if self.resume_after is None or not event_id:
+            return False
+        try:
+            return stream_id_key(event_id) <= self.resume_after
+        except ValueError:
+            return False
+
+    async def next(self, timeout: float) -> str | None:
+        """Next frame, or None when nothing arrived within `timeout` seconds."""
+        while True:
+            if not self._frames:
+                self._ready.clear()
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    return None
+                if not self._frames:
+                    return None
+            event_id, frame, key = self._frames.popleft()
+            if key is not None:
+                event_id, frame = self._coalesced.pop(key)
+            if self._already_replayed(event_id):
+                continue
+            self.delivered += 1
+            return frame
+
+
+class SSEHub:
+    def __init__(self, max_pending: int = 256):
+        self.max_pending = max_pending
+        self._clients: set[SSESubscriber] = set()
+        self._task: asyncio.Task | None = None
+        self.events = 0
+        self.malformed = 0
+
+    def register(self) -> SSESubscriber:
+        client = SSESubscriber(self.max_pending)
+        self._clients.add(client)
+        self._ensure_started()
+        return client
+
+    def unregister(self, client: SSESubscriber) -> None:
+        self._clients.discard(client)
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="sse-hub")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def dispatch(self, raw: Any, event_id: str | None = None) -> None:
+        rendered = frame_for(raw, event_id)
+        if rendered is None:
+            self.malformed += 1
+            return
+        frame, coalesce_key = rendered
+        self.events += 1
+        for client in tuple(self._clients):
+            client.offer(frame, coalesce_key, event_id)
+
+    async def _run(self) -> None:
+        if bus.streams_enabled:
+            await self._run_stream()
+            return
+        backoff = 0.5
+        while True:
+            pubsub = bus.redis.pubsub()
+            try:
+                await pubsub.subscribe(bus.channel)
+                logger.info("SSE hub subscribed to redis channel=%s", bus.channel)
+                backoff = 0.5
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.dispatch(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("SSE hub redis error: %s — resubscribing in %.1fs", exc, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(_RECONNECT_MAX_SEC, backoff * 2)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    logger.debug("SSE hub pubsub close skipped", exc_info=True)
+
+    async def _run_stream(self) -> None:
+        last_id: str | None = None
+        backoff = 0.5
+        while True:
+            try:
+                if last_id is None:
+                    # An explicit id rather than "$": nothing appended between startup and the first XREAD is lost.
+                    last_id = await bus.latest_event_id() or "0-0"
+                # Keeps `last_id` across errors so a Redis blip does not lose events.
+                for event_id, raw in await bus.read_events(last_id, block_ms=5000):
+                    last_id = event_id
+                    self.dispatch(raw, event_id)
+                backoff = 0.5
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("SSE hub stream read error: %s — retrying in %.1fs", exc, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(_RECONNECT_MAX_SEC, backoff * 2)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "clients": len(self._clients),
+            "events": self.events,
+            "malformed": self.malformed,
+            "pending": sum(len(client) for client in self._clients),
+            "dropped": sum(client.dropped for client in self._clients),
+        }
+
+
+hub = SSEHub()
@@ -80,6 +80,7 @@ class BacktestEngine:
         commission_pct: float = 0.03,   # 0.03% per side
         max_open: int = 1,              # max concurrent positions per instrument
         use_decision_engine: bool = True,
+        vectorized: bool = False,       # prefiltered bars + array exit loop; same results
     ):
         self.strategy = strategy
         self.settings = settings
@@ -88,17 +89,24 @@ class BacktestEngine:
         self.commission_pct = commission_pct / 100
         self.max_open = max_open
         self.use_de = use_decision_engine and settings is not None
+        self.vectorized = vectorized
 
-    def run(self, instrument_id: str, candles: list[dict]) -> BacktestResult:
+    def run(self, instrument_id: str, candles: list[dict], *, columns=None, mask_cache: Optional[dict] = None) -> BacktestResult:
         """
         Run backtest over the full candle list.
         candles must be sorted oldest → newest.
+
+        Vectorized mode only: `columns` (CandleColumns of `candles`) and
+        `mask_cache` let repeated runs over the same candles share the
+        column conversion and entry masks.
         """
         lookback = self.strategy.lookback
         if len(candles) < lookback + 10:
             raise ValueError(
                 f"Not enough candles: {len(candles)} < {lookback + 10}"
             )
+        if self.vectorized:
+            return self._run_vectorized(instrument_id, candles, columns=columns, mask_cache=mask_cache)
 
         balance = self.initial_balance
         open_trade: Optional[BacktestTrade] = None
@@ -212,6 +220,102 @@ class BacktestEngine:
             equity_curve=equity_curve,
         )
 
+    def _run_vectorized(self, instrument_id: str, candles: list[dict], *, columns=None, mask_cache: Optional[dict] = None) -> BacktestResult:
+        """
+        Same walk-forward as `run()`, over columns converted once: analyze() is
+        only called on bars the strategy's prefilter marks as possible entries
+        (apps.backtest.vectorized) and exits are checked on float arrays.
+        """
+        from apps.backtest.vectorized import HISTORY_BARS, CandleColumns, candidate_mask
+
+        lookback = self.strategy.lookback
+        cols = columns if columns is not None else CandleColumns(candles)
+        mask = candidate_mask(self.strategy, cols, lookback, mask_cache)
+        highs, lows, closes, times = cols.high, cols.low, cols.close, cols.time
+        commission = self.commission_pct
+
+        balance = self.initial_balance
+        open_trade: Optional[BacktestTrade] = None
+        closed_trades: list[BacktestTrade] = []
+        equity_curve: list[dict] = []
+        is_buy = True
+        entry = sl = tp = size = 0.0
+
+        for i in range(lookback, len(candles)):
+            close = closes[i]
+            ts = times[i]
+
+            if open_trade is not None:
+                high = highs[i]
+                low = lows[i]
+                if is_buy:
+                    if low <= sl:
+                        open_trade.close_price, open_trade.close_reason = sl, "SL"
+                    elif high >= tp:
+                        open_trade.close_price, open_trade.close_reason = tp, "TP"
+                else:
+                    if high >= sl:
+                        open_trade.close_price, open_trade.close_reason = sl, "SL"
+                    elif low <= tp:
+                        open_trade.close_price, open_trade.close_reason = tp, "TP"
+
+                if open_trade.close_reason:
+                    t = open_trade
+                    t.close_bar = i
+                    raw_pnl = (t.close_price - entry) * size if is_buy else (entry - t.close_price) * size
+                    t.pnl = raw_pnl - entry * size * commission * 2
+                    t.pnl_pct = (t.pnl / balance) * 100
+                    balance += t.pnl
+                    closed_trades.append(t)
+                    open_trade = None
+
+            if open_trade is not None:
+                unrealized = (close - entry) * size if is_buy else (entry - close) * size
+            else:
+                unrealized = 0.0
+            equity_curve.append({"ts": ts * 1000 if ts < 10_000_000_000 else ts, "equity": round(balance + unrealized, 2)})
+
+            if open_trade is None and (mask is None or mask[i]):
+                history = candles[max(0, i - HISTORY_BARS): i + 1]
+                sig = self.strategy.analyze(instrument_id, history)
+                if sig and self.use_de:
+                    sig = self._run_de(sig, history)
+                if sig:
+                    entry = float(sig["entry"])
+                    sl = float(sig["sl"])
+                    sl_dist = abs(entry - sl)
+                    size = balance * (self.risk_pct / 100) / sl_dist if sl_dist > 1e-9 else 1.0
+                    tp = float(sig["tp"])
+                    is_buy = sig["side"] == "BUY"
+                    open_trade = BacktestTrade(
+                        instrument_id=instrument_id,
+                        side=sig["side"],
+                        entry_price=entry,
+                        sl=sl,
+                        tp=tp,
+                        size=size,
+                        entry_bar=i,
+                    )
+
+        if open_trade is not None:
+            t = open_trade
+            t.close_price = closes[-1]
+            t.close_reason = "END"
+            t.close_bar = len(candles) - 1
+            raw_pnl = (t.close_price - entry) * size if is_buy else (entry - t.close_price) * size
+            t.pnl = raw_pnl - entry * size * commission * 2
+            t.pnl_pct = (t.pnl / balance) * 100
+            balance += t.pnl
+            closed_trades.append(t)
+
+        return self._build_result(
+            instrument_id=instrument_id,
+            candles=candles,
+            balance=balance,
+            closed_trades=closed_trades,
+            equity_curve=equity_curve,
+        )
+
     def _validation_score(self, result: BacktestResult) -> float:
         trade_quality = min(2.5, float(result.total_trades or 0) / 6.0)
         return (
@@ -258,6 +362,7 @@ class BacktestEngine:
                     commission_pct=self.commission_pct * 100,
                     max_open=self.max_open,
                     use_decision_engine=self.use_de,
+                    vectorized=self.vectorized,
                 )
                 train_res = train_engine.run(instrument_id, train_slice)
                 train_score = self._validation_score(train_res)
@@ -289,6 +394,7 @@ class BacktestEngine:
                 commission_pct=self.commission_pct * 100,
                 max_open=self.max_open,
                 use_decision_engine=self.use_de,
+                vectorized=self.vectorized,
             )
             oos_res = test_engine.run(instrument_id, test_slice)
             oos_score = self._validation_score(oos_res)
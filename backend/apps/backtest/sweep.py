@@ -0,0 +1,260 @@
+"""
+Strategy parameter sweep.
+
+Evaluates a grid (or a random sample of a search space) of constructor
+parameters for one strategy over one candle history, and ranks the
+parameter sets by walk-forward robustness:
+
+  * every set is backtested on the full history and on each fold's train
+    (all bars before the test window) and out-of-sample test window, using
+    the same fold layout as `BacktestEngine.run_walk_forward`;
+  * `robust_score` = mean(OOS score) - 0.8 × std(OOS score), as in the
+    symbol-profile walk-forward rankings;
+  * the sweep-level `walk_forward` block picks, per fold, the set with the
+    best train score and reports its OOS score — the honest estimate of
+    what tuning on past data would have delivered.
+
+Parameter sets are split into chunks and run on a `TrainingPool`. A chunk
+converts each slice (full, fold train, fold test) to CandleColumns once and
+shares entry masks between sets with the same mask parameters (e.g. a
+breakout `lookback` with different SL/TP multipliers).
+"""
+from __future__ import annotations
+
+import itertools
+import random
+import time
+from statistics import mean, pstdev
+from typing import Any, Optional
+
+from apps.backtest.engine import BacktestEngine
+from apps.backtest.vectorized import CandleColumns
+from core.strategy.selector import StrategySelector
+
+MAX_COMBINATIONS = 2000
+_ROBUST_STD_PENALTY = 0.8
+
+
+def grid_combinations(grid: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Cartesian product of `{param: [values...]}`, in a stable order."""
+    names = sorted(grid)
+    values = [list(grid[name]) for name in names]
+    if any(not options for options in values):
+        raise ValueError("Every grid parameter needs at least one value")
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def _sample_value(rng: random.Random, spec: Any) -> Any:
+    if isinstance(spec, (list, tuple)):
+        return rng.choice(list(spec))
+    if isinstance(spec, dict) and "min" in spec and "max" in spec:
+        lo, hi = spec["min"], spec["max"]
+        step = spec.get("step")
+        if step:
+            steps = int(round((hi - lo) / step))
+            value = lo + rng.randint(0, max(0, steps)) * step
+            return int(value) if all(isinstance(v, int) for v in (lo, hi, step)) else round(value, 10)
+        if isinstance(lo, int) and isinstance(hi, int):
+            return rng.randint(lo, hi)
+        return rng.uniform(float(lo), float(hi))
+    raise ValueError(f"Unsupported search space entry: {spec!r}")
+
+
+def random_combinations(space: dict[str, Any], samples: int, *, seed: int = 0) -> list[dict[str, Any]]:
+    """
+    Up to `samples` distinct draws from `{param: [choices] | {min, max, step?}}`.
+    Seeded, so a sweep is reproducible.
+    """
+    rng = random.Random(seed)
+    names = sorted(space)
+    seen: set[tuple] = set()
+    combos: list[dict[str, Any]] = []
+    for _ in range(max(1, samples) * 20):
+        combo = {name: _sample_value(rng, space[name]) for name in names}
+        key = tuple(combo[name] for name in names)
+        if key in seen:
+            continue
+        seen.add(key)
+        combos.append(combo)
+        if len(combos) >= samples:
+            break
+    return combos
+
+
+def build_combinations(
+    strategy: str,
+    *,
+    grid: dict[str, list[Any]] | None = None,
+    space: dict[str, Any] | None = None,
+    samples: int = 100,
+    seed: int = 0,
+) -> tuple[str, list[dict[str, Any]]]:
+    """(method, parameter sets); ValueError for an oversized sweep or unknown parameters."""
+    if grid:
+        method, combos = "grid", grid_combinations(grid)
+    elif space:
+        method, combos = "random", random_combinations(space, samples, seed=seed)
+    else:
+        method, combos = "default", [{}]
+    if len(combos) > MAX_COMBINATIONS:
+        raise ValueError(f"Sweep has {len(combos)} parameter sets (max {MAX_COMBINATIONS})")
+    for params in combos:
+        StrategySelector.create(strategy, **params)
+    return method, combos
+
+
+def fold_windows(n: int, folds: int) -> list[tuple[int, int]]:
+    """(train_end, test_end) per fold; the layout of `BacktestEngine.run_walk_forward`."""
+    test_len = max(80, min(240, n // (folds + 2)))
+    min_train = max(200, test_len * 2)
+    windows = []
+    for fold_idx in range(folds):
+        train_end = min_train + fold_idx * test_len
+        test_end = min(n, train_end + test_len)
+        if test_end - train_end < 60:
+            break
+        windows.append((train_end, test_end))
+    return windows
+
+
+class _Slice:
+    """Candles of one evaluation window plus what runs over it can share."""
+
+    __slots__ = ("candles", "columns", "mask_cache")
+
+    def __init__(self, candles: list[dict]):
+        self.candles = candles
+        self.columns = CandleColumns(candles)
+        self.mask_cache: dict = {}
+
+
+def _light(engine: BacktestEngine, instrument_id: str, window: _Slice) -> Optional[dict[str, Any]]:
+    if len(window.candles) < engine.strategy.lookback + 10:
+        return None
+    result = engine.run(instrument_id, window.candles, columns=window.columns, mask_cache=window.mask_cache)
+    return {
+        "score": round(engine._validation_score(result), 4),
+        "total_return_pct": result.total_return_pct,
+        "win_rate": result.win_rate,
+        "profit_factor": result.profit_factor,
+        "max_drawdown_pct": result.max_drawdown_pct,
+        "total_trades": result.total_trades,
+    }
+
+
+def evaluate_chunk(
+    instrument_id: str,
+    strategy_name: str,
+    combos: list[dict[str, Any]],
+    candles: list[dict],
+    windows: list[tuple[int, int]],
+    engine_kwargs: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Pool job: full-history and per-fold results for a chunk of parameter sets."""
+    full = _Slice(candles)
+    folds = [(_Slice(candles[:train_end]), _Slice(candles[train_end:test_end])) for train_end, test_end in windows]
+    rows = []
+    for params in combos:
+        engine = BacktestEngine(
+            strategy=StrategySelector.create(strategy_name, **params),
+            settings=None,
+            use_decision_engine=False,
+            vectorized=True,
+            **engine_kwargs,
+        )
+        overall = _light(engine, instrument_id, full)
+        if overall is None:
+            continue
+        fold_rows = []
+        for fold_idx, (train, test) in enumerate(folds):
+            train_res = _light(engine, instrument_id, train)
+            test_res = _light(engine, instrument_id, test)
+            if train_res is None or test_res is None:
+                continue
+            fold_rows.append({"fold": fold_idx + 1, "train_score": train_res["score"], "oos_score": test_res["score"], "oos_return_pct": test_res["total_return_pct"]})
+        rows.append({"params": params, "full": overall, "folds": fold_rows})
+    return rows
+
+
+def _rank_row(row: dict[str, Any]) -> dict[str, Any]:
+    oos = [fold["oos_score"] for fold in row["folds"]]
+    train = [fold["train_score"] for fold in row["folds"]]
+    oos_mean = mean(oos) if oos else 0.0
+    train_mean = mean(train) if train else 0.0
+    return {
+        **row,
+        "oos_avg_score": round(oos_mean, 4),
+        "oos_std_score": round(pstdev(oos) if len(oos) > 1 else 0.0, 4),
+        "oos_positive_folds": sum(1 for fold in row["folds"] if fold["oos_return_pct"] > 0),
+        "efficiency": round(oos_mean / train_mean, 4) if train_mean > 0 else None,
+        "robust_score": round(oos_mean - _ROBUST_STD_PENALTY * (pstdev(oos) if len(oos) > 1 else 0.0), 4) if oos else None,
+    }
+
+
+def run_sweep(
+    instrument_id: str,
+    candles: list[dict],
+    *,
+    strategy: str,
+    grid: dict[str, list[Any]] | None = None,
+    space: dict[str, Any] | None = None,
+    samples: int = 100,
+    seed: int = 0,
+    folds: int = 4,
+    top: int = 50,
+    pool=None,
+    chunks_per_process: int = 4,
+    **engine_kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Rank parameter sets of `strategy` (see module docstring). Give `grid` for
+    an exhaustive sweep or `space` + `samples` for a random search.
+    `engine_kwargs` go to BacktestEngine (initial_balance, risk_pct, commission_pct).
+    """
+    started = time.perf_counter()
+    method, combos = build_combinations(strategy, grid=grid, space=space, samples=samples, seed=seed)
+    windows = fold_windows(len(candles), folds) if len(candles) >= 320 else []
+    processes = getattr(pool, "processes", 0) if pool is not None else 0
+    n_chunks = max(1, min(len(combos), processes * chunks_per_process if processes else 1))
+    chunks = [combos[i::n_chunks] for i in range(n_chunks)]
+    jobs = [(idx, evaluate_chunk, (instrument_id, strategy, chunk, candles, windows, engine_kwargs)) for idx, chunk in enumerate(chunks)]
+    if pool is None:
+        outputs = {key: fn(*args) for key, fn, args in jobs}
+    else:
+        outputs = {}
+        for key, result, error in pool.run(jobs):
+            if error is not None:
+                raise error
+            outputs[key] = result
+
+    # Restore submission order so ties rank the same regardless of chunking.
+    order = {tuple(sorted(params.items())): idx for idx, params in enumerate(combos)}
+    rows = sorted((row for out in outputs.values() for row in out), key=lambda row: order[tuple(sorted(row["params"].items()))])
+    ranked = [_rank_row(row) for row in rows]
+    ranked.sort(key=lambda row: (row["robust_score"] if row["robust_score"] is not None else float("-inf"), row["full"]["score"]), reverse=True)
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+
+    selections = []
+    for fold_idx in range(len(windows)):
+        candidates = [(row, fold) for row in ranked for fold in row["folds"] if fold["fold"] == fold_idx + 1]
+        if not candidates:
+            continue
+        row, fold = max(candidates, key=lambda item: item[1]["train_score"])
+        selections.append({"fold": fold_idx + 1, "params": row["params"], "train_score": fold["train_score"], "oos_score": fold["oos_score"]})
+
+    return {
+        "instrument_id": instrument_id,
+        "strategy": strategy,
+        "method": method,
+        "evaluated": len(ranked),
+        "candles_used": len(candles),
+        "fold_count": len(windows),
+        "best_params": ranked[0]["params"] if ranked else None,
+        "walk_forward": {
+            "selections": selections,
+            "oos_avg_score": round(mean(item["oos_score"] for item in selections), 4) if selections else None,
+        },
+        "results": ranked[:max(1, int(top))],
+        "elapsed_ms": int((time.perf_counter() - started) * 1000),
+    }
@@ -0,0 +1,158 @@
+"""
+Candidate-bar prefilters for the vectorized BacktestEngine mode.
+
+The reference engine calls `strategy.analyze()` on a fresh 301-bar slice for
+every bar without an open position, recomputing ATR/RSI/VWAP from dicts each
+time. For the built-in strategies most bars cannot produce a signal, and the
+entry condition can be decided from rolling columns in O(1) per bar:
+
+  - breakout:        close vs rolling max(high) / min(low) of the previous
+                     `lookback - 1` bars (monotonic deques, exact);
+  - mean_reversion:  close outside the Bollinger band (same `calc_bollinger`
+                     call on the last `bb_period` closes, exact);
+  - vwap_bounce:     volume ratio (same `calc_volume_ratio` call, exact) and a
+                     close crossing the window VWAP (prefix sums, with a small
+                     tolerance so float drift never hides a crossing).
+
+`candidate_mask()` returns a superset of the bars where `analyze()` can
+return a signal; the engine still calls `analyze()` on those bars, so
+signals, SL/TP and sizing are exactly the reference ones. Other strategies
+(composites, subclasses) get no mask and are analysed on every bar.
+"""
+from __future__ import annotations
+
+from collections import deque
+from itertools import accumulate
+from typing import Optional
+
+from apps.worker.decision_engine.indicators import calc_bollinger, calc_volume_ratio
+from core.strategy.base import BaseStrategy
+from core.strategy.breakout import BreakoutStrategy
+from core.strategy.mean_reversion import MeanReversionStrategy
+from core.strategy.vwap_bounce import VWAPBounceStrategy
+
+# Bars the reference engine hands to analyze(): candles[max(0, i - HISTORY_BARS):i + 1].
+HISTORY_BARS = 300
+# VWAP is rounded to 6 decimals; prefix sums add relative error far below this.
+_VWAP_REL_TOL = 1e-7
+_VWAP_ABS_TOL = 1e-5
+
+
+class CandleColumns:
+    """Float columns of a candle list, converted once per run."""
+
+    __slots__ = ("time", "high", "low", "close", "volume")
+
+    def __init__(self, candles: list[dict]):
+        self.time = [int(c.get("time", i)) for i, c in enumerate(candles)]
+        self.high = [float(c["high"]) for c in candles]
+        self.low = [float(c["low"]) for c in candles]
+        self.close = [float(c["close"]) for c in candles]
+        self.volume = [float(c.get("volume", 0)) for c in candles]
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+def _window_start(i: int) -> int:
+    return max(0, i - HISTORY_BARS)
+
+
+def _breakout_mask(strategy: BreakoutStrategy, cols: CandleColumns, first: int) -> Optional[bytearray]:
+    span = strategy.lookback - 1
+    if span < 1:
+        return None
+    n = len(cols)
+    mask = bytearray(n)
+    highs, lows, closes = cols.high, cols.low, cols.close
+    max_q: deque[int] = deque()
+    min_q: deque[int] = deque()
+    for i in range(1, n):
+        j = i - 1  # previous bars are i-span .. i-1
+        while max_q and highs[max_q[-1]] <= highs[j]:
+            max_q.pop()
+        max_q.append(j)
+        while min_q and lows[min_q[-1]] >= lows[j]:
+            min_q.pop()
+        min_q.append(j)
+        while max_q[0] < i - span:
+            max_q.popleft()
+        while min_q[0] < i - span:
+            min_q.popleft()
+        if i < first or i + 1 - _window_start(i) < strategy.lookback:
+            continue
+        if closes[i] > highs[max_q[0]] or closes[i] < lows[min_q[0]]:
+            mask[i] = 1
+    return mask
+
+
+def _mean_reversion_mask(strategy: MeanReversionStrategy, cols: CandleColumns, first: int) -> bytearray:
+    n = len(cols)
+    mask = bytearray(n)
+    closes = cols.close
+    period = strategy.bb_period
+    for i in range(first, n):
+        if i + 1 - _window_start(i) < period:
+            continue
+        bb = calc_bollinger(closes[i + 1 - period:i + 1], period, strategy.bb_std)
+        if bb and (closes[i] < bb[2] or closes[i] > bb[0]):
+            mask[i] = 1
+    return mask
+
+
+def _vwap_bounce_mask(strategy: VWAPBounceStrategy, cols: CandleColumns, first: int) -> bytearray:
+    n = len(cols)
+    mask = bytearray(n)
+    closes, volumes = cols.close, cols.volume
+    pv = list(accumulate(((h + lo + c) / 3.0 * v for h, lo, c, v in zip(cols.high, cols.low, closes, volumes)), initial=0.0))
+    vv = list(accumulate(volumes, initial=0.0))
+    for i in range(max(first, 1), n):
+        vol_ratio = calc_volume_ratio(volumes[max(0, i - 20):i + 1], 20)
+        if vol_ratio is None or vol_ratio < strategy.min_vol_ratio:
+            continue
+        start = _window_start(i)
+        total_vol = vv[i + 1] - vv[start]
+        if total_vol <= 0:
+            continue
+        vwap = (pv[i + 1] - pv[start]) / total_vol
+        prev, current = closes[i - 1], closes[i]
+        tol = _VWAP_REL_TOL * max(abs(vwap), abs(current)) + _VWAP_ABS_TOL
+        if min(prev, current) - tol <= vwap <= max(prev, current) + tol:
+            mask[i] = 1
+    return mask
+
+
+def mask_key(strategy: BaseStrategy, first: int) -> Optional[tuple]:
+    """The strategy parameters its mask depends on; SL/TP multipliers don't change entries."""
+    kind = type(strategy)
+    if kind is BreakoutStrategy:
+        return ("breakout", first, strategy.lookback)
+    if kind is MeanReversionStrategy:
+        return ("mean_reversion", first, strategy.bb_period, strategy.bb_std)
+    if kind is VWAPBounceStrategy:
+        return ("vwap_bounce", first, strategy.min_vol_ratio)
+    return None
+
+
+def candidate_mask(strategy: BaseStrategy, cols: CandleColumns, first: int, cache: Optional[dict] = None) -> Optional[bytearray]:
+    """
+    Bars from `first` on where `strategy.analyze()` may signal; None = every bar.
+
+    `cache` (one dict per CandleColumns) shares masks between parameter sets
+    with the same `mask_key`, e.g. across a parameter sweep.
+    """
+    key = mask_key(strategy, first) if cache is not None else None
+    if key is not None and key in cache:
+        return cache[key]
+    kind = type(strategy)
+    if kind is BreakoutStrategy:
+        mask = _breakout_mask(strategy, cols, first)
+    elif kind is MeanReversionStrategy:
+        mask = _mean_reversion_mask(strategy, cols, first)
+    elif kind is VWAPBounceStrategy:
+        mask = _vwap_bounce_mask(strategy, cols, first)
+    else:
+        mask = None
+    if key is not None:
+        cache[key] = mask
+    return mask
@@ -183,6 +183,24 @@ def _load_grpc_modules() -> None:
         ) from exc
 
 
+_STREAM_INTERVALS = {
+    "1m": "SUBSCRIPTION_INTERVAL_ONE_MINUTE",
+    "5m": "SUBSCRIPTION_INTERVAL_FIVE_MINUTES",
+}
+
+
+def _apply_subscription_change(active: list[str], action: str, instrument_ids: List[str]) -> list[str]:
+    """Update the desired stream subscription set in place; returns the normalized ids."""
+    ids = [normalize_instrument_id(i) for i in instrument_ids]
+    if action == "subscribe":
+        active.extend(i for i in ids if i not in active)
+    elif action == "unsubscribe":
+        active[:] = [i for i in active if i not in ids]
+    else:
+        raise ValueError(f"Unknown subscription action: {action}")
+    return ids
+
+
 class TBankApiError(RuntimeError):
     pass
 
@@ -217,6 +235,12 @@ def now_timestamp() -> Timestamp:
     return ts
 
 
+def _proto_ts_to_sec(ts) -> int:
+    if hasattr(ts, "timestamp"):
+        return int(ts.timestamp())
+    return int(getattr(ts, "seconds", 0) or 0)
+
+
 def dt_to_timestamp(dt: datetime) -> Timestamp:
     ts = _new_timestamp()
     if dt.tzinfo is None:
@@ -480,6 +504,7 @@ class TBankGrpcAdapter:
             "last_rate_limit_reset": None,
         }
         self._recent_requests: deque[float] = deque(maxlen=2048)
+        self._rate_limit_seen_at: float | None = None
 
     def _record_rest_stat(self, method: str, *, ok: bool, status_code: int | None = None, rate_limit_remaining: str | None = None, rate_limit_reset: str | None = None, detail: str | None = None) -> None:
         stats = self._request_stats
@@ -505,6 +530,18 @@ class TBankGrpcAdapter:
             stats["last_rate_limit_remaining"] = rate_limit_remaining
         if rate_limit_reset is not None:
             stats["last_rate_limit_reset"] = rate_limit_reset
+        if rate_limit_remaining is not None or rate_limit_reset is not None:
+            self._rate_limit_seen_at = time.monotonic()
+
+    def get_rate_limit_budget(self) -> dict[str, Any] | None:
+        """Latest rate-limit headers with the monotonic time they were observed at."""
+        if self._rate_limit_seen_at is None:
+            return None
+        return {
+            "remaining": self._request_stats.get("last_rate_limit_remaining"),
+            "reset_sec": self._request_stats.get("last_rate_limit_reset"),
+            "observed_monotonic": self._rate_limit_seen_at,
+        }
 
     def get_runtime_stats(self) -> dict[str, Any]:
         stats = dict(self._request_stats)
@@ -976,37 +1013,44 @@ class TBankGrpcAdapter:
         candles.sort(key=lambda x: x["time"])
         return candles
 
-    async def stream_marketdata(self, instrument_ids: List[str]) -> AsyncGenerator[Dict, None]:
-        normalized_ids = [normalize_instrument_id(i) for i in instrument_ids]
+    async def stream_marketdata(
+        self,
+        instrument_ids: List[str],
+        *,
+        interval_str: str = "1m",
+        control: Optional[asyncio.Queue] = None,
+        rest_fallback: bool = True,
+    ) -> AsyncGenerator[Dict, None]:
+        """
+        Candle updates from MarketDataStream.
+
+        `control` receives `("subscribe" | "unsubscribe", [instrument_id, ...])`
+        tuples and turns them into subscription requests on the live stream; the
+        current set is resubscribed after every reconnect. With a control queue
+        the generator also yields `{"event_type": "stream_connected", ...}` markers
+        so the consumer can REST-backfill whatever it missed while disconnected.
+        With `rest_fallback=False` stream failures always reconnect with backoff
+        instead of degrading into REST polling.
+        """
+        normalized_ids = list(dict.fromkeys(normalize_instrument_id(i) for i in instrument_ids))
         if self._stream_mode == "rest_poll":
             async for item in self._rest_poll_marketdata(normalized_ids):
                 yield item
             return
 
         _load_grpc_modules()
+        interval = _STREAM_INTERVALS.get(interval_str)
+        if interval is None:
+            raise TBankApiError(f"Candle streaming is not available for interval {interval_str}")
         backoff = 1
+        connects = 0
         while True:
             try:
-                uids = []
-                map_uid_ticker = {}
-                unresolved: list[str] = []
-                for iid in normalized_ids:
-                    try:
-                        uid = await self.resolve_instrument(iid)
-                    except Exception as exc:
-                        unresolved.append(iid)
-                        logger.warning("Skipping unresolved instrument %s for stream: %s", iid, exc)
-                        continue
-                    if uid:
-                        uids.append(uid)
-                        map_uid_ticker[uid] = iid
-                    else:
-                        unresolved.append(iid)
-
-                if unresolved:
-                    logger.warning("Stream unresolved instruments skipped: %s", ", ".join(unresolved))
-
-                if not uids:
+                if control is not None:
+                    while not control.empty():
+                        _apply_subscription_change(normalized_ids, *control.get_nowait())
+                map_uid_ticker = await self._resolve_stream_uids(normalized_ids)
+                if not map_uid_ticker:
                     logger.warning("No instruments resolved for streaming.")
                     await asyncio.sleep(5)
                     continue
@@ -1014,27 +1058,52 @@ class TBankGrpcAdapter:
                 channel = await self._get_channel()
                 stub = marketdata_pb2_grpc.MarketDataStreamServiceStub(channel)
 
-                subscribe_req = marketdata_pb2.MarketDataRequest(
-                    subscribe_candles_request=marketdata_pb2.SubscribeCandlesRequest(
-                        subscription_action=marketdata_pb2.SUBSCRIPTION_ACTION_SUBSCRIBE,
-                        instruments=[
-                            marketdata_pb2.CandleInstrument(
-                                instrument_id=uid,
-                                interval=marketdata_pb2.SUBSCRIPTION_INTERVAL_ONE_MINUTE,
-                            )
-                            for uid in uids
-                        ],
+                def candles_request(action, uids):
+                    return marketdata_pb2.MarketDataRequest(
+                        subscribe_candles_request=marketdata_pb2.SubscribeCandlesRequest(
+                            subscription_action=action,
+                            instruments=[
+                                marketdata_pb2.CandleInstrument(
+                                    instrument_id=uid,
+                                    interval=getattr(marketdata_pb2, interval),
+                                )
+                                for uid in uids
+                            ],
+                        )
                     )
-                )
 
                 async def request_gen():
-                    yield subscribe_req
+                    yield candles_request(marketdata_pb2.SUBSCRIPTION_ACTION_SUBSCRIBE, list(map_uid_ticker))
                     while True:
-                        await asyncio.sleep(3600)
+                        if control is None:
+                            await asyncio.sleep(3600)
+                            continue
+                        action, ids = await control.get()
+                        ids = _apply_subscription_change(normalized_ids, action, ids)
+                        if action == "subscribe":
+                            added = await self._resolve_stream_uids(ids)
+                            map_uid_ticker.update(added)
+                            uids = list(added)
+                            grpc_action = marketdata_pb2.SUBSCRIPTION_ACTION_SUBSCRIBE
+                        else:
+                            uids = [uid for uid, iid in map_uid_ticker.items() if iid in ids]
+                            for uid in uids:
+                                map_uid_ticker.pop(uid, None)
+                            grpc_action = marketdata_pb2.SUBSCRIPTION_ACTION_UNSUBSCRIBE
+                        if uids:
+                            logger.info("Stream %s: %s", action, ", ".join(ids))
+                            yield candles_request(grpc_action, uids)
 
                 stream = stub.MarketDataStream(request_gen(), metadata=self.metadata)
-                logger.info(f"Connected to T-Bank stream for {len(uids)} instruments.")
+                connects += 1
+                logger.info(f"Connected to T-Bank stream for {len(map_uid_ticker)} instruments.")
                 backoff = 1
+                if control is not None:
+                    yield {
+                        "event_type": "stream_connected",
+                        "instrument_ids": list(map_uid_ticker.values()),
+                        "reconnect": connects > 1,
+                    }
 
                 async for resp in stream:
                     if resp.HasField("candle"):
@@ -1044,11 +1113,12 @@ class TBankGrpcAdapter:
                             yield self._convert_stream_candle(c, internal_id, c.instrument_uid)
                     elif resp.HasField("ping"):
                         pass
+                logger.warning("T-Bank stream closed by server; reconnecting.")
             except Exception as e:
                 if await self._advance_grpc_tls_variant(e):
                     backoff = 1
                     continue
-                if self.sandbox or self._stream_mode == "auto":
+                if rest_fallback and (self.sandbox or self._stream_mode == "auto"):
                     logger.warning(
                         "Falling back to REST candle polling because gRPC stream is unavailable (%s): %s",
                         self._grpc_tls_variant_label,
@@ -1066,6 +1136,27 @@ class TBankGrpcAdapter:
                 await asyncio.sleep(backoff)
                 backoff = min(backoff * 2, 60)
 
+    def supports_candle_stream(self, interval_str: str) -> bool:
+        return self._stream_mode != "rest_poll" and interval_str in _STREAM_INTERVALS
+
+    async def _resolve_stream_uids(self, instrument_ids: List[str]) -> dict[str, str]:
+        map_uid_ticker: dict[str, str] = {}
+        unresolved: list[str] = []
+        for iid in instrument_ids:
+            try:
+                uid = await self.resolve_instrument(iid)
+            except Exception as exc:
+                unresolved.append(iid)
+                logger.warning("Skipping unresolved instrument %s for stream: %s", iid, exc)
+                continue
+            if uid:
+                map_uid_ticker[uid] = iid
+            else:
+                unresolved.append(iid)
+        if unresolved:
+            logger.warning("Stream unresolved instruments skipped: %s", ", ".join(unresolved))
+        return map_uid_ticker
+
     async def _rest_poll_marketdata(self, instrument_ids: List[str]) -> AsyncGenerator[Dict, None]:
         last_seen: dict[str, tuple[int, str, str, str, str, int]] = {}
         logger.info(
@@ -1149,7 +1240,7 @@ class TBankGrpcAdapter:
         return {
             "instrument_id": instrument_id,
             "broker_id": broker_id,
-            "time": int(c.time.timestamp()) if hasattr(c.time, "timestamp") else 0,
+            "time": _proto_ts_to_sec(c.time),
             "open": quotation_to_decimal(c.open),
             "high": quotation_to_decimal(c.high),
             "low": quotation_to_decimal(c.low),
@@ -5,13 +5,20 @@ P3-03: CandleAggregator — агрегация тиков в OHLCV свечи.
   - Определение начала нового бара
   - Обновление текущей свечи
   - Финализацию (закрытие) предыдущей и добавление в историю
+  - Обновление потоковых индикаторов (IndicatorBook) на закрытии бара
+
+История хранится колонками (apps.worker.candle_store), а не dict на бар.
 """
-from collections import deque
 from decimal import Decimal
 from typing import NamedTuple
 
+from apps.worker.candle_store import CandleColumns, CandleHistory
+from apps.worker.decision_engine.streaming import IndicatorBook
 from core.utils.time import ensure_sec
 
+_FRAME_LABELS = {60: "1m", 180: "3m", 300: "5m", 900: "15m", 1800: "30m", 3600: "1h"}
+_NO_BARS = CandleColumns(1)  # never appended to; backs histories of unseen tickers
+
 
 class Candle(NamedTuple):
     instrument_id: str
@@ -37,12 +44,18 @@ class CandleAggregator:
         self.frame_sec = frame_sec
         self.history_size = history_size
         self._current: dict[str, dict] = {}          # live partial candle per ticker
-        self._history: dict[str, deque] = {}         # completed candles per ticker
+        self._history: dict[str, CandleColumns] = {}  # completed candles per ticker
+        self.timeframe = _FRAME_LABELS.get(frame_sec, f"{frame_sec}s")
+        self.indicators = IndicatorBook(window=history_size)
 
-    def on_tick(self, tick: dict) -> tuple[Candle, bool]:
+    def on_tick(self, tick: dict, *, replace: bool = False) -> tuple[Candle, bool]:
         """
         Process a single tick.
 
+        `replace=True` treats the tick as a cumulative snapshot of the broker's
+        own candle for the same frame (gRPC stream / GetCandles), so it overwrites
+        the partial bar instead of adding its volume on top.
+
         Returns:
             (current_candle, bar_closed)
             bar_closed=True means a new bar just started and the previous was finalized.
@@ -52,7 +65,7 @@ class CandleAggregator:
         frame_start = (tick_ts // self.frame_sec) * self.frame_sec
 
         if ticker not in self._history:
-            self._history[ticker] = deque(maxlen=self.history_size)
+            self._history[ticker] = CandleColumns(self.history_size)
 
         candle = self._current.get(ticker)
         bar_closed = False
@@ -60,7 +73,9 @@ class CandleAggregator:
         if not candle or candle["time"] != frame_start:
             # New bar — finalize previous
             if candle:
-                self._history[ticker].append(self._to_dict(candle))
+                finalized = self._to_dict(candle)
+                self._history[ticker].append(finalized)
+                self.indicators.on_bar_closed(ticker, self.timeframe, finalized)
                 bar_closed = True
 
             candle = {
@@ -72,6 +87,11 @@ class CandleAggregator:
                 "close": float(tick["close"]),
                 "volume": int(tick["volume"]),
             }
+        elif replace:
+            candle["high"] = float(tick["high"])
+            candle["low"] = float(tick["low"])
+            candle["close"] = float(tick["close"])
+            candle["volume"] = int(tick["volume"])
         else:
             candle["high"] = max(candle["high"], float(tick["high"]))
             candle["low"] = min(candle["low"], float(tick["low"]))
@@ -93,16 +113,29 @@ class CandleAggregator:
             bar_closed,
         )
 
-    def get_history(self, ticker: str) -> list[dict]:
-        """Return completed candles + current partial candle as list of dicts."""
-        completed = list(self._history.get(ticker, []))
+    def get_history(self, ticker: str) -> CandleHistory:
+        """
+        Return completed candles + current partial candle.
+
+        The result is a read-only sequence of dicts backed by the column store;
+        it does not change when later bars close.
+        """
+        current = self._current.get(ticker)
+        partial = self._to_dict(current) if current else None
+        return self._history.get(ticker, _NO_BARS).view(partial)
+
+    def indicator_snapshot(self, ticker: str) -> dict | None:
+        """Streaming indicators for exactly what `get_history(ticker)` returns."""
         current = self._current.get(ticker)
-        if current:
-            completed.append(self._to_dict(current))
-        return completed
+        return self.indicators.snapshot(ticker, self.timeframe, self._to_dict(current) if current else None)
 
     def history_len(self, ticker: str) -> int:
-        return len(self._history.get(ticker, []))
+        columns = self._history.get(ticker)
+        return len(columns) if columns is not None else 0
+
+    def current_time(self, ticker: str) -> int | None:
+        c = self._current.get(ticker)
+        return c["time"] if c else None
 
     def current_price(self, ticker: str) -> float | None:
         c = self._current.get(ticker)
@@ -0,0 +1,147 @@
+"""
+Process-pool fan-out for the CPU-only analysis stages.
+
+`_run_strategy_timeframe_search` (resampling + `strategy.analyze` per candidate
+timeframe) is pure Python and used to run on the event loop for one ticker at
+a time. The analysis loop now submits it for every due ticker up front and
+`SignalProcessor.process` consumes the finished result, so cycle time scales
+with cores rather than watchlist size.
+
+Candle histories cross the process boundary as compact column arrays
+(`pack_candles` / `unpack_candles`) instead of lists of dicts; aggregator
+histories are already columnar and are copied column by column. When the
+selected timeframe is 1m the child does not send the history back; the parent
+reuses its own list.
+
+WORKER_ANALYSIS_PROCESSES=0 disables the pool; the search then runs in a
+thread so the loop still is not blocked.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from typing import Any
+
+from apps.worker.candle_store import CandleHistory
+from core.strategy.base import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+_SETTINGS_FIELDS = ("higher_timeframe",)
+
+SearchResult = tuple[dict | None, list[dict], dict]
+
+
+def pack_candles(candles: list[dict] | CandleHistory) -> dict[str, array]:
+    if isinstance(candles, CandleHistory):
+        return candles.to_arrays()
+    return {
+        "time": array("q", (int(c["time"]) for c in candles)),
+        "open": array("d", (float(c["open"]) for c in candles)),
+        "high": array("d", (float(c["high"]) for c in candles)),
+        "low": array("d", (float(c["low"]) for c in candles)),
+        "close": array("d", (float(c["close"]) for c in candles)),
+        "volume": array("q", (int(c.get("volume") or 0) for c in candles)),
+    }
+
+
+def unpack_candles(packed: dict[str, array]) -> list[dict]:
+    return [
+        {"time": t, "open": o, "high": h, "low": low, "close": c, "volume": v}
+        for t, o, h, low, c, v in zip(
+            packed["time"], packed["open"], packed["high"], packed["low"], packed["close"], packed["volume"]
+        )
+    ]
+
+
+def _settings_view(settings: Any) -> SimpleNamespace:
+    """The handful of settings fields the search reads, detached from the ORM row."""
+    return SimpleNamespace(**{name: getattr(settings, name, None) for name in _SETTINGS_FIELDS})
+
+
+def _search_job(
+    strategy: BaseStrategy,
+    ticker: str,
+    packed: dict[str, array],
+    adaptive_plan: dict | None,
+    settings: SimpleNamespace,
+    indicators: dict | None,
+) -> tuple[dict | None, dict[str, array] | None, dict]:
+    from apps.worker.processor_support import _run_strategy_timeframe_search
+
+    history = unpack_candles(packed)
+    sig_data, analysis_history, timeframe_meta = _run_strategy_timeframe_search(
+        strategy, ticker, history, adaptive_plan, settings, indicators=indicators
+    )
+    same_as_base = analysis_history is history or (sig_data is None) or timeframe_meta.get("selected_timeframe") == "1m"
+    return sig_data, None if same_as_base else pack_candles(analysis_history), timeframe_meta
+
+
+class AnalysisPool:
+    def __init__(self, processes: int | None = None):
+        configured = os.getenv("WORKER_ANALYSIS_PROCESSES")
+        if processes is None:
+            processes = int(configured) if configured not in (None, "") else min(4, os.cpu_count() or 1)
+        self.processes = max(0, int(processes))
+        self._start_method = os.getenv("WORKER_ANALYSIS_START_METHOD", "spawn") or "spawn"
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context(self._start_method),
+            )
+        return self._pool
+
+    async def strategy_search(
+        self,
+        strategy: BaseStrategy,
+        ticker: str,
+        history: list[dict] | CandleHistory,
+        adaptive_plan: dict | None,
+        settings: Any,
+        *,
+        indicators: dict | None = None,
+    ) -> SearchResult:
+        settings_view = _settings_view(settings)
+        if not self.enabled:
+            from apps.worker.processor_support import _run_strategy_timeframe_search
+
+            return await asyncio.to_thread(
+                _run_strategy_timeframe_search, strategy, ticker, history, adaptive_plan, settings_view, indicators=indicators
+            )
+
+        loop = asyncio.get_running_loop()
+        try:
+            sig_data, packed_history, timeframe_meta = await loop.run_in_executor(
+                self._executor(), _search_job, strategy, ticker, pack_candles(history), adaptive_plan, settings_view, indicators
+            )
+        except BrokenProcessPool as exc:
+            logger.error("Analysis process pool broke (%s); recreating and retrying %s in-thread", exc, ticker)
+            self.shutdown(wait=False)
+            from apps.worker.processor_support import _run_strategy_timeframe_search
+
+            return await asyncio.to_thread(
+                _run_strategy_timeframe_search, strategy, ticker, history, adaptive_plan, settings_view, indicators=indicators
+            )
+        analysis_history = list(history) if packed_history is None else unpack_candles(packed_history)
+        return sig_data, analysis_history, timeframe_meta
+
+    def submit_search(self, *args: Any, **kwargs: Any) -> asyncio.Task:
+        return asyncio.create_task(self.strategy_search(*args, **kwargs))
+
+    def shutdown(self, wait: bool = True) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
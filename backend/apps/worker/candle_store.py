@@ -0,0 +1,163 @@
+"""
+Columnar candle history for CandleAggregator.
+
+Completed bars live in fixed `array` columns (time/open/high/low/close/volume)
+instead of one dict per bar. Storage is twice the retention window and only
+ever written past the current end; when it fills up, the last `capacity - 1`
+bars are copied into fresh arrays. That keeps every window contiguous, so
+`CandleHistory` can expose zero-copy `memoryview` slices. A history handed to
+the analysis loop also never changes underneath it while new bars close.
+
+`CandleHistory` is a read-only `Sequence[dict]`, so legacy callers that index,
+slice, iterate or `len()` a list of candle dicts keep working. Rows are built
+on demand; a full iteration materializes them once per view.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from typing import Any, Iterator
+
+COLUMNS: dict[str, str] = {
+    "time": "q",
+    "open": "d",
+    "high": "d",
+    "low": "d",
+    "close": "d",
+    "volume": "q",
+}
+_ITEM_SIZE = 8
+
+
+class CandleHistory(Sequence):
+    """Immutable view: completed bars (columns) plus an optional partial bar."""
+
+    __slots__ = ("_cols", "_partial", "_rows")
+
+    def __init__(self, cols: dict[str, memoryview], partial: dict | None = None):
+        self._cols = cols
+        self._partial = partial
+        self._rows: list[dict] | None = None
+
+    def __len__(self) -> int:
+        return len(self._cols["time"]) + (1 if self._partial is not None else 0)
+
+    def _row(self, i: int) -> dict:
+        cols = self._cols
+        return {
+            "time": cols["time"][i],
+            "open": cols["open"][i],
+            "high": cols["high"][i],
+            "low": cols["low"][i],
+            "close": cols["close"][i],
+            "volume": cols["volume"][i],
+        }
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("candle history index out of range")
+        if self._rows is not None:
+            return self._rows[index]
+        if self._partial is not None and index == size - 1:
+            return self._partial
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.to_list())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (CandleHistory, list, tuple)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"CandleHistory(bars={len(self)}, partial={self._partial is not None})"
+
+    @property
+    def partial(self) -> dict | None:
+        return self._partial
+
+    def columns(self) -> dict[str, memoryview]:
+        """Zero-copy columns of the completed bars (the partial bar is not included)."""
+        return dict(self._cols)
+
+    def to_arrays(self) -> dict[str, array]:
+        """Compact copies of all bars, partial included, e.g. for pickling to a worker process."""
+        out = {name: array(code, self._cols[name]) for name, code in COLUMNS.items()}
+        if self._partial is not None:
+            for name, code in COLUMNS.items():
+                value = self._partial[name]
+                out[name].append(int(value) if code == "q" else float(value))
+        return out
+
+    def to_list(self) -> list[dict]:
+        if self._rows is None:
+            cols = self._cols
+            rows = [
+                {"time": t, "open": o, "high": h, "low": low, "close": c, "volume": v}
+                for t, o, h, low, c, v in zip(
+                    cols["time"].tolist(),
+                    cols["open"].tolist(),
+                    cols["high"].tolist(),
+                    cols["low"].tolist(),
+                    cols["close"].tolist(),
+                    cols["volume"].tolist(),
+                )
+            ]
+            if self._partial is not None:
+                rows.append(self._partial)
+            self._rows = rows
+        return self._rows
+
+
+class CandleColumns:
+    """Per-instrument ring of the last `capacity` completed bars."""
+
+    __slots__ = ("capacity", "_cols", "_start", "_end")
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._cols = self._allocate()
+        self._start = 0
+        self._end = 0
+
+    def _allocate(self) -> dict[str, array]:
+        size = self.capacity * 2
+        return {name: array(code, bytes(_ITEM_SIZE * size)) for name, code in COLUMNS.items()}
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, candle: dict) -> None:
+        if self._end == self.capacity * 2:
+            keep = self.capacity - 1
+            fresh = self._allocate()
+            for name, column in self._cols.items():
+                fresh[name][0:keep] = column[self._end - keep:self._end]
+            self._cols = fresh
+            self._start = 0
+            self._end = keep
+        i = self._end
+        cols = self._cols
+        cols["time"][i] = int(candle["time"])
+        cols["open"][i] = float(candle["open"])
+        cols["high"][i] = float(candle["high"])
+        cols["low"][i] = float(candle["low"])
+        cols["close"][i] = float(candle["close"])
+        cols["volume"][i] = int(candle.get("volume") or 0)
+        self._end += 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+
+    def view(self, partial: dict | None = None) -> CandleHistory:
+        return CandleHistory(
+            {name: memoryview(column)[self._start:self._end] for name, column in self._cols.items()},
+            partial,
+        )
@@ -0,0 +1,127 @@
+"""
+Write-behind persistence for completed candles.
+
+Bar close and history bootstrap used to upsert into `candle_cache` inline,
+one session and (outside Postgres) one SELECT + commit per row. `CandleWriter`
+turns that into an in-memory append: rows are coalesced by
+(instrument, timeframe, ts) and a background task writes them through
+`db_executor` with multi-row upserts every `flush_ms` or as soon as
+`max_rows` are pending. `close()` flushes whatever is left on shutdown.
+
+A failed flush puts its rows back (unless a newer version of the same candle
+arrived meanwhile) and they are retried on the next cycle. While the database
+stays unavailable the requeued buffer is capped at `max_pending` rows: the
+oldest are dropped, logged and counted in `dropped`. `add()` itself never
+drops; bulk producers (history bootstrap) await `flush()` once `max_rows` are
+pending instead of outrunning the writer.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+from typing import Any, Iterable
+
+from apps.worker.db_executor import WorkerDbExecutor, db_executor
+from core.storage.repos import candles as candle_repo
+
+logger = logging.getLogger(__name__)
+
+
+class CandleWriter:
+    def __init__(
+        self,
+        executor: WorkerDbExecutor = db_executor,
+        flush_ms: int | None = None,
+        max_rows: int | None = None,
+        max_pending: int | None = None,
+    ):
+        self.executor = executor
+        self.flush_sec = max(10, int(flush_ms or os.getenv("WORKER_CANDLE_FLUSH_MS", "1000") or "1000")) / 1000.0
+        self.max_rows = max(1, int(max_rows or os.getenv("WORKER_CANDLE_FLUSH_ROWS", "500") or "500"))
+        self.max_pending = max(self.max_rows, int(max_pending or os.getenv("WORKER_CANDLE_MAX_PENDING", "20000") or "20000"))
+        self._pending: dict[tuple, dict] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.stats: dict[str, int] = {"queued": 0, "written": 0, "flushes": 0, "errors": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, instrument_id: str, timeframe: str, candles: Iterable[dict], source: str = "worker") -> int:
+        """Queue candles for persistence; returns how many were queued."""
+        queued = 0
+        for candle in candles:
+            row = candle_repo.candle_row(instrument_id, timeframe, candle, source)
+            self._pending[(row["instrument_id"], row["timeframe"], row["ts"])] = row
+            queued += 1
+        self.stats["queued"] += queued
+        self._ensure_started()
+        if len(self._pending) >= self.max_rows:
+            self._wakeup.set()
+        return queued
+
+    def _trim(self) -> None:
+        """Drop the oldest requeued rows beyond `max_pending` after a failed flush."""
+        overflow = len(self._pending) - self.max_pending
+        if overflow <= 0:
+            return
+        for key in list(itertools.islice(self._pending, overflow)):
+            del self._pending[key]
+        self.stats["dropped"] += overflow
+        logger.warning("Candle write-behind buffer full: dropped %d oldest row(s) (max_pending=%d)", overflow, self.max_pending)
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="worker-candle-writer")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_sec)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Candle write-behind flush failed (%d rows pending): %s", len(self._pending), exc)
+
+    async def flush(self) -> int:
+        """Write everything pending now; returns the number of rows written."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            try:
+                written = await self.executor.run(candle_repo.upsert_candle_rows, list(batch.values()))
+            except Exception:
+                self.stats["errors"] += 1
+                # Failed rows are older than anything queued meanwhile: keep them first, newer versions win.
+                batch.update(self._pending)
+                self._pending = batch
+                self._trim()
+                raise
+            self.stats["flushes"] += 1
+            self.stats["written"] += written
+            return written
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {**self.stats, "pending": len(self._pending)}
+
+
+candle_writer = CandleWriter()
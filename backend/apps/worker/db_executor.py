@@ -0,0 +1,121 @@
+"""
+Worker DB execution layer.
+
+The engine is synchronous (core.storage.database), so every query issued from a
+worker coroutine used to run on the event-loop thread and stall polling, market
+publishing and the command listener together. `WorkerDbExecutor` moves that work
+to a dedicated thread pool:
+
+  - `run(fn, *args)`  — `fn(db, *args)` in a fresh session that is rolled back
+    on error and closed, all inside the pool thread (same contract as
+    `with SessionLocal() as db:` — repos commit themselves);
+  - `session()`       — async context manager for code that interleaves awaits
+    with DB work (analysis loop, SignalProcessor); session creation, rollback
+    and close happen in the pool;
+  - `call(fn, *args)` — any blocking callable, typically a repo function bound to
+    a session obtained from `session()`.
+
+A session is only ever used by the coroutine that owns it and each `call` is
+awaited before the next one, so access stays sequential even though it hops
+between pool threads.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from sqlalchemy.orm import Session
+
+from core.storage.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerDbExecutor:
+    def __init__(self, max_workers: int | None = None, session_factory: Callable[[], Session] = SessionLocal):
+        self.max_workers = max(1, int(max_workers or os.getenv("WORKER_DB_THREADS", "4") or "4"))
+        self._session_factory = session_factory
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        # Pool threads finish calls concurrently; `_stats_lock` keeps the counters consistent.
+        self._stats_lock = threading.Lock()
+        self.stats: dict[str, int] = {"calls": 0, "errors": 0, "busy_ms_total": 0, "max_call_ms": 0}
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="worker-db")
+        return self._pool
+
+    def _timed(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        started = time.perf_counter()
+        failed = False
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+            with self._stats_lock:
+                self.stats["calls"] += 1
+                self.stats["errors"] += int(failed)
+                self.stats["busy_ms_total"] += elapsed_ms
+                if elapsed_ms > self.stats["max_call_ms"]:
+                    self.stats["max_call_ms"] = elapsed_ms
+
+    async def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), functools.partial(self._timed, fn, *args, **kwargs))
+
+    def _run_in_session(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        db = self._session_factory()
+        try:
+            return fn(db, *args, **kwargs)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self.call(self._run_in_session, fn, *args, **kwargs)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Session]:
+        db = await self.call(self._session_factory)
+        try:
+            yield db
+        except BaseException:
+            await self.call(db.rollback)
+            raise
+        finally:
+            await self.call(db.close)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        calls = stats["calls"]
+        return {
+            **stats,
+            "threads": self.max_workers,
+            "avg_call_ms": round(stats["busy_ms_total"] / calls, 2) if calls else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+db_executor = WorkerDbExecutor()
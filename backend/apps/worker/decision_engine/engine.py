@@ -12,7 +12,7 @@ import logging
 from apps.worker.decision_engine.types import (
     Decision, DecisionResult, MarketSnapshot, Reason, ReasonCode, Severity,
 )
-from apps.worker.decision_engine import rules, indicators
+from apps.worker.decision_engine import rules, indicators, streaming
 from core.risk.economic import EconomicFilter, EconomicFilterConfig
 from core.services.sector_filters import apply_sector_overrides
 
@@ -143,28 +143,50 @@ class DecisionEngine:
                                   _get_w(getattr(self.settings, 'decision_threshold', None), 70), reasons, metrics)
 
         # ── 3. Prepare indicators ─────────────────────────────────────────────
-        closes  = [indicators.to_float(c["close"])  for c in snapshot.candles]
-        highs   = [indicators.to_float(c["high"])   for c in snapshot.candles]
-        lows    = [indicators.to_float(c["low"])    for c in snapshot.candles]
-        volumes = [float(c.get("volume", 0))         for c in snapshot.candles]
+        # Streaming state (fed by CandleAggregator) is O(1) per bar; only the
+        # level lookback tail has to be materialized in that case.
+        level_lookback_bars = max(21, int(getattr(self.settings, 'level_lookback_bars', 55) or 55))
+        streamed = streaming.matching_snapshot(snapshot.indicators, snapshot.candles)
+        n_candles = len(snapshot.candles)
+        source = snapshot.candles[-(level_lookback_bars + 1):] if streamed is not None else snapshot.candles
+        closes  = [indicators.to_float(c["close"])  for c in source]
+        highs   = [indicators.to_float(c["high"])   for c in source]
+        lows    = [indicators.to_float(c["low"])    for c in source]
 
         ema_period = 50
-        if thesis_timeframe in {'15m', '30m', '1h'} and len(closes) >= 38:
+        if thesis_timeframe in {'15m', '30m', '1h'} and n_candles >= 38:
             ema_period = 34
-        elif thesis_timeframe == '5m' and len(closes) >= 40:
+        elif thesis_timeframe == '5m' and n_candles >= 40:
             ema_period = 34
         metrics['ema_period_used'] = ema_period
-        ema50      = indicators.calc_ema(closes, ema_period)
-        ema50_prev = indicators.calc_ema(closes[:-1], min(ema_period, max(1, len(closes) - 1)))
-        rsi14      = indicators.calc_rsi(closes, 14)
-        atr14      = indicators.calc_atr(highs, lows, closes, 14)
-        macd_tuple = indicators.calc_macd(closes)
-
-        # P5-01: New indicators
-        bb         = indicators.calc_bollinger(closes, 20, 2.0)   # (upper, mid, lower)
-        stoch      = indicators.calc_stochastic(highs, lows, closes, 14, 3)  # (%K, %D)
-        vol_ratio  = indicators.calc_volume_ratio(volumes, 20)
-        vwap       = indicators.calc_vwap(highs, lows, closes, volumes)
+        metrics['indicator_source'] = 'streaming' if streamed is not None else 'recomputed'
+        if streamed is not None:
+            ema50      = streamed.get(f'ema_{ema_period}')
+            ema50_prev = streamed.get(f'ema_{ema_period}_prev')
+            if n_candles - 1 < ema_period:
+                # Reference shortens the period for the previous-bar EMA here.
+                all_closes = [indicators.to_float(c["close"]) for c in snapshot.candles[:-1]]
+                ema50_prev = indicators.calc_ema(all_closes, max(1, n_candles - 1))
+            rsi14      = streamed.get('rsi_14')
+            atr14      = streamed.get('atr_14')
+            macd_tuple = streamed.get('macd')
+            bb         = streamed.get('bollinger')
+            stoch      = streamed.get('stochastic')
+            vol_ratio  = streamed.get('volume_ratio')
+            vwap       = streamed.get('vwap')
+        else:
+            volumes = [float(c.get("volume", 0)) for c in snapshot.candles]
+            ema50      = indicators.calc_ema(closes, ema_period)
+            ema50_prev = indicators.calc_ema(closes[:-1], min(ema_period, max(1, len(closes) - 1)))
+            rsi14      = indicators.calc_rsi(closes, 14)
+            atr14      = indicators.calc_atr(highs, lows, closes, 14)
+            macd_tuple = indicators.calc_macd(closes)
+
+            # P5-01: New indicators
+            bb         = indicators.calc_bollinger(closes, 20, 2.0)   # (upper, mid, lower)
+            stoch      = indicators.calc_stochastic(highs, lows, closes, 14, 3)  # (%K, %D)
+            vol_ratio  = indicators.calc_volume_ratio(volumes, 20)
+            vwap       = indicators.calc_vwap(highs, lows, closes, volumes)
 
         stop_atr_ratio = (abs(float(signal.entry) - float(signal.sl)) / atr14) if atr14 and atr14 > 0 else None
         metrics.update({
@@ -254,7 +276,6 @@ class DecisionEngine:
             metrics["stoch_signal"] = "confirm" if stoch_aligned else "neutral"
 
         # D) Levels (nearest opposing S/R, excluding current bar)
-        level_lookback_bars = max(21, int(getattr(self.settings, 'level_lookback_bars', 55) or 55))
         lookback_highs = highs[-(level_lookback_bars + 1):-1] if len(highs) > 1 else []
         lookback_lows = lows[-(level_lookback_bars + 1):-1] if len(lows) > 1 else []
         entry_f = float(signal.entry)
@@ -0,0 +1,372 @@
+"""
+Incremental (streaming) indicator state for the decision engine.
+
+`indicators.py` recomputes every indicator from bar 0 on each call. The classes
+below keep running state per (instrument, timeframe) so that a closed bar costs
+O(1) per indicator, and the live partial bar can be "peeked" without mutating
+the committed state.
+
+Formulas and seeding mirror `indicators.py` exactly (SMA seed for EMA/MACD,
+Wilder smoothing for RSI/ATR, population σ for Bollinger). While the history
+window has not rolled yet the results are bit-identical; once old bars are
+evicted from the window the recursive indicators keep their longer memory and
+differ from a full recompute only by the decayed seed term.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Optional
+
+EMA_PERIODS: tuple[int, ...] = (34, 50)
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+MACD_PERIODS = (12, 26, 9)
+BB_PERIOD = 20
+BB_STD = 2.0
+STOCH_PERIODS = (14, 3)
+VOLUME_RATIO_PERIOD = 20
+
+
+class _Ema:
+    """EMA seeded with the SMA of the first `period` values."""
+
+    __slots__ = ("period", "k", "count", "seed_sum", "value", "prev")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value: Optional[float] = None
+        self.prev: Optional[float] = None
+
+    def update(self, val: float) -> None:
+        self.prev = self.value
+        self.value = self.peek(val)
+        self.count += 1
+        if self.count <= self.period:
+            self.seed_sum += val
+
+    def peek(self, val: float) -> Optional[float]:
+        n = self.count + 1
+        if n < self.period:
+            return None
+        if n == self.period:
+            return (self.seed_sum + val) / self.period
+        return (val * self.k) + (self.value * (1 - self.k))
+
+
+class _Wilder:
+    """Wilder-smoothed average seeded with the SMA of the first `period` inputs."""
+
+    __slots__ = ("period", "count", "seed_sum", "value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, val: float) -> None:
+        self.value = self.peek(val)
+        self.count += 1
+        if self.count <= self.period:
+            self.seed_sum += val
+
+    def peek(self, val: float) -> Optional[float]:
+        n = self.count + 1
+        if n < self.period:
+            return None
+        if n == self.period:
+            return (self.seed_sum + val) / self.period
+        return (self.value * (self.period - 1) + val) / self.period
+
+
+def _rsi_value(avg_gain: Optional[float], avg_loss: Optional[float]) -> Optional[float]:
+    if avg_gain is None or avg_loss is None:
+        return None
+    if avg_loss == 0:
+        return 100.0
+    rs = avg_gain / avg_loss
+    return round(100 - (100 / (1 + rs)), 6)
+
+
+def _bollinger(window: list[float], period: int, std_dev: float) -> Optional[tuple[float, float, float]]:
+    if len(window) < period:
+        return None
+    middle = sum(window) / period
+    variance = sum((x - middle) ** 2 for x in window) / period
+    sigma = variance ** 0.5
+    return (
+        round(middle + std_dev * sigma, 6),
+        round(middle, 6),
+        round(middle - std_dev * sigma, 6),
+    )
+
+
+def _stoch_k(highs: list[float], lows: list[float], close: float) -> float:
+    hh = max(highs)
+    ll = min(lows)
+    denom = hh - ll
+    if denom < 1e-9:
+        return 50.0
+    return (close - ll) / denom * 100.0
+
+
+class IndicatorState:
+    """
+    Running indicator state for one (instrument, timeframe) series.
+
+    Args:
+        window: Size of the completed-bar window the caller keeps (the
+            aggregator's `history_size`). VWAP is a sum over that window, so the
+            state evicts the same bars the caller does.
+    """
+
+    def __init__(self, window: int = 600):
+        self.window = max(1, int(window))
+        self.bars = 0
+        self.last_time: Optional[int] = None
+        self._last_close: Optional[float] = None
+
+        self._ema = {period: _Ema(period) for period in EMA_PERIODS}
+        self._gain = _Wilder(RSI_PERIOD)
+        self._loss = _Wilder(RSI_PERIOD)
+        self._atr = _Wilder(ATR_PERIOD)
+
+        fast, slow, signal = MACD_PERIODS
+        self._macd_fast = _Ema(fast)
+        self._macd_slow = _Ema(slow)
+        self._macd_signal = _Ema(signal)
+
+        k_period, d_period = STOCH_PERIODS
+        self._closes: deque[float] = deque(maxlen=BB_PERIOD)
+        self._highs: deque[float] = deque(maxlen=k_period)
+        self._lows: deque[float] = deque(maxlen=k_period)
+        self._stoch_k: deque[float] = deque(maxlen=d_period)
+        self._volumes: deque[float] = deque(maxlen=VOLUME_RATIO_PERIOD + 1)
+
+        self._vwap_terms: deque[tuple[float, float]] = deque()
+        self._vwap_tp_vol = 0.0
+        self._vwap_vol = 0.0
+        self._vwap_evictions = 0
+
+    # ── Mutation ──────────────────────────────────────────────────────────────
+
+    def update(self, candle: dict[str, Any]) -> None:
+        """Commit one closed bar."""
+        high = float(candle["high"])
+        low = float(candle["low"])
+        close = float(candle["close"])
+        volume = float(candle.get("volume", 0) or 0)
+
+        for ema in self._ema.values():
+            ema.update(close)
+
+        if self._last_close is not None:
+            delta = close - self._last_close
+            self._gain.update(delta if delta > 0 else 0)
+            self._loss.update(-delta if delta < 0 else 0)
+        self._atr.update(self._true_range(high, low))
+
+        self._macd_fast.update(close)
+        self._macd_slow.update(close)
+        if self._macd_slow.value is not None:
+            self._macd_signal.update(self._macd_fast.value - self._macd_slow.value)
+
+        self._closes.append(close)
+        self._highs.append(high)
+        self._lows.append(low)
+        if len(self._highs) == self._highs.maxlen:
+            self._stoch_k.append(_stoch_k(list(self._highs), list(self._lows), close))
+        self._volumes.append(volume)
+        self._push_vwap(high, low, close, volume)
+
+        self._last_close = close
+        self.last_time = candle.get("time")
+        self.bars += 1
+
+    def _true_range(self, high: float, low: float) -> float:
+        if self._last_close is None:
+            return high - low
+        return max(high - low, abs(high - self._last_close), abs(low - self._last_close))
+
+    def _push_vwap(self, high: float, low: float, close: float, volume: float) -> None:
+        term = (((high + low + close) / 3.0) * volume, volume)
+        self._vwap_terms.append(term)
+        self._vwap_tp_vol += term[0]
+        self._vwap_vol += term[1]
+        if len(self._vwap_terms) > self.window:
+            old_tp_vol, old_vol = self._vwap_terms.popleft()
+            self._vwap_tp_vol -= old_tp_vol
+            self._vwap_vol -= old_vol
+            self._vwap_evictions += 1
+            if self._vwap_evictions >= self.window:
+                # Re-sum once per window turnover so subtraction drift never accumulates.
+                self._vwap_evictions = 0
+                self._vwap_tp_vol = sum(t for t, _ in self._vwap_terms)
+                self._vwap_vol = sum(v for _, v in self._vwap_terms)
+
+    # ── Read path ─────────────────────────────────────────────────────────────
+
+    def snapshot(self, partial: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """
+        Indicator values for the committed bars plus an optional live partial bar.
+
+        `partial` is not committed; the same state can be peeked on every tick.
+        Keys are plain JSON-friendly values so the payload can ride on
+        `MarketSnapshot.indicators` unchanged.
+        """
+        if partial is None:
+            return self._committed_snapshot()
+
+        high = float(partial["high"])
+        low = float(partial["low"])
+        close = float(partial["close"])
+        volume = float(partial.get("volume", 0) or 0)
+        bars = self.bars + 1
+
+        out: dict[str, Any] = {
+            "bars": min(self.bars, self.window) + 1,
+            "total_bars": bars,
+            "last_time": partial.get("time"),
+        }
+        for period, ema in self._ema.items():
+            value = ema.peek(close)
+            out[f"ema_{period}"] = round(value, 6) if value is not None else None
+            out[f"ema_{period}_prev"] = round(ema.value, 6) if ema.value is not None else None
+
+        if self._last_close is not None:
+            delta = close - self._last_close
+            out["rsi_14"] = _rsi_value(
+                self._gain.peek(delta if delta > 0 else 0),
+                self._loss.peek(-delta if delta < 0 else 0),
+            ) if bars >= RSI_PERIOD + 1 else None
+        else:
+            out["rsi_14"] = None
+        atr = self._atr.peek(self._true_range(high, low))
+        out["atr_14"] = round(atr, 6) if atr is not None and bars >= ATR_PERIOD + 1 else None
+
+        fast = self._macd_fast.peek(close)
+        slow = self._macd_slow.peek(close)
+        out["macd"] = self._macd_tuple(fast, slow, bars, peek=True)
+
+        out["bollinger"] = _bollinger((list(self._closes) + [close])[-BB_PERIOD:], BB_PERIOD, BB_STD)
+
+        k_period, d_period = STOCH_PERIODS
+        highs = (list(self._highs) + [high])[-k_period:]
+        lows = (list(self._lows) + [low])[-k_period:]
+        k_values = list(self._stoch_k)
+        if len(highs) == k_period:
+            k_values = (k_values + [_stoch_k(highs, lows, close)])[-d_period:]
+        out["stochastic"] = self._stoch_tuple(k_values, highs, lows, close, bars)
+
+        volumes = (list(self._volumes) + [volume])[-(VOLUME_RATIO_PERIOD + 1):]
+        out["volume_ratio"] = self._volume_ratio(volumes)
+
+        # The caller's history is `window` completed bars plus the partial bar,
+        # so peeking adds the partial term without evicting anything.
+        tp_vol = self._vwap_tp_vol + ((high + low + close) / 3.0) * volume
+        vol = self._vwap_vol + volume
+        out["vwap"] = round(tp_vol / vol, 6) if vol >= 1e-9 else None
+        return out
+
+    def _committed_snapshot(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "bars": min(self.bars, self.window),
+            "total_bars": self.bars,
+            "last_time": self.last_time,
+        }
+        for period, ema in self._ema.items():
+            out[f"ema_{period}"] = round(ema.value, 6) if ema.value is not None else None
+            out[f"ema_{period}_prev"] = round(ema.prev, 6) if ema.prev is not None else None
+        out["rsi_14"] = _rsi_value(self._gain.value, self._loss.value) if self.bars >= RSI_PERIOD + 1 else None
+        atr = self._atr.value
+        out["atr_14"] = round(atr, 6) if atr is not None and self.bars >= ATR_PERIOD + 1 else None
+        out["macd"] = self._macd_tuple(self._macd_fast.value, self._macd_slow.value, self.bars, peek=False)
+        out["bollinger"] = _bollinger(list(self._closes), BB_PERIOD, BB_STD)
+        out["stochastic"] = self._stoch_tuple(
+            list(self._stoch_k), list(self._highs), list(self._lows), self._last_close, self.bars,
+        )
+        out["volume_ratio"] = self._volume_ratio(list(self._volumes))
+        out["vwap"] = round(self._vwap_tp_vol / self._vwap_vol, 6) if self._vwap_vol >= 1e-9 else None
+        return out
+
+    def _macd_tuple(self, fast: Optional[float], slow: Optional[float], bars: int, *, peek: bool) -> Optional[tuple[float, ...]]:
+        _, slow_period, signal_period = MACD_PERIODS
+        if bars < slow_period + signal_period or fast is None or slow is None:
+            return None
+        line = fast - slow
+        signal = self._macd_signal.peek(line) if peek else self._macd_signal.value
+        if signal is None:
+            return None
+        return (round(line, 6), round(signal, 6), round(line - signal, 6))
+
+    @staticmethod
+    def _stoch_tuple(k_values: list[float], highs: list[float], lows: list[float], close: Optional[float], bars: int) -> Optional[tuple[float, ...]]:
+        k_period, d_period = STOCH_PERIODS
+        if close is None or bars < k_period + d_period - 1:
+            return None
+        if len(k_values) < d_period:
+            k = _stoch_k(highs[-k_period:], lows[-k_period:], close)
+            return (round(k, 2), round(k, 2))
+        d = sum(k_values[-d_period:]) / d_period
+        return (round(k_values[-1], 2), round(d, 2))
+
+    @staticmethod
+    def _volume_ratio(volumes: list[float]) -> Optional[float]:
+        if len(volumes) < VOLUME_RATIO_PERIOD + 1:
+            return None
+        avg = sum(volumes[:-1]) / VOLUME_RATIO_PERIOD
+        if avg < 1e-9:
+            return None
+        return round(volumes[-1] / avg, 3)
+
+
+class IndicatorBook:
+    """Registry of `IndicatorState` objects keyed by (instrument_id, timeframe)."""
+
+    def __init__(self, window: int = 600):
+        self.window = window
+        self._states: dict[tuple[str, str], IndicatorState] = {}
+
+    def state(self, instrument_id: str, timeframe: str) -> IndicatorState:
+        key = (instrument_id, timeframe)
+        state = self._states.get(key)
+        if state is None:
+            state = IndicatorState(window=self.window)
+            self._states[key] = state
+        return state
+
+    def on_bar_closed(self, instrument_id: str, timeframe: str, candle: dict[str, Any]) -> None:
+        self.state(instrument_id, timeframe).update(candle)
+
+    def snapshot(self, instrument_id: str, timeframe: str, partial: Optional[dict[str, Any]] = None) -> Optional[dict[str, Any]]:
+        state = self._states.get((instrument_id, timeframe))
+        if state is None:
+            if partial is None:
+                return None
+            state = IndicatorState(window=self.window)
+        payload = state.snapshot(partial)
+        payload["timeframe"] = timeframe
+        return payload
+
+    def drop(self, instrument_id: str) -> None:
+        for key in [key for key in self._states if key[0] == instrument_id]:
+            self._states.pop(key, None)
+
+
+def matching_snapshot(indicators: Optional[dict[str, Any]], candles: list[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    """
+    Return `indicators` only if it describes exactly this candle list.
+
+    Consumers fall back to a full recompute when the payload is missing or was
+    built for another window (e.g. a resampled higher-timeframe history).
+    """
+    if not indicators or not candles:
+        return None
+    if int(indicators.get("bars") or 0) != len(candles):
+        return None
+    if indicators.get("last_time") != candles[-1].get("time"):
+        return None
+    return indicators
@@ -81,6 +81,9 @@ class MarketSnapshot(BaseModel):
     # P5-04: Higher timeframe trend info
     htf_trend: Optional[str] = None     # "up" | "down" | "flat"
     htf_ema_slope: Optional[float] = None
+    # Streaming indicator payload (see decision_engine.streaming); used only
+    # when it describes exactly `candles`, otherwise DE recomputes.
+    indicators: Optional[Dict[str, Any]] = None
 
 
 class DecisionResult(BaseModel):
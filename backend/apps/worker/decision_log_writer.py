@@ -0,0 +1,249 @@
+"""
+Batched persistence for decision logs.
+
+The signal pipeline, risk sizing, execution engines and position monitor each
+emit several `append_decision_log_best_effort` calls per signal, and every call
+used to open a session and commit on its own. `DecisionLogWriter` installs
+itself as the decision-log sink: rows are appended to an in-memory buffer and
+written with multi-row inserts every `flush_ms`, as soon as `max_rows` are
+pending, or on an explicit `flush()` (end of an analysis cycle, after an
+executed command, shutdown).
+
+Ordering and durability:
+
+  * types in `WRITE_THROUGH_TYPES` (fills, closes, allocator and risk resets)
+    are read back by other code right away, so each one is inserted on its
+    own in the caller's thread, as a single-row insert like before batching;
+    the buffer is not drained there, so rows queued earlier may land shortly
+    after it (readers order by `ts`, which is stamped at submit);
+  * batches are written one at a time in queue order by the flush task;
+  * a crash loses at most what is pending: normally under `flush_ms` of
+    logs and never more than `max_pending` rows (`snapshot()["loss_bound"]`).
+
+Backpressure: producers never wait on the database. Once `max_pending` rows
+are queued (database slow or down) the oldest are dropped and counted in
+`dropped` / `overflows`. Rows that fail to insert are retried on the next
+flush, up to `MAX_ATTEMPTS` times.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+from apps.worker.db_executor import WorkerDbExecutor, db_executor
+from core.storage.decision_log_utils import set_decision_log_sink, write_decision_log_rows
+from core.storage.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+
+class DecisionLogWriter:
+    def __init__(
+        self,
+        executor: WorkerDbExecutor = db_executor,
+        session_factory: Callable[[], Session] = SessionLocal,
+        flush_ms: int | None = None,
+        max_rows: int | None = None,
+        max_pending: int | None = None,
+    ):
+        self.executor = executor
+        self._session_factory = session_factory
+        self.flush_sec = max(10, int(flush_ms or os.getenv("WORKER_DECISION_LOG_FLUSH_MS", "1000") or "1000")) / 1000.0
+        self.max_rows = max(1, int(max_rows or os.getenv("WORKER_DECISION_LOG_FLUSH_ROWS", "200") or "200"))
+        self.max_pending = max(self.max_rows, int(max_pending or os.getenv("WORKER_DECISION_LOG_MAX_PENDING", "5000") or "5000"))
+        self._pending: list[dict] = []
+        self._attempts: dict[str, int] = {}
+        # `_lock` guards the buffer, retry counts and counters and is never held across I/O;
+        # `_write_lock` keeps one batch in flight so rows land in queue order.
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._last_flush_ts = 0
+        self._last_flush_ms = 0
+        self.stats: dict[str, int] = {
+            "queued": 0,
+            "written": 0,
+            "flushes": 0,
+            "errors": 0,
+            "urgent_writes": 0,
+            "overflows": 0,
+            "retried": 0,
+            "dropped": 0,
+            "max_pending_seen": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        """Start the flush task on the running loop and route decision logs here."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._run(), name="worker-decision-log-writer")
+        set_decision_log_sink(self)
+
+    def submit(self, row: dict, *, urgent: bool = False) -> bool:
+        """Queue a row from `build_decision_log_row`; safe from any thread and never drains the buffer."""
+        if urgent:
+            return self._write_through(row)
+        with self._lock:
+            self.stats["queued"] += 1
+        self._enqueue(row)
+        return True
+
+    def _enqueue(self, row: dict) -> None:
+        with self._lock:
+            self._pending.append(row)
+            pending = len(self._pending)
+            if pending > self.stats["max_pending_seen"]:
+                self.stats["max_pending_seen"] = pending
+            overflow = pending - self.max_pending
+            if overflow > 0:
+                dropped = self._pending[:overflow]
+                del self._pending[:overflow]
+                for item in dropped:
+                    self._attempts.pop(item["id"], None)
+                self.stats["dropped"] += overflow
+                self.stats["overflows"] += 1
+        if overflow > 0:
+            logger.warning("Decision log buffer full: dropped %d oldest row(s) (max_pending=%d)", overflow, self.max_pending)
+        if pending >= self.max_rows:
+            self._wake()
+
+    def _write_through(self, row: dict) -> bool:
+        """Insert one row now, outside the batch; on failure it joins the buffer for retry."""
+        with self._lock:
+            self.stats["queued"] += 1
+            self.stats["urgent_writes"] += 1
+        db = None
+        try:
+            db = self._session_factory()
+            inserted, failed = write_decision_log_rows(db, [row])
+        except Exception as exc:
+            logger.warning("Decision log write-through failed id=%s type=%s: %s", row["id"], row["type"], exc)
+            inserted, failed = 0, [row]
+        finally:
+            if db is not None:
+                db.close()
+        with self._lock:
+            self.stats["written"] += inserted
+            if failed:
+                self.stats["errors"] += 1
+        if failed:
+            self._enqueue(row)
+            self._wake()
+        return not failed
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass
+
+    def flush_blocking(self) -> int:
+        """Write everything pending in the calling thread; returns rows inserted."""
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            db = None
+            try:
+                db = self._session_factory()
+                inserted, failed = write_decision_log_rows(db, batch)
+            except Exception as exc:
+                logger.warning("Decision log flush of %d rows failed: %s", len(batch), exc)
+                inserted, failed = 0, batch
+            finally:
+                if db is not None:
+                    db.close()
+            retry, given_up = [], []
+            with self._lock:
+                for row in failed:
+                    attempts = self._attempts.get(row["id"], 0) + 1
+                    if attempts >= MAX_ATTEMPTS:
+                        self._attempts.pop(row["id"], None)
+                        given_up.append(row)
+                        continue
+                    self._attempts[row["id"]] = attempts
+                    retry.append(row)
+                if self._attempts and len(failed) < len(batch):
+                    failed_ids = {row["id"] for row in failed}
+                    for row in batch:
+                        if row["id"] not in failed_ids:
+                            self._attempts.pop(row["id"], None)
+                self._pending[:0] = retry
+                self.stats["flushes"] += 1
+                self.stats["written"] += inserted
+                self.stats["retried"] += len(retry)
+                self.stats["dropped"] += len(failed) - len(retry)
+                if failed:
+                    self.stats["errors"] += 1
+                self._last_flush_ts = int(time.time() * 1000)
+                self._last_flush_ms = int((time.perf_counter() - started) * 1000)
+            for row in given_up:
+                logger.warning("Decision log row dropped after %d attempts id=%s type=%s", MAX_ATTEMPTS, row["id"], row["type"])
+            return inserted
+
+    async def flush(self) -> int:
+        """Write everything pending now (through the DB pool); returns rows inserted."""
+        if not self._pending:
+            return 0
+        return await self.executor.call(self.flush_blocking)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_sec)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Decision log flush failed (%d rows pending): %s", len(self._pending), exc)
+
+    async def close(self) -> None:
+        set_decision_log_sink(None)
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+            oldest_ts = int(self._pending[0]["ts"]) if pending else None
+        now_ms = int(time.time() * 1000)
+        return {
+            **self.stats,
+            "pending": pending,
+            "oldest_pending_age_ms": max(0, now_ms - oldest_ts) if oldest_ts is not None else 0,
+            "last_flush_ts": self._last_flush_ts,
+            "last_flush_ms": self._last_flush_ms,
+            "loss_bound": {"max_rows": self.max_pending, "flush_sec": self.flush_sec},
+        }
+
+
+decision_log_writer = DecisionLogWriter()
@@ -16,6 +16,7 @@ import logging
 import os
 import signal
 import time
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
@@ -26,11 +27,23 @@ from urllib.parse import urlparse
 import orjson
 
 from core.config import get_token, settings as config
-from core.events.bus import bus
+from core.events.bus import SETTINGS_UPDATED_CHANNEL, bus
 from core.logging import configure_logging
-from core.metrics import record_tick, update_open_positions
+from core.metrics import (
+    instrument_tier,
+    record_analysis_cycle,
+    record_poll_request,
+    record_stage_timings,
+    record_tick,
+    set_event_loop_lag,
+    start_metrics_server,
+    update_open_positions,
+)
+from core.services.backtest_jobs import prune_backtest_jobs
+from core.services.decision_log_retention import run_decision_log_retention
 from core.services.recalibration import run_symbol_recalibration_batch
 from core.services.symbol_adaptive import ensure_symbol_profiles, build_symbol_plan
+from core.services.training_pool import training_pool
 from core.services.trading_schedule import refresh_trading_schedule
 from core.ml.runtime import maybe_run_scheduled_training
 from core.services.instrument_catalog import sync_sandbox_instruments
@@ -40,7 +53,7 @@ from core.storage.models import AccountSnapshot, Position, Signal
 from core.storage.repos import candles as candle_repo
 from core.storage.repos import signals as signal_repo
 from core.storage.repos import settings as settings_repo
-from core.storage.session import SessionLocal
+from core.storage.repos.trade_journal import backfill_trade_journal
 from core.strategy.selector import StrategySelector
 from core.execution.monitor import PositionMonitor
 from core.execution.controls import prefers_paper_execution
@@ -51,7 +64,12 @@ from core.utils.time import start_of_day_ms
 
 from apps.worker.aggregator import CandleAggregator
 from apps.worker.ai.internet.collector import InternetCollector
+from apps.worker.analysis_pool import AnalysisPool
+from apps.worker.candle_writer import candle_writer
+from apps.worker.db_executor import db_executor
+from apps.worker.decision_log_writer import decision_log_writer
 from apps.worker.market import MarketGenerator
+from apps.worker.polling import PollingScheduler
 from apps.worker.processor import SignalProcessor
 from apps.worker.publisher import MarketPublisher
 
@@ -132,26 +150,41 @@ def _sanitize_proxy_env() -> None:
 
 @asynccontextmanager
 async def get_db():
-    db = SessionLocal()
-    try:
+    """Session whose lifecycle runs on the worker DB pool; wrap blocking queries in `db_executor.call`."""
+    async with db_executor.session() as db:
         yield db
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+
+
+def _insert_snapshot(db, balance: float, open_pos: int, day_pnl: float) -> None:
+    db.add(AccountSnapshot(
+        ts=_now_ms(),
+        balance=balance,
+        equity=balance + day_pnl,
+        open_positions=open_pos,
+        day_pnl=day_pnl,
+    ))
+    db.commit()
 
 
 async def _save_snapshot(balance: float, open_pos: int, day_pnl: float) -> None:
-    async with get_db() as db:
-        db.add(AccountSnapshot(
-            ts=_now_ms(),
-            balance=balance,
-            equity=balance + day_pnl,
-            open_positions=open_pos,
-            day_pnl=day_pnl,
-        ))
-        db.commit()
+    await db_executor.run(_insert_snapshot, balance, open_pos, day_pnl)
+
+
+def _count_open_positions(db) -> int:
+    return db.query(Position).filter(Position.qty > 0).count()
+
+
+def _list_open_positions(db) -> list[Position]:
+    return db.query(Position).filter(Position.qty > 0).all()
+
+
+def _day_pnl(db) -> float:
+    from sqlalchemy import func
+
+    sod = start_of_day_ms()
+    realized_today = float(db.query(func.sum(Position.realized_pnl)).filter(Position.updated_ts >= sod).scalar() or 0.0)
+    unrealized = float(db.query(func.sum(Position.unrealized_pnl)).filter(Position.qty > 0).scalar() or 0.0)
+    return realized_today + unrealized
 
 
 def _prime_aggregator(aggregator: CandleAggregator, ticker: str, candles: list[dict]) -> None:
@@ -167,26 +200,24 @@ def _prime_aggregator(aggregator: CandleAggregator, ticker: str, candles: list[d
         })
 
 
-async def _persist_last_completed_candle(ticker: str, aggregator: CandleAggregator, tf_str: str) -> None:
+def _persist_last_completed_candle(ticker: str, aggregator: CandleAggregator, tf_str: str) -> None:
     history = aggregator.get_history(ticker)
     if len(history) < 2:
         return
     completed = history[-2]
-    async with get_db() as db:
-        candle_repo.upsert_candles(db, instrument_id=ticker, timeframe=tf_str, candles=[completed], source="worker")
+    candle_writer.add(ticker, tf_str, [completed], source="worker")
 
 
 async def _load_cached_history(aggregator: CandleAggregator, tickers: list[str], tf_str: str) -> set[str]:
     primed: set[str] = set()
     history_limit = 600 if tf_str == '1m' else 200
-    async with get_db() as db:
-        for ticker in tickers:
-            cached = candle_repo.list_candles(db, ticker, tf_str, limit=history_limit)
-            if not cached:
-                continue
-            _prime_aggregator(aggregator, ticker, cached)
-            primed.add(ticker)
-            logger.info("History cache bootstrap for %s: %d candles loaded", ticker, min(len(cached), history_limit))
+    for ticker in tickers:
+        cached = await db_executor.run(candle_repo.list_candles, ticker, tf_str, limit=history_limit)
+        if not cached:
+            continue
+        _prime_aggregator(aggregator, ticker, cached)
+        primed.add(ticker)
+        logger.info("History cache bootstrap for %s: %d candles loaded", ticker, min(len(cached), history_limit))
     return primed
 
 
@@ -213,18 +244,25 @@ async def _bootstrap_history(adapter, aggregator: CandleAggregator, tickers: lis
             continue
         if candles:
             _prime_aggregator(aggregator, ticker, candles[-history_limit:])
-            with SessionLocal() as cache_db:
-                candle_repo.upsert_candles(cache_db, instrument_id=ticker, timeframe=tf_str, candles=candles, source="broker")
+            candle_writer.add(ticker, tf_str, candles, source="broker")
+            if len(candle_writer) >= candle_writer.max_rows:
+                try:
+                    await candle_writer.flush()
+                except Exception as exc:
+                    logger.warning("History bootstrap candle flush failed (%d rows pending): %s", len(candle_writer), exc)
             logger.info("History bootstrap for %s: %d candles loaded", ticker, min(len(candles), history_limit))
 
 
-async def _load_watchlist() -> list[str]:
+def _query_watchlist(db) -> list[str]:
     from core.storage.models import Watchlist
     from apps.broker.tbank.adapter import normalize_instrument_id
 
-    with SessionLocal() as db:
-        active = db.query(Watchlist.instrument_id).filter(Watchlist.is_active == True).all()  # noqa: E712
-        tickers = [normalize_instrument_id(row[0]) for row in active] if active else list(_DEFAULT_TICKERS)
+    active = db.query(Watchlist.instrument_id).filter(Watchlist.is_active == True).all()  # noqa: E712
+    return [normalize_instrument_id(row[0]) for row in active] if active else list(_DEFAULT_TICKERS)
+
+
+async def _load_watchlist() -> list[str]:
+    tickers = await db_executor.run(_query_watchlist)
     tickers = [t for t in tickers if t]
     return tickers or list(_DEFAULT_TICKERS)
 
@@ -238,6 +276,10 @@ class WorkerRuntimeState:
     status: dict[str, Any] = field(default_factory=dict)
     last_signal_check: dict[str, float] = field(default_factory=dict)
     last_poll_ts: dict[str, float] = field(default_factory=dict)
+    last_poll_ok_ts: dict[str, float] = field(default_factory=dict)
+    last_stream_ts: dict[str, float] = field(default_factory=dict)
+    gap_fill_pending: set[str] = field(default_factory=set)
+    stream_control: asyncio.Queue | None = None
     last_seen_candle: dict[str, tuple] = field(default_factory=dict)
     last_analyzed_candle: dict[str, tuple] = field(default_factory=dict)
     unresolved_instruments: set[str] = field(default_factory=set)
@@ -296,9 +338,18 @@ class WorkerRuntimeState:
             for ticker in removed:
                 self.last_signal_check.pop(ticker, None)
                 self.last_poll_ts.pop(ticker, None)
+                self.last_poll_ok_ts.pop(ticker, None)
+                self.last_stream_ts.pop(ticker, None)
+                self.gap_fill_pending.discard(ticker)
                 self.last_seen_candle.pop(ticker, None)
                 self.last_analyzed_candle.pop(ticker, None)
                 self.unresolved_instruments.discard(ticker)
+            if self.stream_control is not None:
+                if added:
+                    self.stream_control.put_nowait(("subscribe", added))
+                    self.gap_fill_pending.update(added)
+                if removed:
+                    self.stream_control.put_nowait(("unsubscribe", removed))
             self.status["watchlist_last_reload_ts"] = _now_ms()
             self.status["watchlist_added"] = added
             self.status["watchlist_removed"] = removed
@@ -313,6 +364,45 @@ class WorkerRuntimeState:
             self.last_poll_ts[ticker] = now
             return True
 
+    async def note_poll_ok(self, ticker: str, ts: float) -> None:
+        async with self.lock:
+            self.last_poll_ok_ts[ticker] = ts
+
+    async def poll_ok_snapshot(self) -> dict[str, float]:
+        async with self.lock:
+            return dict(self.last_poll_ok_ts)
+
+    async def poll_staleness(self, tickers: list[str], now: float) -> dict[str, float | None]:
+        """Seconds since the last successful poll per ticker (None = never polled)."""
+        async with self.lock:
+            return {
+                ticker: round(now - self.last_poll_ok_ts[ticker], 3) if ticker in self.last_poll_ok_ts else None
+                for ticker in tickers
+            }
+
+    async def attach_stream_control(self, control: asyncio.Queue) -> list[str]:
+        """Route watchlist changes into the market-data stream; returns the tickers to subscribe."""
+        async with self.lock:
+            self.stream_control = control
+            return list(self.tickers)
+
+    async def note_stream_update(self, ticker: str, ts: float) -> None:
+        async with self.lock:
+            self.last_stream_ts[ticker] = ts
+            self.gap_fill_pending.discard(ticker)
+
+    async def request_gap_fill(self, tickers: list[str]) -> None:
+        async with self.lock:
+            self.gap_fill_pending.update(tickers)
+
+    async def gap_fill_due(self, tickers: list[str], *, now: float, stale_sec: float) -> list[str]:
+        """Tickers flagged after a (re)connect or silent on the stream for `stale_sec`."""
+        async with self.lock:
+            return [
+                ticker for ticker in tickers
+                if ticker in self.gap_fill_pending or now - self.last_stream_ts.get(ticker, 0.0) >= stale_sec
+            ]
+
     async def remember_candle(self, ticker: str, candle: dict) -> bool:
         key = (
             candle["time"],
@@ -368,8 +458,7 @@ async def _refresh_watchlist_loop(state: WorkerRuntimeState, adapter, aggregator
     while not _shutdown.is_set():
         try:
             tickers = await _load_watchlist()
-            with SessionLocal() as db:
-                runtime_settings = settings_repo.get_settings(db)
+            runtime_settings = await db_executor.run(settings_repo.get_settings_snapshot)
             bootstrap_limit = max(1, int(getattr(runtime_settings, "worker_bootstrap_limit", bootstrap_limit) or bootstrap_limit))
             added, removed = await state.replace_tickers(tickers)
             if added or removed:
@@ -383,16 +472,15 @@ async def _refresh_watchlist_loop(state: WorkerRuntimeState, adapter, aggregator
                 await _load_cached_history(aggregator, added, tf_str)
                 await _bootstrap_history(adapter, aggregator, added[:bootstrap_limit], tf_str)
             if added:
-                with SessionLocal() as db:
-                    ensure_result = ensure_symbol_profiles(
-                        db,
-                        added,
-                        auto_train=True,
-                        lookback_days=180,
-                        timeframe=tf_str,
-                        train_limit=min(len(added), bootstrap_limit),
-                        source='watchlist_refresh',
-                    )
+                ensure_result = await db_executor.run(
+                    ensure_symbol_profiles,
+                    added,
+                    auto_train=True,
+                    lookback_days=180,
+                    timeframe=tf_str,
+                    train_limit=min(len(added), bootstrap_limit),
+                    source='watchlist_refresh',
+                )
                 await state.set_phase(
                     state.phase,
                     state.message,
@@ -410,7 +498,7 @@ async def _refresh_watchlist_loop(state: WorkerRuntimeState, adapter, aggregator
         await asyncio.sleep(refresh_sec)
 
 
-async def _apply_tick(aggregator: CandleAggregator, publisher: MarketPublisher, ticker: str, candle: dict, tf_str: str) -> None:
+async def _apply_tick(aggregator: CandleAggregator, publisher: MarketPublisher, ticker: str, candle: dict, tf_str: str, *, replace: bool = False) -> None:
     tick = {
         "instrument_id": ticker,
         "time": candle["time"],
@@ -420,18 +508,17 @@ async def _apply_tick(aggregator: CandleAggregator, publisher: MarketPublisher,
         "close": candle["close"],
         "volume": candle.get("volume", 0),
     }
-    aggregated, bar_closed = aggregator.on_tick(tick)
+    aggregated, bar_closed = aggregator.on_tick(tick, replace=replace)
     await publisher.publish_candle(aggregated)
     if bar_closed:
-        await _persist_last_completed_candle(ticker, aggregator, tf_str)
+        _persist_last_completed_candle(ticker, aggregator, tf_str)
 
 
 
 async def _run_recalibration_loop(state: WorkerRuntimeState) -> None:
     while not _shutdown.is_set():
         try:
-            with SessionLocal() as db:
-                result = run_symbol_recalibration_batch(db, force=False, source='worker_schedule')
+            result = await db_executor.run(run_symbol_recalibration_batch, force=False, source='worker_schedule')
             if result.get('started'):
                 await state.set_phase(
                     state.phase,
@@ -453,12 +540,36 @@ async def _run_recalibration_loop(state: WorkerRuntimeState) -> None:
 
 
 
+async def _run_decision_log_retention_loop(state: WorkerRuntimeState) -> None:
+    interval = max(300.0, float(os.getenv("DECISION_LOG_RETENTION_INTERVAL_SEC", "3600") or "3600"))
+    while not _shutdown.is_set():
+        try:
+            result = await db_executor.run(run_decision_log_retention)
+            if result.get('archived') or result.get('partitions_created') or result.get('partitions_dropped'):
+                logger.info('Decision log retention: %s', result)
+            await state.set_phase(state.phase, state.message, decision_log_retention={'last_run_ts': _now_ms(), **result})
+        except Exception as exc:
+            logger.error('Decision log retention failed: %s', exc, exc_info=True)
+            await state.mark_error('worker-decision-log-retention', exc)
+            await state.publish()
+        try:
+            pruned = await db_executor.run(prune_backtest_jobs)
+            if pruned.get('deleted') or pruned.get('stripped'):
+                logger.info('Backtest job retention: %s', pruned)
+        except Exception as exc:
+            logger.error('Backtest job retention failed: %s', exc, exc_info=True)
+        await asyncio.sleep(interval)
+
+
+def _run_scheduled_training(db) -> dict:
+    runtime_settings = settings_repo.get_settings_snapshot(db)
+    return maybe_run_scheduled_training(db, runtime_settings, source='worker_schedule')
+
+
 async def _run_ml_training_loop(state: WorkerRuntimeState) -> None:
     while not _shutdown.is_set():
         try:
-            with SessionLocal() as db:
-                runtime_settings = settings_repo.get_settings(db)
-                result = maybe_run_scheduled_training(db, runtime_settings, source='worker_schedule')
+            result = await db_executor.run(_run_scheduled_training)
             if result.get('started'):
                 await state.set_phase(
                     state.phase,
@@ -481,8 +592,8 @@ async def _run_instrument_auto_sync_loop(state: WorkerRuntimeState, adapter_fact
     last_run_ts = 0
     while not _shutdown.is_set():
         try:
-            with SessionLocal() as db:
-                runtime_settings = settings_repo.get_settings(db)
+            async with get_db() as db:
+                runtime_settings = await db_executor.call(settings_repo.get_settings_snapshot, db)
                 enabled = bool(getattr(runtime_settings, 'instrument_auto_sync_enabled', False))
                 interval_hours = max(1, int(getattr(runtime_settings, 'instrument_auto_sync_interval_hours', 24) or 24))
                 now_ms = _now_ms()
@@ -530,8 +641,8 @@ async def _run_sentiment_collection_loop(state: WorkerRuntimeState) -> None:
     last_run_ts = 0
     while not _shutdown.is_set():
         try:
-            with SessionLocal() as db:
-                runtime_settings = settings_repo.get_settings(db)
+            async with get_db() as db:
+                runtime_settings = await db_executor.call(settings_repo.get_settings_snapshot, db)
                 enabled = bool(getattr(runtime_settings, 'sentiment_collection_enabled', False))
                 interval_minutes = max(5, int(getattr(runtime_settings, 'sentiment_poll_interval_minutes', 60) or 60))
                 now_ms = _now_ms()
@@ -580,18 +691,52 @@ async def _run_status_heartbeat_loop(state: WorkerRuntimeState) -> None:
         await asyncio.sleep(60.0)
 
 
+async def _run_loop_lag_monitor(state: WorkerRuntimeState) -> None:
+    """Sample event-loop lag: a blocking call anywhere in the worker shows up as a late wake-up here."""
+    interval = 0.5
+    report_every = 10.0
+    warn_ms = max(50, int(os.getenv("WORKER_LOOP_LAG_WARN_MS", "250") or "250"))
+    samples: deque[tuple[float, float]] = deque()
+    last_report = time.monotonic()
+    while not _shutdown.is_set():
+        started = time.monotonic()
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        lag_ms = max(0.0, (now - started - interval) * 1000.0)
+        set_event_loop_lag(lag_ms / 1000.0)
+        samples.append((now, lag_ms))
+        while samples and now - samples[0][0] > 60.0:
+            samples.popleft()
+        if lag_ms >= warn_ms:
+            logger.warning("Event loop lag %.0f ms", lag_ms)
+        if now - last_report >= report_every:
+            last_report = now
+            window = sorted(lag for _, lag in samples)
+            await state.set_phase(
+                state.phase,
+                None,
+                event_loop={
+                    "lag_ms": round(lag_ms, 2),
+                    "lag_p95_ms_60s": round(window[int(0.95 * (len(window) - 1))], 2) if window else 0.0,
+                    "lag_max_ms_60s": round(window[-1], 2) if window else 0.0,
+                    "db_pool": db_executor.snapshot(),
+                    "candle_writer": candle_writer.snapshot(),
+                    "decision_log_writer": decision_log_writer.snapshot(),
+                },
+            )
+
+
 async def _run_symbol_profile_bootstrap_task(state: WorkerRuntimeState, tickers: list[str], *, train_limit: int, timeframe: str, source: str) -> None:
     try:
-        with SessionLocal() as db:
-            ensure_result = ensure_symbol_profiles(
-                db,
-                tickers,
-                auto_train=True,
-                lookback_days=180,
-                timeframe=timeframe,
-                train_limit=train_limit,
-                source=source,
-            )
+        ensure_result = await db_executor.run(
+            ensure_symbol_profiles,
+            tickers,
+            auto_train=True,
+            lookback_days=180,
+            timeframe=timeframe,
+            train_limit=train_limit,
+            source=source,
+        )
         await state.set_phase(state.phase, state.message, symbol_profiles_bootstrap=ensure_result)
         await state.publish()
     except Exception as exc:
@@ -600,20 +745,54 @@ async def _run_symbol_profile_bootstrap_task(state: WorkerRuntimeState, tickers:
         await state.publish()
 
 
+async def _run_trade_journal_backfill_task(state: WorkerRuntimeState) -> None:
+    try:
+        result = await db_executor.run(backfill_trade_journal)
+        if result.get('stored'):
+            logger.info('Trade journal backfill: %s', result)
+        await state.set_phase(state.phase, state.message, trade_journal_backfill=result)
+    except Exception as exc:
+        logger.error('Trade journal backfill failed: %s', exc, exc_info=True)
+        await state.mark_error('trade_journal_backfill', exc)
+        await state.publish()
+
+
 def _is_optional_worker_task(task_name: str) -> bool:
-    return task_name in {'worker-symbol-profile-bootstrap'}
+    return task_name in {'worker-symbol-profile-bootstrap', 'worker-trade-journal-backfill'}
 
 
-async def _run_tbank_polling_loop(adapter, aggregator: CandleAggregator, publisher: MarketPublisher, state: WorkerRuntimeState, tf_str: str) -> None:
+async def _run_tbank_polling_loop(
+    adapter,
+    aggregator: CandleAggregator,
+    publisher: MarketPublisher,
+    state: WorkerRuntimeState,
+    tf_str: str,
+    *,
+    gap_fill_only: bool = False,
+) -> None:
+    """
+    REST candle polling.
+
+    With `gap_fill_only=True` the loop runs next to the gRPC stream and only
+    backfills tickers flagged after a (re)connect or silent on the stream for
+    WORKER_STREAM_STALE_SEC, applying every missed bar from the lookback window.
+    """
     high_priority_interval = max(3.0, float(os.getenv("WORKER_CORE_POLL_SEC", "5") or "5"))
     low_priority_interval = max(high_priority_interval, float(os.getenv("WORKER_TAIL_POLL_SEC", "15") or "15"))
+    stream_stale_sec = max(30.0, float(os.getenv("WORKER_STREAM_STALE_SEC", "120") or "120"))
+    gap_fill_lookback = timedelta(minutes=max(3, int(os.getenv("WORKER_STREAM_GAP_FILL_MIN", "30") or "30")))
+    scheduler = PollingScheduler(
+        max_concurrency=max(1, int(os.getenv("WORKER_POLL_CONCURRENCY", "8") or "8")),
+        reserve=max(0, int(os.getenv("WORKER_POLL_RATE_RESERVE", "5") or "5")),
+        max_throttle_wait_sec=max(0.5, float(os.getenv("WORKER_POLL_MAX_THROTTLE_SEC", "10") or "10")),
+        budget_fn=getattr(adapter, "get_rate_limit_budget", None),
+    )
     await state.set_phase("polling", "Market polling loop started")
     await state.publish()
 
     while not _shutdown.is_set():
         tickers = await state.get_tickers()
         cycle_started = _now_ms()
-        processed = 0
         changed = 0
         errors = 0
         unresolved: list[str] = []
@@ -621,29 +800,52 @@ async def _run_tbank_polling_loop(adapter, aggregator: CandleAggregator, publish
         logger.info("Polling iteration started: instruments=%d", len(tickers))
         now_loop = asyncio.get_running_loop().time()
         now_dt = datetime.now(timezone.utc)
-        from_dt = now_dt.replace(second=0, microsecond=0) - timedelta(minutes=3)
-
-        for ticker in tickers:
-            if _shutdown.is_set():
-                break
-            min_interval = high_priority_interval if ticker in _HIGH_PRIORITY_TICKERS else low_priority_interval
-            if not await state.should_poll(ticker, now=now_loop, min_interval_sec=min_interval):
-                continue
-            processed += 1
+        from_dt = now_dt.replace(second=0, microsecond=0) - (gap_fill_lookback if gap_fill_only else timedelta(minutes=3))
+
+        due: list[str] = []
+        candidates = await state.gap_fill_due(tickers, now=time.time(), stale_sec=stream_stale_sec) if gap_fill_only else tickers
+        for ticker in candidates:
+            if gap_fill_only:
+                min_interval = high_priority_interval if ticker in state.gap_fill_pending else stream_stale_sec
+            else:
+                min_interval = high_priority_interval if ticker in _HIGH_PRIORITY_TICKERS else low_priority_interval
+            if await state.should_poll(ticker, now=now_loop, min_interval_sec=min_interval):
+                due.append(ticker)
+        due = PollingScheduler.order(due, high_priority=_HIGH_PRIORITY_TICKERS, last_ok=await state.poll_ok_snapshot())
+
+        async def _poll_one(ticker: str) -> None:
+            nonlocal changed, errors
+            tier = instrument_tier(ticker, _HIGH_PRIORITY_TICKERS)
+            request_started = time.perf_counter()
             try:
                 candles = await adapter.get_candles(ticker, from_dt, now_dt, interval_str=tf_str)
             except Exception as exc:
+                record_poll_request(tier, time.perf_counter() - request_started, ok=False)
                 errors += 1
                 text = str(exc)
                 if "not found" in text.lower():
                     unresolved.append(ticker)
                     await state.note_unresolved(ticker)
                 logger.warning("Polling failed for %s: %s", ticker, exc)
-                continue
+                return
 
+            record_poll_request(tier, time.perf_counter() - request_started, ok=True)
+            await state.note_poll_ok(ticker, time.time())
             if not candles:
-                continue
+                return
             await state.note_resolved(ticker)
+            if gap_fill_only:
+                current_time = aggregator.current_time(ticker)
+                missed = [c for c in candles if current_time is None or c["time"] >= current_time]
+                for candle in missed:
+                    await _apply_tick(aggregator, publisher, ticker, candle, tf_str, replace=True)
+                if missed:
+                    changed += 1
+                    await state.remember_candle(ticker, missed[-1])
+                    record_tick(ticker)
+                await state.note_stream_update(ticker, time.time())
+                logger.debug("Gap-fill %s: %d candle(s) applied", ticker, len(missed))
+                return
             candle = candles[-1]
             is_changed = await state.remember_candle(ticker, candle)
             if is_changed:
@@ -652,6 +854,11 @@ async def _run_tbank_polling_loop(adapter, aggregator: CandleAggregator, publish
             await _apply_tick(aggregator, publisher, ticker, candle, tf_str)
             logger.debug("Polling candle %s t=%s changed=%s", ticker, candle.get("time"), is_changed)
 
+        cycle = await scheduler.run(due, _poll_one, should_stop=_shutdown.is_set)
+        processed = cycle.requested
+        staleness = await state.poll_staleness(tickers, time.time())
+        known_staleness = [value for value in staleness.values() if value is not None]
+
         finished_ts = _now_ms()
         await state.set_phase(
             "idle",
@@ -663,20 +870,62 @@ async def _run_tbank_polling_loop(adapter, aggregator: CandleAggregator, publish
                 "errors": errors,
                 "duration_ms": finished_ts - cycle_started,
                 "unresolved_instruments": unresolved,
+                "concurrency": cycle.as_dict(),
+                "staleness_sec": staleness,
+                "max_staleness_sec": max(known_staleness) if known_staleness else None,
             },
             tbank_stats=adapter.get_runtime_stats() if hasattr(adapter, "get_runtime_stats") else None,
         )
         await state.publish()
         logger.info(
-            "Polling iteration finished: processed=%d changed=%d errors=%d duration_ms=%d",
+            "Polling iteration finished: processed=%d changed=%d errors=%d concurrency=%d throttled=%d duration_ms=%d",
             processed,
             changed,
             errors,
+            cycle.concurrency_limit,
+            cycle.throttled_waits,
             finished_ts - cycle_started,
         )
         await asyncio.sleep(1.0)
 
 
+async def _run_tbank_stream_loop(adapter, aggregator: CandleAggregator, publisher: MarketPublisher, state: WorkerRuntimeState, tf_str: str) -> None:
+    """Drive the aggregator from MarketDataStream; watchlist changes arrive via `state.stream_control`."""
+    control: asyncio.Queue = asyncio.Queue()
+    tickers = await state.attach_stream_control(control)
+    stats = {"received": 0, "changed": 0, "connects": 0, "reconnects": 0, "last_event_ts": None}
+    last_status = 0.0
+    await state.set_phase("streaming", f"Market stream starting for {len(tickers)} instrument(s)", stream_stats=dict(stats))
+    await state.publish()
+
+    async for event in adapter.stream_marketdata(tickers, interval_str=tf_str, control=control, rest_fallback=False):
+        if _shutdown.is_set():
+            break
+        if event.get("event_type") == "stream_connected":
+            stats["connects"] += 1
+            if event.get("reconnect"):
+                stats["reconnects"] += 1
+                await state.request_gap_fill(await state.get_tickers())
+            logger.info("Market stream connected: instruments=%d reconnect=%s", len(event.get("instrument_ids") or []), bool(event.get("reconnect")))
+            await state.set_phase("streaming", f"Market stream connected: {len(event.get('instrument_ids') or [])} instrument(s)", stream_stats=dict(stats))
+            continue
+
+        ticker = event["instrument_id"]
+        stats["received"] += 1
+        stats["last_event_ts"] = _now_ms()
+        await state.note_stream_update(ticker, time.time())
+        await state.note_resolved(ticker)
+        if await state.remember_candle(ticker, event):
+            stats["changed"] += 1
+            record_tick(ticker)
+            await _apply_tick(aggregator, publisher, ticker, event, tf_str, replace=True)
+
+        now_mono = time.monotonic()
+        if now_mono - last_status >= 5.0:
+            last_status = now_mono
+            await state.set_phase(state.phase, None, stream_stats=dict(stats))
+
+
 async def _run_mock_polling_loop(aggregator: CandleAggregator, publisher: MarketPublisher, state: WorkerRuntimeState, tf_str: str) -> None:
     market = MarketGenerator(tickers=await state.get_tickers())
     await state.set_phase("polling", "Mock market polling loop started")
@@ -703,6 +952,7 @@ async def _run_analysis_loop(
     state: WorkerRuntimeState,
     runtime_tbank_token: str | None,
     runtime_tbank_account: str | None,
+    analysis_pool: AnalysisPool,
 ) -> None:
     signal_interval = max(3.0, float(os.getenv("WORKER_SIGNAL_INTERVAL_SEC", "5") or "5"))
     snapshot_interval = max(30.0, float(os.getenv("WORKER_SNAPSHOT_INTERVAL_SEC", "300") or "300"))
@@ -724,6 +974,10 @@ async def _run_analysis_loop(
         logger.info("Cycle started: instruments=%d", len(tickers))
 
         now_loop = asyncio.get_running_loop().time()
+        # Pass 1: I/O-bound planning per ticker; the CPU-only strategy search is
+        # submitted to the analysis process pool straight away.
+        jobs: list[dict[str, Any]] = []
+        bot_disabled = False
         for ticker in tickers:
             if _shutdown.is_set():
                 break
@@ -733,23 +987,66 @@ async def _run_analysis_loop(
             logger.info("Instrument processing: %s history_len=%d", ticker, len(history))
 
             async with get_db() as db:
-                settings = settings_repo.get_settings(db)
+                settings = await db_executor.call(settings_repo.get_settings_snapshot, db)
                 if settings and not bool(getattr(settings, "bot_enabled", False)):
-                    logger.info("Analysis paused because bot is disabled")
-                    await state.set_phase("idle", "Bot disabled — analysis paused")
-                    await state.publish()
-                    await asyncio.sleep(2.0)
+                    bot_disabled = True
                     break
+                adaptive_plan = await db_executor.call(build_symbol_plan, db, ticker, history, settings) if history else None
+            if adaptive_plan:
+                logger.info("Adaptive plan: %s regime=%s strategy=%s threshold=%s hold=%s reentry=%ss risk_x=%.2f", ticker, adaptive_plan.regime, adaptive_plan.strategy_name, adaptive_plan.decision_threshold, adaptive_plan.hold_bars, adaptive_plan.reentry_cooldown_sec, adaptive_plan.risk_multiplier)
+            new_strategy_name = adaptive_plan.strategy_name if adaptive_plan else (getattr(settings, "strategy_name", "breakout,mean_reversion") if settings else "breakout,mean_reversion")
+            new_strategy = selector.get(new_strategy_name)
+            if len(history) < new_strategy.lookback:
+                skipped += 1
+                logger.debug("Instrument skipped: %s history too short (%d < %d)", ticker, len(history), new_strategy.lookback)
+                continue
+            plan_meta = adaptive_plan.to_meta() if adaptive_plan else None
+            jobs.append({
+                "ticker": ticker,
+                "history": history,
+                "settings": settings,
+                "plan_meta": plan_meta,
+                "strategy": new_strategy,
+                "search": analysis_pool.submit_search(
+                    new_strategy,
+                    ticker,
+                    history,
+                    plan_meta,
+                    settings,
+                    indicators=processor._indicator_snapshot(ticker, history),
+                ),
+            })
 
-                adaptive_plan = build_symbol_plan(db, ticker, history, settings) if history else None
-                if adaptive_plan:
-                    logger.info("Adaptive plan: %s regime=%s strategy=%s threshold=%s hold=%s reentry=%ss risk_x=%.2f", ticker, adaptive_plan.regime, adaptive_plan.strategy_name, adaptive_plan.decision_threshold, adaptive_plan.hold_bars, adaptive_plan.reentry_cooldown_sec, adaptive_plan.risk_multiplier)
-                new_strategy_name = adaptive_plan.strategy_name if adaptive_plan else (getattr(settings, "strategy_name", "breakout,mean_reversion") if settings else "breakout,mean_reversion")
-                new_strategy = selector.get(new_strategy_name)
-                if len(history) < new_strategy.lookback:
-                    skipped += 1
-                    logger.debug("Instrument skipped: %s history too short (%d < %d)", ticker, len(history), new_strategy.lookback)
-                    continue
+        if bot_disabled:
+            for job in jobs:
+                job["search"].cancel()
+            jobs = []
+            logger.info("Analysis paused because bot is disabled")
+            await state.set_phase("idle", "Bot disabled — analysis paused")
+            await state.publish()
+            await asyncio.sleep(2.0)
+
+        # Pass 2: stateful, DB-heavy part of the pipeline in watchlist order.
+        for job in jobs:
+            if _shutdown.is_set():
+                job["search"].cancel()
+                continue
+            ticker = job["ticker"]
+            settings = job["settings"]
+            new_strategy = job["strategy"]
+            try:
+                strategy_search = await job["search"]
+            except Exception as exc:
+                logger.warning("%s: pooled strategy search failed, running inline: %s", ticker, exc)
+                strategy_search = None
+            # Pass 1 may be a whole cycle old by now: monitor exits and the pipeline
+            # run on the latest candles. The pooled search only stays valid while
+            # the bar it saw is still the one forming.
+            history = aggregator.get_history(ticker) or job["history"]
+            if strategy_search is not None and history[-1]["time"] != job["history"][-1]["time"]:
+                logger.debug("%s: new bar since strategy search was submitted, re-running it inline", ticker)
+                strategy_search = None
+            async with get_db() as db:
                 processed += 1
                 async with state.lock:
                     state.status["last_processed_instrument"] = ticker
@@ -776,9 +1073,10 @@ async def _run_analysis_loop(
                     if settings and bool(getattr(settings, "use_broker_trading_schedule", True)):
                         await refresh_trading_schedule(exchange=(getattr(settings, "trading_schedule_exchange", None) or None), force=False)
 
-                result = await processor.process(ticker, history, db, adaptive_plan=(adaptive_plan.to_meta() if adaptive_plan else None))
+                result = await processor.process(ticker, history, db, adaptive_plan=job["plan_meta"], strategy_search=strategy_search)
                 telemetry = dict(result.get('telemetry') or {}) if isinstance(result, dict) else {}
                 flat_timings = _flatten_timing_metrics(telemetry)
+                record_stage_timings(telemetry, instrument_tier(ticker, _HIGH_PRIORITY_TICKERS))
                 if flat_timings:
                     timing_samples += 1
                     for metric, value in flat_timings.items():
@@ -822,13 +1120,13 @@ async def _run_analysis_loop(
                     logger.debug("No actionable signal for %s in this cycle", ticker)
 
                 if db.new or db.dirty or db.deleted:
-                    db.commit()
+                    await db_executor.call(db.commit)
 
         if now_loop - last_snapshot_ts > snapshot_interval:
             last_snapshot_ts = now_loop
             async with get_db() as db:
-                open_pos = db.query(Position).filter(Position.qty > 0).count()
-                snap_settings = settings_repo.get_settings(db)
+                open_pos = await db_executor.call(_count_open_positions, db)
+                snap_settings = await db_executor.call(settings_repo.get_settings_snapshot, db)
                 if snap_settings and getattr(snap_settings, "trade_mode", "review") == "auto_live" and config.BROKER_PROVIDER == "tbank":
                     try:
                         portfolio = await TBankExecutionEngine(db, token=runtime_tbank_token, account_id=runtime_tbank_account, sandbox=config.TBANK_SANDBOX).get_portfolio()
@@ -840,32 +1138,34 @@ async def _run_analysis_loop(
                     snap_balance = float(getattr(snap_settings, "account_balance", 100_000) or 100_000)
                 if snap_settings and getattr(snap_settings, 'trade_mode', 'review') == 'auto_paper':
                     max_positions = int(getattr(snap_settings, 'max_concurrent_positions', 4) or 4)
-                    approved_signal = signal_repo.get_oldest_approved_signal(db)
+                    approved_signal = await db_executor.call(signal_repo.get_oldest_approved_signal, db)
                     if approved_signal is not None:
                         await PaperExecutionEngine(db).execute_approved_signal(approved_signal.id)
-                        open_pos = db.query(Position).filter(Position.qty > 0).count()
+                        open_pos = await db_executor.call(_count_open_positions, db)
                     if open_pos < max_positions:
-                        top_pending = signal_repo.get_top_pending_review_candidate(db, ttl_sec=int(getattr(snap_settings, 'pending_review_ttl_sec', 900) or 900))
+                        top_pending = await db_executor.call(signal_repo.get_top_pending_review_candidate, db, ttl_sec=int(getattr(snap_settings, 'pending_review_ttl_sec', 900) or 900))
                         if top_pending is not None:
                             top_pending.status = 'approved'
-                            db.commit()
+                            await db_executor.call(db.commit)
                             await PaperExecutionEngine(db).execute_approved_signal(top_pending.id)
                             open_pos += 1
-                from sqlalchemy import func
-                sod = start_of_day_ms()
-                realized_today = float(db.query(func.sum(Position.realized_pnl)).filter(Position.updated_ts >= sod).scalar() or 0.0)
-                unrealized = float(db.query(func.sum(Position.unrealized_pnl)).filter(Position.qty > 0).scalar() or 0.0)
-                day_pnl = realized_today + unrealized
+                day_pnl = await db_executor.call(_day_pnl, db)
             update_open_positions(open_pos)
             await _save_snapshot(snap_balance, open_pos, day_pnl)
 
+        try:
+            await decision_log_writer.flush()
+        except Exception as exc:
+            logger.warning("Decision log flush after analysis cycle failed: %s", exc)
         cycle_finished = _now_ms()
+        record_analysis_cycle((cycle_finished - cycle_started) / 1000.0)
         avg_timings = {metric: round(total / max(1, timing_samples), 2) for metric, total in timing_totals.items()} if timing_totals else {}
         last_analysis_stats = {
             "processed": processed,
             "takes": takes,
             "skipped": skipped,
             "duration_ms": cycle_finished - cycle_started,
+            "analysis_processes": analysis_pool.processes,
         }
         if timing_samples > 0:
             last_analysis_stats.update({
@@ -914,11 +1214,18 @@ async def run_worker() -> None:
         logger.error("%s", exc)
         return
     logger.info("Worker starting (env=%s tf=%s broker=%s)", config.APP_ENV, os.getenv("TF", "1m"), config.BROKER_PROVIDER)
+    metrics_port = int(os.getenv("WORKER_METRICS_PORT", "9101") or "0")
+    try:
+        if start_metrics_server(metrics_port):
+            logger.info("Worker metrics served on :%d/metrics", metrics_port)
+    except OSError as exc:
+        logger.warning("Worker metrics server disabled (port %d): %s", metrics_port, exc)
     _sanitize_proxy_env()
 
     loop = asyncio.get_running_loop()
     for sig in (signal.SIGTERM, signal.SIGINT):
         loop.add_signal_handler(sig, lambda s=sig: _handle_signal(s.name))
+    decision_log_writer.start()
 
     tf_str = os.getenv("TF", "1m")
     frame_sec = {"1m": 60, "5m": 300, "15m": 900}.get(tf_str, 60)
@@ -928,28 +1235,30 @@ async def run_worker() -> None:
     logger.info("Worker history retention configured: tf=%s history_size=%d", tf_str, history_size)
 
     selector = StrategySelector()
-    with SessionLocal() as init_db:
-        settings = settings_repo.get_settings(init_db)
-        strategy_name = getattr(settings, "strategy_name", "breakout,mean_reversion") if settings else "breakout,mean_reversion"
-        if settings:
-            logger.info(
-                "Active settings loaded: id=%s updated_ts=%s active=%s threshold=%s reentry=%s risk_per_trade_pct=%s min_sl_distance_pct=%s min_profit_after_costs_multiplier=%s trade_mode=%s",
-                getattr(settings, "id", None),
-                getattr(settings, "updated_ts", None),
-                bool(getattr(settings, "is_active", False)),
-                getattr(settings, "decision_threshold", None),
-                getattr(settings, "signal_reentry_cooldown_sec", None),
-                getattr(settings, "risk_per_trade_pct", None),
-                getattr(settings, "min_sl_distance_pct", None),
-                getattr(settings, "min_profit_after_costs_multiplier", None),
-                getattr(settings, "trade_mode", None),
-            )
+    settings = await db_executor.run(settings_repo.get_settings)
+    strategy_name = getattr(settings, "strategy_name", "breakout,mean_reversion") if settings else "breakout,mean_reversion"
+    if settings:
+        logger.info(
+            "Active settings loaded: id=%s updated_ts=%s active=%s threshold=%s reentry=%s risk_per_trade_pct=%s min_sl_distance_pct=%s min_profit_after_costs_multiplier=%s trade_mode=%s",
+            getattr(settings, "id", None),
+            getattr(settings, "updated_ts", None),
+            bool(getattr(settings, "is_active", False)),
+            getattr(settings, "decision_threshold", None),
+            getattr(settings, "signal_reentry_cooldown_sec", None),
+            getattr(settings, "risk_per_trade_pct", None),
+            getattr(settings, "min_sl_distance_pct", None),
+            getattr(settings, "min_profit_after_costs_multiplier", None),
+            getattr(settings, "trade_mode", None),
+        )
 
     strategy = selector.get(strategy_name)
     aggregator = CandleAggregator(frame_sec=frame_sec, history_size=history_size)
     publisher = MarketPublisher(tf_str=tf_str)
     internet = InternetCollector(redis_client=bus.redis, news_ttl=config.NEWS_CACHE_TTL_SEC, macro_ttl=config.MACRO_CACHE_TTL_SEC)
     processor = SignalProcessor(strategy=strategy, internet_collector=internet, aggregator=aggregator)
+    analysis_pool = AnalysisPool()
+    logger.info("Analysis process pool: processes=%d", analysis_pool.processes)
+    logger.info("Training process pool: processes=%d", training_pool.processes)
     monitors: dict[str, PositionMonitor] = {}
     state = WorkerRuntimeState(
         tickers=list(tickers),
@@ -960,11 +1269,13 @@ async def run_worker() -> None:
     await state.set_phase("bootstrap", f"Worker bootstrapping {len(tickers)} instrument(s)")
     await state.publish()
     status_task = asyncio.create_task(_run_status_heartbeat_loop(state), name="worker-status-heartbeat")
+    loop_lag_task = asyncio.create_task(_run_loop_lag_monitor(state), name="worker-loop-lag")
 
     runtime_tbank_token = get_token("TBANK_TOKEN") or config.TBANK_TOKEN
     runtime_tbank_account = get_token("TBANK_ACCOUNT_ID") or config.TBANK_ACCOUNT_ID
     adapter = None
     polling_task = None
+    stream_task = None
     profile_bootstrap_task = None
 
     def instrument_adapter_factory():
@@ -988,7 +1299,15 @@ async def run_worker() -> None:
         await _bootstrap_history(adapter, aggregator, tickers[:bootstrap_limit], tf_str)
         await state.set_phase('bootstrap', f"History primed for {bootstrap_limit} instrument(s)")
         await state.publish()
-        polling_task = asyncio.create_task(_run_tbank_polling_loop(adapter, aggregator, publisher, state, tf_str), name="worker-polling")
+        market_data_mode = (os.getenv("WORKER_MARKET_DATA_MODE", "auto") or "auto").strip().lower()
+        use_stream = market_data_mode == "stream" or (market_data_mode == "auto" and adapter.supports_candle_stream(tf_str))
+        logger.info("Worker market data mode: %s (configured=%s)", "stream" if use_stream else "poll", market_data_mode)
+        if use_stream:
+            stream_task = asyncio.create_task(_run_tbank_stream_loop(adapter, aggregator, publisher, state, tf_str), name="worker-market-stream")
+        polling_task = asyncio.create_task(
+            _run_tbank_polling_loop(adapter, aggregator, publisher, state, tf_str, gap_fill_only=use_stream),
+            name="worker-gap-fill" if use_stream else "worker-polling",
+        )
         profile_bootstrap_task = asyncio.create_task(
             _run_symbol_profile_bootstrap_task(state, tickers, train_limit=bootstrap_limit, timeframe=tf_str, source='worker_startup'),
             name='worker-symbol-profile-bootstrap',
@@ -1007,6 +1326,8 @@ async def run_worker() -> None:
 
     watchlist_task = asyncio.create_task(_refresh_watchlist_loop(state, adapter, aggregator, tf_str), name="worker-watchlist")
     recalibration_task = asyncio.create_task(_run_recalibration_loop(state), name="worker-recalibration")
+    journal_backfill_task = asyncio.create_task(_run_trade_journal_backfill_task(state), name="worker-trade-journal-backfill")
+    retention_task = asyncio.create_task(_run_decision_log_retention_loop(state), name="worker-decision-log-retention")
     ml_training_task = asyncio.create_task(_run_ml_training_loop(state), name="worker-ml-training")
     instrument_sync_task = asyncio.create_task(_run_instrument_auto_sync_loop(state, instrument_adapter_factory), name="worker-instrument-auto-sync")
     analysis_task = asyncio.create_task(
@@ -1018,19 +1339,22 @@ async def run_worker() -> None:
             state=state,
             runtime_tbank_token=runtime_tbank_token,
             runtime_tbank_account=runtime_tbank_account,
+            analysis_pool=analysis_pool,
         ),
         name="worker-analysis",
     )
 
     cmd_pubsub = bus.redis.pubsub()
-    await cmd_pubsub.subscribe("cmd:execute_signal")
+    await cmd_pubsub.subscribe("cmd:execute_signal", SETTINGS_UPDATED_CHANNEL)
     command_task = asyncio.create_task(_command_listener(cmd_pubsub, runtime_tbank_token, runtime_tbank_account), name="worker-command-listener")
 
     logger.info("Worker running. Instruments: %s", tickers)
     await state.set_phase("running", f"Worker running with {len(tickers)} instrument(s)")
     await state.publish()
 
-    tasks = [polling_task, analysis_task, watchlist_task, recalibration_task, ml_training_task, instrument_sync_task, status_task, command_task]
+    tasks = [polling_task, analysis_task, watchlist_task, recalibration_task, ml_training_task, instrument_sync_task, status_task, loop_lag_task, command_task, journal_backfill_task, retention_task]
+    if stream_task is not None:
+        tasks.append(stream_task)
     if profile_bootstrap_task is not None:
         tasks.append(profile_bootstrap_task)
     try:
@@ -1058,7 +1382,7 @@ async def run_worker() -> None:
             task.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
         try:
-            await cmd_pubsub.unsubscribe("cmd:execute_signal")
+            await cmd_pubsub.unsubscribe("cmd:execute_signal", SETTINGS_UPDATED_CHANNEL)
             await cmd_pubsub.aclose()
         except Exception:
             pass
@@ -1067,14 +1391,29 @@ async def run_worker() -> None:
                 await adapter.close()
             except Exception:
                 pass
+        try:
+            await publisher.close()
+        except Exception:
+            logger.debug("kline batch flush skipped on shutdown", exc_info=True)
+        try:
+            await candle_writer.close()
+        except Exception as exc:
+            logger.warning("Candle write-behind flush on shutdown failed: %s", exc)
+        try:
+            await decision_log_writer.close()
+        except Exception as exc:
+            logger.warning("Decision log flush on shutdown failed: %s", exc)
         await state.set_phase("stopped", "Worker stopped")
         await state.publish()
         await _shutdown_cleanup(monitors)
+        analysis_pool.shutdown(wait=False)
+        training_pool.shutdown(wait=False)
+        db_executor.shutdown()
 
 
 async def _shutdown_cleanup(monitors: dict[str, PositionMonitor]) -> None:
     async with get_db() as db:
-        open_pos = db.query(Position).filter(Position.qty > 0).all()
+        open_pos = await db_executor.call(_list_open_positions, db)
         if open_pos:
             instruments = [p.instrument_id for p in open_pos]
             logger.warning("Worker shutdown: %d open position(s) remain: %s — NOT auto-closed", len(open_pos), instruments)
@@ -1091,13 +1430,17 @@ async def _command_listener(pubsub, runtime_tbank_token: str | None, runtime_tba
     while not _shutdown.is_set():
         try:
             msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-            if msg:
+            if msg and msg.get("channel") == SETTINGS_UPDATED_CHANNEL:
+                version = orjson.loads(msg["data"]).get("version")
+                dropped = settings_repo.invalidate_settings_snapshot(version)
+                logger.info("Settings updated: version=%s dropped_snapshots=%d", version, dropped)
+            elif msg:
                 data = orjson.loads(msg["data"])
                 sig_id = data.get("signal_id")
                 if sig_id:
                     logger.info("Execute command: signal_id=%s", sig_id)
                     async with get_db() as db:
-                        settings = settings_repo.get_settings(db)
+                        settings = await db_executor.call(settings_repo.get_settings, db)
                         if not settings or not bool(getattr(settings, "bot_enabled", False)):
                             logger.warning("Execution skipped because bot is disabled")
                         else:
@@ -1106,6 +1449,7 @@ async def _command_listener(pubsub, runtime_tbank_token: str | None, runtime_tba
                                 await TBankExecutionEngine(db, token=runtime_tbank_token, account_id=runtime_tbank_account, sandbox=config.TBANK_SANDBOX).execute_approved_signal(sig_id)
                             else:
                                 await PaperExecutionEngine(db).execute_approved_signal(sig_id)
+                    await decision_log_writer.flush()
             await asyncio.sleep(0.1)
         except asyncio.CancelledError:
             break
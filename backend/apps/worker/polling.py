@@ -0,0 +1,202 @@
+"""
+Bounded-concurrency, rate-limit-aware market polling scheduler.
+
+The T-Bank REST adapter reports `x-ratelimit-remaining` / `x-ratelimit-reset`
+on every response (`TBankGrpcAdapter.get_rate_limit_budget`). The scheduler
+fans polling requests out up to `max_concurrency` in parallel, shrinks the
+effective concurrency as the remaining budget approaches `reserve`, and waits
+for the reset window when the budget is exhausted instead of burning requests
+into HTTP 429s.
+
+Ordering keeps the worker's priority tiers: high-priority tickers go first,
+and within a tier the stalest ticker is polled first.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable
+
+
+def _to_int(value: Any) -> int | None:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: Any) -> float | None:
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RateLimitBudget:
+    """Latest rate-limit headers as seen by the adapter."""
+
+    remaining: int | None = None
+    reset_sec: float | None = None
+    observed_monotonic: float | None = None
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any] | None) -> "RateLimitBudget":
+        payload = dict(payload or {})
+        return cls(
+            remaining=_to_int(payload.get("remaining")),
+            reset_sec=_to_float(payload.get("reset_sec")),
+            observed_monotonic=_to_float(payload.get("observed_monotonic")),
+        )
+
+    def seconds_until_reset(self, now: float) -> float:
+        if self.reset_sec is None or self.observed_monotonic is None:
+            return 0.0
+        return max(0.0, self.observed_monotonic + self.reset_sec - now)
+
+    def effective_remaining(self, now: float) -> int | None:
+        """Remaining requests, or None once the reported window has reset."""
+        if self.remaining is None:
+            return None
+        if self.reset_sec is not None and self.observed_monotonic is not None and self.seconds_until_reset(now) <= 0:
+            return None
+        return self.remaining
+
+
+@dataclass
+class PollCycleStats:
+    requested: int = 0
+    throttled_waits: int = 0
+    throttle_wait_ms: int = 0
+    peak_in_flight: int = 0
+    concurrency_limit: int = 0
+    budget_remaining_start: int | None = None
+    budget_remaining_end: int | None = None
+    budget_reset_sec: float | None = None
+    results: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requested,
+            "concurrency_limit": self.concurrency_limit,
+            "peak_in_flight": self.peak_in_flight,
+            "throttled_waits": self.throttled_waits,
+            "throttle_wait_ms": self.throttle_wait_ms,
+            "remaining_start": self.budget_remaining_start,
+            "remaining_end": self.budget_remaining_end,
+            "reset_sec": self.budget_reset_sec,
+        }
+
+
+class PollingScheduler:
+    """
+    Runs one polling cycle over a set of tickers with bounded concurrency.
+
+    Args:
+        max_concurrency: Upper bound of in-flight requests.
+        reserve: Requests kept back from the broker budget for orders,
+            portfolio reads and other non-polling calls.
+        max_throttle_wait_sec: Cap on a single wait for the rate-limit reset.
+        budget_fn: Returns the adapter's latest rate-limit payload
+            (`remaining`, `reset_sec`, `observed_monotonic`), or None.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 8,
+        reserve: int = 5,
+        max_throttle_wait_sec: float = 10.0,
+        budget_fn: Callable[[], dict[str, Any] | None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.reserve = max(0, int(reserve))
+        self.max_throttle_wait_sec = max(0.0, float(max_throttle_wait_sec))
+        self._budget_fn = budget_fn
+        self._clock = clock
+        self._sleep = sleep
+
+    @staticmethod
+    def order(tickers: Iterable[str], *, high_priority: set[str], last_ok: dict[str, float]) -> list[str]:
+        """High-priority tier first, then stalest-first within each tier."""
+        return sorted(
+            tickers,
+            key=lambda ticker: (0 if ticker in high_priority else 1, last_ok.get(ticker, 0.0)),
+        )
+
+    def budget(self) -> RateLimitBudget:
+        if self._budget_fn is None:
+            return RateLimitBudget()
+        try:
+            return RateLimitBudget.from_payload(self._budget_fn())
+        except Exception:
+            return RateLimitBudget()
+
+    def concurrency_for(self, budget: RateLimitBudget) -> int:
+        remaining = budget.effective_remaining(self._clock())
+        if remaining is None:
+            return self.max_concurrency
+        return max(1, min(self.max_concurrency, remaining - self.reserve))
+
+    async def _wait_for_budget(self, stats: PollCycleStats) -> None:
+        budget = self.budget()
+        now = self._clock()
+        remaining = budget.effective_remaining(now)
+        if remaining is None or remaining > self.reserve:
+            return
+        wait_sec = min(self.max_throttle_wait_sec, budget.seconds_until_reset(now) or 1.0)
+        stats.throttled_waits += 1
+        stats.throttle_wait_ms += int(wait_sec * 1000)
+        await self._sleep(wait_sec)
+
+    async def run(
+        self,
+        tickers: list[str],
+        fetch: Callable[[str], Awaitable[Any]],
+        *,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> PollCycleStats:
+        """
+        Call `fetch(ticker)` for every ticker, at most `concurrency` at a time.
+
+        `fetch` owns its own error handling; whatever it returns (or raises) is
+        stored in `stats.results[ticker]`.
+        """
+        stats = PollCycleStats()
+        start_budget = self.budget()
+        stats.budget_remaining_start = start_budget.remaining
+        stats.budget_reset_sec = start_budget.reset_sec
+        stats.concurrency_limit = self.concurrency_for(start_budget)
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for ticker in tickers:
+            queue.put_nowait(ticker)
+        in_flight = 0
+
+        async def _worker() -> None:
+            nonlocal in_flight
+            while not queue.empty():
+                if should_stop is not None and should_stop():
+                    return
+                ticker = queue.get_nowait()
+                await self._wait_for_budget(stats)
+                in_flight += 1
+                stats.peak_in_flight = max(stats.peak_in_flight, in_flight)
+                stats.requested += 1
+                try:
+                    stats.results[ticker] = await fetch(ticker)
+                except Exception as exc:
+                    stats.results[ticker] = exc
+                finally:
+                    in_flight -= 1
+
+        workers = min(stats.concurrency_limit, len(tickers))
+        if workers:
+            await asyncio.gather(*(_worker() for _ in range(workers)))
+        end_budget = self.budget()
+        stats.budget_remaining_end = end_budget.remaining
+        if end_budget.reset_sec is not None:
+            stats.budget_reset_sec = end_budget.reset_sec
+        return stats
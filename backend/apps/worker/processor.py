@@ -17,7 +17,9 @@ from types import SimpleNamespace
 
 from sqlalchemy.orm import Session
 
+from apps.worker.db_executor import db_executor
 from apps.worker.decision_engine.engine import DecisionEngine
+from apps.worker.decision_engine.streaming import matching_snapshot
 from apps.worker.decision_engine.types import Decision, MarketSnapshot
 from apps.worker.ai.historical import HistoricalContextAnalyzer
 from apps.worker.ai.fast_path import evaluate_ai_fast_path
@@ -92,38 +94,44 @@ class SignalProcessor:
         self._internet = internet_collector  # P4-02: optional InternetCollector
         self._aggregator = aggregator        # P5-06: for correlation candles_map
 
-    async def _prepare_signal_context(self, ticker: str, candle_history: list[dict], db: Session, adaptive_plan: dict | None = None) -> dict | None:
-        settings = settings_repo.get_settings(db)
+    async def _prepare_signal_context(self, ticker: str, candle_history: list[dict], db: Session, adaptive_plan: dict | None = None, strategy_search: tuple | None = None) -> dict | None:
+        settings = await db_executor.call(settings_repo.get_settings_snapshot, db)
         pending_ttl_sec = int(getattr(settings, 'pending_review_ttl_sec', 900) or 900)
-        signal_repo.expire_stale_pending_signals(db, ticker, ttl_sec=pending_ttl_sec)
+        await db_executor.call(signal_repo.expire_stale_pending_signals, db, ticker, ttl_sec=pending_ttl_sec)
         if len(candle_history) < self.strategy.lookback:
             logger.debug("%s: history too short (%d < %d)", ticker, len(candle_history), self.strategy.lookback)
             return None
 
         if adaptive_plan is None and candle_history:
             try:
-                built_plan = build_symbol_plan(db, ticker, candle_history, settings)
+                built_plan = await db_executor.call(build_symbol_plan, db, ticker, candle_history, settings)
                 adaptive_plan = built_plan.to_meta() if built_plan else None
             except Exception as exc:
                 logger.warning("%s: adaptive plan fallback build failed: %s", ticker, exc)
 
         confirmation_tf = normalize_timeframe((adaptive_plan or {}).get('confirmation_timeframe') or getattr(settings, 'higher_timeframe', '15m') or '15m', '15m')
-        confirmation_history = resample_candles(candle_history, confirmation_tf) if confirmation_tf != '1m' else list(candle_history)
+        confirmation_history = resample_candles(candle_history, confirmation_tf, cache_key=ticker) if confirmation_tf != '1m' else list(candle_history)
 
         # 1. Strategy signal on adaptive timeframe with fallback search
-        sig_data, analysis_history, timeframe_meta = _run_strategy_timeframe_search(
-            self.strategy,
-            ticker,
-            candle_history,
-            adaptive_plan,
-            settings,
-        )
+        indicators = self._indicator_snapshot(ticker, candle_history)
+        if strategy_search is not None:
+            # Precomputed by AnalysisPool for these bars / plan / strategy (main drops it once a new bar opens).
+            sig_data, analysis_history, timeframe_meta = strategy_search
+        else:
+            sig_data, analysis_history, timeframe_meta = _run_strategy_timeframe_search(
+                self.strategy,
+                ticker,
+                candle_history,
+                adaptive_plan,
+                settings,
+                indicators=indicators,
+            )
         if not sig_data:
             logger.debug("Strategy analyzed %s: signal=none history_len=%d requested_tf=%s", ticker, len(candle_history), timeframe_meta.get('requested_timeframe'))
             return None
 
         execution_tf = normalize_timeframe((adaptive_plan or {}).get('execution_timeframe') or (sig_data.get('meta') or {}).get('execution_timeframe') or '1m', '1m')
-        execution_history = resample_candles(candle_history, execution_tf) if execution_tf != '1m' else list(candle_history)
+        execution_history = resample_candles(candle_history, execution_tf, cache_key=ticker) if execution_tf != '1m' else list(candle_history)
 
         sig_data = _attach_execution_geometry(
             sig_data,
@@ -184,8 +192,20 @@ class SignalProcessor:
             "sig_data": sig_data,
             "trace_id": trace_id,
             "timeframe_meta": timeframe_meta,
+            "indicators": indicators,
         }
 
+    def _indicator_snapshot(self, ticker: str, candle_history: list[dict]) -> dict | None:
+        """Streaming indicators from the aggregator, if they describe `candle_history`."""
+        snapshot_fn = getattr(self._aggregator, 'indicator_snapshot', None)
+        if snapshot_fn is None:
+            return None
+        try:
+            return matching_snapshot(snapshot_fn(ticker), candle_history)
+        except Exception as exc:
+            logger.debug("%s: streaming indicator snapshot unavailable: %s", ticker, exc)
+            return None
+
     def _apply_risk_and_sizing(self, db: Session, context: dict) -> dict | None:
         ticker = context["ticker"]
         candle_history = context["candle_history"]
@@ -493,7 +513,7 @@ class SignalProcessor:
         policy_state = context.get('policy_state')
         decision_timing: dict[str, int] = {}
         # 6. Load settings
-        settings = settings_repo.get_settings(db)
+        settings = await db_executor.call(settings_repo.get_settings_snapshot, db)
         if not settings:
             logger.warning("%s: no settings row — skipping DE/AI", ticker)
             context["halt_after_persist"] = True
@@ -501,7 +521,7 @@ class SignalProcessor:
             return context
 
         # 7. P4-08: Run DE and internet collection in parallel
-        snapshot = _snapshot_for_history(sig_data, analysis_history, confirmation_history)
+        snapshot = _snapshot_for_history(sig_data, analysis_history, confirmation_history, indicators=context.get("indicators"))
         de = DecisionEngine(settings)
 
         section_started = time.perf_counter()
@@ -526,8 +546,8 @@ class SignalProcessor:
 
         strategy_name = (sig_data.get('meta') or {}).get("strategy_name") or (sig_data.get('meta') or {}).get("strategy") or getattr(self.strategy, "name", None)
         section_started = time.perf_counter()
-        symbol_profile = get_symbol_profile(ticker, db=db)
-        symbol_diagnostics = get_symbol_diagnostics(db, ticker, lookback_days=180, timeframe='1m')
+        symbol_profile = await db_executor.call(get_symbol_profile, ticker, db=db)
+        symbol_diagnostics = await db_executor.call(get_symbol_diagnostics, db, ticker, lookback_days=180, timeframe='1m')
         event_regime_obj = analyze_event_regime(
             ticker,
             sig_data["side"],
@@ -568,10 +588,11 @@ class SignalProcessor:
                         adaptive_plan,
                         settings,
                         rescue_hint=rescue_hint,
+                        indicators=context.get("indicators"),
                     )
                     if rescue_signal and rescue_meta.get('selected_timeframe'):
                         rescue_confirmation_tf = normalize_timeframe((adaptive_plan or {}).get('confirmation_timeframe') or getattr(settings, 'higher_timeframe', '15m') or '15m', '15m')
-                        rescue_confirmation_history = resample_candles(candle_history, rescue_confirmation_tf) if rescue_confirmation_tf != '1m' else list(candle_history)
+                        rescue_confirmation_history = resample_candles(candle_history, rescue_confirmation_tf, cache_key=ticker) if rescue_confirmation_tf != '1m' else list(candle_history)
                         rescue_signal = _attach_execution_geometry(
                             rescue_signal,
                             execution_history=execution_history,
@@ -591,7 +612,7 @@ class SignalProcessor:
                         )
                         analysis_history = rescue_history
                         confirmation_history = rescue_confirmation_history
-                        snapshot = _snapshot_for_history(rescue_signal, analysis_history, confirmation_history)
+                        snapshot = _snapshot_for_history(rescue_signal, analysis_history, confirmation_history, indicators=context.get("indicators"))
                         sig_data = rescue_signal
                         sig_meta = dict(sig_data.get('meta') or {})
                         sig_meta['multi_timeframe'] = {
@@ -860,7 +881,7 @@ class SignalProcessor:
             hard_blocked=de_has_blockers or freshness_blocked,
         )
         if policy_state and getattr(policy_state, 'state', '') == 'frozen' and bool(getattr(policy_state, 'selective_throttle', False)):
-            reject_storm_active = signal_repo.detect_reject_storm(db, lookback_minutes=60)
+            reject_storm_active = await db_executor.call(signal_repo.detect_reject_storm, db, lookback_minutes=60)
             selective_policy_blocked, selective_policy_reason = _evaluate_selective_policy_throttle(
                 policy_state=policy_state,
                 final_decision=final_decision,
@@ -964,7 +985,8 @@ class SignalProcessor:
                     },
                 )
             else:
-                historical_context = HistoricalContextAnalyzer(db).analyze(
+                historical_context = await db_executor.call(
+                    HistoricalContextAnalyzer(db).analyze,
                     instrument_id=ticker,
                     side=sig_data["side"],
                     strategy_name=strategy_name,
@@ -1254,8 +1276,8 @@ class SignalProcessor:
         if signal_orm.ai_decision_id:
             meta["ai_decision_id"] = signal_orm.ai_decision_id
         signal_orm.meta = meta
-        db.commit()
-        db.refresh(signal_orm)
+        await db_executor.call(db.commit)
+        await db_executor.call(db.refresh, signal_orm)
 
         # 10. Detailed decision logs
         _append_decision_log(
@@ -1287,9 +1309,7 @@ class SignalProcessor:
         )
 
         if final_decision != "TAKE" and signal_orm.status == "pending_review":
-            signal_repo.update_signal_status(db, signal_orm.id, "rejected", commit=False)
-            db.commit()
-            db.refresh(signal_orm)
+            await db_executor.call(self._set_signal_status, db, signal_orm, "rejected")
 
         decision_timing['finalize_ms'] = _elapsed_ms(section_started)
         context.setdefault('telemetry', {})['decision_flow_ms'] = decision_timing
@@ -1351,10 +1371,61 @@ class SignalProcessor:
         context.setdefault('telemetry', {})['publish_notify_ms'] = notify_timing
 
 
+    @staticmethod
+    def _set_signal_status(db: Session, signal_orm, status: str, uow: SignalExecutionUnitOfWork | None = None) -> None:
+        signal_repo.update_signal_status(db, signal_orm.id, status, commit=False)
+        if uow is not None:
+            uow.mark(f'signal_{status}')
+            uow.commit()
+        else:
+            db.commit()
+        db.refresh(signal_orm)
+
+    @staticmethod
+    def _record_execution_outcome(db: Session, signal_id: str, uow: SignalExecutionUnitOfWork, error_reason: str | None, trace_id: str | None) -> dict | None:
+        """Store the unit of work on the signal; a failed execution also marks it and returns its new meta.
+
+        The signal is reloaded here so callers on the loop can read it without a lazy load.
+        """
+        current_signal = signal_repo.get_signal(db, signal_id)
+        if current_signal is None:
+            return None
+        current_meta = dict(current_signal.meta or {})
+        failed_meta = None
+        if not error_reason:
+            current_meta['execution_uow'] = uow.to_meta()
+            current_signal.meta = current_meta
+            db.commit()
+        elif current_signal.status in {"pending_review", "approved"}:
+            current_signal.status = "execution_error"
+            current_meta['execution_error'] = {
+                'reason': error_reason,
+                'ts': int(time.time() * 1000),
+                'trace_id': trace_id,
+                'unit_of_work': uow.to_meta(),
+            }
+            current_signal.meta = failed_meta = current_meta
+            db.commit()
+        db.refresh(current_signal)
+        return failed_meta
+
+    @staticmethod
+    def _reject_after_decision_flow(db: Session, signal_orm, error: dict, *, keep_existing: bool = False) -> None:
+        failed_meta = dict(signal_orm.meta or {})
+        if keep_existing:
+            failed_meta.setdefault('decision_flow_error', error)
+        else:
+            failed_meta['decision_flow_error'] = error
+        signal_orm.status = 'rejected'
+        signal_orm.meta = failed_meta
+        db.commit()
+        db.refresh(signal_orm)
+
     async def _execute_signal(self, db: Session, context: dict) -> None:
         exec_started = time.perf_counter()
         ticker = context["ticker"]
         signal_orm = context["signal_orm"]
+        signal_id = signal_orm.id
         settings = context["settings"]
         final_decision = context["final_decision"]
         ai_mode_str = context["ai_mode_str"]
@@ -1362,7 +1433,7 @@ class SignalProcessor:
         # 13. Auto-execution based on final_decision
         trade_mode = settings.trade_mode or "review"
         execution_payload = {
-            "signal_id": signal_orm.id,
+            "signal_id": signal_id,
             "instrument_id": ticker,
             "final_decision": final_decision,
             "trade_mode": trade_mode,
@@ -1377,18 +1448,16 @@ class SignalProcessor:
         )
         if final_decision == "TAKE":
             execution_error_reason = None
-            uow = SignalExecutionUnitOfWork(db, signal_id=signal_orm.id, trace_id=trace_id)
-            current_settings = settings_repo.get_settings(db)
+            uow = SignalExecutionUnitOfWork(db, signal_id=signal_id, trace_id=trace_id)
+            current_settings = await db_executor.call(settings_repo.get_settings, db)
             force_paper = trade_mode == "auto_live" and prefers_paper_execution(current_settings)
             try:
                 uow.mark('begin', trade_mode=trade_mode)
                 if trade_mode == "auto_paper" or force_paper:
-                    signal_repo.update_signal_status(db, signal_orm.id, "approved", commit=False)
-                    uow.mark('signal_approved')
-                    uow.commit()
-                    db.refresh(signal_orm)
+                    await db_executor.call(self._set_signal_status, db, signal_orm, "approved", uow)
                     uow.mark('paper_execution_start')
-                    await PaperExecutionEngine(db).execute_approved_signal(signal_orm.id)
+                    engine = await db_executor.call(PaperExecutionEngine, db)
+                    await engine.execute_approved_signal(signal_id, db_call=db_executor.call)
                     uow.mark('paper_execution_done')
                 elif trade_mode == "auto_live":
                     from core.config import settings as cfg
@@ -1396,13 +1465,10 @@ class SignalProcessor:
                     runtime_tbank_account = get_token("TBANK_ACCOUNT_ID") or cfg.TBANK_ACCOUNT_ID
                     if runtime_tbank_token and runtime_tbank_account:
                         from core.execution.tbank import TBankExecutionEngine
-                        engine = TBankExecutionEngine(db, runtime_tbank_token, runtime_tbank_account, cfg.TBANK_SANDBOX)
-                        signal_repo.update_signal_status(db, signal_orm.id, "approved", commit=False)
-                        uow.mark('signal_approved')
-                        uow.commit()
-                        db.refresh(signal_orm)
+                        engine = await db_executor.call(TBankExecutionEngine, db, runtime_tbank_token, runtime_tbank_account, cfg.TBANK_SANDBOX)
+                        await db_executor.call(self._set_signal_status, db, signal_orm, "approved", uow)
                         uow.mark('live_execution_start')
-                        await engine.execute_approved_signal(signal_orm.id)
+                        await engine.execute_approved_signal(signal_id, db_call=db_executor.call)
                         uow.mark('live_execution_done')
                     else:
                         execution_error_reason = 'missing_tbank_credentials'
@@ -1417,38 +1483,20 @@ class SignalProcessor:
             except Exception as exc:
                 execution_error_reason = f'execution_failed:{type(exc).__name__}'
                 uow.mark('exception', reason=execution_error_reason)
-                logger.error("%s: execution failed for signal %s", ticker, signal_orm.id, exc_info=exc)
-
-            if execution_error_reason:
-                failed_signal = signal_repo.get_signal(db, signal_orm.id)
-                if failed_signal is not None and failed_signal.status in {"pending_review", "approved"}:
-                    failed_signal.status = "execution_error"
-                    failed_meta = dict(failed_signal.meta or {})
-                    failed_meta['execution_error'] = {
-                        'reason': execution_error_reason,
-                        'ts': int(time.time() * 1000),
-                        'trace_id': trace_id,
-                        'unit_of_work': uow.to_meta(),
-                    }
-                    failed_signal.meta = failed_meta
-                    db.commit()
-                    await bus.publish('signal_updated', {'id': failed_signal.id, 'status': failed_signal.status, 'meta': failed_meta})
-            else:
-                current_signal = signal_repo.get_signal(db, signal_orm.id)
-                if current_signal is not None:
-                    current_meta = dict(current_signal.meta or {})
-                    current_meta['execution_uow'] = uow.to_meta()
-                    current_signal.meta = current_meta
-                    db.commit()
+                logger.error("%s: execution failed for signal %s", ticker, signal_id, exc_info=exc)
+
+            failed_meta = await db_executor.call(self._record_execution_outcome, db, signal_id, uow, execution_error_reason, trace_id)
+            if failed_meta is not None:
+                await bus.publish('signal_updated', {'id': signal_id, 'status': 'execution_error', 'meta': failed_meta})
         context.setdefault('telemetry', {})['execute_signal_ms'] = _elapsed_ms(exec_started)
 
 
-    async def process(self, ticker: str, candle_history: list[dict], db: Session, adaptive_plan: dict | None = None) -> dict:
+    async def process(self, ticker: str, candle_history: list[dict], db: Session, adaptive_plan: dict | None = None, strategy_search: tuple | None = None) -> dict:
         total_started = time.perf_counter()
         telemetry: dict[str, object] = {}
 
         stage_started = time.perf_counter()
-        context = await self._prepare_signal_context(ticker, candle_history, db, adaptive_plan)
+        context = await self._prepare_signal_context(ticker, candle_history, db, adaptive_plan, strategy_search=strategy_search)
         telemetry['prepare_context_ms'] = _elapsed_ms(stage_started)
         if context is None:
             telemetry['total_ms'] = _elapsed_ms(total_started)
@@ -1460,7 +1508,7 @@ class SignalProcessor:
             }
 
         stage_started = time.perf_counter()
-        context = self._apply_risk_and_sizing(db, context)
+        context = await db_executor.call(self._apply_risk_and_sizing, db, context)
         telemetry['risk_and_sizing_ms'] = _elapsed_ms(stage_started)
         if context is None:
             telemetry['total_ms'] = _elapsed_ms(total_started)
@@ -1474,7 +1522,7 @@ class SignalProcessor:
         pre_persist_blocked = bool(context.get('pre_persist_blocked'))
 
         stage_started = time.perf_counter()
-        context = self._persist_signal(db, context)
+        context = await db_executor.call(self._persist_signal, db, context)
         telemetry['persist_signal_ms'] = _elapsed_ms(stage_started)
         if context is None:
             telemetry['total_ms'] = _elapsed_ms(total_started)
@@ -1507,15 +1555,10 @@ class SignalProcessor:
             logger.error("%s: decision flow crashed after persist: %s", decision_context.get('ticker'), exc, exc_info=True)
             signal_orm = decision_context.get('signal_orm')
             if signal_orm is not None:
-                failed_meta = dict(signal_orm.meta or {})
-                failed_meta['decision_flow_error'] = {
+                await db_executor.call(self._reject_after_decision_flow, db, signal_orm, {
                     'stage': 'run_decision_flow',
                     'reason': f'{type(exc).__name__}: {exc}',
-                }
-                signal_orm.status = 'rejected'
-                signal_orm.meta = failed_meta
-                db.commit()
-                db.refresh(signal_orm)
+                })
             telemetry['decision_flow_total_ms'] = _elapsed_ms(stage_started)
             telemetry['total_ms'] = _elapsed_ms(total_started)
             return {
@@ -1528,15 +1571,10 @@ class SignalProcessor:
         if context is None:
             signal_orm = decision_context.get('signal_orm')
             if signal_orm is not None:
-                failed_meta = dict(signal_orm.meta or {})
-                failed_meta.setdefault('decision_flow_error', {
+                await db_executor.call(self._reject_after_decision_flow, db, signal_orm, {
                     'stage': 'run_decision_flow',
                     'reason': 'returned_none',
-                })
-                signal_orm.status = 'rejected'
-                signal_orm.meta = failed_meta
-                db.commit()
-                db.refresh(signal_orm)
+                }, keep_existing=True)
             telemetry['total_ms'] = _elapsed_ms(total_started)
             return {
                 'ok': False,
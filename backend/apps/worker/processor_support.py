@@ -494,7 +494,7 @@ def _candidate_timeframes(adaptive_plan: dict | None, settings: Any, *, rescue_h
     return ordered
 
 
-def _run_strategy_timeframe_search(strategy: BaseStrategy, ticker: str, base_history: list[dict], adaptive_plan: dict | None, settings: Any, *, rescue_hint: str | None = None) -> tuple[dict | None, list[dict], dict]:
+def _run_strategy_timeframe_search(strategy: BaseStrategy, ticker: str, base_history: list[dict], adaptive_plan: dict | None, settings: Any, *, rescue_hint: str | None = None, indicators: dict | None = None) -> tuple[dict | None, list[dict], dict]:
     candidates_meta: list[dict] = []
     requested = normalize_timeframe((adaptive_plan or {}).get('analysis_timeframe') or '1m', '1m')
     confirmation_tf = normalize_timeframe((adaptive_plan or {}).get('confirmation_timeframe') or getattr(settings, 'higher_timeframe', '15m') or '15m', '15m')
@@ -516,7 +516,7 @@ def _run_strategy_timeframe_search(strategy: BaseStrategy, ticker: str, base_his
     for tf in attempted_tfs:
         if tf not in allowed_tfs:
             continue
-        history = resample_candles(base_history, tf) if tf != '1m' else list(base_history)
+        history = resample_candles(base_history, tf, cache_key=ticker) if tf != '1m' else list(base_history)
         candidate_row = {'timeframe': tf, 'history_len': len(history), 'signal_found': False}
         if len(history) < strategy.lookback:
             candidate_row['skip_reason'] = 'history_too_short'
@@ -524,7 +524,10 @@ def _run_strategy_timeframe_search(strategy: BaseStrategy, ticker: str, base_his
             candidates_meta.append(candidate_row)
             continue
         try:
-            signal = strategy.analyze(ticker, history)
+            if tf == '1m' and indicators is not None:
+                signal = strategy.analyze(ticker, history, indicators=indicators)
+            else:
+                signal = strategy.analyze(ticker, history)
         except Exception:
             logger.exception('Strategy %s crashed for %s on %s', getattr(strategy, 'name', 'unknown'), ticker, tf)
             candidate_row['skip_reason'] = 'strategy_exception'
@@ -576,7 +579,7 @@ def _run_strategy_timeframe_search(strategy: BaseStrategy, ticker: str, base_his
         promoted_thesis_tf = tf
         higher_tf_thesis = dict(meta.get('higher_tf_thesis') or {}) if isinstance(meta.get('higher_tf_thesis'), dict) else None
         if tf == '1m' and confirmation_tf != '1m':
-            confirmation_history = resample_candles(base_history, confirmation_tf)
+            confirmation_history = resample_candles(base_history, confirmation_tf, cache_key=ticker)
             if confirmation_history:
                 trend, slope = detect_trend(confirmation_history)
                 side = str(signal.get('side') or 'BUY').upper()
@@ -641,11 +644,12 @@ def _attach_execution_geometry(sig_data: dict, *, execution_history: list[dict],
     return sig_data
 
 
-def _snapshot_for_history(sig_data: dict, analysis_history: list[dict], confirmation_history: list[dict] | None = None) -> MarketSnapshot:
+def _snapshot_for_history(sig_data: dict, analysis_history: list[dict], confirmation_history: list[dict] | None = None, indicators: dict | None = None) -> MarketSnapshot:
     trend, slope = detect_trend(confirmation_history or []) if confirmation_history else ('flat', None)
     return MarketSnapshot(
         candles=analysis_history,
         last_price=sig_data.get('entry') or analysis_history[-1]['close'],
         htf_trend=None if trend == 'flat' else trend,
         htf_ema_slope=slope,
+        indicators=indicators,
     )
@@ -6,9 +6,15 @@ Responsible for:
   - Building the SSE payload
   - Emitting heartbeat republishes so the chart keeps moving even when
     sandbox candles do not change materially between polls.
+  - Optional batching (WORKER_KLINE_BATCH_MS): candles that pass the
+    throttle are collected for a short window and published as
+    `kline_batch` events in one pipelined Redis round trip. Candles queued
+    while a batch is being published get their own window right after it;
+    `close()` waits for the in-flight batch and publishes what is left.
 """
 import asyncio
 import logging
+import os
 
 from core.events.bus import bus
 
@@ -24,13 +30,21 @@ class MarketPublisher:
     unchanged for multiple poll cycles.
     """
 
-    def __init__(self, tf_str: str = "1m", throttle_sec: float = 1.0, heartbeat_sec: float = 10.0):
+    MAX_BATCH_ITEMS = 200
+
+    def __init__(self, tf_str: str = "1m", throttle_sec: float = 1.0, heartbeat_sec: float = 10.0, batch_window_sec: float | None = None):
         self.tf_str = tf_str
         self.throttle_sec = throttle_sec
         self.heartbeat_sec = heartbeat_sec
+        if batch_window_sec is None:
+            batch_window_sec = max(0.0, float(os.getenv("WORKER_KLINE_BATCH_MS", "0") or "0")) / 1000.0
+        self.batch_window_sec = batch_window_sec
         self._last_sent: dict[str, float] = {}
         self._last_payload: dict[str, tuple] = {}
         self._last_forced: dict[str, float] = {}
+        self._pending: dict[str, dict] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._closing = asyncio.Event()
 
     async def publish_candle(self, candle) -> None:
         now = asyncio.get_running_loop().time()
@@ -65,7 +79,12 @@ class MarketPublisher:
             },
             "heartbeat": is_same_payload,
         }
-        await bus.publish("kline", payload)
+        if self.batch_window_sec > 0:
+            self._pending[instrument_id] = payload
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_after_window(), name="kline-batch-flush")
+        else:
+            await bus.publish("kline", payload)
         self._last_sent[instrument_id] = now
         self._last_payload[instrument_id] = payload_key
         if is_same_payload:
@@ -73,3 +92,41 @@ class MarketPublisher:
             logger.debug("publish_candle heartbeat %s tf=%s t=%s", instrument_id, self.tf_str, candle.time)
         else:
             logger.debug("publish_candle %s tf=%s t=%s", instrument_id, self.tf_str, candle.time)
+
+    async def _flush_after_window(self) -> None:
+        # Keep going while candles arrive during publish_many; publish_candle only
+        # starts a new task once this one is done.
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._closing.wait(), self.batch_window_sec)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning("kline batch publish failed: %s", exc)
+
+    async def flush(self) -> int:
+        """Publish pending candles now; returns how many were sent."""
+        if not self._pending:
+            return 0
+        items = list(self._pending.values())
+        self._pending.clear()
+        batches = [
+            ("kline_batch", {"tf": self.tf_str, "items": items[i:i + self.MAX_BATCH_ITEMS]})
+            for i in range(0, len(items), self.MAX_BATCH_ITEMS)
+        ]
+        await bus.publish_many(batches)
+        logger.debug("publish kline_batch tf=%s items=%d events=%d", self.tf_str, len(items), len(batches))
+        return len(items)
+
+    async def close(self) -> None:
+        """Cut the current window short, wait for the in-flight batch and publish the rest."""
+        self._closing.set()
+        task, self._flush_task = self._flush_task, None
+        try:
+            if task is not None:
+                await task
+            await self.flush()
+        finally:
+            self._closing.clear()
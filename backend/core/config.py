@@ -38,6 +38,11 @@ class Settings(BaseSettings):
 
     # Feature Flags
     ALLOW_NO_REDIS: bool = False
+
+    # Event bus: "pubsub" (fire-and-forget) or "streams" (capped Redis Stream, SSE Last-Event-ID replay)
+    EVENT_BUS_BACKEND: str = "pubsub"
+    EVENT_STREAM_MAXLEN: int = 10000
+    SSE_REPLAY_LIMIT: int = 2000
     TBANK_SANDBOX: bool = False
     LIVE_TRADING_ENABLED: bool = False
 
@@ -74,6 +79,9 @@ class Settings(BaseSettings):
 
     LOG_DIR: str = ""
 
+    # ── Columnar candle archive (training / backtests); empty = read candle_cache directly
+    CANDLE_ARCHIVE_DIR: str = ""
+
 
 settings = Settings()
 
@@ -1,21 +1,105 @@
+import logging
+
 import redis.asyncio as redis
+from redis.exceptions import RedisError
 from core.config import settings
 import orjson
 import time
 
+logger = logging.getLogger(__name__)
+
+# Processes holding a cached settings snapshot subscribe here to drop it.
+SETTINGS_UPDATED_CHANNEL = "settings:updated"
+
+
+def stream_id_key(event_id: str) -> tuple[int, int]:
+    """Sortable key of a Redis Stream id ("<ms>-<seq>"); raises ValueError for anything else."""
+    ms, _, seq = str(event_id).partition("-")
+    return int(ms), int(seq or 0)
+
 
 class EventBus:
-    def __init__(self):
-        self.redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    def __init__(self, client=None, backend: str | None = None):
+        self.redis = client if client is not None else redis.from_url(settings.REDIS_URL, decode_responses=True)
         self.pubsub = self.redis.pubsub()
         self.channel = "events:v1"
+        self.stream_key = "events:v1:log"
+        self.stream_maxlen = max(100, int(settings.EVENT_STREAM_MAXLEN or 10000))
+        self.backend = str(backend or settings.EVENT_BUS_BACKEND or "pubsub").strip().lower()
+
+    @property
+    def streams_enabled(self) -> bool:
+        return self.backend == "streams"
 
     async def publish(self, type: str, data: dict):
         """
         Publishes a unified event: {type, ts, data}
+
+        With the "streams" backend the event is appended to a capped Redis
+        Stream instead; the stream id is the SSE event id used for replay.
         """
         payload = {"type": type, "ts": int(time.time() * 1000), "data": data}
-        await self.redis.publish(self.channel, orjson.dumps(payload).decode())
+        raw = orjson.dumps(payload).decode()
+        if self.streams_enabled:
+            return await self.redis.xadd(self.stream_key, {"payload": raw}, maxlen=self.stream_maxlen, approximate=True)
+        await self.redis.publish(self.channel, raw)
+
+    async def publish_many(self, events: list[tuple[str, dict]]):
+        """Publish several unified events in one pipelined round trip."""
+        if not events:
+            return []
+        ts = int(time.time() * 1000)
+        pipe = self.redis.pipeline(transaction=False)
+        for type, data in events:
+            raw = orjson.dumps({"type": type, "ts": ts, "data": data}).decode()
+            if self.streams_enabled:
+                pipe.xadd(self.stream_key, {"payload": raw}, maxlen=self.stream_maxlen, approximate=True)
+            else:
+                pipe.publish(self.channel, raw)
+        return await pipe.execute()
+
+    async def read_events(self, last_id: str = "$", *, block_ms: int = 5000, count: int = 500) -> list[tuple[str, str]]:
+        """Blocking read of events appended after `last_id` (streams backend)."""
+        response = await self.redis.xread({self.stream_key: last_id}, block=block_ms, count=count)
+        return [(event_id, fields.get("payload", "")) for _, entries in response or [] for event_id, fields in entries]
+
+    async def latest_event_id(self) -> str | None:
+        newest = await self.redis.xrevrange(self.stream_key, max="+", min="-", count=1)
+        return newest[0][0] if newest else None
+
+    async def replay_events(self, after_id: str, *, limit: int) -> tuple[list[tuple[str, str]], bool]:
+        """
+        Events strictly after `after_id`, oldest first, and whether that is the
+        complete gap: False when the id is unknown/trimmed, newer than anything
+        in the stream (the stream was reset), or more than `limit` events were
+        missed.
+        """
+        try:
+            after_key = stream_id_key(after_id)
+        except ValueError:
+            return [], False
+        newest = await self.latest_event_id()
+        if newest is None or stream_id_key(newest) < after_key:
+            return [], False
+        oldest = await self.redis.xrange(self.stream_key, min="-", max="+", count=1)
+        if oldest and stream_id_key(oldest[0][0]) > after_key:
+            return [], False
+        entries = await self.redis.xrange(self.stream_key, min=f"({after_id}", max="+", count=limit + 1)
+        if len(entries) > limit:
+            return [], False
+        return [(event_id, fields.get("payload", "")) for event_id, fields in entries], True
+
+    async def publish_settings_updated(self, version: int | None = None):
+        """
+        Best-effort invalidation of cached settings snapshots (worker, API).
+        A missed message is covered by the snapshot TTL.
+        """
+        data = {"version": version}
+        try:
+            await self.redis.publish(SETTINGS_UPDATED_CHANNEL, orjson.dumps(data).decode())
+            await self.publish("settings_updated", data)
+        except RedisError as exc:
+            logger.warning("settings_updated publish failed: %s", exc)
 
     async def subscribe(self):
         await self.pubsub.subscribe(self.channel)
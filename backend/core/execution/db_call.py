@@ -0,0 +1,19 @@
+"""
+How execution engines run their synchronous DB sections.
+
+The engines keep ORM work (risk checks, order/trade/position rows, commits) in
+plain methods and await them through a `DbCall`. Called from the API the
+sections run inline as before; the worker passes `db_executor.call` so they
+run on its DB pool instead of the event loop, while broker requests and bus
+publishes stay on the loop.
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+DbCall = Callable[..., Awaitable[Any]]
+
+
+async def call_inline(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    return fn(*args, **kwargs)
@@ -57,6 +57,8 @@ except Exception:  # pragma: no cover
                 min_position_age_for_partial_close = 1
                 strong_signal_score_threshold = 70
             return _Defaults()
+
+        get_settings_snapshot = get_settings
     settings_repo = _SettingsRepo()
 def _safe_train_symbol_profile(db, instrument_id: str) -> None:
     try:
@@ -114,7 +116,7 @@ class PositionMonitor:
         return int(self._dynamic_hold_overrides.get(position.instrument_id) or base)
 
     def _partial_close_controls(self, position: Position) -> tuple[int, int, bool]:
-        settings = settings_repo.get_settings(self.db)
+        settings = settings_repo.get_settings_snapshot(self.db)
         cooldown_sec = int(getattr(settings, 'adaptive_exit_partial_cooldown_sec', 180) or 180)
         max_partials = int(getattr(settings, 'adaptive_exit_max_partial_closes', 2) or 2)
         count = int(getattr(position, 'partial_closes_count', 0) or 0)
@@ -131,7 +133,7 @@ class PositionMonitor:
             close_qty = max(1, int(qty_open) - 1)
         if close_qty <= 0:
             return
-        settings = settings_repo.get_settings(self.db)
+        settings = settings_repo.get_settings_snapshot(self.db)
         fees_bps = float(getattr(settings, 'fees_bps', 3) or 3)
         close_side = 'SELL' if position.side == 'BUY' else 'BUY'
         sign = 1 if position.side == 'BUY' else -1
@@ -255,7 +257,7 @@ class PositionMonitor:
         event_regime = dict(signal_meta.get('event_regime') or {}) if isinstance(signal_meta, dict) else {}
         effective_time_stop = self._effective_time_stop_bars(position, time_stop_bars)
         partial_count, _max_partials, cooldown_active = self._partial_close_controls(position)
-        exit_manager = AdaptiveExitManager(settings_repo.get_settings(self.db))
+        exit_manager = AdaptiveExitManager(settings_repo.get_settings_snapshot(self.db))
         current_unreal = float(position.unrealized_pnl or 0)
         mfe_total = float(getattr(position, 'mfe_total_pnl', 0) or 0)
         mfe_capture_ratio = (current_unreal / mfe_total) if mfe_total > 1e-9 and current_unreal > 0 else None
@@ -331,7 +333,7 @@ class PositionMonitor:
                 logger.error('Live close failed for %s: %s', position.instrument_id, exc)
                 raise
 
-        settings = settings_repo.get_settings(self.db)
+        settings = settings_repo.get_settings_snapshot(self.db)
         fees_bps = float(getattr(settings, 'fees_bps', 3) or 3)
         slippage_bps = float(getattr(settings, 'slippage_bps', 5) or 5)
         close_price = _adverse_close_fill(float(current_price), position.side, slippage_bps)
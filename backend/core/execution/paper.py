@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from core.events.bus import bus
 from core.execution.controls import ExecutionControlBlocked, assert_new_entries_allowed
+from core.execution.db_call import DbCall, call_inline
 from core.execution.fill_quality import build_fill_quality
 from core.execution.idempotent_submit import signal_client_order_id
 from core.execution.order_lifecycle import OrderLifecycleManager, map_broker_execution_status
@@ -201,11 +202,17 @@ class PaperExecutionEngine:
         )
         return {'order_id': order.order_id, 'trade_id': trade.trade_id, 'qty_closed': close_qty, 'qty_remaining': remaining_qty}
 
-    async def execute_approved_signal(self, signal_id: str) -> None:
+    async def execute_approved_signal(self, signal_id: str, *, db_call: DbCall = call_inline) -> None:
+        events = await db_call(self._fill_approved_signal, signal_id)
+        for event_type, payload in events:
+            await bus.publish(event_type, payload)
+
+    def _fill_approved_signal(self, signal_id: str) -> list[tuple[str, dict[str, Any]]]:
+        """Risk checks, fill and commits for an approved signal; returns the events to publish."""
         signal = self.db.query(Signal).filter(Signal.id == signal_id).first()
         if not signal or signal.status != 'approved':
             logger.warning('execute_approved_signal: signal %s not found or not approved', signal_id)
-            return
+            return []
 
         settings = settings_repo.get_settings(self.db)
         trace_id = self._signal_trace_id(signal)
@@ -226,8 +233,7 @@ class PaperExecutionEngine:
                     'execution_target': 'paper',
                 },
             )
-            await bus.publish('signal_updated', {'id': signal_id, 'status': 'pending_review', 'reason': str(exc)})
-            return
+            return [('signal_updated', {'id': signal_id, 'status': 'pending_review', 'reason': str(exc)})]
         risk_ok, risk_reason = self.risk.check_new_signal(signal)
         if not risk_ok:
             candidate, ratio, alloc_meta = self._eligible_partial_close_candidate(signal, settings)
@@ -259,8 +265,7 @@ class PaperExecutionEngine:
                 message=f'Paper execution blocked for {signal.instrument_id}: {risk_reason}',
                 payload={'signal_id': signal.id, 'trace_id': trace_id, 'risk_reason': risk_reason, 'risk_detail': self.risk.last_check_details},
             )
-            await bus.publish('signal_updated', {'id': signal_id, 'status': 'rejected', 'reason': risk_reason})
-            return
+            return [('signal_updated', {'id': signal_id, 'status': 'rejected', 'reason': risk_reason})]
 
         qty = self.risk.normalize_qty(float(signal.size), lot_size=1)
         fees_bps = float(getattr(settings, 'fees_bps', 3) or 3)
@@ -298,7 +303,7 @@ class PaperExecutionEngine:
         order = create_result.order
         if not create_result.created:
             logger.info('Duplicate paper submit suppressed for signal %s client_order_id=%s', signal.id, getattr(order, 'client_order_id', None))
-            return
+            return []
         lifecycle.transition(order, 'submitted', reason='paper_submit', created_at=now_ms + 1)
         lifecycle.transition(order, 'acknowledged', reason='paper_ack', created_at=now_ms + 2)
         lifecycle.transition(order, 'filled', reason='paper_fill', filled_qty=qty, created_at=now_ms + 3)
@@ -477,7 +482,9 @@ class PaperExecutionEngine:
         except Exception as snap_err:
             logger.debug('AccountSnapshot save failed: %s', snap_err)
 
-        await bus.publish('orders_updated', {'order_id': order.order_id})
-        await bus.publish('trade_filled', {'trade_id': trade.trade_id})
-        await bus.publish('positions_updated', {'instrument_id': position.instrument_id})
-        await bus.publish('signal_updated', {'id': signal.id, 'status': 'executed'})
+        return [
+            ('orders_updated', {'order_id': order.order_id}),
+            ('trade_filled', {'trade_id': trade.trade_id}),
+            ('positions_updated', {'instrument_id': position.instrument_id}),
+            ('signal_updated', {'id': signal.id, 'status': 'executed'}),
+        ]
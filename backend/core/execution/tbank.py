@@ -14,6 +14,7 @@ import logging
 import uuid
 import time
 from decimal import Decimal
+from typing import Any
 
 from sqlalchemy.orm import Session
 
@@ -25,6 +26,7 @@ from apps.broker.tbank.adapter import (
 )
 from core.config import settings as config
 from core.events.bus import bus
+from core.execution.db_call import DbCall, call_inline
 from core.risk.manager import RiskManager
 from core.storage.models import AccountSnapshot, Order, Position, Signal, Trade
 from core.storage.decision_log_utils import append_decision_log_best_effort
@@ -42,29 +44,19 @@ class TBankExecutionEngine:
         self.risk = RiskManager(db)
         self.adapter = TBankGrpcAdapter(token=token, account_id=account_id, sandbox=sandbox)
 
-    async def execute_approved_signal(self, signal_id: str) -> None:
-        signal = self.db.query(Signal).filter(Signal.id == signal_id).first()
-        if not signal or signal.status != "approved":
-            logger.warning("live execute_approved_signal: signal %s not found or not approved", signal_id)
+    async def execute_approved_signal(self, signal_id: str, *, db_call: DbCall = call_inline) -> None:
+        signal, risk_reason = await db_call(self._check_approved_signal, signal_id)
+        if signal is None:
             return
-
-        risk_ok, risk_reason = self.risk.check_new_signal(signal)
-        if not risk_ok:
-            signal.status = "rejected"
-            self.db.commit()
+        if risk_reason is not None:
             await bus.publish("signal_updated", {"id": signal_id, "status": "rejected", "reason": risk_reason})
             raise TBankApiError(f"Signal blocked by risk manager: {risk_reason}")
 
         details = await self.adapter.ensure_instrument_tradable(signal.instrument_id, signal.side)
-        if signal.side == "SELL" and not details.get("short_enabled"):
-            existing = self.db.query(Position).filter(
-                Position.instrument_id == signal.instrument_id,
-                Position.qty > 0,
-            ).first()
-            if not existing:
-                raise TBankApiError(
-                    f"Instrument {signal.instrument_id} does not allow short selling and there is no open long position to close"
-                )
+        if signal.side == "SELL" and not details.get("short_enabled") and not await db_call(self._has_open_position, signal.instrument_id):
+            raise TBankApiError(
+                f"Instrument {signal.instrument_id} does not allow short selling and there is no open long position to close"
+            )
 
         lots = self.adapter.normalize_signal_qty_to_lots(Decimal(str(signal.size)), details.get("lot", 1))
         client_order_id = str(uuid.uuid4())
@@ -83,8 +75,28 @@ class TBankExecutionEngine:
             account_id=self.account_id,
         )
 
-        await self._persist_executed_signal(signal=signal, details=details, requested_lots=lots, state=order_state)
-        await self._sync_account_snapshot()
+        await self._persist_executed_signal(signal=signal, details=details, requested_lots=lots, state=order_state, db_call=db_call)
+        await self._sync_account_snapshot(db_call=db_call)
+
+    def _check_approved_signal(self, signal_id: str) -> tuple[Signal | None, str | None]:
+        """The approved signal and its risk block reason; a blocked signal is rejected and committed."""
+        signal = self.db.query(Signal).filter(Signal.id == signal_id).first()
+        if not signal or signal.status != "approved":
+            logger.warning("live execute_approved_signal: signal %s not found or not approved", signal_id)
+            return None, None
+        risk_ok, risk_reason = self.risk.check_new_signal(signal)
+        if not risk_ok:
+            signal.status = "rejected"
+            self.db.commit()
+            return signal, risk_reason
+        return signal, None
+
+    def _has_open_position(self, instrument_id: str) -> bool:
+        return self.db.query(Position).filter(Position.instrument_id == instrument_id, Position.qty > 0).first() is not None
+
+    def _reject_signal(self, signal: Signal) -> None:
+        signal.status = "rejected"
+        self.db.commit()
 
     async def close_position(self, instrument_id: str, close_price: float, reason: str = "EXIT") -> None:
         position = (
@@ -207,19 +219,25 @@ class TBankExecutionEngine:
         details: dict,
         requested_lots: int,
         state: dict,
+        db_call: DbCall = call_inline,
     ) -> None:
         status = state.get("executionReportStatus")
         message = state.get("message") or ""
         if status == "EXECUTION_REPORT_STATUS_REJECTED":
-            signal.status = "rejected"
-            self.db.commit()
-            await bus.publish("signal_updated", {"id": signal.id, "status": "rejected", "reason": message})
+            signal_id = signal.id
+            await db_call(self._reject_signal, signal)
+            await bus.publish("signal_updated", {"id": signal_id, "status": "rejected", "reason": message})
             raise TBankOrderRejected(message or f"Order {state.get('orderId')} rejected")
         if status != "EXECUTION_REPORT_STATUS_FILL":
             raise TBankApiError(
                 f"Broker order {state.get('orderId')} completed with unexpected status {status}"
             )
+        events = await db_call(self._record_fill, signal=signal, details=details, requested_lots=requested_lots, state=state)
+        for event_type, payload in events:
+            await bus.publish(event_type, payload)
 
+    def _record_fill(self, *, signal: Signal, details: dict, requested_lots: int, state: dict) -> list[tuple[str, dict[str, Any]]]:
+        """Order, trades and position for a filled broker order; returns the events to publish."""
         lots_executed = int(state.get("lotsExecuted") or requested_lots)
         qty_units = Decimal(lots_executed * int(details.get("lot", 1)))
         executed_price = money_to_decimal(state.get("executedOrderPrice"))
@@ -376,12 +394,14 @@ class TBankExecutionEngine:
             },
         )
 
-        await bus.publish("orders_updated", {"order_id": order_id})
-        await bus.publish("positions_updated", {"instrument_id": signal.instrument_id})
-        await bus.publish("signal_updated", {"id": signal.id, "status": "executed"})
-        await bus.publish("trade_filled", {"order_id": order_id, "qty": float(qty_units), "price": float(executed_price)})
+        return [
+            ("orders_updated", {"order_id": order_id}),
+            ("positions_updated", {"instrument_id": signal.instrument_id}),
+            ("signal_updated", {"id": signal.id, "status": "executed"}),
+            ("trade_filled", {"order_id": order_id, "qty": float(qty_units), "price": float(executed_price)}),
+        ]
 
-    async def _sync_account_snapshot(self) -> None:
+    async def _sync_account_snapshot(self, *, db_call: DbCall = call_inline) -> None:
         portfolio = await self.adapter.get_portfolio(self.account_id)
         total_portfolio = money_to_decimal(portfolio.get("totalAmountPortfolio"))
         total_cash = money_to_decimal(portfolio.get("totalAmountCurrencies"))
@@ -401,5 +421,8 @@ class TBankExecutionEngine:
             open_positions=open_positions,
             day_pnl=open_pnl,
         )
+        await db_call(self._save_snapshot, snapshot)
+
+    def _save_snapshot(self, snapshot: AccountSnapshot) -> None:
         self.db.add(snapshot)
         self.db.commit()
\ No newline at end of file
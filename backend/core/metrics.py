@@ -10,7 +10,18 @@ Custom metrics:
   open_positions_gauge   — number of open positions
   signal_score_histogram — distribution of decision engine scores
   request_latency        — HTTP request duration (from prometheus-fastapi-instrumentator)
+
+Latency telemetry (worker; the API shares the loop-lag and DB metrics):
+  pipeline_stage_seconds — SignalProcessor.process stage timings by stage and instrument tier
+  poll_request_seconds   — market polling requests by tier and outcome
+  analysis_cycle_seconds — one analysis loop pass over the watchlist
+  event_loop_lag_seconds — latest asyncio wake-up delay
+  db_query_seconds       — SQLAlchemy cursor executions by statement kind
+
+The worker serves its registry on WORKER_METRICS_PORT (start_metrics_server).
 """
+import asyncio
+import time
 
 try:
     from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, REGISTRY
@@ -19,6 +30,10 @@ except ImportError:
     _HAS_PROMETHEUS = False
 
 
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_DB_OPERATIONS = {"select", "insert", "update", "delete"}
+
+
 def _make_metrics():
     if not _HAS_PROMETHEUS:
         return None
@@ -57,6 +72,33 @@ def _make_metrics():
             "Total market ticks processed by worker",
             ["instrument"],
         )
+        pipeline_stage_seconds = Histogram(
+            "trading_pipeline_stage_seconds",
+            "SignalProcessor.process stage duration",
+            ["stage", "tier"],
+            buckets=_LATENCY_BUCKETS,
+        )
+        poll_request_seconds = Histogram(
+            "trading_poll_request_seconds",
+            "Market polling request duration",
+            ["tier", "outcome"],
+            buckets=_LATENCY_BUCKETS,
+        )
+        analysis_cycle_seconds = Histogram(
+            "trading_analysis_cycle_seconds",
+            "Duration of one analysis loop pass over the watchlist",
+            buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300),
+        )
+        event_loop_lag_seconds = Gauge(
+            "trading_event_loop_lag_seconds",
+            "Latest asyncio event-loop wake-up delay",
+        )
+        db_query_seconds = Histogram(
+            "trading_db_query_seconds",
+            "SQLAlchemy statement execution time",
+            ["operation"],
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+        )
 
     return _Metrics()
 
@@ -106,6 +148,85 @@ def record_tick(instrument: str) -> None:
         metrics.worker_ticks_total.labels(instrument=instrument).inc()
 
 
+def instrument_tier(instrument: str, high_priority) -> str:
+    """Polling tier label: "core" for the high-priority set, else "tail"."""
+    return "core" if instrument in high_priority else "tail"
+
+
+def record_stage_timings(telemetry: dict, tier: str, prefix: str = "") -> None:
+    """
+    Observe every `<stage>_ms` value of a SignalProcessor telemetry dict;
+    nested dicts become dotted stage names (e.g. "decision_flow.ai").
+    """
+    if not metrics or not isinstance(telemetry, dict):
+        return
+    for key, value in telemetry.items():
+        if isinstance(value, dict):
+            record_stage_timings(value, tier, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and str(key).endswith("_ms"):
+            metrics.pipeline_stage_seconds.labels(stage=f"{prefix}{key[:-3]}", tier=tier).observe(max(0.0, float(value)) / 1000.0)
+
+
+def record_poll_request(tier: str, seconds: float, ok: bool) -> None:
+    if metrics:
+        metrics.poll_request_seconds.labels(tier=tier, outcome="ok" if ok else "error").observe(seconds)
+
+
+def record_analysis_cycle(seconds: float) -> None:
+    if metrics:
+        metrics.analysis_cycle_seconds.observe(seconds)
+
+
+def set_event_loop_lag(seconds: float) -> None:
+    if metrics:
+        metrics.event_loop_lag_seconds.set(seconds)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Sample the running loop's wake-up delay forever (cancel to stop)."""
+    while True:
+        started = time.monotonic()
+        await asyncio.sleep(interval)
+        set_event_loop_lag(max(0.0, time.monotonic() - started - interval))
+
+
+def instrument_db_engine(engine) -> None:
+    """Observe cursor execution time of every statement on `engine`."""
+    if not metrics or getattr(engine, "_query_metrics_attached", False):
+        return
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        operation = str(statement).lstrip().split(None, 1)[0].lower() if statement else ""
+        metrics.db_query_seconds.labels(operation=operation if operation in _DB_OPERATIONS else "other").observe(time.perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    engine._query_metrics_attached = True
+
+
+def start_metrics_server(port: int) -> bool:
+    """Serve the default registry on `port` (worker process; the API mounts /metrics)."""
+    if not _HAS_PROMETHEUS or int(port or 0) <= 0:
+        return False
+    from prometheus_client import start_http_server
+
+    start_http_server(int(port))
+    return True
+
+
 def setup_metrics_endpoint(app) -> None:
     """
     Add /metrics endpoint to FastAPI app.
@@ -2,7 +2,7 @@
 
 from .dataset import TrainingDataset, TrainingRow, build_live_feature_dict, build_training_datasets, build_training_rows_from_entities
 from .runtime import build_ml_runtime_status, evaluate_ml_overlay, list_training_runs, maybe_run_scheduled_training, train_ml_models
-from .trainer import InsufficientTrainingDataError, TrainedModelArtifact, predict_probability, train_classifier
+from .trainer import InsufficientTrainingDataError, TrainedModelArtifact, predict_probabilities, predict_probability, train_classifier
 
 __all__ = [
     'TrainingDataset',
@@ -18,5 +18,6 @@ __all__ = [
     'InsufficientTrainingDataError',
     'TrainedModelArtifact',
     'predict_probability',
+    'predict_probabilities',
     'train_classifier',
 ]
@@ -9,6 +9,10 @@ try:
 except Exception:  # pragma: no cover
     Session = Any  # type: ignore
 
+from core.ml.dataset import build_live_feature_dict
+from core.ml.registry import load_artifact, model_cache
+from core.ml.runtime import get_latest_training_run
+from core.ml.trainer import predict_probabilities
 from core.storage.models import DecisionLog, Signal
 
 
@@ -142,14 +146,36 @@ def _closed_pnl_and_reason(logs: list[Any]) -> tuple[float | None, str | None]:
     return realized, str(payload.get('reason') or '') or None
 
 
+def _active_model_probabilities(signals: list[Any], artifact: Any) -> list[float]:
+    """Score every signal with the active model in one batched call."""
+    features = [
+        build_live_feature_dict(
+            instrument_id=str(getattr(signal, 'instrument_id', '') or ''),
+            side=str(getattr(signal, 'side', '') or ''),
+            entry=_safe_float(getattr(signal, 'entry', None)),
+            sl=_safe_float(getattr(signal, 'sl', None)),
+            tp=_safe_float(getattr(signal, 'tp', None)),
+            size=_safe_float(getattr(signal, 'size', None)),
+            ts_ms=int(getattr(signal, 'created_ts', 0) or 0),
+            meta=_signal_meta(signal),
+            final_decision=str(_signal_meta(signal).get('final_decision') or '') or None,
+        )
+        for signal in signals
+    ]
+    return predict_probabilities(artifact, features)
+
+
 def build_ml_attribution_report_from_entities(
     signals: Iterable[Any],
     decision_logs: Iterable[Any],
     *,
     limit: int = 50,
+    active_artifact: Any = None,
 ) -> dict[str, Any]:
-    signal_list = list(signals)
+    signal_list = [signal for signal in signals if str(getattr(signal, 'id', '') or '')]
     log_index, unmapped_guardrail_logs = _index_logs(decision_logs)
+    active_probabilities = _active_model_probabilities(signal_list, active_artifact) if active_artifact is not None else None
+    stage_probabilities: dict[str, list[float]] = defaultdict(list)
 
     summary = Counter()
     ml_reason_breakdown = Counter()
@@ -157,10 +183,8 @@ def build_ml_attribution_report_from_entities(
     close_reason_breakdown = Counter()
     recent_rows: list[dict[str, Any]] = []
 
-    for signal in signal_list:
+    for idx, signal in enumerate(signal_list):
         signal_id = str(getattr(signal, 'id', '') or '')
-        if not signal_id:
-            continue
         meta = _signal_meta(signal)
         decision = _extract_decision(meta)
         trace_id = str(meta.get('trace_id') or '') or None
@@ -230,7 +254,10 @@ def build_ml_attribution_report_from_entities(
             'guardrail_reason': guardrail_reason,
             'close_reason': close_reason,
             'realized_pnl': round(realized_pnl, 6) if realized_pnl is not None else None,
+            'active_model_probability': round(active_probabilities[idx], 6) if active_probabilities is not None else None,
         })
+        if active_probabilities is not None:
+            stage_probabilities[stage].append(active_probabilities[idx])
 
     recent_rows.sort(key=lambda row: int(row.get('created_ts') or 0), reverse=True)
     limit = max(1, int(limit or 50))
@@ -254,6 +281,10 @@ def build_ml_attribution_report_from_entities(
             'close_reason': dict(close_reason_breakdown),
         },
         'recent_rows': recent_rows[:limit],
+        'active_model': {
+            'scored': len(active_probabilities),
+            'avg_probability_by_stage': {stage: round(sum(values) / len(values), 6) for stage, values in stage_probabilities.items()},
+        } if active_probabilities is not None else None,
     }
 
 
@@ -272,7 +303,11 @@ def build_ml_attribution_report(db: Session, *, days: int = 30, limit: int = 50)
         .order_by(DecisionLog.ts.asc())
         .all()
     )
-    payload = build_ml_attribution_report_from_entities(signals, decision_logs, limit=limit)
+    active_run = get_latest_training_run(db, target='trade_outcome', active_only=True)
+    active_artifact = model_cache.get(active_run, loader=load_artifact)
+    payload = build_ml_attribution_report_from_entities(signals, decision_logs, limit=limit, active_artifact=active_artifact)
+    if payload['active_model'] is not None:
+        payload['active_model']['run_id'] = str(active_run.id)
     payload['period_days'] = days
     payload['signals_scanned'] = len(signals)
     payload['decision_logs_scanned'] = len(decision_logs)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import os
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from joblib import dump, load
 
@@ -33,3 +37,99 @@ def load_artifact(path: str | None) -> Any | None:
     if not file_path.exists() or not file_path.is_file():
         return None
     return load(file_path)
+
+
+@dataclass(frozen=True)
+class ActiveModelRef:
+    id: str
+    target: str
+    artifact_path: str | None
+
+
+class ModelCache:
+    """
+    Process-level cache of unpickled artifacts keyed by training-run id.
+
+    Artifacts are immutable once saved, so a run id is loaded at most once.
+    Active-run lookups are cached for `active_ttl_sec` so runs activated by
+    another process are picked up; `activate()` swaps in-process immediately.
+    """
+
+    def __init__(self, active_ttl_sec: float = 30.0):
+        self.active_ttl_sec = max(0.0, float(active_ttl_sec))
+        self._lock = threading.Lock()
+        self._artifacts: dict[str, tuple[str, Any]] = {}  # run_id -> (target, artifact)
+        self._active: dict[Any, tuple[float, dict[str, ActiveModelRef | None]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_ms_total = 0.0
+        self.last_load_ms: float | None = None
+
+    def active_runs(self, key: Any, fetch: Callable[[], dict[str, Any]]) -> dict[str, ActiveModelRef | None]:
+        now = time.monotonic()
+        if key is not None:
+            with self._lock:
+                cached = self._active.get(key)
+            if cached is not None and now - cached[0] < self.active_ttl_sec:
+                return cached[1]
+        refs = {
+            target: (ActiveModelRef(id=str(run.id), target=target, artifact_path=getattr(run, 'artifact_path', None)) if run is not None else None)
+            for target, run in fetch().items()
+        }
+        if key is not None:
+            with self._lock:
+                self._active[key] = (now, refs)
+        return refs
+
+    def get(self, run: Any, *, loader: Callable[[str | None], Any] = load_artifact) -> Any | None:
+        if run is None:
+            return None
+        run_id = str(getattr(run, 'id', '') or '')
+        with self._lock:
+            entry = self._artifacts.get(run_id) if run_id else None
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        started = time.perf_counter()
+        artifact = loader(getattr(run, 'artifact_path', None))
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        if artifact is None or not run_id:
+            return artifact
+        with self._lock:
+            self.loads += 1
+            self.load_ms_total += elapsed_ms
+            self.last_load_ms = elapsed_ms
+            self._artifacts[run_id] = (str(getattr(run, 'target', '') or ''), artifact)
+        return artifact
+
+    def activate(self, target: str, run_id: str) -> None:
+        """Drop artifacts of `target` other than `run_id` and forget cached active runs."""
+        with self._lock:
+            for cached_id, (cached_target, _) in list(self._artifacts.items()):
+                if cached_target == target and cached_id != run_id:
+                    del self._artifacts[cached_id]
+            self._active.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._artifacts.clear()
+            self._active.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'cached_runs': sorted(self._artifacts),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'loads': self.loads,
+                'avg_load_ms': round(self.load_ms_total / self.loads, 3) if self.loads else None,
+                'last_load_ms': round(self.last_load_ms, 3) if self.last_load_ms is not None else None,
+                'active_ttl_sec': self.active_ttl_sec,
+            }
+
+
+model_cache = ModelCache(active_ttl_sec=float(os.getenv('ML_ACTIVE_RUN_TTL_SEC', '30') or '30'))
@@ -14,7 +14,7 @@ except Exception:  # pragma: no cover
     Session = Any  # type: ignore
 
 from core.ml.dataset import build_live_feature_dict, build_training_datasets
-from core.ml.registry import load_artifact, save_artifact
+from core.ml.registry import load_artifact, model_cache, save_artifact
 from core.ml.trainer import InsufficientTrainingDataError, TrainedModelArtifact, predict_probability, train_classifier
 from core.storage.decision_log_utils import append_decision_log_best_effort
 from core.storage.models import MLTrainingRun, Settings
@@ -154,6 +154,7 @@ def train_ml_models(db: Session, settings: Settings, *, force: bool = False, sou
     min_rows = int(_get_setting(settings, 'ml_min_training_samples', 80) or 80)
     datasets = build_training_datasets(db, lookback_days=lookback_days)
     results: list[dict[str, Any]] = []
+    activated: list[tuple[str, str]] = []
     trained_any = False
 
     for target, dataset in datasets.items():
@@ -188,6 +189,7 @@ def train_ml_models(db: Session, settings: Settings, *, force: bool = False, sou
                 activate=True,
             )
             trained_any = True
+            activated.append((target, row.id))
             append_decision_log_best_effort(
                 log_type='ml_training_run',
                 message=f'ML model trained for {target}',
@@ -226,6 +228,9 @@ def train_ml_models(db: Session, settings: Settings, *, force: bool = False, sou
             results.append({'target': target, 'status': 'insufficient_data', 'reason': str(exc), 'rows_total': len(dataset.rows), 'run_id': row.id})
 
     db.commit()
+    # Swap cached models only once the new runs are committed as active.
+    for target, run_id in activated:
+        model_cache.activate(target, run_id)
     return {
         'started': trained_any,
         'lookback_days': lookback_days,
@@ -268,9 +273,17 @@ def build_ml_runtime_status(db: Session, settings: Settings) -> dict[str, Any]:
             'take_fill': _run_payload(active_fill),
         },
         'recent_runs': [_run_payload(row) for row in runs],
+        'model_cache': model_cache.stats(),
     }
 
 
+def _cache_key(db: Session) -> Any:
+    try:
+        return db.get_bind()
+    except Exception:
+        return None
+
+
 def _run_payload(row: MLTrainingRun | None) -> dict[str, Any] | None:
     if row is None:
         return None
@@ -311,10 +324,14 @@ def evaluate_ml_overlay(
     if not bool(_get_setting(settings, 'ml_enabled', True)):
         return MLPredictionOverlay(enabled=False, model_ready=False, target_probability=None, fill_probability=None, action='unavailable', reason='ml_disabled')
 
-    target_run = get_latest_training_run(db, target='trade_outcome', active_only=True)
-    fill_run = get_latest_training_run(db, target='take_fill', active_only=True)
-    target_artifact = load_artifact(getattr(target_run, 'artifact_path', None)) if target_run else None
-    fill_artifact = load_artifact(getattr(fill_run, 'artifact_path', None)) if fill_run else None
+    active = model_cache.active_runs(_cache_key(db), lambda: {
+        'trade_outcome': get_latest_training_run(db, target='trade_outcome', active_only=True),
+        'take_fill': get_latest_training_run(db, target='take_fill', active_only=True),
+    })
+    target_run = active.get('trade_outcome')
+    fill_run = active.get('take_fill')
+    target_artifact = model_cache.get(target_run, loader=load_artifact)
+    fill_artifact = model_cache.get(fill_run, loader=load_artifact)
     if target_artifact is None and fill_artifact is None:
         return MLPredictionOverlay(enabled=True, model_ready=False, target_probability=None, fill_probability=None, action='unavailable', reason='no_active_model')
 
@@ -137,9 +137,23 @@ def train_classifier(dataset: TrainingDataset, *, min_rows: int = 80, validation
 
 
 
+def _artifact_parts(artifact: TrainedModelArtifact | dict[str, Any]) -> tuple[DictVectorizer, LogisticRegression]:
+    if isinstance(artifact, TrainedModelArtifact):
+        return artifact.vectorizer, artifact.model
+    return artifact['vectorizer'], artifact['model']
+
+
 def predict_probability(artifact: TrainedModelArtifact | dict[str, Any], features: dict[str, Any]) -> float:
-    vectorizer = artifact.vectorizer if isinstance(artifact, TrainedModelArtifact) else artifact['vectorizer']
-    model = artifact.model if isinstance(artifact, TrainedModelArtifact) else artifact['model']
+    vectorizer, model = _artifact_parts(artifact)
     X = vectorizer.transform([dict(features)])
     proba = model.predict_proba(X)[0][1]
     return float(proba)
+
+
+def predict_probabilities(artifact: TrainedModelArtifact | dict[str, Any], features: list[dict[str, Any]]) -> list[float]:
+    """Score many feature dicts with one transform/predict_proba call (backtests, attribution)."""
+    if not features:
+        return []
+    vectorizer, model = _artifact_parts(artifact)
+    X = vectorizer.transform([dict(row) for row in features])
+    return [float(p) for p in model.predict_proba(X)[:, 1]]
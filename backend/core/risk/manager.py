@@ -86,7 +86,7 @@ class RiskManager:
         self._reload_settings()
 
     def _reload_settings(self) -> None:
-        self.settings = settings_repo.get_settings(self.db)
+        self.settings = settings_repo.get_settings_snapshot(self.db)
 
     def _risk_window_start_ms(self) -> int:
         sod = _start_of_day_ms()
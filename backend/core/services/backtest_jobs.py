@@ -0,0 +1,414 @@
+"""
+Asynchronous backtest jobs.
+
+POST /backtest used to run the engine (and walk-forward) inside the request,
+holding an API worker for the whole run. Jobs are now recorded in
+`backtest_jobs` and executed on a process pool owned by the API process:
+
+  * at most BACKTEST_JOB_WORKERS jobs run at once (0 = run in a thread),
+  * at most BACKTEST_JOB_QUEUE_LIMIT jobs wait or run per process,
+  * every state change is published as a `backtest_job` event,
+  * a completed job is reused for an identical request (same instrument,
+    timeframe, strategy, params and candle data), so repeats are instant.
+
+Parameter sweeps (apps.backtest.sweep) are `sweep` jobs; inside the job
+process they fan out further on a TrainingPool (TRAINING_PROCESSES).
+
+A running process-pool job cannot be interrupted: cancelling it marks the row
+`cancelled` and its result is discarded when it finishes.
+
+Results are bounded in time (`prune_backtest_jobs`, run by the worker's
+retention loop): completed jobs keep equity curves and trade lists for
+BACKTEST_JOB_DETAIL_DAYS (default 7) and are only reused as cache hits in that
+window; finished jobs are deleted after BACKTEST_JOB_RETENTION_DAYS (default 30).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable
+
+import orjson
+from sqlalchemy.orm import Session
+
+from core.storage.models import BacktestJob
+from core.utils.ids import new_prefixed_id
+from core.utils.time import now_ms
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("completed", "failed", "cancelled")
+GENERIC_ERROR = "Backtest failed"  # unexpected errors; ValueError messages are kept (invalid input)
+DETAIL_KEYS = ("equity_curve", "trades")
+_DAY_MS = 86_400_000
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+def cache_key(spec: dict[str, Any], candles: list[dict]) -> str:
+    """Hash of (instrument, timeframe, strategy, params, data range + content)."""
+    digest = hashlib.sha256(orjson.dumps(candles)).hexdigest()
+    payload = {
+        "spec": spec,
+        "from_ts": int(candles[0].get("time", 0)) if candles else 0,
+        "to_ts": int(candles[-1].get("time", 0)) if candles else 0,
+        "count": len(candles),
+        "candles": digest,
+    }
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _runtime_settings(spec: dict[str, Any]):
+    if not spec.get("use_decision_engine"):
+        return None
+    from core.storage.repos import settings as settings_repo
+    from core.storage.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return settings_repo.get_settings(db)
+    finally:
+        db.close()
+
+
+def _execute_sweep(spec: dict[str, Any], candles: list[dict]) -> dict[str, Any]:
+    from apps.backtest.sweep import run_sweep
+    from core.services.training_pool import TrainingPool
+
+    pool = TrainingPool()
+    try:
+        return run_sweep(
+            spec["instrument_id"],
+            candles,
+            strategy=spec["strategy"],
+            grid=spec.get("grid"),
+            space=spec.get("space"),
+            samples=spec["samples"],
+            seed=spec["seed"],
+            folds=spec["folds"],
+            top=spec["top"],
+            pool=pool if pool.enabled else None,
+            initial_balance=spec["initial_balance"],
+            risk_pct=spec["risk_pct"],
+            commission_pct=spec["commission_pct"],
+        )
+    finally:
+        pool.shutdown()
+
+
+def execute_backtest(spec: dict[str, Any], candles: list[dict], stage: str) -> dict[str, Any]:
+    """Pool entry point: one stage ("single" | "walk_forward" | "sweep") of a job."""
+    from apps.backtest.engine import BacktestEngine
+    from core.strategy.selector import StrategySelector
+
+    if stage == "sweep":
+        return _execute_sweep(spec, candles)
+
+    selector = StrategySelector()
+    engine = BacktestEngine(
+        strategy=selector.get(spec["strategy"]),
+        settings=_runtime_settings(spec),
+        initial_balance=spec["initial_balance"],
+        risk_pct=spec["risk_pct"],
+        commission_pct=spec["commission_pct"],
+        use_decision_engine=spec["use_decision_engine"],
+        vectorized=spec["vectorized"],
+    )
+    if stage == "walk_forward":
+        strategies = [selector.get(name) for name in (spec.get("strategies") or StrategySelector.available())]
+        return engine.run_walk_forward(spec["instrument_id"], candles, strategies=strategies, folds=spec["folds"])
+    result = asdict(engine.run(spec["instrument_id"], candles))
+    result.pop("settings_used", None)
+    return result
+
+
+def _days_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    return max(0, int(raw)) if raw not in (None, "") else default
+
+
+def detail_cutoff_ms(now: int | None = None) -> int | None:
+    """Completed jobs finished before this no longer carry curves/trades; None = kept forever."""
+    days = _days_env("BACKTEST_JOB_DETAIL_DAYS", 7)
+    return int(now or now_ms()) - days * _DAY_MS if days else None
+
+
+def prune_backtest_jobs(db: Session, *, now: int | None = None, batch_size: int = 200) -> dict[str, int]:
+    """
+    Delete finished jobs past BACKTEST_JOB_RETENTION_DAYS and strip `DETAIL_KEYS`
+    from completed results past BACKTEST_JOB_DETAIL_DAYS (0 disables either step).
+    """
+    now = int(now or now_ms())
+    retention_days = _days_env("BACKTEST_JOB_RETENTION_DAYS", 30)
+    deleted = stripped = 0
+    if retention_days:
+        deleted = (
+            db.query(BacktestJob)
+            .filter(BacktestJob.status.in_(FINAL_STATUSES), BacktestJob.finished_ts < now - retention_days * _DAY_MS)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+    cutoff = detail_cutoff_ms(now)
+    if cutoff is not None:
+        query = db.query(BacktestJob).filter(BacktestJob.status == "completed", BacktestJob.finished_ts < cutoff)
+        if retention_days:
+            query = query.filter(BacktestJob.finished_ts >= now - retention_days * _DAY_MS)
+        for row in query.order_by(BacktestJob.finished_ts).yield_per(batch_size):
+            result = row.result or {}
+            if result.get("detail_pruned") or not any(key in result for key in DETAIL_KEYS):
+                continue
+            row.result = {**{k: v for k, v in result.items() if k not in DETAIL_KEYS}, "detail_pruned": True}
+            stripped += 1
+        db.commit()
+    return {"deleted": int(deleted or 0), "stripped": stripped}
+
+
+def job_payload(row: BacktestJob, *, cached: bool = False) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "status": row.status,
+        "cached": cached,
+        "instrument_id": row.instrument_id,
+        "timeframe": row.timeframe,
+        "strategy": row.strategy,
+        "mode": row.mode,
+        "candles_used": int(row.candles_used or 0),
+        "from_ts": row.from_ts,
+        "to_ts": row.to_ts,
+        "progress": dict(row.progress or {}),
+        "ts": row.ts,
+        "started_ts": row.started_ts,
+        "finished_ts": row.finished_ts,
+        "error": row.error,
+    }
+
+
+class BacktestJobService:
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_limit: int | None = None,
+        *,
+        session_factory: Callable[[], Session] | None = None,
+        publish: Callable[[str, dict], Awaitable[Any]] | None = None,
+    ):
+        if workers is None:
+            workers = int(os.getenv("BACKTEST_JOB_WORKERS") or 2)
+        if queue_limit is None:
+            queue_limit = int(os.getenv("BACKTEST_JOB_QUEUE_LIMIT") or 16)
+        self.workers = max(0, int(workers))
+        self.queue_limit = max(1, int(queue_limit))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._session_factory = session_factory
+        self._publish = publish
+        self._start_method = os.getenv("BACKTEST_JOB_START_METHOD", "spawn") or "spawn"
+        self._pool: ProcessPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    # ── plumbing ──────────────────────────────────────────────────────────────
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from core.storage.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    async def _emit(self, payload: dict[str, Any]) -> None:
+        try:
+            if self._publish is None:
+                from core.events.bus import bus
+                self._publish = bus.publish
+            await self._publish("backtest_job", payload)
+        except Exception as exc:
+            logger.warning("backtest_job event publish failed: %s", exc)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self._start_method),
+            )
+        return self._pool
+
+    async def _execute(self, spec: dict[str, Any], candles: list[dict], stage: str) -> dict[str, Any]:
+        if self.workers <= 0:
+            return await asyncio.to_thread(execute_backtest, spec, candles, stage)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor(), execute_backtest, spec, candles, stage)
+        except BrokenProcessPool as exc:
+            logger.error("Backtest process pool broke (%s); running stage %s in a thread", exc, stage)
+            self._shutdown_pool(wait=False)
+            return await asyncio.to_thread(execute_backtest, spec, candles, stage)
+
+    def _update(self, job_id: str, **values: Any) -> dict[str, Any] | None:
+        """Apply `values` unless the job already reached a final state; returns the payload."""
+        db = self._session()
+        try:
+            row = db.get(BacktestJob, job_id)
+            if row is None:
+                return None
+            if row.status in FINAL_STATUSES:
+                return job_payload(row)
+            for key, value in values.items():
+                setattr(row, key, value)
+            db.commit()
+            return job_payload(row)
+        finally:
+            db.close()
+
+    # ── public API ────────────────────────────────────────────────────────────
+    def active_count(self) -> int:
+        return sum(1 for task in self._tasks.values() if not task.done())
+
+    async def submit(self, db: Session, spec: dict[str, Any], candles: list[dict]) -> dict[str, Any]:
+        key = cache_key(spec, candles)
+        cached_query = db.query(BacktestJob).filter(BacktestJob.cache_key == key, BacktestJob.status == "completed")
+        cutoff = detail_cutoff_ms()
+        if cutoff is not None:
+            cached_query = cached_query.filter(BacktestJob.finished_ts >= cutoff)
+        cached = cached_query.order_by(BacktestJob.finished_ts.desc()).first()
+        if cached is not None:
+            return job_payload(cached, cached=True)
+        running = (
+            db.query(BacktestJob)
+            .filter(BacktestJob.cache_key == key, BacktestJob.status.in_(ACTIVE_STATUSES), BacktestJob.owner == self.owner)
+            .first()
+        )
+        if running is not None and running.id in self._tasks:
+            return job_payload(running)
+        if self.active_count() >= self.queue_limit:
+            raise JobQueueFull(f"Backtest queue is full ({self.queue_limit} jobs)")
+
+        row = BacktestJob(
+            id=new_prefixed_id("bt"),
+            ts=now_ms(),
+            status="queued",
+            cache_key=key,
+            instrument_id=spec["instrument_id"],
+            timeframe=spec["timeframe"],
+            strategy=spec["strategy"],
+            mode=spec["mode"],
+            params=spec,
+            progress={"stage": "queued", "pct": 0},
+            candles_used=len(candles),
+            from_ts=int(candles[0].get("time", 0)) if candles else None,
+            to_ts=int(candles[-1].get("time", 0)) if candles else None,
+            owner=self.owner,
+        )
+        db.add(row)
+        db.commit()
+        payload = job_payload(row)
+        self._tasks[row.id] = asyncio.create_task(self._run(row.id, spec, candles), name=f"backtest-job:{row.id}")
+        await self._emit(payload)
+        return payload
+
+    async def _run(self, job_id: str, spec: dict[str, Any], candles: list[dict]) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, self.workers))
+        stages = {"walk_forward": ["single", "walk_forward"], "sweep": ["sweep"]}.get(spec["mode"], ["single"])
+        try:
+            async with self._semaphore:
+                payload = self._update(job_id, status="running", started_ts=now_ms(), progress={"stage": stages[0], "pct": 5})
+                if payload is None or payload["status"] != "running":
+                    return
+                await self._emit(payload)
+                result: dict[str, Any] = {}
+                for idx, stage in enumerate(stages):
+                    output = await self._execute(spec, candles, stage)
+                    if stage == "walk_forward":
+                        result["walk_forward"] = output
+                    else:
+                        result.update(output)
+                    if idx + 1 < len(stages):
+                        pct = int(100 * (idx + 1) / len(stages))
+                        payload = self._update(job_id, progress={"stage": stages[idx + 1], "pct": pct})
+                        if payload is None or payload["status"] != "running":
+                            return
+                        await self._emit(payload)
+                payload = self._update(job_id, status="completed", finished_ts=now_ms(), result=result, progress={"stage": "done", "pct": 100})
+        except asyncio.CancelledError:
+            payload = self._update(job_id, status="cancelled", finished_ts=now_ms())
+            if payload is not None:
+                await self._emit(payload)
+            raise
+        except ValueError as exc:
+            payload = self._update(job_id, status="failed", finished_ts=now_ms(), error=str(exc))
+        except Exception as exc:
+            logger.exception("Backtest job %s failed: %s", job_id, exc)
+            payload = self._update(job_id, status="failed", finished_ts=now_ms(), error=GENERIC_ERROR)
+        finally:
+            self._tasks.pop(job_id, None)
+        if payload is not None:
+            await self._emit(payload)
+
+    async def wait(self, job_id: str) -> None:
+        """Wait until a job run by this process finishes; a client disconnect does not cancel it."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.wait({task})
+
+    def get(self, db: Session, job_id: str) -> BacktestJob | None:
+        row = db.get(BacktestJob, job_id)
+        if row is not None and row.status in ACTIVE_STATUSES and self._is_orphaned(row):
+            row.status = "failed"
+            row.error = "API process running the job exited"
+            row.finished_ts = now_ms()
+            db.commit()
+        return row
+
+    def _is_orphaned(self, row: BacktestJob) -> bool:
+        if row.owner == self.owner:
+            return row.id not in self._tasks
+        host, _, pid = str(row.owner or "").rpartition(":")
+        if host != socket.gethostname() or not pid.isdigit():
+            return False  # another host; it reports its own jobs
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            return False
+        return False
+
+    async def cancel(self, db: Session, job_id: str) -> BacktestJob | None:
+        row = self.get(db, job_id)
+        if row is None or row.status in FINAL_STATUSES:
+            return row
+        row.status = "cancelled"
+        row.finished_ts = now_ms()
+        db.commit()
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+        else:
+            await self._emit(job_payload(row))
+        return row
+
+    def _shutdown_pool(self, wait: bool = True) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    async def shutdown(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._shutdown_pool(wait=False)
+
+    def stats(self) -> dict[str, Any]:
+        return {"workers": self.workers, "queue_limit": self.queue_limit, "active": self.active_count(), "pool_running": self._pool is not None}
+
+
+backtest_jobs = BacktestJobService()
@@ -86,7 +86,11 @@ class CapitalAllocator:
         cutoff = int(time.time() * 1000) - max(1, int(lookback_sec)) * 1000
         rows = (
             self.db.query(DecisionLog)
-            .filter(DecisionLog.ts >= cutoff)
+            .filter(
+                DecisionLog.ts >= cutoff,
+                DecisionLog.type.in_(('trade_filled', 'position_closed')),
+                DecisionLog.instrument_id == instrument_id,
+            )
             .all()
         )
         bias = 0.0
@@ -0,0 +1,289 @@
+"""
+DecisionLog retention and partition upkeep.
+
+`decision_log` receives every pipeline, risk and execution event, so it grows
+without bound under 24/7 operation. The retention job keeps the hot table at
+a fixed time window:
+
+  * rows older than DECISION_LOG_RETENTION_DAYS (default 180, covering the
+    ML and performance-layer lookbacks) are moved, oldest first, into
+    `decision_log_archive` as gzip-compressed JSONL batches; feedback types
+    read by validation and learning over long windows (`LONG_LIVED_TYPES`)
+    are kept for DECISION_LOG_FEEDBACK_RETENTION_DAYS (default 400);
+  * each batch is archived and deleted in one transaction, so a crash never
+    loses or duplicates rows;
+  * `iter_archived_logs` reads archived rows back for investigations.
+
+On Postgres the table can optionally be converted to monthly range
+partitions on `ts` (`partition_decision_log`, run once via
+scripts/partition_decision_log.py). When it is partitioned the job also
+creates upcoming monthly partitions and drops months that retention has
+emptied, which returns their space immediately instead of leaving dead
+tuples for autovacuum.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from sqlalchemy import and_, asc, func, or_, text
+from sqlalchemy.orm import Session
+
+from core.storage.models import DecisionLog, DecisionLogArchive
+from core.utils.ids import new_prefixed_id
+
+logger = logging.getLogger(__name__)
+
+LONG_LIVED_TYPES = ('position_closed', 'trade_filled', 'live_validation_snapshot')
+DEFAULT_RETENTION_DAYS = 180
+DEFAULT_FEEDBACK_RETENTION_DAYS = 400
+_DAY_MS = 86_400_000
+_PARTITION_PREFIX = 'decision_log_p'
+_DEFAULT_PARTITION = 'decision_log_default'
+
+
+def _days_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    return max(0, int(raw)) if raw not in (None, '') else default
+
+
+def retention_cutoffs(now_ms: int | None = None) -> tuple[int | None, int | None]:
+    """(general cutoff, long-lived cutoff) in ms; None where retention is disabled (0 days)."""
+    now_ms = int(now_ms or time.time() * 1000)
+    general = _days_env('DECISION_LOG_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    feedback = _days_env('DECISION_LOG_FEEDBACK_RETENTION_DAYS', DEFAULT_FEEDBACK_RETENTION_DAYS)
+    return (now_ms - general * _DAY_MS if general else None, now_ms - feedback * _DAY_MS if feedback else None)
+
+
+def _expired_filter(general_cutoff: int | None, long_cutoff: int | None):
+    clauses = []
+    if general_cutoff is not None:
+        clauses.append(and_(DecisionLog.ts < general_cutoff, DecisionLog.type.notin_(LONG_LIVED_TYPES)))
+    if long_cutoff is not None:
+        clauses.append(and_(DecisionLog.ts < long_cutoff, DecisionLog.type.in_(LONG_LIVED_TYPES)))
+    return or_(*clauses) if clauses else None
+
+
+def _serialize(row: DecisionLog) -> dict[str, Any]:
+    return {'id': row.id, 'ts': int(row.ts), 'type': row.type, 'message': row.message, 'payload': row.payload or {}, 'instrument_id': row.instrument_id}
+
+
+def archive_batch(db: Session, rows: list[DecisionLog]) -> DecisionLogArchive:
+    """Stage one archive chunk for `rows` and their deletion (caller commits)."""
+    body = ''.join(json.dumps(_serialize(row), ensure_ascii=False, default=str) + '\n' for row in rows)
+    type_counts: dict[str, int] = {}
+    for row in rows:
+        type_counts[row.type] = type_counts.get(row.type, 0) + 1
+    chunk = DecisionLogArchive(
+        id=new_prefixed_id('dla'),
+        ts=int(time.time() * 1000),
+        from_ts=min(int(row.ts) for row in rows),
+        to_ts=max(int(row.ts) for row in rows),
+        row_count=len(rows),
+        type_counts=type_counts,
+        codec='jsonl.gz',
+        data=gzip.compress(body.encode('utf-8'), compresslevel=6),
+    )
+    db.add(chunk)
+    db.query(DecisionLog).filter(DecisionLog.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+    return chunk
+
+
+def run_decision_log_retention(
+    db: Session,
+    *,
+    now_ms: int | None = None,
+    batch_size: int = 5000,
+    max_batches: int = 20,
+) -> dict[str, Any]:
+    """
+    Archive expired rows in batches of `batch_size` (at most `max_batches` per
+    run, so one pass stays short), then maintain partitions when present.
+    """
+    general_cutoff, long_cutoff = retention_cutoffs(now_ms)
+    expired = _expired_filter(general_cutoff, long_cutoff)
+    archived = batches = 0
+    while expired is not None and batches < max_batches:
+        rows = db.query(DecisionLog).filter(expired).order_by(asc(DecisionLog.ts)).limit(batch_size).all()
+        if not rows:
+            break
+        archive_batch(db, rows)
+        db.commit()
+        db.expunge_all()
+        archived += len(rows)
+        batches += 1
+    result: dict[str, Any] = {'archived': archived, 'batches': batches, 'general_cutoff': general_cutoff, 'feedback_cutoff': long_cutoff}
+    if is_partitioned(db):
+        result['partitions_created'] = ensure_monthly_partitions(db, now_ms=now_ms)
+        cutoffs = [c for c in (general_cutoff, long_cutoff) if c is not None]
+        if cutoffs:
+            result['partitions_dropped'] = drop_empty_partitions(db, before_ts=min(cutoffs))
+    return result
+
+
+def iter_archived_logs(db: Session, *, from_ts: int | None = None, to_ts: int | None = None, log_type: str | None = None) -> Iterator[dict[str, Any]]:
+    """Archived rows (oldest chunk first) overlapping [from_ts, to_ts]."""
+    query = db.query(DecisionLogArchive)
+    if from_ts is not None:
+        query = query.filter(DecisionLogArchive.to_ts >= from_ts)
+    if to_ts is not None:
+        query = query.filter(DecisionLogArchive.from_ts <= to_ts)
+    for chunk in query.order_by(asc(DecisionLogArchive.from_ts)).yield_per(4):
+        for line in gzip.decompress(chunk.data).decode('utf-8').splitlines():
+            row = json.loads(line)
+            if from_ts is not None and row['ts'] < from_ts:
+                continue
+            if to_ts is not None and row['ts'] > to_ts:
+                continue
+            if log_type and row['type'] != log_type:
+                continue
+            yield row
+
+
+def archive_stats(db: Session) -> dict[str, Any]:
+    count, rows, oldest, newest = db.query(
+        func.count(DecisionLogArchive.id),
+        func.coalesce(func.sum(DecisionLogArchive.row_count), 0),
+        func.min(DecisionLogArchive.from_ts),
+        func.max(DecisionLogArchive.to_ts),
+    ).one()
+    return {'chunks': int(count or 0), 'rows': int(rows or 0), 'oldest_ts': oldest, 'newest_ts': newest}
+
+
+# ── Postgres monthly partitioning ────────────────────────────────────────────
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == 'postgresql'
+
+
+def is_partitioned(db: Session) -> bool:
+    if not _is_postgres(db):
+        return False
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'decision_log' AND c.relnamespace = to_regnamespace(current_schema())::oid"
+    )).scalar())
+
+
+def _month_start(year: int, month: int) -> datetime:
+    return datetime(year + (month - 1) // 12, (month - 1) % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def month_bounds(ts_ms: int, offset: int = 0) -> tuple[str, int, int]:
+    """(partition name, from_ms, to_ms) of the UTC month containing `ts_ms`, shifted by `offset` months."""
+    moment = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
+    start = _month_start(moment.year, moment.month + offset)
+    end = _month_start(start.year, start.month + 1)
+    return f'{_PARTITION_PREFIX}{start:%Y%m}', int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+
+
+def _create_partition(db: Session, name: str, from_ms: int, to_ms: int, *, has_default: bool = False) -> None:
+    """
+    Create and attach one monthly partition. With a DEFAULT partition present,
+    `PARTITION OF ... FOR VALUES` fails as soon as the default holds a row in
+    that range (clock skew, retention not run before the month started), so the
+    month is built standalone, takes over those rows and is attached afterwards,
+    all in the caller's transaction.
+    """
+    if not has_default:
+        db.execute(text(f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF decision_log FOR VALUES FROM ({from_ms}) TO ({to_ms})'))
+        return
+    db.execute(text(f'CREATE TABLE {name} (LIKE decision_log INCLUDING DEFAULTS)'))
+    db.execute(
+        text(
+            f'WITH moved AS (DELETE FROM {_DEFAULT_PARTITION} WHERE ts >= :from_ms AND ts < :to_ms RETURNING *) '
+            f'INSERT INTO {name} SELECT * FROM moved'
+        ),
+        {'from_ms': from_ms, 'to_ms': to_ms},
+    )
+    db.execute(text(f'ALTER TABLE decision_log ATTACH PARTITION {name} FOR VALUES FROM ({from_ms}) TO ({to_ms})'))
+
+
+def _partition_names(db: Session) -> list[str]:
+    return [row[0] for row in db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = 'decision_log'"
+    ))]
+
+
+def ensure_monthly_partitions(db: Session, *, now_ms: int | None = None, months_ahead: int = 2) -> list[str]:
+    """Create this month's and the next `months_ahead` partitions if missing."""
+    now_ms = int(now_ms or time.time() * 1000)
+    existing = set(_partition_names(db))
+    created = []
+    for offset in range(months_ahead + 1):
+        name, from_ms, to_ms = month_bounds(now_ms, offset)
+        if name not in existing:
+            _create_partition(db, name, from_ms, to_ms, has_default=_DEFAULT_PARTITION in existing)
+            created.append(name)
+    db.commit()
+    return created
+
+
+def drop_empty_partitions(db: Session, *, before_ts: int) -> list[str]:
+    """Drop monthly partitions that end before `before_ts` and hold no rows."""
+    dropped = []
+    for name in sorted(_partition_names(db)):
+        if not name.startswith(_PARTITION_PREFIX):
+            continue
+        stamp = name[len(_PARTITION_PREFIX):]
+        if not stamp.isdigit():
+            continue
+        end = _month_start(int(stamp[:4]), int(stamp[4:]) + 1)
+        if int(end.timestamp() * 1000) > before_ts:
+            continue
+        if db.execute(text(f'SELECT EXISTS (SELECT 1 FROM {name})')).scalar():
+            continue
+        db.execute(text(f'DROP TABLE {name}'))
+        dropped.append(name)
+    db.commit()
+    return dropped
+
+
+def partition_decision_log(db: Session, *, months_ahead: int = 2) -> dict[str, Any]:
+    """
+    One-off conversion of `decision_log` into a table range-partitioned by
+    month on `ts` (PRIMARY KEY (id, ts)), copying all rows, in a single
+    transaction. Writers should be stopped while it runs.
+    """
+    if not _is_postgres(db):
+        raise RuntimeError('decision_log partitioning requires PostgreSQL')
+    if is_partitioned(db):
+        return {'converted': False, 'reason': 'already partitioned'}
+    oldest = db.execute(text('SELECT min(ts) FROM decision_log')).scalar()
+    now_ms = int(time.time() * 1000)
+    statements = [
+        'ALTER TABLE decision_log RENAME TO decision_log_unpartitioned',
+        'ALTER TABLE decision_log_unpartitioned DROP CONSTRAINT IF EXISTS decision_log_pkey',
+        'DROP INDEX IF EXISTS idx_decision_log_ts',
+        'DROP INDEX IF EXISTS idx_decision_log_type_ts',
+        'DROP INDEX IF EXISTS idx_decision_log_instrument_ts',
+        'CREATE TABLE decision_log (LIKE decision_log_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (ts)',
+        'ALTER TABLE decision_log ADD PRIMARY KEY (id, ts)',
+        'CREATE INDEX idx_decision_log_ts ON decision_log (ts)',
+        'CREATE INDEX idx_decision_log_type_ts ON decision_log (type, ts)',
+        'CREATE INDEX idx_decision_log_instrument_ts ON decision_log (instrument_id, ts)',
+    ]
+    for statement in statements:
+        db.execute(text(statement))
+    created = []
+    ts = int(oldest) if oldest is not None else now_ms
+    _, _, last_to = month_bounds(now_ms, months_ahead)
+    while True:
+        name, from_ms, to_ms = month_bounds(ts)
+        _create_partition(db, name, from_ms, to_ms)
+        created.append(name)
+        if to_ms >= last_to:
+            break
+        ts = to_ms
+    db.execute(text(f'CREATE TABLE IF NOT EXISTS {_DEFAULT_PARTITION} PARTITION OF decision_log DEFAULT'))
+    copied = db.execute(text('INSERT INTO decision_log SELECT * FROM decision_log_unpartitioned')).rowcount
+    db.execute(text('DROP TABLE decision_log_unpartitioned'))
+    db.commit()
+    logger.info('decision_log partitioned: %d partition(s), %s row(s) copied', len(created), copied)
+    return {'converted': True, 'partitions': created, 'rows': copied}
@@ -1,14 +1,21 @@
+"""
+Forensic export: one zip with the raw trading record (signals, orders, fills,
+decision log, profiles, training runs) of the last N days plus the derived
+audits, for offline investigation.
+
+The archive is streamed (`iter_forensic_export`): row tables are read through
+server-side cursors and written incrementally into a streaming zip, so peak
+memory does not grow with the period. `build_forensic_export` still returns
+the whole archive as bytes for scripts.
+"""
 from __future__ import annotations
 
-import csv
-import io
 import json
 import time
-import zipfile
 from datetime import datetime, timedelta, timezone
-from decimal import Decimal
-from typing import Any
+from typing import Any, Iterator
 
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from core.services.business_metrics import build_metrics
@@ -19,73 +26,63 @@ from core.services.performance_layer import build_performance_layer
 from core.services.performance_governor import build_performance_governor
 from core.ml.runtime import build_ml_runtime_status
 from core.services.symbol_adaptive import build_symbol_plan_readonly
-from core.storage.models import CandleCache, DecisionLog, MLTrainingRun, Order, Position, Settings, Signal, SymbolEventRegime, SymbolProfile, SymbolTrainingRun, Trade, Watchlist
+from core.storage.models import DecisionLog, MLTrainingRun, Order, Position, Settings, Signal, SymbolEventRegime, SymbolProfile, SymbolTrainingRun, Trade, Watchlist
 from core.storage.repos.settings import get_settings
-
-
-def _json_safe(value: Any) -> Any:
-    if isinstance(value, dict):
-        return {str(k): _json_safe(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [_json_safe(v) for v in value]
-    if isinstance(value, tuple):
-        return [_json_safe(v) for v in value]
-    if isinstance(value, Decimal):
-        return float(value)
-    if hasattr(value, 'model_dump'):
-        return _json_safe(value.model_dump(mode='json'))
-    return value
-
+from core.storage.repos.candles import load_candle_history
+from core.services.streaming_export import ZipStream, csv_chunks, iter_rows, json_array_chunks, json_safe, jsonl_chunks
+
+
+SIGNAL_FIELDS = ['id', 'instrument_id', 'broker_id', 'ts', 'side', 'entry', 'sl', 'tp', 'size', 'r', 'status', 'reason', 'meta', 'ai_influenced', 'ai_mode_used', 'ai_decision_id', 'created_ts', 'updated_ts']
+TRADE_FIELDS = ['trade_id', 'instrument_id', 'broker_id', 'ts', 'side', 'price', 'qty', 'order_id', 'signal_id', 'strategy', 'trace_id']
+ORDER_FIELDS = ['order_id', 'instrument_id', 'broker_id', 'ts', 'side', 'type', 'price', 'qty', 'filled_qty', 'status', 'related_signal_id', 'strategy', 'trace_id', 'ai_influenced', 'ai_mode_used', 'created_ts', 'updated_ts']
+POSITION_FIELDS = ['instrument_id', 'broker_id', 'side', 'qty', 'opened_qty', 'avg_price', 'sl', 'tp', 'unrealized_pnl', 'realized_pnl', 'opened_signal_id', 'opened_order_id', 'closed_order_id', 'strategy', 'trace_id', 'entry_fee_est', 'exit_fee_est', 'total_fees_est', 'opened_ts', 'updated_ts']
+LOG_FIELDS = ['id', 'ts', 'type', 'message', 'payload']
+PROFILE_FIELDS = ['instrument_id', 'enabled', 'preferred_strategies', 'decision_threshold_offset', 'hold_bars_base', 'hold_bars_min', 'hold_bars_max', 'reentry_cooldown_sec', 'risk_multiplier', 'aggressiveness', 'autotune', 'session_bias', 'regime_bias', 'preferred_side', 'best_hours_json', 'blocked_hours_json', 'news_sensitivity', 'confidence_bias', 'notes', 'source', 'profile_version', 'last_regime', 'last_strategy', 'last_threshold', 'last_hold_bars', 'last_win_rate', 'sample_size', 'last_tuned_ts', 'created_ts', 'updated_ts']
+TRAINING_FIELDS = ['id', 'ts', 'instrument_id', 'mode', 'status', 'source', 'candles_used', 'trades_used', 'recommendations', 'diagnostics', 'notes']
+EVENT_FIELDS = ['id', 'ts', 'instrument_id', 'regime', 'severity', 'direction', 'score_bias', 'hold_bias', 'risk_bias', 'action', 'payload']
+ML_RUN_FIELDS = ['id', 'ts', 'target', 'status', 'source', 'lookback_days', 'train_rows', 'validation_rows', 'artifact_path', 'model_type', 'feature_columns', 'metrics', 'params', 'notes', 'is_active']
+SETTINGS_FIELDS = [
+    
+    'id', 'risk_profile', 'risk_per_trade_pct', 'daily_loss_limit_pct', 'max_concurrent_positions', 'max_trades_per_day',
+    'decision_threshold', 'strategy_name', 'trade_mode', 'bot_enabled', 'ai_mode', 'ai_primary_provider', 'ai_fallback_providers',
+    'pm_risk_throttle_enabled', 'auto_degrade_enabled', 'auto_freeze_enabled', 'auto_policy_lookback_days',
+    'auto_degrade_max_execution_errors', 'auto_freeze_max_execution_errors', 'auto_degrade_min_profit_factor', 'auto_freeze_min_profit_factor',
+    'auto_degrade_min_expectancy', 'auto_freeze_min_expectancy', 'auto_degrade_drawdown_pct', 'auto_freeze_drawdown_pct',
+    'auto_degrade_risk_multiplier', 'auto_degrade_threshold_penalty', 'auto_freeze_new_entries',
+    'performance_governor_enabled', 'performance_governor_lookback_days', 'performance_governor_min_closed_trades',
+    'performance_governor_strict_whitelist', 'performance_governor_auto_suppress', 'performance_governor_max_execution_error_rate',
+    'performance_governor_min_take_fill_rate', 'performance_governor_pass_risk_multiplier', 'performance_governor_fail_risk_multiplier',
+    'performance_governor_threshold_bonus', 'performance_governor_threshold_penalty', 'performance_governor_execution_priority_boost',
+    'performance_governor_execution_priority_penalty', 'performance_governor_allocator_boost', 'performance_governor_allocator_penalty', 'updated_ts',
+]
 
 
 def _row_to_dict(row: Any, fields: list[str]) -> dict[str, Any]:
-    return {field: _json_safe(getattr(row, field, None)) for field in fields}
-
-
-
-def _rows_jsonl(rows: list[dict[str, Any]]) -> str:
-    return ''.join(json.dumps(_json_safe(row), ensure_ascii=False) + '\n' for row in rows)
-
-
+    return {field: json_safe(getattr(row, field, None)) for field in fields}
 
-def _rows_csv(rows: list[dict[str, Any]], fieldnames: list[str]) -> str:
-    buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=fieldnames)
-    writer.writeheader()
-    for row in rows:
-        writer.writerow({key: _json_safe(row.get(key)) for key in fieldnames})
-    return buf.getvalue()
 
+def _json_entry(value: Any) -> list[str]:
+    return [json.dumps(json_safe(value), ensure_ascii=False, indent=2)]
 
 
 def _recent_cutoff(days: int) -> int:
     return int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp() * 1000)
 
 
-
 def _collect_recent_candles(db: Session, instrument_id: str, *, limit: int = 400) -> list[dict[str, Any]]:
-    rows = (
-        db.query(CandleCache)
-        .filter(CandleCache.instrument_id == instrument_id, CandleCache.timeframe == '1m')
-        .order_by(CandleCache.ts.desc())
-        .limit(limit)
-        .all()
-    )
-    result = [
+    return [
         {
-            'time': int(r.ts),
-            'open': float(r.open or 0),
-            'high': float(r.high or 0),
-            'low': float(r.low or 0),
-            'close': float(r.close or 0),
-            'volume': int(r.volume or 0),
-            'instrument_id': r.instrument_id,
-            'broker_id': getattr(r, 'broker_id', None),
+            'time': candle['time'],
+            'open': candle['open'],
+            'high': candle['high'],
+            'low': candle['low'],
+            'close': candle['close'],
+            'volume': candle['volume'],
+            'instrument_id': instrument_id,
+            'broker_id': None,
         }
-        for r in reversed(rows)
+        for candle in load_candle_history(db, instrument_id, '1m', limit=limit)
     ]
-    return result
-
 
 
 def _instrument_candidates(db: Session, cutoff: int) -> list[str]:
@@ -103,102 +100,65 @@ def _instrument_candidates(db: Session, cutoff: int) -> list[str]:
     return ordered[:60]
 
 
+def _queries(db: Session, cutoff: int, instrument_id: str | None) -> dict[str, Any]:
+    """Ordered, filtered queries for every row table of the archive."""
+    signals = db.query(Signal).filter(Signal.created_ts >= cutoff)
+    trades = db.query(Trade).filter(Trade.ts >= cutoff)
+    orders = db.query(Order).filter(Order.created_ts >= cutoff)
+    positions = db.query(Position)
+    logs = db.query(DecisionLog).filter(DecisionLog.ts >= cutoff)
+    profiles = db.query(SymbolProfile)
+    training_runs = db.query(SymbolTrainingRun).filter(SymbolTrainingRun.ts >= cutoff)
+    event_regimes = db.query(SymbolEventRegime).filter(SymbolEventRegime.ts >= cutoff)
+    ml_runs = db.query(MLTrainingRun).filter(MLTrainingRun.ts >= cutoff)
 
-def build_forensic_export(db: Session, *, days: int = 30, instrument_id: str | None = None) -> tuple[bytes, dict[str, Any]]:
-    cutoff = _recent_cutoff(days)
-    settings = get_settings(db)
+    if instrument_id:
+        signals = signals.filter(Signal.instrument_id == instrument_id)
+        trades = trades.filter(Trade.instrument_id == instrument_id)
+        orders = orders.filter(Order.instrument_id == instrument_id)
+        positions = positions.filter(Position.instrument_id == instrument_id)
+        signal_ids = select(Signal.id).where(Signal.created_ts >= cutoff, Signal.instrument_id == instrument_id)
+        logs = logs.filter(or_(
+            DecisionLog.payload['instrument_id'].as_string() == instrument_id,
+            DecisionLog.payload['signal_id'].as_string().in_(signal_ids),
+        ))
+        profiles = profiles.filter(SymbolProfile.instrument_id == instrument_id)
+        training_runs = training_runs.filter(SymbolTrainingRun.instrument_id == instrument_id)
+        event_regimes = event_regimes.filter(SymbolEventRegime.instrument_id == instrument_id)
+
+    return {
+        'signals': signals.order_by(Signal.created_ts.asc()),
+        'trades': trades.order_by(Trade.ts.asc()),
+        'orders': orders.order_by(Order.created_ts.asc()),
+        'positions': positions.order_by(Position.instrument_id.asc()),
+        'decision_logs': logs.order_by(DecisionLog.ts.asc()),
+        'profiles': profiles.order_by(SymbolProfile.instrument_id.asc()),
+        'training_runs': training_runs.order_by(SymbolTrainingRun.ts.asc()),
+        'event_regimes': event_regimes.order_by(SymbolEventRegime.ts.asc()),
+        'ml_training_runs': ml_runs.order_by(MLTrainingRun.ts.asc()),
+    }
 
-    signals = (
-        db.query(Signal)
-        .filter(Signal.created_ts >= cutoff)
-        .order_by(Signal.created_ts.asc())
-        .all()
-    )
-    trades = (
-        db.query(Trade)
-        .filter(Trade.ts >= cutoff)
-        .order_by(Trade.ts.asc())
-        .all()
-    )
-    orders = (
-        db.query(Order)
-        .filter(Order.created_ts >= cutoff)
-        .order_by(Order.created_ts.asc())
-        .all()
-    )
-    positions = db.query(Position).order_by(Position.instrument_id.asc()).all()
-    logs = (
-        db.query(DecisionLog)
-        .filter(DecisionLog.ts >= cutoff)
-        .order_by(DecisionLog.ts.asc())
-        .all()
-    )
-    profiles = db.query(SymbolProfile).order_by(SymbolProfile.instrument_id.asc()).all()
-    training_runs = (
-        db.query(SymbolTrainingRun)
-        .filter(SymbolTrainingRun.ts >= cutoff)
-        .order_by(SymbolTrainingRun.ts.asc())
-        .all()
-    )
-    event_regimes = (
-        db.query(SymbolEventRegime)
-        .filter(SymbolEventRegime.ts >= cutoff)
-        .order_by(SymbolEventRegime.ts.asc())
-        .all()
-    )
-    ml_runs = (
-        db.query(MLTrainingRun)
-        .filter(MLTrainingRun.ts >= cutoff)
-        .order_by(MLTrainingRun.ts.asc())
-        .all()
-    )
 
-    if instrument_id:
-        signals = [row for row in signals if row.instrument_id == instrument_id]
-        trades = [row for row in trades if row.instrument_id == instrument_id]
-        orders = [row for row in orders if row.instrument_id == instrument_id]
-        positions = [row for row in positions if row.instrument_id == instrument_id]
-        logs = [row for row in logs if (row.payload or {}).get('instrument_id') == instrument_id or (row.payload or {}).get('signal_id') in {s.id for s in signals}]
-        profiles = [row for row in profiles if row.instrument_id == instrument_id]
-        training_runs = [row for row in training_runs if row.instrument_id == instrument_id]
-        event_regimes = [row for row in event_regimes if row.instrument_id == instrument_id]
-        ml_runs = list(ml_runs)
-
-    summary = {
+def build_forensic_summary(db: Session, *, days: int = 30, instrument_id: str | None = None) -> dict[str, Any]:
+    """Archive summary; row counts come from COUNT queries, not loaded rows."""
+    queries = _queries(db, _recent_cutoff(days), instrument_id)
+    return {
         'generated_ts': int(time.time() * 1000),
         'period_days': int(days),
         'instrument_id': instrument_id,
-        'counts': {
-            'signals': len(signals),
-            'trades': len(trades),
-            'orders': len(orders),
-            'positions': len(positions),
-            'decision_logs': len(logs),
-            'profiles': len(profiles),
-            'training_runs': len(training_runs),
-            'event_regimes': len(event_regimes),
-            'ml_training_runs': len(ml_runs),
-        },
+        'counts': {name: query.order_by(None).count() for name, query in queries.items()},
     }
 
-    signal_rows = [_row_to_dict(row, ['id', 'instrument_id', 'broker_id', 'ts', 'side', 'entry', 'sl', 'tp', 'size', 'r', 'status', 'reason', 'meta', 'ai_influenced', 'ai_mode_used', 'ai_decision_id', 'created_ts', 'updated_ts']) for row in signals]
-    trade_rows = [_row_to_dict(row, ['trade_id', 'instrument_id', 'broker_id', 'ts', 'side', 'price', 'qty', 'order_id', 'signal_id', 'strategy', 'trace_id']) for row in trades]
-    order_rows = [_row_to_dict(row, ['order_id', 'instrument_id', 'broker_id', 'ts', 'side', 'type', 'price', 'qty', 'filled_qty', 'status', 'related_signal_id', 'strategy', 'trace_id', 'ai_influenced', 'ai_mode_used', 'created_ts', 'updated_ts']) for row in orders]
-    position_rows = [_row_to_dict(row, ['instrument_id', 'broker_id', 'side', 'qty', 'opened_qty', 'avg_price', 'sl', 'tp', 'unrealized_pnl', 'realized_pnl', 'opened_signal_id', 'opened_order_id', 'closed_order_id', 'strategy', 'trace_id', 'entry_fee_est', 'exit_fee_est', 'total_fees_est', 'opened_ts', 'updated_ts']) for row in positions]
-    log_rows = [_row_to_dict(row, ['id', 'ts', 'type', 'message', 'payload']) for row in logs]
-    profile_rows = [_row_to_dict(row, ['instrument_id', 'enabled', 'preferred_strategies', 'decision_threshold_offset', 'hold_bars_base', 'hold_bars_min', 'hold_bars_max', 'reentry_cooldown_sec', 'risk_multiplier', 'aggressiveness', 'autotune', 'session_bias', 'regime_bias', 'preferred_side', 'best_hours_json', 'blocked_hours_json', 'news_sensitivity', 'confidence_bias', 'notes', 'source', 'profile_version', 'last_regime', 'last_strategy', 'last_threshold', 'last_hold_bars', 'last_win_rate', 'sample_size', 'last_tuned_ts', 'created_ts', 'updated_ts']) for row in profiles]
-    training_rows = [_row_to_dict(row, ['id', 'ts', 'instrument_id', 'mode', 'status', 'source', 'candles_used', 'trades_used', 'recommendations', 'diagnostics', 'notes']) for row in training_runs]
-    event_rows = [_row_to_dict(row, ['id', 'ts', 'instrument_id', 'regime', 'severity', 'direction', 'score_bias', 'hold_bias', 'risk_bias', 'action', 'payload']) for row in event_regimes]
-    ml_run_rows = [_row_to_dict(row, ['id', 'ts', 'target', 'status', 'source', 'lookback_days', 'train_rows', 'validation_rows', 'artifact_path', 'model_type', 'feature_columns', 'metrics', 'params', 'notes', 'is_active']) for row in ml_runs]
-
-    metrics = build_metrics(db, days=days)
-    paper_audit = build_paper_audit(db, days=min(max(days, 3), 180))
-    validation = build_live_trader_validation(db, days=min(max(days, 14), 365), weeks=min(max(max(2, days // 7), 2), 26))
-    performance_layer = build_performance_layer(db, days=min(max(days, 14), 180))
-    performance_governor = build_performance_governor(db, settings=settings, days=min(max(days, 14), 180))
-    ml_runtime = build_ml_runtime_status(db, settings)
-
-    effective_plans: list[dict[str, Any]] = []
+
+def _trace_links(query) -> Iterator[dict[str, Any]]:
+    for row in iter_rows(query, ['id', 'instrument_id', 'meta', 'created_ts']):
+        meta = row.get('meta') if isinstance(row.get('meta'), dict) else {}
+        trace_id = meta.get('trace_id')
+        if trace_id:
+            yield {'signal_id': row['id'], 'trace_id': trace_id, 'instrument_id': row['instrument_id'], 'created_ts': row['created_ts']}
+
+
+def _effective_plans(db: Session, settings, cutoff: int, instrument_id: str | None) -> Iterator[dict[str, Any]]:
     for candidate in ([instrument_id] if instrument_id else _instrument_candidates(db, cutoff)):
         if not candidate:
             continue
@@ -207,48 +167,41 @@ def build_forensic_export(db: Session, *, days: int = 30, instrument_id: str | N
             continue
         try:
             plan = build_symbol_plan_readonly(db, candidate, candles, settings)
-            effective_plans.append({'instrument_id': candidate, 'plan': _json_safe(plan.to_meta())})
+            yield {'instrument_id': candidate, 'plan': json_safe(plan.to_meta())}
         except Exception as exc:
-            effective_plans.append({'instrument_id': candidate, 'error': str(exc)})
+            yield {'instrument_id': candidate, 'error': str(exc)}
 
-    trace_links = []
-    for row in signal_rows:
-        meta = dict(row.get('meta') or {}) if isinstance(row.get('meta'), dict) else {}
-        trace_id = meta.get('trace_id')
-        if trace_id:
-            trace_links.append({'signal_id': row['id'], 'trace_id': trace_id, 'instrument_id': row['instrument_id'], 'created_ts': row['created_ts']})
-
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr('summary.json', json.dumps(_json_safe(summary), ensure_ascii=False, indent=2))
-        zf.writestr('settings.json', json.dumps(_json_safe(_row_to_dict(settings, [
-            'id', 'risk_profile', 'risk_per_trade_pct', 'daily_loss_limit_pct', 'max_concurrent_positions', 'max_trades_per_day',
-            'decision_threshold', 'strategy_name', 'trade_mode', 'bot_enabled', 'ai_mode', 'ai_primary_provider', 'ai_fallback_providers',
-            'pm_risk_throttle_enabled', 'auto_degrade_enabled', 'auto_freeze_enabled', 'auto_policy_lookback_days',
-            'auto_degrade_max_execution_errors', 'auto_freeze_max_execution_errors', 'auto_degrade_min_profit_factor', 'auto_freeze_min_profit_factor',
-            'auto_degrade_min_expectancy', 'auto_freeze_min_expectancy', 'auto_degrade_drawdown_pct', 'auto_freeze_drawdown_pct',
-            'auto_degrade_risk_multiplier', 'auto_degrade_threshold_penalty', 'auto_freeze_new_entries',
-            'performance_governor_enabled', 'performance_governor_lookback_days', 'performance_governor_min_closed_trades',
-            'performance_governor_strict_whitelist', 'performance_governor_auto_suppress', 'performance_governor_max_execution_error_rate',
-            'performance_governor_min_take_fill_rate', 'performance_governor_pass_risk_multiplier', 'performance_governor_fail_risk_multiplier',
-            'performance_governor_threshold_bonus', 'performance_governor_threshold_penalty', 'performance_governor_execution_priority_boost',
-            'performance_governor_execution_priority_penalty', 'performance_governor_allocator_boost', 'performance_governor_allocator_penalty', 'updated_ts',
-        ])), ensure_ascii=False, indent=2))
-        zf.writestr('metrics.json', json.dumps(_json_safe(metrics), ensure_ascii=False, indent=2))
-        zf.writestr('paper_audit.json', json.dumps(_json_safe(paper_audit), ensure_ascii=False, indent=2))
-        zf.writestr('validation.json', json.dumps(_json_safe(validation), ensure_ascii=False, indent=2))
-        zf.writestr('performance_layer.json', json.dumps(_json_safe(performance_layer), ensure_ascii=False, indent=2))
-        zf.writestr('performance_governor.json', json.dumps(_json_safe(performance_governor), ensure_ascii=False, indent=2))
-        zf.writestr('ml_runtime.json', json.dumps(_json_safe(ml_runtime), ensure_ascii=False, indent=2))
-        zf.writestr('signals.jsonl', _rows_jsonl(signal_rows))
-        zf.writestr('decision_log.jsonl', _rows_jsonl(log_rows))
-        zf.writestr('traces.jsonl', _rows_jsonl(trace_links))
-        zf.writestr('trades.csv', _rows_csv(trade_rows, ['trade_id', 'instrument_id', 'broker_id', 'ts', 'side', 'price', 'qty', 'order_id', 'signal_id', 'strategy', 'trace_id']))
-        zf.writestr('orders.csv', _rows_csv(order_rows, ['order_id', 'instrument_id', 'broker_id', 'ts', 'side', 'type', 'price', 'qty', 'filled_qty', 'status', 'related_signal_id', 'strategy', 'trace_id', 'ai_influenced', 'ai_mode_used', 'created_ts', 'updated_ts']))
-        zf.writestr('positions.json', json.dumps(_json_safe(position_rows), ensure_ascii=False, indent=2))
-        zf.writestr('profiles.json', json.dumps(_json_safe(profile_rows), ensure_ascii=False, indent=2))
-        zf.writestr('training_runs.json', json.dumps(_json_safe(training_rows), ensure_ascii=False, indent=2))
-        zf.writestr('event_regimes.json', json.dumps(_json_safe(event_rows), ensure_ascii=False, indent=2))
-        zf.writestr('ml_training_runs.json', json.dumps(_json_safe(ml_run_rows), ensure_ascii=False, indent=2))
-        zf.writestr('effective_symbol_plans.json', json.dumps(_json_safe(effective_plans), ensure_ascii=False, indent=2))
-    return buf.getvalue(), summary
+
+def iter_forensic_export(db: Session, *, days: int = 30, instrument_id: str | None = None, summary: dict[str, Any] | None = None) -> Iterator[bytes]:
+    """The forensic zip as a stream of byte chunks (pass `summary` to reuse precomputed counts)."""
+    cutoff = _recent_cutoff(days)
+    settings = get_settings(db)
+    summary = summary or build_forensic_summary(db, days=days, instrument_id=instrument_id)
+    queries = _queries(db, cutoff, instrument_id)
+    zf = ZipStream()
+
+    yield from zf.entry('summary.json', _json_entry(summary))
+    yield from zf.entry('settings.json', _json_entry(_row_to_dict(settings, SETTINGS_FIELDS)))
+    yield from zf.entry('metrics.json', _json_entry(build_metrics(db, days=days)))
+    yield from zf.entry('paper_audit.json', _json_entry(build_paper_audit(db, days=min(max(days, 3), 180))))
+    yield from zf.entry('validation.json', _json_entry(build_live_trader_validation(db, days=min(max(days, 14), 365), weeks=min(max(max(2, days // 7), 2), 26))))
+    yield from zf.entry('performance_layer.json', _json_entry(build_performance_layer(db, days=min(max(days, 14), 180))))
+    yield from zf.entry('performance_governor.json', _json_entry(build_performance_governor(db, settings=settings, days=min(max(days, 14), 180))))
+    yield from zf.entry('ml_runtime.json', _json_entry(build_ml_runtime_status(db, settings)))
+    yield from zf.entry('signals.jsonl', jsonl_chunks(iter_rows(queries['signals'], SIGNAL_FIELDS)))
+    yield from zf.entry('decision_log.jsonl', jsonl_chunks(iter_rows(queries['decision_logs'], LOG_FIELDS)))
+    yield from zf.entry('traces.jsonl', jsonl_chunks(_trace_links(queries['signals'])))
+    yield from zf.entry('trades.csv', csv_chunks(iter_rows(queries['trades'], TRADE_FIELDS), TRADE_FIELDS))
+    yield from zf.entry('orders.csv', csv_chunks(iter_rows(queries['orders'], ORDER_FIELDS), ORDER_FIELDS))
+    yield from zf.entry('positions.json', json_array_chunks(iter_rows(queries['positions'], POSITION_FIELDS)))
+    yield from zf.entry('profiles.json', json_array_chunks(iter_rows(queries['profiles'], PROFILE_FIELDS)))
+    yield from zf.entry('training_runs.json', json_array_chunks(iter_rows(queries['training_runs'], TRAINING_FIELDS)))
+    yield from zf.entry('event_regimes.json', json_array_chunks(iter_rows(queries['event_regimes'], EVENT_FIELDS)))
+    yield from zf.entry('ml_training_runs.json', json_array_chunks(iter_rows(queries['ml_training_runs'], ML_RUN_FIELDS)))
+    yield from zf.entry('effective_symbol_plans.json', json_array_chunks(_effective_plans(db, settings, cutoff, instrument_id)))
+    yield from zf.close()
+
+
+def build_forensic_export(db: Session, *, days: int = 30, instrument_id: str | None = None) -> tuple[bytes, dict[str, Any]]:
+    summary = build_forensic_summary(db, days=days, instrument_id=instrument_id)
+    return b''.join(iter_forensic_export(db, days=days, instrument_id=instrument_id, summary=summary)), summary
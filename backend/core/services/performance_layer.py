@@ -14,9 +14,9 @@ except Exception:  # pragma: no cover
 from apps.backtest.engine import BacktestEngine
 from core.storage.models import DecisionLog, Position, Signal, Watchlist
 try:
-    from core.storage.repos.candles import list_candles as _list_candles
+    from core.storage.repos.candles import load_candle_history as _load_candle_history
 except Exception:  # pragma: no cover
-    _list_candles = None
+    _load_candle_history = None
 try:
     from core.storage.repos.settings import get_settings as _get_settings
 except Exception:  # pragma: no cover
@@ -27,9 +27,9 @@ MSK = ZoneInfo('Europe/Moscow')
 
 
 def list_candles(db: Session, instrument_id: str, timeframe: str, limit: int = 500) -> list[dict[str, Any]]:
-    if _list_candles is None:  # pragma: no cover
+    if _load_candle_history is None:  # pragma: no cover
         raise RuntimeError('candle repo unavailable')
-    return _list_candles(db, instrument_id, timeframe, limit=limit)
+    return _load_candle_history(db, instrument_id, timeframe, limit=limit)
 
 
 def get_settings(db: Session) -> Any:
@@ -300,6 +300,7 @@ def build_performance_layer(
                 risk_pct=risk_pct,
                 commission_pct=commission_pct,
                 use_decision_engine=True,
+                vectorized=True,
             )
             walk = engine.run_walk_forward(instrument_id, candles, strategies=strategy_objs, folds=folds)
             rankings = list(walk.get('strategy_rankings') or [])
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 
 from core.storage.models import DecisionLog, Position, SymbolProfile, SymbolTrainingRun, Watchlist
 from core.storage.repos import settings as settings_repo
-from core.services.symbol_adaptive import train_symbol_profile
+from core.services.symbol_adaptive import train_symbol_profiles_bulk
 from core.storage.decision_log_utils import append_decision_log_best_effort
 
 _MSK = ZoneInfo('Europe/Moscow')
@@ -131,30 +131,32 @@ def run_symbol_recalibration_batch(db: Session, *, force: bool = False, source:
     items: list[dict[str, Any]] = []
     completed = 0
     errors = 0
+    result = train_symbol_profiles_bulk(
+        db,
+        [str(item['instrument_id']) for item in candidates],
+        lookback_days=int(status['lookback_days']),
+        timeframe='1m',
+        source=source,
+    )
+    trained = {str(entry['instrument_id']): entry for entry in result['items']}
     for item in candidates:
         instrument_id = str(item['instrument_id'])
-        try:
-            result = train_symbol_profile(
-                db,
-                instrument_id,
-                lookback_days=int(status['lookback_days']),
-                timeframe='1m',
-                source=source,
-            )
-            items.append({
-                'instrument_id': instrument_id,
-                'training_run_id': result.get('training_run_id'),
-                'priority_score': item.get('priority_score'),
-                'notes': (result.get('profile') or {}).get('notes'),
-            })
-            completed += 1
-        except Exception as exc:
+        entry = trained.get(instrument_id) or {'error': 'not_trained'}
+        if entry.get('error'):
             errors += 1
             items.append({
                 'instrument_id': instrument_id,
                 'priority_score': item.get('priority_score'),
-                'error': str(exc),
+                'error': str(entry['error']),
             })
+            continue
+        items.append({
+            'instrument_id': instrument_id,
+            'training_run_id': entry.get('training_run_id'),
+            'priority_score': item.get('priority_score'),
+            'notes': (entry.get('profile') or {}).get('notes'),
+        })
+        completed += 1
 
     summary = {
         'source': source,
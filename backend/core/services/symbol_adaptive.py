@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import logging
 import math
 import time
 import uuid
@@ -14,11 +15,15 @@ from typing import Any
 
 from sqlalchemy.orm import Session
 
-from core.storage.models import CandleCache, DecisionLog, SymbolEventRegime, SymbolProfile, SymbolRegimeSnapshot, SymbolTrainingRun
+from core.storage.models import DecisionLog, SymbolEventRegime, SymbolProfile, SymbolRegimeSnapshot, SymbolTrainingRun
+from core.storage.repos.candles import load_candle_history
 from core.strategy.selector import StrategySelector
 from core.services.timeframe_engine import max_timeframe, next_higher_timeframe, normalize_timeframe, timeframe_rank
 from core.services.symbol_adaptive_timeframes import choose_strategy as _choose_strategy, low_price_instrument as _low_price_instrument, select_execution_timeframe as _select_execution_timeframe, select_timeframes as _select_timeframes_base
 from core.services.trading_schedule import get_schedule_snapshot
+from core.services.training_pool import TrainingPool, training_pool
+
+logger = logging.getLogger(__name__)
 
 
 def _clamp(value: float, low: float, high: float) -> float:
@@ -595,6 +600,7 @@ def build_symbol_plan(db: Session, instrument_id: str, candles: list[dict[str, A
         strategy_source = 'regime'
 
     analysis_timeframe, execution_timeframe, confirmation_timeframe, timeframe_source, analysis_timeframe_floor = _select_timeframes(strategy_name=strategy_name, regime=regime, settings=settings, candles=candles)
+    policy_effective = ','.join(effective_allowed) if effective_allowed else strategy_name
     notes: list[str] = [
         f'regime={regime}',
         f'strategy={strategy_name}',
@@ -602,7 +608,7 @@ def build_symbol_plan(db: Session, instrument_id: str, candles: list[dict[str, A
         f'analysis_tf={analysis_timeframe}',
         f'analysis_floor={analysis_timeframe_floor}',
         f'execution_tf={execution_timeframe}',
-        f'policy_effective={','.join(effective_allowed) if effective_allowed else strategy_name}',
+        f'policy_effective={policy_effective}',
     ]
     if set(profile_allowed) - set(global_allowed):
         notes.append('profile strategies constrained by global whitelist')
@@ -761,24 +767,9 @@ def build_symbol_plan_persisting(db: Session, instrument_id: str, candles: list[
 
 
 def _candles_for_training(db: Session, instrument_id: str, timeframe: str = '1m', lookback_days: int = 180) -> list[dict[str, Any]]:
-    cutoff_ts = int(time.time() * 1000) - lookback_days * 86_400_000
-    rows = (
-        db.query(CandleCache)
-        .filter(CandleCache.instrument_id == instrument_id, CandleCache.timeframe == timeframe, CandleCache.ts >= cutoff_ts)
-        .order_by(CandleCache.ts.asc())
-        .all()
-    )
-    return [
-        {
-            'time': int(c.ts),
-            'open': float(c.open),
-            'high': float(c.high),
-            'low': float(c.low),
-            'close': float(c.close),
-            'volume': int(c.volume or 0),
-        }
-        for c in rows
-    ]
+    # candle_cache.ts holds bar open time in seconds.
+    start_ts = int(time.time()) - lookback_days * 86_400
+    return load_candle_history(db, instrument_id, timeframe, start_ts=start_ts)
 
 
 def _hourly_returns(candles: list[dict[str, Any]]) -> dict[int, list[float]]:
@@ -836,12 +827,40 @@ def _strategy_validation_score(result: dict[str, Any]) -> float:
     )
 
 
-def _walk_forward_validate(instrument_id: str, candles: list[dict[str, Any]], *, initial_balance: float = 100_000.0, risk_pct: float = 0.5) -> dict[str, Any]:
+def _walk_forward_job(instrument_id: str, strategy_name: str, test_slice: list[dict[str, Any]], initial_balance: float, risk_pct: float) -> dict[str, Any] | None:
+    """One (fold, strategy) backtest; module-level so the training pool can pickle it."""
+    from apps.backtest.engine import BacktestEngine
+
+    engine = BacktestEngine(
+        strategy=StrategySelector().get(strategy_name),
+        settings=None,
+        initial_balance=initial_balance,
+        risk_pct=risk_pct,
+        commission_pct=0.03,
+        use_decision_engine=False,
+        vectorized=True,
+    )
+    try:
+        result = engine.run(instrument_id, test_slice)
+    except Exception:
+        return None
+    light = {
+        'strategy': strategy_name,
+        'total_return_pct': float(result.total_return_pct or 0.0),
+        'win_rate': float(result.win_rate or 0.0),
+        'profit_factor': float(result.profit_factor or 0.0),
+        'max_drawdown_pct': float(result.max_drawdown_pct or 0.0),
+        'total_trades': int(result.total_trades or 0),
+    }
+    light['validation_score'] = round(_strategy_validation_score(light), 4)
+    return light
+
+
+def _walk_forward_plan(instrument_id: str, candles: list[dict[str, Any]], *, initial_balance: float = 100_000.0, risk_pct: float = 0.5) -> dict[str, Any]:
+    """Fold layout plus the (instrument, fold, strategy) jobs to run; `available` is False when history is too short."""
     if len(candles) < 320:
         return {'available': False, 'reason': 'not_enough_candles', 'candles_used': len(candles)}
 
-    from apps.backtest.engine import BacktestEngine
-
     selector = StrategySelector()
     strategies = selector.available()
     fold_count = 4
@@ -850,8 +869,8 @@ def _walk_forward_validate(instrument_id: str, candles: list[dict[str, Any]], *,
     if len(candles) < min_train + test_len:
         return {'available': False, 'reason': 'not_enough_walk_forward_history', 'candles_used': len(candles)}
 
-    folds: list[dict[str, Any]] = []
-    rankings: dict[str, list[float]] = {name: [] for name in strategies}
+    folds: list[tuple[int, list[dict[str, Any]]]] = []
+    jobs: list[tuple[tuple[str, int, str], Any, tuple]] = []
     for fold_idx in range(fold_count):
         train_end = min_train + fold_idx * test_len
         test_start = train_end
@@ -859,32 +878,34 @@ def _walk_forward_validate(instrument_id: str, candles: list[dict[str, Any]], *,
         if test_end - test_start < 60:
             break
         test_slice = candles[test_start:test_end]
-        fold_scores: list[dict[str, Any]] = []
+        folds.append((fold_idx, test_slice))
         for strategy_name in strategies:
-            strategy = selector.get(strategy_name)
-            if len(test_slice) < strategy.lookback + 10:
+            if len(test_slice) < selector.get(strategy_name).lookback + 10:
                 continue
-            engine = BacktestEngine(
-                strategy=strategy,
-                settings=None,
-                initial_balance=initial_balance,
-                risk_pct=risk_pct,
-                commission_pct=0.03,
-                use_decision_engine=False,
-            )
-            try:
-                result = engine.run(instrument_id, test_slice)
-            except Exception:
+            jobs.append(((instrument_id, fold_idx, strategy_name), _walk_forward_job, (instrument_id, strategy_name, test_slice, initial_balance, risk_pct)))
+    return {
+        'available': True,
+        'strategies': strategies,
+        'folds': folds,
+        'jobs': jobs,
+        'candles_used': len(candles),
+        'test_window_bars': test_len,
+    }
+
+
+def _walk_forward_result(instrument_id: str, plan: dict[str, Any], results: dict[tuple[str, int, str], dict[str, Any] | None]) -> dict[str, Any]:
+    """Assemble job results in fold/strategy order, independent of completion order."""
+    if not plan.get('available'):
+        return {key: value for key, value in plan.items() if key in {'available', 'reason', 'candles_used'}}
+
+    folds: list[dict[str, Any]] = []
+    rankings: dict[str, list[float]] = {name: [] for name in plan['strategies']}
+    for fold_idx, test_slice in plan['folds']:
+        fold_scores: list[dict[str, Any]] = []
+        for strategy_name in plan['strategies']:
+            light = results.get((instrument_id, fold_idx, strategy_name))
+            if light is None:
                 continue
-            light = {
-                'strategy': strategy_name,
-                'total_return_pct': float(result.total_return_pct or 0.0),
-                'win_rate': float(result.win_rate or 0.0),
-                'profit_factor': float(result.profit_factor or 0.0),
-                'max_drawdown_pct': float(result.max_drawdown_pct or 0.0),
-                'total_trades': int(result.total_trades or 0),
-            }
-            light['validation_score'] = round(_strategy_validation_score(light), 4)
             rankings[strategy_name].append(light['validation_score'])
             fold_scores.append(light)
         if fold_scores:
@@ -914,33 +935,38 @@ def _walk_forward_validate(instrument_id: str, candles: list[dict[str, Any]], *,
         'folds': folds,
         'strategy_rankings': aggregate,
         'best_strategy': aggregate[0]['strategy'] if aggregate else None,
-        'candles_used': len(candles),
+        'candles_used': plan['candles_used'],
         'fold_count': len(folds),
-        'test_window_bars': test_len,
+        'test_window_bars': plan['test_window_bars'],
     }
 
 
-def train_symbol_profile(
-    db: Session,
-    instrument_id: str,
+def _walk_forward_validate(instrument_id: str, candles: list[dict[str, Any]], *, initial_balance: float = 100_000.0, risk_pct: float = 0.5, pool: TrainingPool | None = None) -> dict[str, Any]:
+    plan = _walk_forward_plan(instrument_id, candles, initial_balance=initial_balance, risk_pct=risk_pct)
+    jobs = plan.get('jobs') or []
+    if pool is None:
+        results = {key: fn(*args) for key, fn, args in jobs}
+    else:
+        results = {key: result for key, result, _error in pool.run(jobs)}
+    return _walk_forward_result(instrument_id, plan, results)
+
+
+def _training_recommendations(
+    current: dict[str, Any],
+    diagnostics: dict[str, Any],
     *,
-    lookback_days: int = 180,
-    timeframe: str = '1m',
-    source: str = 'api',
+    lookback_days: int,
+    timeframe: str,
+    candles_used: int,
 ) -> dict[str, Any]:
-    candles = _candles_for_training(db, instrument_id, timeframe=timeframe, lookback_days=lookback_days)
-    diagnostics = _diagnostics_from_history(db, instrument_id, candles)
-    walk_forward = _walk_forward_validate(instrument_id, candles)
-    diagnostics['walk_forward'] = walk_forward
+    walk_forward = diagnostics.get('walk_forward') or {}
     perf = diagnostics.get('performance') or {}
     regime = str(diagnostics.get('regime') or 'balanced')
     volatility_pct = float(diagnostics.get('volatility_pct') or 0.0)
     best_hours = diagnostics.get('best_hours') or []
     blocked_hours = diagnostics.get('blocked_hours') or []
 
-    row = _ensure_profile_row(db, instrument_id)
     recommended: dict[str, Any] = {}
-    current = _profile_to_dict(row)
 
     # Strategy family by observed regime.
     best_validated_strategy = (walk_forward.get('best_strategy') if isinstance(walk_forward, dict) else None) or None
@@ -991,7 +1017,7 @@ def train_symbol_profile(
             recommended['confidence_bias'] = 0.96
 
     if best_validated_strategy:
-        recommended['notes'] = f"offline trainer + walk-forward ({lookback_days}d/{timeframe}) regime={regime} best={best_validated_strategy} candles={len(candles)}"
+        recommended['notes'] = f"offline trainer + walk-forward ({lookback_days}d/{timeframe}) regime={regime} best={best_validated_strategy} candles={candles_used}"
         top_rank = (walk_forward.get('strategy_rankings') or [{}])[0]
         robust_score = float(top_rank.get('robust_score') or 0.0)
         if robust_score > 16:
@@ -1007,21 +1033,55 @@ def train_symbol_profile(
     recommended['source'] = 'offline_training'
     recommended['profile_version'] = max(int(current.get('profile_version') or 1), 3)
     recommended['sample_size'] = int(perf.get('sample_size') or 0)
-    recommended.setdefault('notes', f"offline trainer ({lookback_days}d/{timeframe}) regime={regime} candles={len(candles)}")
+    recommended.setdefault('notes', f"offline trainer ({lookback_days}d/{timeframe}) regime={regime} candles={candles_used}")
+    return recommended
 
-    profile = upsert_symbol_profile(instrument_id, recommended, db=db)
 
-    run = SymbolTrainingRun(
+def _training_run(instrument_id: str, *, source: str, candles_used: int, diagnostics: dict[str, Any], recommended: dict[str, Any], notes: str | None) -> SymbolTrainingRun:
+    walk_forward = diagnostics.get('walk_forward') or {}
+    return SymbolTrainingRun(
         id=f"symtrain_{uuid.uuid4().hex[:10]}",
         ts=int(time.time() * 1000),
         instrument_id=instrument_id,
         mode='offline_walk_forward' if bool(walk_forward.get('available')) else 'offline',
         status='completed',
         source=source,
-        candles_used=len(candles),
-        trades_used=int(perf.get('sample_size') or 0),
+        candles_used=candles_used,
+        trades_used=int((diagnostics.get('performance') or {}).get('sample_size') or 0),
         recommendations=dict(recommended),
         diagnostics=dict(diagnostics),
+        notes=notes,
+    )
+
+
+def train_symbol_profile(
+    db: Session,
+    instrument_id: str,
+    *,
+    lookback_days: int = 180,
+    timeframe: str = '1m',
+    source: str = 'api',
+) -> dict[str, Any]:
+    candles = _candles_for_training(db, instrument_id, timeframe=timeframe, lookback_days=lookback_days)
+    diagnostics = _diagnostics_from_history(db, instrument_id, candles)
+    diagnostics['walk_forward'] = _walk_forward_validate(instrument_id, candles)
+
+    row = _ensure_profile_row(db, instrument_id)
+    recommended = _training_recommendations(
+        _profile_to_dict(row),
+        diagnostics,
+        lookback_days=lookback_days,
+        timeframe=timeframe,
+        candles_used=len(candles),
+    )
+    profile = upsert_symbol_profile(instrument_id, recommended, db=db)
+
+    run = _training_run(
+        instrument_id,
+        source=source,
+        candles_used=len(candles),
+        diagnostics=diagnostics,
+        recommended=recommended,
         notes=profile.get('notes'),
     )
     db.add(run)
@@ -1047,6 +1107,7 @@ def ensure_symbol_profiles(
     trained = 0
     errors: list[dict[str, Any]] = []
     train_budget = max(0, int(train_limit if train_limit is not None else len(unique_ids)))
+    candidates: list[str] = []
     for instrument_id in unique_ids:
         row = _db_get_profile(db, instrument_id)
         if row is None:
@@ -1061,17 +1122,23 @@ def ensure_symbol_profiles(
         if not auto_train or train_budget <= 0:
             continue
         needs_training = int(getattr(row, 'sample_size', 0) or 0) <= 0 or int(getattr(row, 'last_tuned_ts', 0) or 0) <= 0
-        if not needs_training:
-            continue
-        candles = _candles_for_training(db, instrument_id, timeframe=timeframe, lookback_days=lookback_days)
-        if len(candles) < min_train_candles:
-            continue
-        try:
-            train_symbol_profile(db, instrument_id, lookback_days=lookback_days, timeframe=timeframe, source=source)
-            trained += 1
-            train_budget -= 1
-        except Exception as exc:
-            errors.append({'instrument_id': instrument_id, 'error': str(exc)})
+        if needs_training:
+            candidates.append(instrument_id)
+    if candidates:
+        result = train_symbol_profiles_bulk(
+            db,
+            candidates,
+            lookback_days=lookback_days,
+            timeframe=timeframe,
+            source=source,
+            min_candles=min_train_candles,
+            limit=train_budget,
+        )
+        for item in result['items']:
+            if item.get('error'):
+                errors.append(item)
+            else:
+                trained += 1
     if seeded:
         db.commit()
     return {
@@ -1090,14 +1157,134 @@ def train_symbol_profiles_bulk(
     lookback_days: int = 180,
     timeframe: str = '1m',
     source: str = 'api_bulk',
+    min_candles: int = 0,
+    limit: int | None = None,
+    pool: TrainingPool | None = None,
 ) -> dict[str, Any]:
-    items = []
-    for instrument_id in instrument_ids:
+    """
+    Train several instruments with their walk-forward backtests spread over the
+    training pool. Candles and diagnostics are loaded here, one instrument at a
+    time, while earlier instruments' jobs already run. Each instrument is
+    finalised as soon as its last job returns; profiles and `SymbolTrainingRun`
+    rows are committed together at the end.
+
+    Instruments with fewer than `min_candles` bars are skipped; at most `limit`
+    instruments are trained.
+    """
+    pool = pool or training_pool
+    unique_ids = [iid for iid in dict.fromkeys(instrument_ids) if iid]
+    items: dict[str, dict[str, Any]] = {}
+    skipped: list[str] = []
+    prepared: dict[str, dict[str, Any]] = {}
+
+    def _jobs():
+        for instrument_id in unique_ids:
+            if limit is not None and len(prepared) >= limit:
+                break
+            try:
+                candles = _candles_for_training(db, instrument_id, timeframe=timeframe, lookback_days=lookback_days)
+                if len(candles) < min_candles:
+                    skipped.append(instrument_id)
+                    continue
+                diagnostics = _diagnostics_from_history(db, instrument_id, candles)
+                plan = _walk_forward_plan(instrument_id, candles)
+                _ensure_profile_row(db, instrument_id)
+            except Exception as exc:
+                db.rollback()
+                items[instrument_id] = {'instrument_id': instrument_id, 'error': str(exc)}
+                continue
+            jobs = plan.pop('jobs', None) or []
+            prepared[instrument_id] = {
+                'candles_used': len(candles),
+                'diagnostics': diagnostics,
+                'plan': plan,
+                'results': {},
+                'pending': len(jobs),
+            }
+            yield from jobs
+
+    rows: dict[str, SymbolProfile] = {}
+    touched: dict[str, SymbolProfile] = {}
+    runs: list[SymbolTrainingRun] = []
+
+    def _finish(instrument_id: str) -> None:
+        state = prepared[instrument_id]
+        diagnostics = state['diagnostics']
+        diagnostics['walk_forward'] = _walk_forward_result(instrument_id, state['plan'], state['results'])
+        row = _db_get_profile(db, instrument_id)
+        if row is None:
+            items[instrument_id] = {'instrument_id': instrument_id, 'error': 'profile_row_missing_after_seed'}
+            return
+        touched[instrument_id] = row
+        recommended = _training_recommendations(
+            _profile_to_dict(row),
+            diagnostics,
+            lookback_days=lookback_days,
+            timeframe=timeframe,
+            candles_used=state['candles_used'],
+        )
+        _merge_profile_row(row, {k: v for k, v in recommended.items() if v is not None})
+        db.add(row)
+        run = _training_run(
+            instrument_id,
+            source=source,
+            candles_used=state['candles_used'],
+            diagnostics=diagnostics,
+            recommended=recommended,
+            notes=row.notes,
+        )
+        runs.append(run)
+        rows[instrument_id] = row
+        items[instrument_id] = {'instrument_id': instrument_id, 'profile': _profile_to_dict(row), 'diagnostics': diagnostics, 'training_run_id': run.id}
+
+    def _finish_safely(instrument_id: str) -> None:
+        try:
+            _finish(instrument_id)
+        except Exception as exc:
+            rows.pop(instrument_id, None)
+            # The row is still in the session: drop its half-merged changes (and its run) so the final commit skips it.
+            row = touched.pop(instrument_id, None)
+            if row is not None:
+                if row in db.new:
+                    db.expunge(row)
+                else:
+                    db.expire(row)
+            runs[:] = [run for run in runs if run.instrument_id != instrument_id]
+            items[instrument_id] = {'instrument_id': instrument_id, 'error': str(exc)}
+
+    for key, result, error in pool.run(_jobs()):
+        instrument_id = key[0]
+        state = prepared[instrument_id]
+        if error is not None:
+            logger.warning('Walk-forward job %s failed: %s', key, error)
+        state['results'][key] = result
+        state['pending'] -= 1
+        if state['pending'] == 0:
+            _finish_safely(instrument_id)
+    for instrument_id in prepared:
+        if instrument_id not in items:
+            _finish_safely(instrument_id)
+
+    if runs:
         try:
-            items.append(train_symbol_profile(db, instrument_id, lookback_days=lookback_days, timeframe=timeframe, source=source))
+            db.add_all(runs)
+            db.commit()
         except Exception as exc:
-            items.append({'instrument_id': instrument_id, 'error': str(exc)})
-    return {'items': items}
+            db.rollback()
+            for instrument_id in rows:
+                items[instrument_id] = {'instrument_id': instrument_id, 'error': str(exc)}
+            rows = {}
+    if rows:
+        # keep file export for transparency/debugging
+        try:
+            payload = _file_store_load()
+            profiles = payload.setdefault('profiles', {})
+            for instrument_id in rows:
+                profiles[instrument_id] = items[instrument_id]['profile']
+            _atomic_json_write(_json_store_path(), payload)
+        except Exception:
+            pass
+    return {'items': [items[iid] for iid in unique_ids if iid in items], 'skipped': skipped}
 
 
 def get_symbol_diagnostics(db: Session, instrument_id: str, *, lookback_days: int = 180, timeframe: str = '1m') -> dict[str, Any]:
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import threading
+from collections import Counter, OrderedDict, defaultdict, deque
 from datetime import datetime
+from functools import lru_cache
 from statistics import median
 from typing import Any
 from zoneinfo import ZoneInfo
@@ -211,10 +213,13 @@ def resample_candles(
     *,
     drop_last_incomplete: bool = True,
     anchor_mode: str = 'session',
+    cache_key: str | None = None,
 ) -> list[dict[str, Any]]:
     tf = normalize_timeframe(timeframe)
     if tf == '1m':
         return list(candles)
+    if cache_key is not None and drop_last_incomplete and anchor_mode == 'session':
+        return shared_resampler.resample(cache_key, candles, tf)
     ordered = sorted(candles, key=lambda item: int(item.get('time') or 0))
     if not ordered:
         return []
@@ -272,6 +277,252 @@ def resample_candles(
     return result
 
 
+@lru_cache(maxsize=8192)
+def _msk_day_for_hour(hour_index: int) -> tuple[str, int, int]:
+    # MSK offsets are whole hours, so one UTC hour never spans two local days.
+    ts_ms = hour_index * 3_600_000
+    return _local_trading_day(ts_ms), _default_anchor_ms(ts_ms, '1m'), _default_anchor_ms(ts_ms, '1d')
+
+
+def _candle_values(candle: dict[str, Any]) -> tuple[float, float, float, float, int]:
+    return (
+        float(candle.get('open') or candle.get('close') or 0.0),
+        float(candle.get('high') or candle.get('close') or 0.0),
+        float(candle.get('low') or candle.get('close') or 0.0),
+        float(candle.get('close') or 0.0),
+        int(candle.get('volume') or 0),
+    )
+
+
+def _median_step_ms(deltas: Counter) -> int:
+    total = sum(deltas.values())
+    if total == 0:
+        return _TIMEFRAME_MS['1m']
+    lo_rank, hi_rank = (total - 1) // 2, total // 2
+    lo: int | None = None
+    seen = 0
+    for delta in sorted(deltas):
+        seen += deltas[delta]
+        if lo is None and seen > lo_rank:
+            lo = delta
+        if seen > hi_rank:
+            return max(_TIMEFRAME_MS['1m'], int((lo + delta) / 2))
+    return _TIMEFRAME_MS['1m']
+
+
+class _Bucket:
+    __slots__ = ('day', 'start', 'open', 'high', 'low', 'close', 'volume', 'last_ts', 'inputs', 'emitted')
+
+    def __init__(self, day: str, start: int, ts: int, values: tuple[float, float, float, float, int]):
+        self.day = day
+        self.start = start
+        self.open, self.high, self.low, self.close, self.volume = values
+        self.last_ts = ts
+        self.inputs = 1
+        self.emitted: dict[str, Any] | None = None
+
+    def as_candle(self) -> dict[str, Any]:
+        return {'time': self.start, 'open': self.open, 'high': self.high, 'low': self.low, 'close': self.close, 'volume': self.volume}
+
+
+class _ResampleState:
+    """
+    Higher-timeframe buckets for one (instrument, timeframe) series.
+
+    Only the bars that are new since the previous call are bucketed; bars that
+    left the front of the window are subtracted. The last input is treated as
+    provisional (the aggregator's partial bar) and never committed. Output is
+    identical to `resample_candles(candles, timeframe)`.
+    """
+
+    def __init__(self, timeframe: str):
+        self.timeframe = timeframe
+        self.step_ms = timeframe_ms(timeframe)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.times: deque[int] = deque()
+        self.deltas: Counter = Counter()
+        self.buckets: deque[_Bucket] = deque()
+        self.emitted: deque[dict[str, Any]] = deque()
+        self.emitted_step = 0
+        self.tail: tuple[float, float, float, float, int] | None = None
+
+    def _key(self, ts: int) -> tuple[str, int]:
+        day, session_anchor, day_anchor = _msk_day_for_hour(ts // 3_600_000)
+        anchor = day_anchor if self.timeframe == '1d' else session_anchor
+        return day, _bucket_start(ts, step_ms=self.step_ms, anchor_ms=anchor)
+
+    def _complete(self, start: int, last_ts: int, source_step: int) -> bool:
+        return last_ts >= start + self.step_ms - source_step
+
+    def _drop_delta(self, delta: int) -> None:
+        self.deltas[delta] -= 1
+        if self.deltas[delta] <= 0:
+            del self.deltas[delta]
+
+    def _commit(self, ts: int, values: tuple[float, float, float, float, int]) -> None:
+        if self.times:
+            self.deltas[ts - self.times[-1]] += 1
+        self.times.append(ts)
+        self.tail = values
+        day, start = self._key(ts)
+        last = self.buckets[-1] if self.buckets else None
+        if last is not None and last.day == day and last.start == start:
+            last.high = max(last.high, values[1])
+            last.low = min(last.low, values[2])
+            last.close = values[3]
+            last.volume += values[4]
+            last.last_ts = ts
+            last.inputs += 1
+            return
+        if last is not None and self._complete(last.start, last.last_ts, self.emitted_step):
+            last.emitted = last.as_candle()
+            self.emitted.append(last.emitted)
+        self.buckets.append(_Bucket(day, start, ts, values))
+
+    def _evict_before(self, first_ts: int) -> bool:
+        head_trimmed = False
+        while self.times and self.times[0] < first_ts:
+            ts = self.times.popleft()
+            if self.times:
+                self._drop_delta(self.times[0] - ts)
+            head = self.buckets[0]
+            head.inputs -= 1
+            head_trimmed = True
+            if head.inputs == 0:
+                self.buckets.popleft()
+                if head.emitted is not None:
+                    self.emitted.popleft()
+                head_trimmed = False
+        return head_trimmed and bool(self.buckets)
+
+    def _recompute_head(self, candles: Any) -> None:
+        head = self.buckets[0]
+        values = [_candle_values(candles[i]) for i in range(head.inputs)]
+        head.open = values[0][0]
+        head.high = max(v[1] for v in values)
+        head.low = min(v[2] for v in values)
+        head.volume = sum(v[4] for v in values)
+        if head.emitted is not None:
+            head.emitted = head.as_candle()
+            self.emitted[0] = head.emitted
+
+    def _rebuild_emitted(self, source_step: int) -> None:
+        self.emitted.clear()
+        for idx, bucket in enumerate(self.buckets):
+            if idx == len(self.buckets) - 1:
+                break
+            bucket.emitted = bucket.as_candle() if self._complete(bucket.start, bucket.last_ts, source_step) else None
+            if bucket.emitted is not None:
+                self.emitted.append(bucket.emitted)
+        self.emitted_step = source_step
+
+    def _fallback(self, candles: Any) -> list[dict[str, Any]]:
+        self.reset()
+        return resample_candles(candles, self.timeframe)
+
+    def resample(self, candles: Any) -> list[dict[str, Any]]:
+        size = len(candles)
+        if size == 0:
+            self.reset()
+            return []
+        first_ts = _as_epoch_ms(candles[0].get('time'))
+        head_trimmed = self._evict_before(first_ts)
+        kept = len(self.times)
+        if kept and (
+            kept > size - 1
+            or self.times[0] != first_ts
+            or _as_epoch_ms(candles[kept - 1].get('time')) != self.times[-1]
+            or _candle_values(candles[kept - 1]) != self.tail
+        ):
+            self.reset()
+            kept = 0
+            head_trimmed = False
+        if head_trimmed:
+            self._recompute_head(candles)
+
+        for idx in range(kept, size - 1):
+            ts = _as_epoch_ms(candles[idx].get('time'))
+            if ts <= 0 or (self.times and ts <= self.times[-1]):
+                return self._fallback(candles)
+            self._commit(ts, _candle_values(candles[idx]))
+
+        last = candles[size - 1]
+        ts = _as_epoch_ms(last.get('time'))
+        prev_ts = self.times[-1] if self.times else None
+        if ts <= 0 or (prev_ts is not None and ts <= prev_ts):
+            return self._fallback(candles)
+        if prev_ts is not None:
+            self.deltas[ts - prev_ts] += 1
+            source_step = _median_step_ms(self.deltas)
+            self._drop_delta(ts - prev_ts)
+        else:
+            source_step = _median_step_ms(self.deltas)
+        if source_step != self.emitted_step:
+            self._rebuild_emitted(source_step)
+
+        result = list(self.emitted)
+        o, h, lo, c, v = _candle_values(last)
+        day, start = self._key(ts)
+        open_bucket = self.buckets[-1] if self.buckets else None
+        if open_bucket is not None and open_bucket.day == day and open_bucket.start == start:
+            if self._complete(start, ts, source_step):
+                result.append({
+                    'time': start,
+                    'open': open_bucket.open,
+                    'high': max(open_bucket.high, h),
+                    'low': min(open_bucket.low, lo),
+                    'close': c,
+                    'volume': open_bucket.volume + v,
+                })
+            return result
+        if open_bucket is not None and self._complete(open_bucket.start, open_bucket.last_ts, source_step):
+            result.append(open_bucket.as_candle())
+        if self._complete(start, ts, source_step):
+            result.append({'time': start, 'open': o, 'high': h, 'low': lo, 'close': c, 'volume': v})
+        return result
+
+
+class TimeframeResampler:
+    """
+    Incremental `resample_candles` for sliding windows of one instrument's history.
+
+    Each call only buckets the bars that closed since the previous call for the
+    same (key, timeframe), so per-cycle cost does not grow with history length.
+    Callers pass the window in time order (the aggregator history, a backtest
+    slice); anything else falls back to a full resample.
+    """
+
+    def __init__(self, max_series: int = 2048):
+        self.max_series = max_series
+        self._series: OrderedDict[tuple[str, str], _ResampleState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resample(self, key: str, candles: Any, timeframe: str) -> list[dict[str, Any]]:
+        tf = normalize_timeframe(timeframe)
+        if tf == '1m':
+            return list(candles)
+        with self._lock:
+            state = self._series.get((key, tf))
+            if state is None:
+                state = self._series[(key, tf)] = _ResampleState(tf)
+                if len(self._series) > self.max_series:
+                    self._series.popitem(last=False)
+            else:
+                self._series.move_to_end((key, tf))
+        with state.lock:
+            return state.resample(candles)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+shared_resampler = TimeframeResampler()
+
+
 def detect_trend(candles: list[dict[str, Any]]) -> tuple[str, float | None]:
     closes = [float(c.get('close') or 0.0) for c in candles if c.get('close') is not None]
     if len(closes) < 10:
@@ -0,0 +1,95 @@
+"""
+Process-pool executor for symbol-profile training.
+
+Walk-forward validation runs a backtest per (instrument, fold, strategy).
+Those jobs are pure CPU and independent, so bulk training, the startup
+bootstrap and the recalibration batch submit them here and collect results as
+they finish. DB reads and writes stay in the calling thread. The worker calls
+training through `db_executor` and the pool runs in separate processes, so a
+large watchlist no longer competes with the analysis loop for the GIL.
+
+TRAINING_PROCESSES=0 runs the jobs inline. A broken pool is discarded and the
+remaining jobs run inline.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+Job = tuple[Hashable, Callable[..., Any], tuple]  # (key, fn, args)
+
+
+class TrainingPool:
+    def __init__(self, processes: int | None = None):
+        configured = os.getenv("TRAINING_PROCESSES")
+        if processes is None:
+            processes = int(configured) if configured not in (None, "") else min(4, os.cpu_count() or 1)
+        self.processes = max(0, int(processes))
+        self._start_method = os.getenv("TRAINING_START_METHOD", "spawn") or "spawn"
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context(self._start_method),
+            )
+        return self._pool
+
+    def _submit(self, fn: Callable[..., Any], args: tuple) -> Future:
+        if self.enabled:
+            try:
+                return self._executor().submit(fn, *args)
+            except BrokenProcessPool:
+                self.shutdown(wait=False)
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def run(self, jobs: Iterable[Job]) -> Iterator[tuple[Hashable, Any, BaseException | None]]:
+        """Submit every job, then yield (key, result, error) in completion order."""
+        futures: dict[Future, tuple[Hashable, Callable[..., Any], tuple]] = {}
+        for key, fn, args in jobs:
+            futures[self._submit(fn, args)] = (key, fn, args)
+        for future in as_completed(futures):
+            key, fn, args = futures[future]
+            try:
+                yield key, future.result(), None
+            except BrokenProcessPool as exc:
+                logger.error("Training process pool broke (%s); running job %s inline", exc, key)
+                self.shutdown(wait=False)
+                retry = self._submit_inline(fn, args)
+                yield key, retry[0], retry[1]
+            except Exception as exc:
+                yield key, None, exc
+
+    @staticmethod
+    def _submit_inline(fn: Callable[..., Any], args: tuple) -> tuple[Any, BaseException | None]:
+        try:
+            return fn(*args), None
+        except Exception as exc:
+            return None, exc
+
+    def stats(self) -> dict[str, Any]:
+        return {"processes": self.processes, "running": self._pool is not None}
+
+    def shutdown(self, wait: bool = True) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+training_pool = TrainingPool()
@@ -0,0 +1,278 @@
+"""
+Columnar on-disk archive of `candle_cache`.
+
+Training, walk-forward and backtests read months of 1m bars. Loading them as
+`CandleCache` ORM objects (with Decimal columns) costs far more time and
+memory than the bars themselves. The archive keeps one file per
+(timeframe, instrument, UTC month):
+
+    <root>/<timeframe>/<instrument>/<YYYY-MM>.bin
+        16-byte header: b"CNDL", format version (u32), row count (u64)
+        then time, open, high, low, close, volume as contiguous 8-byte columns
+
+Reads memory-map the month files, bisect the time column and copy only the
+requested range into `array` columns. `sync()` feeds the archive
+incrementally from `candle_cache` using an `updated_ts` watermark (kept in
+`_manifest.json` next to the month files), so rows upserted by the worker or
+the candles API are picked up on the next read. The manifest also keeps the
+row count and `updated_ts` sum of the overlap window below the watermark, so a
+sync with nothing new costs one aggregate query; re-fetched rows identical to
+the archived ones leave their month file untouched. Files are replaced atomically; a
+reader never sees a half-written month.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable
+
+from sqlalchemy import func
+
+from core.storage.models import CandleCache
+
+logger = logging.getLogger(__name__)
+
+COLUMNS: dict[str, str] = {
+    "time": "q",
+    "open": "d",
+    "high": "d",
+    "low": "d",
+    "close": "d",
+    "volume": "q",
+}
+_MAGIC = b"CNDL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+_ITEM_SIZE = 8
+# `upsert_candle_rows` stamps one `updated_ts` for a whole batch before its chunked INSERTs
+# commit, so a sync running mid-batch can see newer stamps while older ones are still
+# invisible. Rows this close below the watermark are fetched again unless the window's
+# count/stamp-sum fingerprint in the manifest shows nothing landed there.
+_WATERMARK_OVERLAP_MS = 120_000
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def empty_columns() -> dict[str, array]:
+    return {name: array(code) for name, code in COLUMNS.items()}
+
+
+def columns_to_rows(columns: dict[str, array]) -> list[dict[str, Any]]:
+    """Candle dicts in the shape `candle_repo.list_candles` returns."""
+    return [
+        {"time": t, "open": o, "high": h, "low": lo, "close": c, "volume": v, "is_complete": True}
+        for t, o, h, lo, c, v in zip(*(columns[name] for name in COLUMNS))
+    ]
+
+
+def month_key(ts: int) -> str:
+    tm = time.gmtime(int(ts))
+    return f"{tm.tm_year:04d}-{tm.tm_mon:02d}"
+
+
+class CandleArchive:
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+
+    def _series_dir(self, instrument_id: str, timeframe: str) -> str:
+        return os.path.join(self.root, _SAFE_NAME.sub("_", timeframe), _SAFE_NAME.sub("_", instrument_id))
+
+    def months(self, instrument_id: str, timeframe: str) -> list[str]:
+        try:
+            names = os.listdir(self._series_dir(instrument_id, timeframe))
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-4] for name in names if name.endswith(".bin"))
+
+    # ── month files ──────────────────────────────────────────────────────────
+
+    def _read_month(self, path: str, start_ts: int | None = None, end_ts: int | None = None) -> dict[str, array]:
+        out = empty_columns()
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size <= _HEADER.size:
+                return out
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                magic, version, count = _HEADER.unpack_from(mapped, 0)
+                if magic != _MAGIC or version != _VERSION or size < _HEADER.size + count * _ITEM_SIZE * len(COLUMNS):
+                    raise ValueError(f"corrupt candle archive file: {path}")
+                view = memoryview(mapped)
+                try:
+                    blocks = {}
+                    for idx, (name, code) in enumerate(COLUMNS.items()):
+                        offset = _HEADER.size + idx * count * _ITEM_SIZE
+                        blocks[name] = view[offset:offset + count * _ITEM_SIZE].cast(code)
+                    times = blocks["time"]
+                    lo = 0 if start_ts is None else bisect_left(times, int(start_ts))
+                    hi = count if end_ts is None else bisect_right(times, int(end_ts))
+                    for name, block in blocks.items():
+                        if hi > lo:
+                            out[name].frombytes(block[lo:hi].tobytes())
+                        block.release()
+                finally:
+                    view.release()
+        return out
+
+    def _write_month(self, path: str, columns: dict[str, array]) -> None:
+        count = len(columns["time"])
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(_HEADER.pack(_MAGIC, _VERSION, count))
+            for name in COLUMNS:
+                columns[name].tofile(fh)
+        os.replace(tmp, path)
+
+    def _merge_month(self, path: str, rows: list[tuple]) -> int:
+        """Merge rows into a month file; returns how many differed (0 leaves the file as is)."""
+        existing = self._read_month(path) if os.path.exists(path) else empty_columns()
+        times = existing["time"]
+        changed: list[tuple] = []
+        for row in rows:
+            idx = bisect_left(times, row[0])
+            if idx < len(times) and times[idx] == row[0] and all(existing[name][idx] == value for name, value in zip(COLUMNS, row)):
+                continue
+            changed.append(row)
+        if not changed:
+            return 0
+        merged = {row[0]: row for row in zip(*(existing[name] for name in COLUMNS))}
+        for row in changed:
+            merged[row[0]] = row
+        columns = empty_columns()
+        for row in sorted(merged.values()):
+            for name, value in zip(COLUMNS, row):
+                columns[name].append(value)
+        self._write_month(path, columns)
+        return len(changed)
+
+    # ── manifest / feed ──────────────────────────────────────────────────────
+
+    def _manifest_path(self, instrument_id: str, timeframe: str) -> str:
+        return os.path.join(self._series_dir(instrument_id, timeframe), "_manifest.json")
+
+    def _manifest(self, instrument_id: str, timeframe: str) -> dict[str, Any]:
+        try:
+            with open(self._manifest_path(instrument_id, timeframe), "r", encoding="utf-8") as fh:
+                manifest = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    def watermark(self, instrument_id: str, timeframe: str) -> int | None:
+        value = self._manifest(instrument_id, timeframe).get("updated_ts")
+        return int(value) if value is not None else None
+
+    def append(
+        self,
+        instrument_id: str,
+        timeframe: str,
+        rows: Iterable[tuple],
+        *,
+        watermark: int | None = None,
+        window: tuple[int, int] | None = None,
+    ) -> int:
+        """Merge (time, open, high, low, close, volume) rows; later rows win per time.
+
+        Returns how many rows changed the archive.
+        """
+        by_month: dict[str, list[tuple]] = {}
+        for ts, open_, high, low, close, volume in rows:
+            ts = int(ts)
+            by_month.setdefault(month_key(ts), []).append((ts, float(open_), float(high), float(low), float(close), int(volume or 0)))
+        series_dir = self._series_dir(instrument_id, timeframe)
+        with self._lock:
+            os.makedirs(series_dir, exist_ok=True)
+            changed = sum(self._merge_month(os.path.join(series_dir, f"{month}.bin"), month_rows) for month, month_rows in by_month.items())
+            if watermark is not None:
+                manifest = {"updated_ts": int(watermark)}
+                if window is not None:
+                    manifest["window"] = [int(window[0]), int(window[1])]
+                tmp = f"{self._manifest_path(instrument_id, timeframe)}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as fh:
+                    json.dump(manifest, fh)
+                os.replace(tmp, self._manifest_path(instrument_id, timeframe))
+        return changed
+
+    def sync(self, db: Any, instrument_id: str, timeframe: str) -> int:
+        """Copy rows changed in `candle_cache` since the last sync; returns rows that changed the archive."""
+        manifest = self._manifest(instrument_id, timeframe)
+        watermark = int(manifest["updated_ts"]) if manifest.get("updated_ts") is not None else None
+        series = (CandleCache.instrument_id == instrument_id, CandleCache.timeframe == timeframe)
+        if watermark is not None and manifest.get("window") is not None:
+            count, stamp_sum, newest = (
+                db.query(func.count(), func.sum(CandleCache.updated_ts), func.max(CandleCache.updated_ts))
+                .filter(*series, CandleCache.updated_ts >= watermark - _WATERMARK_OVERLAP_MS)
+                .one()
+            )
+            if int(newest or 0) <= watermark and [int(count or 0), int(stamp_sum or 0)] == list(manifest["window"]):
+                return 0
+        query = db.query(
+            CandleCache.ts,
+            CandleCache.open,
+            CandleCache.high,
+            CandleCache.low,
+            CandleCache.close,
+            CandleCache.volume,
+            CandleCache.updated_ts,
+        ).filter(*series)
+        if watermark is not None:
+            query = query.filter(CandleCache.updated_ts >= watermark - _WATERMARK_OVERLAP_MS)
+        rows = query.all()
+        if not rows and watermark is None:
+            return 0
+        watermark = max(max((int(row[6] or 0) for row in rows), default=0), watermark or 0)
+        in_window = [int(row[6] or 0) for row in rows if int(row[6] or 0) >= watermark - _WATERMARK_OVERLAP_MS]
+        return self.append(instrument_id, timeframe, (row[:6] for row in rows), watermark=watermark, window=(len(in_window), sum(in_window)))
+
+    # ── range reads ──────────────────────────────────────────────────────────
+
+    def read(self, instrument_id: str, timeframe: str, *, start_ts: int | None = None, end_ts: int | None = None, limit: int | None = None) -> dict[str, array]:
+        """Columns for bars with start_ts <= time <= end_ts (seconds), oldest first; `limit` keeps the newest."""
+        series_dir = self._series_dir(instrument_id, timeframe)
+        months = self.months(instrument_id, timeframe)
+        if start_ts is not None:
+            months = [month for month in months if month >= month_key(start_ts)]
+        if end_ts is not None:
+            months = [month for month in months if month <= month_key(end_ts)]
+        parts: list[dict[str, array]] = []
+        remaining = limit
+        # Newest month first so a `limit` read stops early.
+        for month in reversed(months):
+            part = self._read_month(os.path.join(series_dir, f"{month}.bin"), start_ts, end_ts)
+            if remaining is not None:
+                if len(part["time"]) > remaining:
+                    part = {name: column[len(column) - remaining:] for name, column in part.items()}
+                remaining -= len(part["time"])
+            parts.append(part)
+            if remaining is not None and remaining <= 0:
+                break
+        out = empty_columns()
+        for part in reversed(parts):
+            for name in COLUMNS:
+                out[name].extend(part[name])
+        return out
+
+
+_ARCHIVES: dict[str, CandleArchive] = {}
+_ARCHIVES_LOCK = threading.Lock()
+
+
+def get_candle_archive() -> CandleArchive | None:
+    """Archive at `CANDLE_ARCHIVE_DIR`, or None when the archive is not configured."""
+    from core.config import settings
+
+    root = str(getattr(settings, "CANDLE_ARCHIVE_DIR", "") or os.getenv("CANDLE_ARCHIVE_DIR") or "").strip()
+    if not root:
+        return None
+    with _ARCHIVES_LOCK:
+        archive = _ARCHIVES.get(root)
+        if archive is None:
+            archive = _ARCHIVES[root] = CandleArchive(root)
+    return archive
@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base
 from core.config import settings
+from core.metrics import instrument_db_engine
 
 # Sync engine for MVP simplicity as requested
 engine = create_engine(
@@ -8,5 +9,6 @@ engine = create_engine(
     pool_pre_ping=True,
     # echo=True if needed for debug
 )
+instrument_db_engine(engine)
 
 Base = declarative_base()
@@ -5,11 +5,14 @@ import time
 from typing import Any
 
 try:
-    from sqlalchemy.exc import IntegrityError
+    from sqlalchemy.exc import IntegrityError, OperationalError
 except Exception:  # pragma: no cover
     class IntegrityError(Exception):
         pass
 
+    class OperationalError(Exception):
+        pass
+
 try:
     from core.storage.models import DecisionLog
 except Exception:  # pragma: no cover
@@ -52,13 +55,22 @@ except Exception:  # pragma: no cover
     _sqlite_insert = None
 
 
+def payload_instrument_id(payload: dict[str, Any] | None) -> str | None:
+    """Instrument a log is about, as stored in the indexed `decision_log.instrument_id` column."""
+    payload = payload or {}
+    value = payload.get('instrument_id') or payload.get('incoming_instrument')
+    return str(value) if value else None
+
+
 def build_decision_log_row(*, log_type: str, message: str, payload: dict[str, Any] | None = None, ts_ms: int | None = None, log_id: str | None = None) -> dict[str, Any]:
+    payload = dict(payload or {})
     return {
         'id': str(log_id or new_prefixed_id('log')),
         'ts': int(ts_ms or time.time() * 1000),
         'type': str(log_type),
         'message': str(message),
-        'payload': dict(payload or {}),
+        'payload': payload,
+        'instrument_id': payload_instrument_id(payload),
     }
 
 
@@ -76,7 +88,8 @@ def _execute_insert(session, row: dict[str, Any]) -> bool:
     bind = getattr(session, 'bind', None)
     dialect = getattr(getattr(bind, 'dialect', None), 'name', '') if bind is not None else ''
     if dialect == 'postgresql' and _pg_insert is not None:
-        stmt = _pg_insert(DecisionLog).values(**row).on_conflict_do_nothing(index_elements=['id'])
+        # No conflict target: a range-partitioned decision_log has PRIMARY KEY (id, ts), not a unique id.
+        stmt = _pg_insert(DecisionLog).values(**row).on_conflict_do_nothing()
         result = session.execute(stmt)
         return bool(getattr(result, 'rowcount', 0))
     if dialect == 'sqlite' and _sqlite_insert is not None:
@@ -88,12 +101,108 @@ def _execute_insert(session, row: dict[str, Any]) -> bool:
     return True
 
 
+def _insert_rows(session, rows: list[dict[str, Any]]) -> int:
+    """Multi-row insert that skips ids already present; returns rows inserted."""
+    bind = getattr(session, 'bind', None)
+    dialect = getattr(getattr(bind, 'dialect', None), 'name', '') if bind is not None else ''
+    if dialect == 'postgresql' and _pg_insert is not None:
+        result = session.execute(_pg_insert(DecisionLog).values(rows).on_conflict_do_nothing())
+        return int(getattr(result, 'rowcount', 0) or 0)
+    if dialect == 'sqlite' and _sqlite_insert is not None:
+        result = session.execute(_sqlite_insert(DecisionLog).values(rows).on_conflict_do_nothing(index_elements=['id']))
+        return int(getattr(result, 'rowcount', 0) or 0)
+    session.add_all([_instantiate_decision_log(row) for row in rows])
+    session.flush()
+    return len(rows)
+
+
+def write_decision_log_rows(session, rows: list[dict[str, Any]], *, chunk_size: int = 500) -> tuple[int, list[dict[str, Any]]]:
+    """
+    Bulk-insert prepared rows (from `build_decision_log_row`) with one commit per
+    chunk; returns (inserted, failed rows). A chunk that fails is retried row by
+    row so one bad payload does not take its neighbours down; a connection error
+    gives up on everything not yet written. Committed `position_closed` rows are
+    materialized into the trade journal.
+    """
+    inserted = 0
+    failed: list[dict[str, Any]] = []
+    chunk_size = max(1, chunk_size)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        disconnected = False
+        try:
+            inserted += _insert_rows(session, chunk)
+            session.commit()
+            written = chunk
+        except Exception:
+            session.rollback()
+            logger.warning('DecisionLog bulk insert of %d rows failed, retrying per row', len(chunk), exc_info=True)
+            written = []
+            for idx, row in enumerate(chunk):
+                try:
+                    inserted += int(_execute_insert(session, row))
+                    session.commit()
+                    written.append(row)
+                except IntegrityError:
+                    session.rollback()
+                    logger.warning('DecisionLog duplicate skipped id=%s type=%s', row['id'], row['type'])
+                except OperationalError:
+                    session.rollback()
+                    failed.extend(chunk[idx:])
+                    disconnected = True
+                    break
+                except Exception:
+                    session.rollback()
+                    failed.append(row)
+        for row in written:
+            if row['type'] == 'position_closed':
+                _sync_trade_journal(session, row['id'])
+        if disconnected:
+            failed.extend(rows[start + chunk_size:])
+            break
+    return inserted, failed
+
+
+def _sync_trade_journal(session, log_id: str) -> None:
+    """Materialize a committed `position_closed` log; the worker backfill retries failures."""
+    try:
+        from core.storage.repos.trade_journal import record_closed_position
+
+        log = session.get(DecisionLog, log_id)
+        if log is not None and record_closed_position(session, log) is not None:
+            session.commit()
+    except Exception:
+        session.rollback()
+        logger.warning('Trade journal sync failed for log id=%s', log_id, exc_info=True)
+
+
+# Types other code reads back right after writing them (risk limits, feedback
+# index, trade journal, allocator history); a sink writes these through.
+WRITE_THROUGH_TYPES = frozenset({'trade_filled', 'position_closed', 'capital_reallocation', 'risk_daily_reset'})
+
+_sink = None
+
+
+def set_decision_log_sink(sink) -> None:
+    """
+    Route `append_decision_log_best_effort` through `sink.submit(row, urgent=...)`
+    (see apps.worker.decision_log_writer); None restores one commit per call.
+    """
+    global _sink
+    _sink = sink
+
+
 def append_decision_log_best_effort(*, log_type: str, message: str, payload: dict[str, Any] | None = None, ts_ms: int | None = None) -> bool:
     row = build_decision_log_row(log_type=log_type, message=message, payload=payload, ts_ms=ts_ms)
+    sink = _sink
+    if sink is not None:
+        return sink.submit(row, urgent=row['type'] in WRITE_THROUGH_TYPES)
     session = SessionLocal()
     try:
         inserted = _execute_insert(session, row)
         session.commit()
+        if inserted and row['type'] == 'position_closed':
+            _sync_trade_journal(session, row['id'])
         return inserted
     except IntegrityError:
         session.rollback()
@@ -0,0 +1,48 @@
+"""add backtest_jobs table for asynchronous backtests
+
+Revision ID: 20261018_01
+Revises: 20260413_01
+Create Date: 2026-10-18 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = '20261018_01'
+down_revision = '20260413_01'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'backtest_jobs',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('ts', sa.BigInteger(), nullable=False),
+        sa.Column('updated_ts', sa.BigInteger(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False, server_default='queued'),
+        sa.Column('cache_key', sa.String(), nullable=False),
+        sa.Column('instrument_id', sa.String(), nullable=False),
+        sa.Column('timeframe', sa.String(), nullable=False, server_default='1m'),
+        sa.Column('strategy', sa.String(), nullable=False),
+        sa.Column('mode', sa.String(), nullable=False, server_default='single'),
+        sa.Column('params', JSONB(astext_type=sa.Text()), nullable=True, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('progress', JSONB(astext_type=sa.Text()), nullable=True, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('candles_used', sa.Integer(), nullable=True, server_default='0'),
+        sa.Column('from_ts', sa.BigInteger(), nullable=True),
+        sa.Column('to_ts', sa.BigInteger(), nullable=True),
+        sa.Column('owner', sa.String(), nullable=True),
+        sa.Column('started_ts', sa.BigInteger(), nullable=True),
+        sa.Column('finished_ts', sa.BigInteger(), nullable=True),
+        sa.Column('result', JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+    )
+    op.create_index('idx_backtest_jobs_cache', 'backtest_jobs', ['cache_key', 'status', 'finished_ts'], unique=False)
+    op.create_index('idx_backtest_jobs_ts', 'backtest_jobs', ['ts'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_backtest_jobs_ts', table_name='backtest_jobs')
+    op.drop_index('idx_backtest_jobs_cache', table_name='backtest_jobs')
+    op.drop_table('backtest_jobs')
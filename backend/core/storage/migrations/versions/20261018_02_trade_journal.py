@@ -0,0 +1,48 @@
+"""add trade_journal read model for closed trades
+
+Revision ID: 20261018_02
+Revises: 20261018_01
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = '20261018_02'
+down_revision = '20261018_01'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'trade_journal',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('close_ts', sa.BigInteger(), nullable=False),
+        sa.Column('opened_ts', sa.BigInteger(), nullable=True),
+        sa.Column('instrument_id', sa.String(), nullable=False),
+        sa.Column('side', sa.String(), nullable=True),
+        sa.Column('strategy', sa.String(), nullable=True),
+        sa.Column('close_reason', sa.String(), nullable=True),
+        sa.Column('entry_price', sa.Numeric(18, 9), nullable=True, server_default='0'),
+        sa.Column('close_price', sa.Numeric(18, 9), nullable=True, server_default='0'),
+        sa.Column('qty', sa.Numeric(18, 9), nullable=True, server_default='0'),
+        sa.Column('realized_pnl', sa.Numeric(18, 9), nullable=True, server_default='0'),
+        sa.Column('fees_est', sa.Numeric(18, 9), nullable=True, server_default='0'),
+        sa.Column('duration_sec', sa.Integer(), nullable=True, server_default='0'),
+        sa.Column('signal_id', sa.String(), nullable=True),
+        sa.Column('trace_id', sa.String(), nullable=True),
+        sa.Column('opened_order_id', sa.String(), nullable=True),
+        sa.Column('closed_order_id', sa.String(), nullable=True),
+        sa.Column('extra', JSONB(astext_type=sa.Text()), nullable=True, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('updated_ts', sa.BigInteger(), nullable=True),
+    )
+    op.create_index('idx_trade_journal_close_ts', 'trade_journal', ['close_ts', 'instrument_id'], unique=False)
+    op.create_index('idx_trade_journal_instrument_ts', 'trade_journal', ['instrument_id', 'close_ts'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_trade_journal_instrument_ts', table_name='trade_journal')
+    op.drop_index('idx_trade_journal_close_ts', table_name='trade_journal')
+    op.drop_table('trade_journal')
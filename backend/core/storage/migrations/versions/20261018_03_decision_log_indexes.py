@@ -0,0 +1,46 @@
+"""decision_log type/instrument indexes and decision_log_archive
+
+Revision ID: 20261018_03
+Revises: 20261018_02
+Create Date: 2026-10-18 14:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = '20261018_03'
+down_revision = '20261018_02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('decision_log', sa.Column('instrument_id', sa.String(), nullable=True))
+    op.execute(
+        "UPDATE decision_log SET instrument_id = COALESCE(payload ->> 'instrument_id', payload ->> 'incoming_instrument') "
+        "WHERE instrument_id IS NULL"
+    )
+    op.create_index('idx_decision_log_type_ts', 'decision_log', ['type', 'ts'], unique=False)
+    op.create_index('idx_decision_log_instrument_ts', 'decision_log', ['instrument_id', 'ts'], unique=False)
+
+    op.create_table(
+        'decision_log_archive',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('ts', sa.BigInteger(), nullable=False),
+        sa.Column('from_ts', sa.BigInteger(), nullable=False),
+        sa.Column('to_ts', sa.BigInteger(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('type_counts', JSONB(astext_type=sa.Text()), nullable=True, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('codec', sa.String(), nullable=False, server_default='jsonl.gz'),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+    )
+    op.create_index('idx_decision_log_archive_range', 'decision_log_archive', ['from_ts', 'to_ts'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_decision_log_archive_range', table_name='decision_log_archive')
+    op.drop_table('decision_log_archive')
+    op.drop_index('idx_decision_log_instrument_ts', table_name='decision_log')
+    op.drop_index('idx_decision_log_type_ts', table_name='decision_log')
+    op.drop_column('decision_log', 'instrument_id')
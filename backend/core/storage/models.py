@@ -7,6 +7,7 @@ try:
         BigInteger,
         Text,
         Index,
+        LargeBinary,
         Numeric,
     )
     from sqlalchemy.dialects.postgresql import JSONB
@@ -35,7 +36,7 @@ except Exception:  # pragma: no cover - lightweight tests without sqlalchemy
     def Column(*args, **kwargs):
         return _DummyColumn(*args, **kwargs)
 
-    Integer = String = Boolean = BigInteger = Text = Numeric = JSONB = _DummyType
+    Integer = String = Boolean = BigInteger = Text = Numeric = JSONB = LargeBinary = _DummyType
 
     def Index(*args, **kwargs):
         return None
@@ -357,8 +358,61 @@ class DecisionLog(Base):
     type = Column(String, nullable=False)
     message = Column(Text, nullable=False)
     payload = Column(JSONB, default={})
+    instrument_id = Column(String, nullable=True)  # payload instrument, extracted on write for indexed filters
 
-    __table_args__ = (Index("idx_decision_log_ts", "ts"),)
+    __table_args__ = (
+        Index("idx_decision_log_ts", "ts"),
+        Index("idx_decision_log_type_ts", "type", "ts"),
+        Index("idx_decision_log_instrument_ts", "instrument_id", "ts"),
+    )
+
+
+class DecisionLogArchive(Base):
+    """A batch of retired decision_log rows, stored as gzip-compressed JSONL."""
+
+    __tablename__ = "decision_log_archive"
+
+    id = Column(String, primary_key=True)
+    ts = Column(BigInteger, nullable=False)  # archived at
+    from_ts = Column(BigInteger, nullable=False)
+    to_ts = Column(BigInteger, nullable=False)
+    row_count = Column(Integer, nullable=False, default=0)
+    type_counts = Column(JSONB, default={})
+    codec = Column(String, nullable=False, default="jsonl.gz")
+    data = Column(LargeBinary, nullable=False)
+
+    __table_args__ = (Index("idx_decision_log_archive_range", "from_ts", "to_ts"),)
+
+
+class TradeJournal(Base):
+    """Closed round trip materialized from its `position_closed` decision log (same id)."""
+
+    __tablename__ = "trade_journal"
+
+    id = Column(String, primary_key=True)
+    close_ts = Column(BigInteger, nullable=False)
+    opened_ts = Column(BigInteger, nullable=True)
+    instrument_id = Column(String, nullable=False)
+    side = Column(String, nullable=True)
+    strategy = Column(String, nullable=True)
+    close_reason = Column(String, nullable=True)
+    entry_price = Column(Numeric(18, 9), default=0.0)
+    close_price = Column(Numeric(18, 9), default=0.0)
+    qty = Column(Numeric(18, 9), default=0.0)
+    realized_pnl = Column(Numeric(18, 9), default=0.0)
+    fees_est = Column(Numeric(18, 9), default=0.0)
+    duration_sec = Column(Integer, default=0)
+    signal_id = Column(String, nullable=True)
+    trace_id = Column(String, nullable=True)
+    opened_order_id = Column(String, nullable=True)
+    closed_order_id = Column(String, nullable=True)
+    extra = Column(JSONB, default={})  # ai_decision, ai_confidence, de_score, ai_influenced, ai_mode_used
+    updated_ts = Column(BigInteger, default=now_utc_ms, onupdate=now_utc_ms)
+
+    __table_args__ = (
+        Index("idx_trade_journal_close_ts", "close_ts", "instrument_id"),
+        Index("idx_trade_journal_instrument_ts", "instrument_id", "close_ts"),
+    )
 
 
 class SymbolProfile(Base):
@@ -519,6 +573,35 @@ class MLTrainingRun(Base):
     )
 
 
+class BacktestJob(Base):
+    __tablename__ = "backtest_jobs"
+
+    id = Column(String, primary_key=True)
+    ts = Column(BigInteger, nullable=False)
+    updated_ts = Column(BigInteger, default=now_utc_ms, onupdate=now_utc_ms)
+    status = Column(String, nullable=False, default="queued")  # queued | running | completed | failed | cancelled
+    cache_key = Column(String, nullable=False)
+    instrument_id = Column(String, nullable=False)
+    timeframe = Column(String, nullable=False, default="1m")
+    strategy = Column(String, nullable=False)
+    mode = Column(String, nullable=False, default="single")
+    params = Column(JSONB, default={})
+    progress = Column(JSONB, default={})  # {stage, pct}
+    candles_used = Column(Integer, default=0)
+    from_ts = Column(BigInteger, nullable=True)
+    to_ts = Column(BigInteger, nullable=True)
+    owner = Column(String, nullable=True)  # host:pid of the API process running the job
+    started_ts = Column(BigInteger, nullable=True)
+    finished_ts = Column(BigInteger, nullable=True)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("idx_backtest_jobs_cache", "cache_key", "status", "finished_ts"),
+        Index("idx_backtest_jobs_ts", "ts"),
+    )
+
+
 class PositionExcursion(Base):
     __tablename__ = "position_excursions"
 
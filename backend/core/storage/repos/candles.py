@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import logging
+from array import array
 from typing import Iterable
 
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from core.storage.models import CandleCache
+from core.storage.candle_archive import columns_to_rows, empty_columns, get_candle_archive
+from core.storage.models import CandleCache, now_utc_ms
+
+logger = logging.getLogger(__name__)
 
 
 def list_candles(db: Session, instrument_id: str, timeframe: str, limit: int = 500) -> list[dict]:
@@ -31,7 +36,47 @@ def list_candles(db: Session, instrument_id: str, timeframe: str, limit: int = 5
     ]
 
 
-def _payload(instrument_id: str, timeframe: str, candle: dict, source: str) -> dict:
+def load_candle_columns(db: Session, instrument_id: str, timeframe: str, *, start_ts: int | None = None, limit: int | None = None) -> dict[str, array]:
+    """Bars from `start_ts` (seconds) as columns, oldest first; `limit` keeps the newest.
+
+    Served from the columnar archive when CANDLE_ARCHIVE_DIR is set (synced from
+    candle_cache first), otherwise by a column query without ORM hydration.
+    """
+    archive = get_candle_archive()
+    if archive is not None:
+        try:
+            archive.sync(db, instrument_id, timeframe)
+            return archive.read(instrument_id, timeframe, start_ts=start_ts, limit=limit)
+        except (OSError, ValueError) as exc:
+            logger.warning("Candle archive read failed for %s %s, using candle_cache: %s", instrument_id, timeframe, exc)
+
+    query = db.query(
+        CandleCache.ts, CandleCache.open, CandleCache.high, CandleCache.low, CandleCache.close, CandleCache.volume,
+    ).filter(CandleCache.instrument_id == instrument_id, CandleCache.timeframe == timeframe)
+    if start_ts is not None:
+        query = query.filter(CandleCache.ts >= int(start_ts))
+    if limit is not None:
+        rows = query.order_by(CandleCache.ts.desc()).limit(limit).all()
+        rows.reverse()
+    else:
+        rows = query.order_by(CandleCache.ts.asc()).all()
+    columns = empty_columns()
+    for ts, open_, high, low, close, volume in rows:
+        columns["time"].append(int(ts))
+        columns["open"].append(float(open_))
+        columns["high"].append(float(high))
+        columns["low"].append(float(low))
+        columns["close"].append(float(close))
+        columns["volume"].append(int(volume or 0))
+    return columns
+
+
+def load_candle_history(db: Session, instrument_id: str, timeframe: str, *, start_ts: int | None = None, limit: int | None = None) -> list[dict]:
+    """`load_candle_columns` as candle dicts for the backtest/training consumers."""
+    return columns_to_rows(load_candle_columns(db, instrument_id, timeframe, start_ts=start_ts, limit=limit))
+
+
+def candle_row(instrument_id: str, timeframe: str, candle: dict, source: str) -> dict:
     return {
         "instrument_id": instrument_id,
         "timeframe": timeframe,
@@ -45,31 +90,52 @@ def _payload(instrument_id: str, timeframe: str, candle: dict, source: str) -> d
     }
 
 
+# Rows per multi-row INSERT; keeps SQLite under its bound-parameter limit (9 columns per row).
+_UPSERT_CHUNK_ROWS = {"postgresql": 1000, "sqlite": 100}
+_UPDATE_COLUMNS = ("open", "high", "low", "close", "volume", "source", "updated_ts")
+
+
 def upsert_candles(db: Session, *, instrument_id: str, timeframe: str, candles: Iterable[dict], source: str = "worker") -> int:
-    rows = [_payload(instrument_id, timeframe, candle, source) for candle in candles]
-    if not rows:
+    return upsert_candle_rows(db, [candle_row(instrument_id, timeframe, candle, source) for candle in candles])
+
+
+def upsert_candle_rows(db: Session, rows: Iterable[dict]) -> int:
+    """Upsert prepared `candle_row` rows (any mix of instruments) and commit.
+
+    Postgres and SQLite use multi-row `INSERT … ON CONFLICT DO UPDATE`; other
+    dialects fall back to a lookup per row.
+    """
+    deduped: dict[tuple, dict] = {}
+    for row in rows:
+        # ON CONFLICT cannot touch the same row twice in one statement; the last write wins.
+        deduped[(row["instrument_id"], row["timeframe"], row["ts"])] = row
+    if not deduped:
         return 0
+    payloads = list(deduped.values())
 
     dialect = (getattr(getattr(db, 'bind', None), 'dialect', None) and db.bind.dialect.name) or ''
+    chunk_rows = _UPSERT_CHUNK_ROWS.get(dialect)
+    if chunk_rows is None:
+        return _upsert_rows_per_row(db, payloads)
+
     if dialect == 'postgresql':
-        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
 
-        stmt = pg_insert(CandleCache).values(rows)
+    now_ms = now_utc_ms()
+    for start in range(0, len(payloads), chunk_rows):
+        stmt = dialect_insert(CandleCache).values([{**row, "updated_ts": now_ms} for row in payloads[start:start + chunk_rows]])
         stmt = stmt.on_conflict_do_update(
             index_elements=['instrument_id', 'timeframe', 'ts'],
-            set_={
-                'open': stmt.excluded.open,
-                'high': stmt.excluded.high,
-                'low': stmt.excluded.low,
-                'close': stmt.excluded.close,
-                'volume': stmt.excluded.volume,
-                'source': stmt.excluded.source,
-            },
+            set_={column: getattr(stmt.excluded, column) for column in _UPDATE_COLUMNS},
         )
         db.execute(stmt)
-        db.commit()
-        return len(rows)
+    db.commit()
+    return len(payloads)
+
 
+def _upsert_rows_per_row(db: Session, rows: list[dict]) -> int:
     count = 0
     for payload in rows:
         try:
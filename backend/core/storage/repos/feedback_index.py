@@ -0,0 +1,139 @@
+"""
+In-memory index of recent `trade_filled` / `position_closed` decision logs.
+
+Pending-signal confidence shaping used to load and parse every feedback log
+of the last 6-24h once per bias per candidate. The index parses each log once,
+files it under the keys the biases match on (thesis timeframe/type,
+instrument, regime) and is kept current by an incremental `ts` watermark
+query, so logs written by any process (worker, API) are picked up on the
+next ranking pass. Time-decay is still applied at lookup time, which keeps
+the scores identical to the per-query implementation.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any, Iterable
+
+from core.storage.models import DecisionLog
+
+FEEDBACK_LOG_TYPES = ('trade_filled', 'position_closed')
+RETENTION_HOURS = 24
+# Logs are stamped before their transaction commits; re-read this much behind the watermark.
+_WATERMARK_OVERLAP_MS = 120_000
+_INDEXES_MAX = 8
+
+
+def _text(value: Any) -> str:
+    return str(value or '')
+
+
+def _bucket_keys(row_type: str, payload: dict[str, Any]) -> list[tuple]:
+    instrument_id = _text(payload.get('instrument_id'))
+    seed = dict(payload.get('execution_quality_seed') or {})
+    seed_review = dict(seed.get('review_readiness') or {})
+    conviction = dict(payload.get('conviction_profile') or {})
+    review_ctx = dict(payload.get('review_readiness') or {})
+    regime_conviction = dict(payload.get('conviction_profile') or seed.get('conviction_profile') or {})
+    seed_type = _text(seed_review.get('thesis_type'))
+
+    keys: list[tuple] = [
+        ('instrument', instrument_id),
+        ('symbol', _text(seed.get('thesis_timeframe') or conviction.get('thesis_timeframe')), seed_type, instrument_id),
+        ('regime', instrument_id, _text(seed.get('thesis_timeframe') or regime_conviction.get('thesis_timeframe')), seed_type, _text(regime_conviction.get('regime'))),
+    ]
+    if row_type == 'trade_filled':
+        keys.append(('execution', _text(seed.get('thesis_timeframe')), seed_type))
+    else:
+        keys.append(('outcome', _text(conviction.get('thesis_timeframe'))))
+        keys.append(('early_failure', _text(conviction.get('thesis_timeframe') or review_ctx.get('thesis_timeframe')), _text(review_ctx.get('thesis_type'))))
+        keys.append(('reentry', instrument_id, _text(review_ctx.get('thesis_timeframe')), _text(review_ctx.get('thesis_type'))))
+    return keys
+
+
+class FeedbackIndex:
+    def __init__(self, retention_hours: int = RETENTION_HOURS):
+        self.retention_ms = int(retention_hours) * 60 * 60 * 1000
+        self._lock = threading.Lock()
+        self._buckets: dict[tuple, list[SimpleNamespace]] = {}
+        self._seen: dict[str, int] = {}  # log id -> ts
+        self._watermark: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, rows: Iterable[Any]) -> int:
+        added = 0
+        with self._lock:
+            for row in rows:
+                row_id = _text(getattr(row, 'id', None))
+                row_type = _text(getattr(row, 'type', None))
+                if row_type not in FEEDBACK_LOG_TYPES or not row_id or row_id in self._seen:
+                    continue
+                ts = int(getattr(row, 'ts', 0) or 0)
+                payload = dict(getattr(row, 'payload', None) or {})
+                event = SimpleNamespace(id=row_id, ts=ts, type=row_type, payload=payload)
+                for key in _bucket_keys(row_type, payload):
+                    self._buckets.setdefault(key, []).append(event)
+                self._seen[row_id] = ts
+                self._watermark = max(self._watermark or 0, ts)
+                added += 1
+        return added
+
+    def prune(self, now_ms: int) -> None:
+        cutoff = int(now_ms) - self.retention_ms
+        with self._lock:
+            for key in list(self._buckets):
+                kept = [event for event in self._buckets[key] if event.ts >= cutoff]
+                if kept:
+                    self._buckets[key] = kept
+                else:
+                    del self._buckets[key]
+            self._seen = {row_id: ts for row_id, ts in self._seen.items() if ts >= cutoff}
+
+    def sync(self, db: Any, *, now_ms: int | None = None) -> int:
+        now_ms = int(now_ms if now_ms is not None else time.time() * 1000)
+        floor = now_ms - self.retention_ms
+        since = floor if self._watermark is None else max(floor, self._watermark - _WATERMARK_OVERLAP_MS)
+        rows = (
+            db.query(DecisionLog)
+            .filter(DecisionLog.ts >= since, DecisionLog.type.in_(list(FEEDBACK_LOG_TYPES)))
+            .all()
+        )
+        added = self.add(rows)
+        self.prune(now_ms)
+        return added
+
+    def rows(self, key: tuple, types: Iterable[str], cutoff_ms: int) -> list[SimpleNamespace]:
+        wanted = set(types)
+        with self._lock:
+            events = list(self._buckets.get(key, ()))
+        return [event for event in events if event.ts >= cutoff_ms and event.type in wanted]
+
+
+_INDEX_LOCK = threading.Lock()
+_INDEXES: OrderedDict[Any, FeedbackIndex] = OrderedDict()  # engine -> index
+
+
+def feedback_index_for(db: Any) -> FeedbackIndex | None:
+    """Synced index for the session's engine; None when the session has no bind (callers fall back to queries)."""
+    try:
+        key = db.get_bind()
+    except Exception:
+        return None
+    with _INDEX_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = FeedbackIndex()
+        _INDEXES.move_to_end(key)
+        while len(_INDEXES) > _INDEXES_MAX:
+            _INDEXES.popitem(last=False)
+    index.sync(db)
+    return index
+
+
+def reset_feedback_indexes() -> None:
+    with _INDEX_LOCK:
+        _INDEXES.clear()
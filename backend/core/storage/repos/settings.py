@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import copy
+import os
+import threading
 import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any
 
 try:
+    from sqlalchemy import inspect as sa_inspect
     from sqlalchemy.orm import Session
 except Exception:  # pragma: no cover - lightweight tests without sqlalchemy
+    sa_inspect = None
+
     class Session:  # type: ignore[override]
         pass
 
@@ -68,6 +77,106 @@ def get_settings(db: Session) -> Settings:
     return selected
 
 
+class SettingsSnapshot:
+    """
+    Read-only copy of the active Settings row for hot read paths.
+
+    Attribute access mirrors the ORM row (`getattr(settings, name, default)`
+    keeps working); `version` is the row's `updated_ts`.
+    """
+
+    __slots__ = ("_values", "version", "loaded_at")
+
+    def __init__(self, values: dict[str, Any], version: int, loaded_at: float):
+        object.__setattr__(self, "_values", MappingProxyType(dict(values)))
+        object.__setattr__(self, "version", int(version or 0))
+        object.__setattr__(self, "loaded_at", float(loaded_at))
+
+    @classmethod
+    def from_row(cls, row: Settings) -> "SettingsSnapshot":
+        values = {}
+        for attr in sa_inspect(type(row)).column_attrs:
+            value = getattr(row, attr.key)
+            values[attr.key] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        return cls(values, version=int(values.get("updated_ts") or 0), loaded_at=time.monotonic())
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("SettingsSnapshot is read-only; update settings through update_settings()")
+
+    def __reduce__(self):
+        return (SettingsSnapshot, (dict(self._values), self.version, self.loaded_at))
+
+    def __repr__(self) -> str:
+        return f"SettingsSnapshot(id={self._values.get('id')}, version={self.version})"
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self._values)
+
+
+_SNAPSHOT_TTL_SEC = max(0.0, float(os.getenv("SETTINGS_SNAPSHOT_TTL_SEC", "10") or "10"))
+_SNAPSHOT_LOCK = threading.Lock()
+_SNAPSHOT_CACHE: OrderedDict[Any, SettingsSnapshot] = OrderedDict()  # engine -> snapshot
+_SNAPSHOT_CACHE_MAX = 8
+
+
+def _snapshot_key(db: Session) -> Any:
+    try:
+        return db.get_bind()
+    except Exception:
+        return None
+
+
+def _is_settings_row(row: Any) -> bool:
+    return sa_inspect is not None and isinstance(Settings, type) and isinstance(row, Settings)
+
+
+def _store_snapshot(key: Any, row: Settings) -> SettingsSnapshot:
+    snapshot = SettingsSnapshot.from_row(row)
+    if key is None:
+        return snapshot
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOT_CACHE[key] = snapshot
+        _SNAPSHOT_CACHE.move_to_end(key)
+        while len(_SNAPSHOT_CACHE) > _SNAPSHOT_CACHE_MAX:
+            _SNAPSHOT_CACHE.popitem(last=False)
+    return snapshot
+
+
+def get_settings_snapshot(db: Session) -> SettingsSnapshot | Settings:
+    """
+    Cached active settings for read-only callers (worker loops, risk, status).
+
+    Refreshed after `SETTINGS_SNAPSHOT_TTL_SEC` or when a `settings_updated`
+    event invalidates it. Callers that modify settings must keep using
+    `get_settings()`.
+    """
+    key = _snapshot_key(db)
+    if key is not None:
+        with _SNAPSHOT_LOCK:
+            cached = _SNAPSHOT_CACHE.get(key)
+        if cached is not None and time.monotonic() - cached.loaded_at < _SNAPSHOT_TTL_SEC:
+            return cached
+    row = get_settings(db)
+    if not _is_settings_row(row):
+        return row
+    return _store_snapshot(key, row)
+
+
+def invalidate_settings_snapshot(version: int | None = None) -> int:
+    """Drop cached snapshots older than `version` (all of them when None). Returns how many were dropped."""
+    with _SNAPSHOT_LOCK:
+        stale = [key for key, snapshot in _SNAPSHOT_CACHE.items() if version is None or snapshot.version != int(version)]
+        for key in stale:
+            del _SNAPSHOT_CACHE[key]
+    return len(stale)
+
+
 def update_settings(db: Session, update_data: schemas.RiskSettings) -> Settings:
     settings = get_settings(db)
 
@@ -328,6 +437,8 @@ def update_settings(db: Session, update_data: schemas.RiskSettings) -> Settings:
     settings.is_active = True
     db.commit()
     db.refresh(settings)
+    if _is_settings_row(settings):
+        _store_snapshot(_snapshot_key(db), settings)
     return settings
 
 
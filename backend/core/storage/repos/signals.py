@@ -5,6 +5,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from core.storage.models import DecisionLog, Signal
+from core.storage.repos.feedback_index import FeedbackIndex, feedback_index_for
 
 
 def _safe_float(value, default: float = 0.0) -> float:
@@ -36,19 +37,22 @@ def _pending_review_priority(signal: Signal) -> tuple[int, int, int, int]:
     return (approval, queue_priority, confidence_bias, created_ts, ts)
 
 
-def _execution_feedback_bonus(db: Session, signal: Signal, *, lookback_hours: int = 24) -> int:
+def _feedback_rows(db: Session, types: tuple[str, ...], *, lookback_hours: int, index: FeedbackIndex | None, key: tuple) -> list:
+    cutoff = int(time.time() * 1000) - int(max(1, lookback_hours)) * 60 * 60 * 1000
+    if index is not None:
+        return index.rows(key, types, cutoff)
+    type_filter = DecisionLog.type == types[0] if len(types) == 1 else DecisionLog.type.in_(list(types))
+    return db.query(DecisionLog).filter(DecisionLog.ts >= cutoff, type_filter).all()
+
+
+def _execution_feedback_bonus(db: Session, signal: Signal, *, lookback_hours: int = 24, index: FeedbackIndex | None = None) -> int:
     meta = dict(getattr(signal, 'meta', None) or {})
     review = dict(meta.get('review_readiness') or {})
     thesis_tf = str(review.get('thesis_timeframe') or '')
     thesis_type = str(review.get('thesis_type') or '')
     if not thesis_tf or not thesis_type:
         return 0
-    cutoff = int(time.time() * 1000) - int(max(1, lookback_hours)) * 60 * 60 * 1000
-    rows = (
-        db.query(DecisionLog)
-        .filter(DecisionLog.ts >= cutoff, DecisionLog.type == 'trade_filled')
-        .all()
-    )
+    rows = _feedback_rows(db, ('trade_filled',), lookback_hours=lookback_hours, index=index, key=('execution', thesis_tf, thesis_type))
     bonus = 0
     now_ms = int(time.time() * 1000)
     for row in rows:
@@ -67,19 +71,14 @@ def _execution_feedback_bonus(db: Session, signal: Signal, *, lookback_hours: in
     return bonus
 
 
-def _outcome_feedback_bonus(db: Session, signal: Signal, *, lookback_hours: int = 24) -> int:
+def _outcome_feedback_bonus(db: Session, signal: Signal, *, lookback_hours: int = 24, index: FeedbackIndex | None = None) -> int:
     meta = dict(getattr(signal, 'meta', None) or {})
     review = dict(meta.get('review_readiness') or {})
     thesis_tf = str(review.get('thesis_timeframe') or '')
     thesis_type = str(review.get('thesis_type') or '')
     if not thesis_tf or not thesis_type:
         return 0
-    cutoff = int(time.time() * 1000) - int(max(1, lookback_hours)) * 60 * 60 * 1000
-    rows = (
-        db.query(DecisionLog)
-        .filter(DecisionLog.ts >= cutoff, DecisionLog.type == 'position_closed')
-        .all()
-    )
+    rows = _feedback_rows(db, ('position_closed',), lookback_hours=lookback_hours, index=index, key=('outcome', thesis_tf))
     bonus = 0
     now_ms = int(time.time() * 1000)
     for row in rows:
@@ -97,7 +96,7 @@ def _outcome_feedback_bonus(db: Session, signal: Signal, *, lookback_hours: int
     return bonus
 
 
-def _symbol_thesis_learning_bias(db: Session, signal: Signal, *, lookback_hours: int = 24) -> int:
+def _symbol_thesis_learning_bias(db: Session, signal: Signal, *, lookback_hours: int = 24, index: FeedbackIndex | None = None) -> int:
     meta = dict(getattr(signal, 'meta', None) or {})
     review = dict(meta.get('review_readiness') or {})
     thesis_tf = str(review.get('thesis_timeframe') or '')
@@ -105,12 +104,7 @@ def _symbol_thesis_learning_bias(db: Session, signal: Signal, *, lookback_hours:
     instrument_id = str(getattr(signal, 'instrument_id', '') or '')
     if not thesis_tf or not thesis_type or not instrument_id:
         return 0
-    cutoff = int(time.time() * 1000) - int(max(1, lookback_hours)) * 60 * 60 * 1000
-    rows = (
-        db.query(DecisionLog)
-        .filter(DecisionLog.ts >= cutoff, DecisionLog.type.in_(['trade_filled', 'position_closed']))
-        .all()
-    )
+    rows = _feedback_rows(db, ('trade_filled', 'position_closed'), lookback_hours=lookback_hours, index=index, key=('symbol', thesis_tf, thesis_type, instrument_id))
     bonus = 0
     now_ms = int(time.time() * 1000)
     for row in rows:
@@ -138,7 +132,7 @@ def _symbol_thesis_learning_bias(db: Session, signal: Signal, *, lookback_hours:
     return bonus
 
 
-def _regime_aware_learning_bias(db: Session, signal: Signal, *, lookback_hours: int = 24) -> int:
+def _regime_aware_learning_bias(db: Session, signal: Signal, *, lookback_hours: int = 24, index: FeedbackIndex | None = None) -> int:
     meta = dict(getattr(signal, 'meta', None) or {})
     review = dict(meta.get('review_readiness') or {})
     conviction = dict(meta.get('conviction_profile') or {})
@@ -148,12 +142,7 @@ def _regime_aware_learning_bias(db: Session, signal: Signal, *, lookback_hours:
     regime = str(conviction.get('regime') or meta.get('market_regime') or '')
     if not instrument_id or not thesis_tf or not thesis_type or not regime:
         return 0
-    cutoff = int(time.time() * 1000) - int(max(1, lookback_hours)) * 60 * 60 * 1000
-    rows = (
-        db.query(DecisionLog)
-        .filter(DecisionLog.ts >= cutoff, DecisionLog.type.in_(['trade_filled', 'position_closed']))
-        .all()
-    )
+    rows = _feedback_rows(db, ('trade_filled', 'position_closed'), lookback_hours=lookback_hours, index=index, key=('regime', instrument_id, thesis_tf, thesis_type, regime))
     bonus = 0
     now_ms = int(time.time() * 1000)
     for row in rows:
@@ -181,16 +170,11 @@ def _regime_aware_learning_bias(db: Session, signal: Signal, *, lookback_hours:
     return bonus
 
 
-def _instrument_fatigue_bias(db: Session, signal: Signal, *, lookback_hours: int = 6) -> int:
+def _instrument_fatigue_bias(db: Session, signal: Signal, *, lookback_hours: int = 6, index: FeedbackIndex | None = None) -> int:
     instrument_id = str(getattr(signal, 'instrument_id', '') or '')
     if not instrument_id:
         return 0
-    cutoff = int(time.time() * 1000) - int(max(1, lookback_hours)) * 60 * 60 * 1000
-    rows = (
-        db.query(DecisionLog)
-        .filter(DecisionLog.ts >= cutoff, DecisionLog.type.in_(['trade_filled', 'position_closed']))
-        .all()
-    )
+    rows = _feedback_rows(db, ('trade_filled', 'position_closed'), lookback_hours=lookback_hours, index=index, key=('instrument', instrument_id))
     touches = 0
     negative = 0
     for row in rows:
@@ -206,7 +190,7 @@ def _instrument_fatigue_bias(db: Session, signal: Signal, *, lookback_hours: int
     return -penalty
 
 
-def _early_failure_cluster_bias(db: Session, signal: Signal, *, lookback_hours: int = 6) -> int:
+def _early_failure_cluster_bias(db: Session, signal: Signal, *, lookback_hours: int = 6, index: FeedbackIndex | None = None) -> int:
     meta = dict(getattr(signal, 'meta', None) or {})
     review = dict(meta.get('review_readiness') or {})
     thesis_tf = str(review.get('thesis_timeframe') or '')
@@ -214,12 +198,7 @@ def _early_failure_cluster_bias(db: Session, signal: Signal, *, lookback_hours:
     instrument_id = str(getattr(signal, 'instrument_id', '') or '')
     if not thesis_tf or not thesis_type:
         return 0
-    cutoff = int(time.time() * 1000) - int(max(1, lookback_hours)) * 60 * 60 * 1000
-    rows = (
-        db.query(DecisionLog)
-        .filter(DecisionLog.ts >= cutoff, DecisionLog.type == 'position_closed')
-        .all()
-    )
+    rows = _feedback_rows(db, ('position_closed',), lookback_hours=lookback_hours, index=index, key=('early_failure', thesis_tf, thesis_type))
     penalty = 0
     for row in rows:
         payload = dict(getattr(row, 'payload', None) or {})
@@ -240,7 +219,7 @@ def _early_failure_cluster_bias(db: Session, signal: Signal, *, lookback_hours:
     return -min(15, penalty)
 
 
-def _thesis_reentry_bias(db: Session, signal: Signal, *, lookback_hours: int = 6) -> int:
+def _thesis_reentry_bias(db: Session, signal: Signal, *, lookback_hours: int = 6, index: FeedbackIndex | None = None) -> int:
     meta = dict(getattr(signal, 'meta', None) or {})
     review = dict(meta.get('review_readiness') or {})
     thesis_tf = str(review.get('thesis_timeframe') or '')
@@ -249,12 +228,7 @@ def _thesis_reentry_bias(db: Session, signal: Signal, *, lookback_hours: int = 6
     instrument_id = str(getattr(signal, 'instrument_id', '') or '')
     if thesis_tf not in {'5m', '15m'} or thesis_type not in {'continuation', 'timeframe_signal', 'context_alignment'} or selection_reason not in {'requested', 'confirmation'}:
         return 0
-    cutoff = int(time.time() * 1000) - int(max(1, lookback_hours)) * 60 * 60 * 1000
-    rows = (
-        db.query(DecisionLog)
-        .filter(DecisionLog.ts >= cutoff, DecisionLog.type == 'position_closed')
-        .all()
-    )
+    rows = _feedback_rows(db, ('position_closed',), lookback_hours=lookback_hours, index=index, key=('reentry', instrument_id, thesis_tf, thesis_type))
     for row in rows:
         payload = dict(getattr(row, 'payload', None) or {})
         review_ctx = dict(payload.get('review_readiness') or {})
@@ -363,15 +337,16 @@ def _throughput_preserving_bonus(signal: Signal) -> int:
     return 0
 
 
-def _confidence_shaping_bias(db: Session, signal: Signal) -> int:
+def _confidence_shaping_bias(db: Session, signal: Signal, index: FeedbackIndex | None = None) -> int:
+    feedback = {'index': index} if index is not None else {}
     return (
-        _execution_feedback_bonus(db, signal)
-        + _outcome_feedback_bonus(db, signal)
-        + _symbol_thesis_learning_bias(db, signal)
-        + _regime_aware_learning_bias(db, signal)
-        + _instrument_fatigue_bias(db, signal)
-        + _early_failure_cluster_bias(db, signal)
-        + _thesis_reentry_bias(db, signal)
+        _execution_feedback_bonus(db, signal, **feedback)
+        + _outcome_feedback_bonus(db, signal, **feedback)
+        + _symbol_thesis_learning_bias(db, signal, **feedback)
+        + _regime_aware_learning_bias(db, signal, **feedback)
+        + _instrument_fatigue_bias(db, signal, **feedback)
+        + _early_failure_cluster_bias(db, signal, **feedback)
+        + _thesis_reentry_bias(db, signal, **feedback)
         + _diversification_bias(db, signal)
         + _correlation_nudge(db, signal)
         + _session_phase_bias(signal)
@@ -379,12 +354,12 @@ def _confidence_shaping_bias(db: Session, signal: Signal) -> int:
     )
 
 
-def _apply_confidence_shaping(db: Session, signal: Signal) -> None:
+def _apply_confidence_shaping(db: Session, signal: Signal, index: FeedbackIndex | None = None) -> None:
     meta = dict(getattr(signal, 'meta', None) or {})
     review = dict(meta.get('review_readiness') or {})
     if not review:
         return
-    bias = int(_confidence_shaping_bias(db, signal))
+    bias = int(_confidence_shaping_bias(db, signal, index) if index is not None else _confidence_shaping_bias(db, signal))
     review['confidence_bias'] = bias
     review['confidence_multiplier'] = round(max(0.8, min(1.35, 1.0 + (bias / 100.0))), 2)
     meta['review_readiness'] = review
@@ -397,8 +372,9 @@ def list_signals(db: Session, limit: int = 50, status: str = None) -> List[Signa
         query = query.filter(Signal.status == status)
     rows = query.order_by(Signal.created_ts.desc(), Signal.ts.desc()).limit(limit).all()
     if status == 'pending_review':
+        index = feedback_index_for(db) if rows else None
         for row in rows:
-            _apply_confidence_shaping(db, row)
+            _apply_confidence_shaping(db, row, index)
         return sorted(rows, key=_pending_review_priority, reverse=True)
     return rows
 
@@ -416,9 +392,11 @@ def get_top_pending_review_candidate(db: Session, *, ttl_sec: int = 900) -> Opti
         review = dict(meta.get('review_readiness') or {})
         if bool(review.get('approval_candidate')):
             approval_rows.append(row)
+    index = feedback_index_for(db)
+    feedback = {'index': index} if index is not None else {}
     if approval_rows:
-        return max(approval_rows, key=lambda row: (_pending_review_priority(row), _confidence_shaping_bias(db, row)))
-    return max(fresh_rows, key=lambda row: (_pending_review_priority(row), _confidence_shaping_bias(db, row)))
+        return max(approval_rows, key=lambda row: (_pending_review_priority(row), _confidence_shaping_bias(db, row, **feedback)))
+    return max(fresh_rows, key=lambda row: (_pending_review_priority(row), _confidence_shaping_bias(db, row, **feedback)))
 
 
 def get_oldest_approved_signal(db: Session) -> Optional[Signal]:
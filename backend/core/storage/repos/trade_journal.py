@@ -0,0 +1,449 @@
+"""
+Materialized trade journal.
+
+The immutable `position_closed` decision log stays the source of truth for
+closed trades. Resolving a journal entry from it takes Signal / Trade / Order
+lookups (entry price, side, AI context), so `trade_journal` stores each
+resolved and normalized entry once, keyed by the log id, when the position
+closes. The journal API then pages with an indexed keyset query on
+(close_ts, id) and server-side filters instead of rebuilding the history on
+every request.
+
+`backfill_trade_journal` materializes logs written before the table existed
+(or whose write-time sync failed); the worker runs it once at startup.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Iterator
+
+from sqlalchemy import and_, asc, case, desc, exists, func, or_
+from sqlalchemy.orm import Session
+
+from core.storage.models import DecisionLog, Order, Signal, Trade, TradeJournal
+
+logger = logging.getLogger(__name__)
+
+_EXTRA_KEYS = ('ai_decision', 'ai_confidence', 'de_score', 'ai_influenced', 'ai_mode_used')
+
+
+def find_signal(db: Session, instrument_id: str, opened_ts: int, signal_id: str | None = None) -> Signal | None:
+    if signal_id:
+        linked = db.query(Signal).filter(Signal.id == signal_id).first()
+        if linked:
+            return linked
+    return (
+        db.query(Signal)
+        .filter(
+            Signal.instrument_id == instrument_id,
+            Signal.status == "executed",
+            Signal.ts >= opened_ts - 120_000,
+            Signal.ts <= opened_ts + 120_000,
+        )
+        .order_by(desc(Signal.ts))
+        .first()
+    )
+
+
+def signal_meta(signal: Signal | None) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    meta = (signal.meta or {}) if signal else {}
+    ai_dec = meta.get("ai_decision", {}) if isinstance(meta, dict) else {}
+    de_data = meta.get("decision", {}) if isinstance(meta, dict) else {}
+    return meta, ai_dec, de_data
+
+
+def strategy_name(meta: dict[str, Any], de_data: dict[str, Any], fallback: str | None = None) -> str:
+    return str(
+        fallback
+        or meta.get("multi_strategy", {}).get("selected")
+        or meta.get("strategy")
+        or meta.get("strategy_name")
+        or de_data.get("strategy")
+        or ""
+    )
+
+
+def _find_open_fill(db: Session, payload: dict[str, Any]) -> Trade | None:
+    opened_order_id = payload.get("opened_order_id")
+    instrument_id = payload.get("instrument_id")
+    opened_ts = int(payload.get("opened_ts") or 0)
+    if opened_order_id:
+        trade = db.query(Trade).filter(Trade.order_id == opened_order_id).order_by(asc(Trade.ts)).first()
+        if trade:
+            return trade
+    if instrument_id and opened_ts:
+        return (
+            db.query(Trade)
+            .filter(
+                Trade.instrument_id == instrument_id,
+                Trade.ts >= opened_ts - 120_000,
+                Trade.ts <= opened_ts + 120_000,
+            )
+            .order_by(asc(Trade.ts))
+            .first()
+        )
+    return None
+
+
+def _find_open_order(db: Session, payload: dict[str, Any]) -> Order | None:
+    opened_order_id = payload.get("opened_order_id")
+    instrument_id = payload.get("instrument_id")
+    opened_ts = int(payload.get("opened_ts") or 0)
+    if opened_order_id:
+        order = db.query(Order).filter(Order.order_id == opened_order_id).first()
+        if order:
+            return order
+    if instrument_id and opened_ts:
+        return (
+            db.query(Order)
+            .filter(
+                Order.instrument_id == instrument_id,
+                Order.ts >= opened_ts - 120_000,
+                Order.ts <= opened_ts + 120_000,
+                Order.status == "FILLED",
+            )
+            .order_by(asc(Order.ts))
+            .first()
+        )
+    return None
+
+
+def build_closed_entry(db: Session, log: DecisionLog) -> dict[str, Any]:
+    """Resolve a `position_closed` log into a journal entry (one Signal/Trade/Order lookup each)."""
+    payload = (log.payload or {}) if isinstance(log.payload, dict) else {}
+    instrument_id = str(payload.get("instrument_id") or "")
+    opened_ts = int(payload.get("opened_ts") or 0)
+    closed_ts = int(payload.get("closed_ts") or log.ts or 0)
+    signal = find_signal(db, instrument_id, opened_ts, payload.get("signal_id"))
+    meta, ai_dec, de_data = signal_meta(signal)
+
+    open_trade = _find_open_fill(db, payload)
+    open_order = _find_open_order(db, payload)
+
+    entry_price = 0.0
+    entry_qty = 0.0
+    side = ""
+    trace_id = payload.get("trace_id") or meta.get("trace_id")
+    strategy = strategy_name(meta, de_data, payload.get("strategy_name"))
+    opened_order_id = payload.get("opened_order_id")
+    closed_order_id = payload.get("closed_order_id")
+
+    if open_trade:
+        entry_price = float(open_trade.price or 0)
+        entry_qty = float(open_trade.qty or 0)
+        side = str(open_trade.side or "")
+        trace_id = trace_id or getattr(open_trade, "trace_id", None)
+        strategy = strategy or getattr(open_trade, "strategy", None) or ""
+        opened_order_id = opened_order_id or getattr(open_trade, "order_id", None)
+    elif open_order:
+        entry_price = float(open_order.price or 0)
+        entry_qty = float(open_order.filled_qty or open_order.qty or 0)
+        side = str(open_order.side or "")
+        trace_id = trace_id or getattr(open_order, "trace_id", None)
+        strategy = strategy or getattr(open_order, "strategy", None) or ""
+        opened_order_id = opened_order_id or getattr(open_order, "order_id", None)
+
+    if not entry_qty:
+        entry_qty = float(payload.get("opened_qty") or payload.get("qty") or 0)
+    close_qty = float(payload.get("qty") or payload.get("closed_qty") or entry_qty or 0)
+
+    close_price = float(payload.get("close_price") or 0)
+    realized_pnl = payload.get("net_pnl")
+    if realized_pnl is None:
+        realized_pnl = payload.get("gross_pnl")
+    realized_pnl = round(float(realized_pnl or 0.0), 2)
+
+    duration_sec = 0
+    if opened_ts and closed_ts:
+        duration_sec = max(0, int((closed_ts - opened_ts) / 1000))
+
+    entry_id = str(log.id or f"{instrument_id}_{closed_ts}")
+    return {
+        "id": entry_id,
+        "source": "closed_trade",
+        "signal_id": getattr(signal, "id", None) if signal else payload.get("signal_id"),
+        "trace_id": trace_id,
+        "opened_order_id": opened_order_id,
+        "closed_order_id": closed_order_id,
+        "ts": closed_ts,
+        "opened_ts": opened_ts,
+        "instrument_id": instrument_id,
+        "side": side,
+        "entry_price": round(float(entry_price or 0), 4),
+        "close_price": round(close_price, 4) if close_price else 0.0,
+        "qty": float(close_qty or 0.0),
+        "realized_pnl": realized_pnl,
+        "fees_est": round(float(payload.get("fees_est") or 0.0), 6),
+        "close_reason": str(payload.get("reason") or ""),
+        "duration_sec": duration_sec,
+        "strategy": strategy,
+        "ai_decision": ai_dec.get("decision", ""),
+        "ai_confidence": ai_dec.get("confidence"),
+        "de_score": de_data.get("score_pct") or de_data.get("score"),
+        "ai_influenced": bool(getattr(signal, "ai_influenced", False)) if signal else False,
+        "ai_mode_used": getattr(signal, "ai_mode_used", None) if signal else None,
+    }
+
+
+def is_closed_journal_item(entry: dict[str, Any]) -> bool:
+    if not entry:
+        return False
+    if str(entry.get("source") or "") != "closed_trade":
+        return False
+    if str(entry.get("close_reason") or "").upper() == "OPEN":
+        return False
+    try:
+        close_price = float(entry.get("close_price") or 0)
+        qty = float(entry.get("qty") or 0)
+    except Exception:
+        return False
+    if close_price <= 0 or qty <= 0:
+        return False
+    return True
+
+
+def recalc_realized_pnl(entry: dict[str, Any]) -> float:
+    try:
+        pnl = float(entry.get("realized_pnl") or 0.0)
+        if abs(pnl) > 1e-9:
+            return round(pnl, 2)
+        entry_price = float(entry.get("entry_price") or 0.0)
+        close_price = float(entry.get("close_price") or 0.0)
+        qty = float(entry.get("qty") or 0.0)
+        side = str(entry.get("side") or "").upper()
+        if entry_price <= 0 or close_price <= 0 or qty <= 0 or side not in {"BUY", "SELL"}:
+            return round(pnl, 2)
+        gross = (close_price - entry_price) * qty if side == "BUY" else (entry_price - close_price) * qty
+        fees = float(entry.get("fees_est") or 0.0)
+        return round(gross - fees, 2)
+    except Exception:
+        return round(float(entry.get("realized_pnl") or 0.0), 2)
+
+
+def normalize_closed_entry(entry: dict[str, Any]) -> dict[str, Any] | None:
+    if not is_closed_journal_item(entry):
+        return None
+    normalized = dict(entry)
+    normalized["realized_pnl"] = recalc_realized_pnl(normalized)
+    return normalized
+
+
+def _float(value: Any) -> float:
+    return float(value) if value is not None else 0.0
+
+
+def entry_from_row(row: TradeJournal) -> dict[str, Any]:
+    """API shape of a journal row (the dict `build_closed_entry` + normalization produced)."""
+    extra = dict(row.extra or {})
+    return {
+        "id": row.id,
+        "source": "closed_trade",
+        "signal_id": row.signal_id,
+        "trace_id": row.trace_id,
+        "opened_order_id": row.opened_order_id,
+        "closed_order_id": row.closed_order_id,
+        "ts": int(row.close_ts or 0),
+        "opened_ts": int(row.opened_ts or 0),
+        "instrument_id": row.instrument_id,
+        "side": row.side or "",
+        "entry_price": _float(row.entry_price),
+        "close_price": _float(row.close_price),
+        "qty": _float(row.qty),
+        "realized_pnl": round(_float(row.realized_pnl), 2),
+        "fees_est": _float(row.fees_est),
+        "close_reason": row.close_reason or "",
+        "duration_sec": int(row.duration_sec or 0),
+        "strategy": row.strategy or "",
+        "ai_decision": extra.get("ai_decision", ""),
+        "ai_confidence": extra.get("ai_confidence"),
+        "de_score": extra.get("de_score"),
+        "ai_influenced": bool(extra.get("ai_influenced", False)),
+        "ai_mode_used": extra.get("ai_mode_used"),
+    }
+
+
+def record_closed_position(db: Session, log: DecisionLog) -> TradeJournal | None:
+    """Upsert the journal row for `log`; None when the log is not a complete closed trade. Flushes, does not commit."""
+    entry = normalize_closed_entry(build_closed_entry(db, log))
+    if entry is None:
+        return None
+    row = db.get(TradeJournal, entry["id"]) or TradeJournal(id=entry["id"])
+    row.close_ts = int(entry["ts"] or 0)
+    row.opened_ts = int(entry["opened_ts"] or 0) or None
+    row.instrument_id = entry["instrument_id"]
+    row.side = entry["side"] or None
+    row.strategy = entry["strategy"] or None
+    row.close_reason = entry["close_reason"] or None
+    row.entry_price = entry["entry_price"]
+    row.close_price = entry["close_price"]
+    row.qty = entry["qty"]
+    row.realized_pnl = entry["realized_pnl"]
+    row.fees_est = entry["fees_est"]
+    row.duration_sec = entry["duration_sec"]
+    row.signal_id = entry["signal_id"]
+    row.trace_id = entry["trace_id"]
+    row.opened_order_id = entry["opened_order_id"]
+    row.closed_order_id = entry["closed_order_id"]
+    row.extra = {key: entry.get(key) for key in _EXTRA_KEYS}
+    db.add(row)
+    db.flush()
+    return row
+
+
+def backfill_trade_journal(db: Session, *, batch_size: int = 500, limit: int | None = None) -> dict[str, int]:
+    """
+    Materialize `position_closed` logs that have no journal row, oldest first,
+    committing per entry so one bad log cannot roll back its batch. Logs that are not complete closed trades are skipped
+    (and re-checked on the next run).
+    """
+    missing = ~exists().where(TradeJournal.id == DecisionLog.id)
+    scanned = stored = 0
+    cursor: tuple[int, str] | None = None
+    while limit is None or scanned < limit:
+        query = db.query(DecisionLog).filter(DecisionLog.type == "position_closed", missing)
+        if cursor is not None:
+            query = query.filter(or_(DecisionLog.ts > cursor[0], and_(DecisionLog.ts == cursor[0], DecisionLog.id > cursor[1])))
+        logs = query.order_by(asc(DecisionLog.ts), asc(DecisionLog.id)).limit(batch_size).all()
+        if not logs:
+            break
+        for log in logs:
+            scanned += 1
+            log_id, log_ts = str(log.id), int(log.ts)
+            try:
+                if record_closed_position(db, log) is not None:
+                    stored += 1
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.warning("Trade journal backfill skipped log id=%s", log_id, exc_info=True)
+            cursor = (log_ts, log_id)
+    return {"scanned": scanned, "stored": stored}
+
+
+def encode_cursor(row: TradeJournal) -> str:
+    return f"{int(row.close_ts)}:{row.id}"
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    ts, sep, row_id = str(cursor or "").partition(":")
+    if not sep or not row_id or not ts.lstrip("-").isdigit():
+        raise ValueError("Invalid journal cursor")
+    return int(ts), row_id
+
+
+def _filtered(
+    db: Session,
+    *,
+    instrument: str | None = None,
+    side: str | None = None,
+    outcome: str | None = None,
+    strategy: str | None = None,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+):
+    query = db.query(TradeJournal)
+    if instrument:
+        query = query.filter(TradeJournal.instrument_id == instrument)
+    if side:
+        query = query.filter(func.upper(TradeJournal.side) == side.upper())
+    if outcome == "profit":
+        query = query.filter(TradeJournal.realized_pnl > 0)
+    elif outcome == "loss":
+        query = query.filter(TradeJournal.realized_pnl < 0)
+    if strategy:
+        query = query.filter(func.lower(TradeJournal.strategy).contains(strategy.lower(), autoescape=True))
+    if from_ts:
+        query = query.filter(TradeJournal.close_ts >= from_ts)
+    if to_ts:
+        query = query.filter(TradeJournal.close_ts <= to_ts)
+    return query
+
+
+def list_journal(
+    db: Session,
+    *,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+    sort_dir: str = "desc",
+    with_total: bool = True,
+    **filters: Any,
+) -> dict[str, Any]:
+    """
+    One journal page. With `cursor` (the previous page's `next_cursor`) the
+    page is a keyset seek on (close_ts, id) and `offset` is ignored.
+    """
+    query = _filtered(db, **filters)
+    total = query.order_by(None).count() if with_total else None
+    ascending = sort_dir == "asc"
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        if ascending:
+            query = query.filter(or_(TradeJournal.close_ts > ts, and_(TradeJournal.close_ts == ts, TradeJournal.id > row_id)))
+        else:
+            query = query.filter(or_(TradeJournal.close_ts < ts, and_(TradeJournal.close_ts == ts, TradeJournal.id < row_id)))
+        offset = 0
+    order = (asc(TradeJournal.close_ts), asc(TradeJournal.id)) if ascending else (desc(TradeJournal.close_ts), desc(TradeJournal.id))
+    rows = query.order_by(*order).offset(offset).limit(limit + 1).all()
+    page = rows[:limit]
+    return {
+        "items": [entry_from_row(row) for row in page],
+        "total": total,
+        "next_cursor": encode_cursor(page[-1]) if len(rows) > limit and page else None,
+    }
+
+
+def iter_journal(db: Session, *, from_ts: int | None = None, to_ts: int | None = None, batch_size: int = 1000) -> Iterator[dict[str, Any]]:
+    """Journal entries newest first, fetched in keyset batches."""
+    cursor = None
+    while True:
+        page = list_journal(db, limit=batch_size, cursor=cursor, with_total=False, from_ts=from_ts, to_ts=to_ts)
+        yield from page["items"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return
+
+
+def journal_stats(db: Session, *, from_ts: int | None = None, to_ts: int | None = None) -> dict[str, Any]:
+    """Summary aggregates computed in SQL over the filtered journal."""
+    pnl = TradeJournal.realized_pnl
+    base = _filtered(db, from_ts=from_ts, to_ts=to_ts)
+    row = base.with_entities(
+        func.count(TradeJournal.id),
+        func.coalesce(func.sum(pnl), 0),
+        func.sum(case((pnl > 0, 1), else_=0)),
+        func.coalesce(func.sum(case((pnl > 0, pnl), else_=0)), 0),
+        func.sum(case((pnl < 0, 1), else_=0)),
+        func.coalesce(func.sum(case((pnl < 0, pnl), else_=0)), 0),
+        func.max(case((pnl > 0, pnl))),
+        func.min(case((pnl < 0, pnl))),
+        func.avg(case((TradeJournal.duration_sec > 0, TradeJournal.duration_sec))),
+    ).one()
+    count, total_pnl, wins, wins_sum, losses, losses_sum, best, worst, avg_duration = row
+    count = int(count or 0)
+    if not count:
+        return {
+            "total_trades": 0,
+            "win_rate": 0,
+            "total_pnl": 0,
+            "avg_trade_pnl": 0,
+            "best_trade": 0,
+            "worst_trade": 0,
+            "wins_count": 0,
+            "losses_count": 0,
+            "profit_factor": None,
+            "avg_duration_sec": 0,
+        }
+    total_pnl, wins_sum, losses_sum = float(total_pnl), float(wins_sum), abs(float(losses_sum))
+    return {
+        "total_trades": count,
+        "win_rate": round(int(wins or 0) / count * 100, 1),
+        "total_pnl": round(total_pnl, 2),
+        "avg_trade_pnl": round(total_pnl / count, 2),
+        "best_trade": round(float(best), 2) if best is not None else 0,
+        "worst_trade": round(float(worst), 2) if worst is not None else 0,
+        "wins_count": int(wins or 0),
+        "losses_count": int(losses or 0),
+        "profit_factor": round(wins_sum / losses_sum, 2) if losses_sum > 0 else None,
+        "avg_duration_sec": round(float(avg_duration)) if avg_duration is not None else 0,
+    }
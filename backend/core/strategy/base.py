@@ -23,10 +23,14 @@ class BaseStrategy(ABC):
         ...
 
     @abstractmethod
-    def analyze(self, instrument_id: str, candles: list[dict]) -> Optional[dict]:
+    def analyze(self, instrument_id: str, candles: list[dict], indicators: Optional[dict] = None) -> Optional[dict]:
         """
         Analyze candle history and return a signal dict or None.
 
+        `indicators` is an optional streaming snapshot
+        (apps.worker.decision_engine.streaming) for exactly `candles`;
+        strategies may read from it instead of recomputing from bar 0.
+
         Signal dict keys: id, instrument_id, ts, side, entry, sl, tp, size, r,
                           status, reason, meta
         """
@@ -37,8 +37,10 @@ def _calc_atr(candles: list, period: int = 14) -> float:
 
 class BreakoutStrategy(BaseStrategy):
 
-    def __init__(self, lookback: int = 20):
+    def __init__(self, lookback: int = 20, sl_atr: float = 2.0, tp_atr: float = 3.0):
         self._lookback = lookback
+        self.sl_atr = sl_atr
+        self.tp_atr = tp_atr
 
     @property
     def name(self) -> str:
@@ -48,10 +50,13 @@ class BreakoutStrategy(BaseStrategy):
     def lookback(self) -> int:
         return self._lookback
 
-    def analyze(self, instrument_id: str, candles: List[dict]) -> Optional[dict]:
+    def analyze(self, instrument_id: str, candles: List[dict], indicators: Optional[dict] = None) -> Optional[dict]:
         """
         Анализирует историю свечей.
         Возвращает dict сигнала или None.
+
+        Работает только с хвостом lookback/20 свечей, поэтому потоковые
+        индикаторы (`indicators`) не нужны и игнорируются.
         """
         if len(candles) < self._lookback:
             return None
@@ -78,14 +83,14 @@ class BreakoutStrategy(BaseStrategy):
         # ── BUY: пробой вверх ─────────────────────────────────────────────────
         if current_close > range_high:
             signal_side = "BUY"
-            sl = current_close - atr * 2.0   # SL = 2×ATR ниже входа
-            tp = current_close + atr * 3.0   # TP = 3×ATR выше входа (R/R = 1.5)
+            sl = current_close - atr * self.sl_atr   # SL = 2×ATR ниже входа
+            tp = current_close + atr * self.tp_atr   # TP = 3×ATR выше входа (R/R = 1.5)
 
         # ── SELL: пробой вниз (P2-03 новая логика) ────────────────────────────
         elif current_close < range_low:
             signal_side = "SELL"
-            sl = current_close + atr * 2.0   # SL = 2×ATR выше входа
-            tp = current_close - atr * 3.0   # TP = 3×ATR ниже входа (R/R = 1.5)
+            sl = current_close + atr * self.sl_atr   # SL = 2×ATR выше входа
+            tp = current_close - atr * self.tp_atr   # TP = 3×ATR ниже входа (R/R = 1.5)
 
         if not signal_side:
             return None
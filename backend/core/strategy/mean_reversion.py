@@ -22,6 +22,9 @@ from core.strategy.base import BaseStrategy
 from apps.worker.decision_engine.indicators import (
     calc_bollinger, calc_stochastic, calc_atr,
 )
+from apps.worker.decision_engine.streaming import (
+    BB_PERIOD, BB_STD, STOCH_PERIODS, matching_snapshot,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -38,31 +41,45 @@ class MeanReversionStrategy(BaseStrategy):
 
 
     def __init__(self, bb_period: int = 20, bb_std: float = 2.0,
-                 stoch_k: int = 14, stoch_d: int = 3):
+                 stoch_k: int = 14, stoch_d: int = 3, sl_atr: float = 1.5):
         self.bb_period = bb_period
         self.bb_std = bb_std
         self.stoch_k = stoch_k
         self.stoch_d = stoch_d
+        self.sl_atr = sl_atr
+
+    def _uses_streaming_defaults(self) -> bool:
+        return (
+            (self.bb_period, self.bb_std) == (BB_PERIOD, BB_STD)
+            and (self.stoch_k, self.stoch_d) == STOCH_PERIODS
+        )
 
-    def analyze(self, instrument_id: str, candles: list[dict]) -> Optional[dict]:
+    def analyze(self, instrument_id: str, candles: list[dict], indicators: Optional[dict] = None) -> Optional[dict]:
         if len(candles) < self.lookback:
             return None
 
-        closes = [float(c["close"]) for c in candles]
-        highs  = [float(c["high"])  for c in candles]
-        lows   = [float(c["low"])   for c in candles]
+        streamed = matching_snapshot(indicators, candles) if self._uses_streaming_defaults() else None
+        if streamed is not None:
+            bb = streamed.get("bollinger")
+            stoch = streamed.get("stochastic")
+            atr = streamed.get("atr_14")
+            current = float(candles[-1]["close"])
+        else:
+            closes = [float(c["close"]) for c in candles]
+            highs  = [float(c["high"])  for c in candles]
+            lows   = [float(c["low"])   for c in candles]
+            bb = calc_bollinger(closes, self.bb_period, self.bb_std)
+            stoch = calc_stochastic(highs, lows, closes, self.stoch_k, self.stoch_d)
+            atr = calc_atr(highs, lows, closes, 14)
+            current = closes[-1]
 
-        bb = calc_bollinger(closes, self.bb_period, self.bb_std)
         if not bb:
             return None
         upper, middle, lower = bb
 
-        stoch = calc_stochastic(highs, lows, closes, self.stoch_k, self.stoch_d)
-        atr = calc_atr(highs, lows, closes, 14)
         if atr is None or atr < 1e-9:
-            atr = closes[-1] * 0.005
+            atr = current * 0.005
 
-        current = closes[-1]
         side = None
         entry = current
 
@@ -70,14 +87,14 @@ class MeanReversionStrategy(BaseStrategy):
         if current < lower:
             if stoch is None or stoch[0] < 35:  # K < 35 = oversold confirmation
                 side = "BUY"
-                sl = entry - atr * 1.5    # below current entry price
+                sl = entry - atr * self.sl_atr    # below current entry price
                 tp = middle               # target = mean
 
         # SELL: price above upper band + stochastic overbought
         elif current > upper:
             if stoch is None or stoch[0] > 65:  # K > 65 = overbought confirmation
                 side = "SELL"
-                sl = entry + atr * 1.5    # above current entry price
+                sl = entry + atr * self.sl_atr    # above current entry price
                 tp = middle
 
         if not side:
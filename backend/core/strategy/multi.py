@@ -47,11 +47,14 @@ class CompositeStrategy(BaseStrategy):
     def strategies(self) -> list[BaseStrategy]:
         return list(self._strategies)
 
-    def analyze(self, instrument_id: str, candles: list[dict]) -> Optional[dict]:
+    def analyze(self, instrument_id: str, candles: list[dict], indicators: Optional[dict] = None) -> Optional[dict]:
         candidates: list[dict] = []
         for strategy in self._strategies:
             try:
-                signal = strategy.analyze(instrument_id, candles)
+                if indicators is not None:
+                    signal = strategy.analyze(instrument_id, candles, indicators=indicators)
+                else:
+                    signal = strategy.analyze(instrument_id, candles)
             except Exception:
                 logger.exception("Strategy %s crashed for %s", strategy.name, instrument_id)
                 continue
@@ -89,6 +89,20 @@ class StrategySelector:
         logger.info("Strategy activated: %s (CompositeStrategy)", cache_key)
         return composite
 
+    @staticmethod
+    def create(name: str, **params) -> BaseStrategy:
+        """
+        Fresh, uncached instance with constructor overrides (parameter sweeps).
+        Raises ValueError for an unknown strategy or parameter.
+        """
+        cls = _REGISTRY.get(str(name or "").strip().lower())
+        if cls is None:
+            raise ValueError(f"Unknown strategy '{name}'")
+        try:
+            return cls(**params)
+        except TypeError as exc:
+            raise ValueError(f"Invalid parameters for '{name}': {exc}") from exc
+
     @staticmethod
     def available() -> list[str]:
         """List of all registered strategy names."""
@@ -9,8 +9,8 @@ Logic:
          AND volume confirms
          AND RSI not oversold (> 30)
 
-SL: 1.5 ATR from entry (beyond the bounce zone)
-TP: 2.5 ATR (reward target)
+SL: sl_atr × ATR from entry, 1.5 by default (beyond the bounce zone)
+TP: tp_atr × ATR, 2.5 by default (reward target)
 """
 from __future__ import annotations
 
@@ -22,6 +22,7 @@ from typing import Optional
 from apps.worker.decision_engine.indicators import (
     calc_atr, calc_rsi, calc_vwap, calc_volume_ratio,
 )
+from apps.worker.decision_engine.streaming import RSI_PERIOD, matching_snapshot
 from core.strategy.base import BaseStrategy
 
 logger = logging.getLogger(__name__)
@@ -38,32 +39,42 @@ class VWAPBounceStrategy(BaseStrategy):
         return 30
 
 
-    def __init__(self, min_vol_ratio: float = 1.2, rsi_period: int = 14):
+    def __init__(self, min_vol_ratio: float = 1.2, rsi_period: int = 14,
+                 sl_atr: float = 1.5, tp_atr: float = 2.5):
         self.min_vol_ratio = min_vol_ratio
         self.rsi_period = rsi_period
+        self.sl_atr = sl_atr
+        self.tp_atr = tp_atr
 
-    def analyze(self, instrument_id: str, candles: list[dict]) -> Optional[dict]:
+    def analyze(self, instrument_id: str, candles: list[dict], indicators: Optional[dict] = None) -> Optional[dict]:
         if len(candles) < self.lookback:
             return None
 
-        closes  = [float(c["close"])  for c in candles]
-        highs   = [float(c["high"])   for c in candles]
-        lows    = [float(c["low"])    for c in candles]
-        volumes = [float(c.get("volume", 0)) for c in candles]
+        streamed = matching_snapshot(indicators, candles) if self.rsi_period == RSI_PERIOD else None
+        if streamed is not None:
+            vwap = streamed.get("vwap")
+            atr = streamed.get("atr_14")
+            rsi = streamed.get("rsi_14")
+            vol_ratio = streamed.get("volume_ratio")
+            current = float(candles[-1]["close"])
+            prev    = float(candles[-2]["close"]) if len(candles) >= 2 else current
+        else:
+            closes  = [float(c["close"])  for c in candles]
+            highs   = [float(c["high"])   for c in candles]
+            lows    = [float(c["low"])    for c in candles]
+            volumes = [float(c.get("volume", 0)) for c in candles]
+            vwap = calc_vwap(highs, lows, closes, volumes)
+            atr = calc_atr(highs, lows, closes, 14)
+            rsi = calc_rsi(closes, self.rsi_period)
+            vol_ratio = calc_volume_ratio(volumes, 20)
+            current = closes[-1]
+            prev    = closes[-2] if len(closes) >= 2 else current
 
-        vwap = calc_vwap(highs, lows, closes, volumes)
         if vwap is None:
             return None
 
-        atr = calc_atr(highs, lows, closes, 14)
         if not atr or atr < 1e-9:
-            atr = closes[-1] * 0.005
-
-        rsi = calc_rsi(closes, self.rsi_period)
-        vol_ratio = calc_volume_ratio(volumes, 20)
-
-        current = closes[-1]
-        prev    = closes[-2] if len(closes) >= 2 else current
+            atr = current * 0.005
 
         # Volume confirmation
         vol_ok = vol_ratio is not None and vol_ratio >= self.min_vol_ratio
@@ -76,15 +87,15 @@ class VWAPBounceStrategy(BaseStrategy):
         if prev < vwap and current > vwap and vol_ok:
             if rsi is None or rsi < 70:
                 side = "BUY"
-                sl = entry - atr * 1.5
-                tp = entry + atr * 2.5
+                sl = entry - atr * self.sl_atr
+                tp = entry + atr * self.tp_atr
 
         # SELL rejection: was above VWAP, now back below + volume + RSI not cold
         elif prev > vwap and current < vwap and vol_ok:
             if rsi is None or rsi > 30:
                 side = "SELL"
-                sl = entry + atr * 1.5
-                tp = entry - atr * 2.5
+                sl = entry + atr * self.sl_atr
+                tp = entry - atr * self.tp_atr
 
         if not side:
             return None
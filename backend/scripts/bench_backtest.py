@@ -0,0 +1,64 @@
+"""
+BacktestEngine wall time: reference per-bar loop vs vectorized mode.
+
+Runs each built-in strategy over synthetic 1m candles with both engine modes
+and checks the results are identical. Run from backend/:
+
+    python scripts/bench_backtest.py
+"""
+import os
+import random
+import sys
+import time
+from dataclasses import asdict
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+from apps.backtest.engine import BacktestEngine
+from core.strategy.breakout import BreakoutStrategy
+from core.strategy.mean_reversion import MeanReversionStrategy
+from core.strategy.vwap_bounce import VWAPBounceStrategy
+
+BARS = 20_000
+START = 1743390000  # 2025-03-31 06:00 MSK
+
+
+def _candles(count: int) -> list[dict]:
+    rng = random.Random(42)
+    price = 250.0
+    out = []
+    for i in range(count):
+        open_ = price
+        price = max(0.01, price * (1 + rng.gauss(0, 0.003)))
+        out.append({
+            'time': START + i * 60,
+            'open': open_,
+            'high': max(open_, price) * (1 + abs(rng.gauss(0, 0.001))),
+            'low': min(open_, price) * (1 - abs(rng.gauss(0, 0.001))),
+            'close': price,
+            'volume': rng.randint(100, 1000) * rng.choice((1, 1, 1, 3)),
+        })
+    return out
+
+
+def _run(strategy, candles: list[dict], vectorized: bool):
+    engine = BacktestEngine(strategy=strategy, use_decision_engine=False, vectorized=vectorized)
+    started = time.perf_counter()
+    result = engine.run('TQBR:BENCH', candles)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    candles = _candles(BARS)
+    print(f"{BARS} bars")
+    print(f"{'strategy':>16} {'trades':>7} {'reference ms':>13} {'vectorized ms':>14} {'speedup':>8} {'identical':>10}")
+    for strategy in (BreakoutStrategy(), MeanReversionStrategy(), VWAPBounceStrategy()):
+        reference, reference_ms = _run(strategy, candles, False)
+        vectorized, vectorized_ms = _run(strategy, candles, True)
+        identical = asdict(reference) == asdict(vectorized)
+        print(f"{strategy.name:>16} {reference.total_trades:>7} {reference_ms:>13.0f} {vectorized_ms:>14.0f} {reference_ms / vectorized_ms:>7.1f}x {str(identical):>10}")
+
+
+if __name__ == '__main__':
+    main()
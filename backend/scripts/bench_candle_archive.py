@@ -0,0 +1,80 @@
+"""
+Load time and peak allocations for 180 days of 1m candles per symbol.
+
+Compares the ORM query the training path used (`CandleCache` objects turned
+into dicts) with a range read from the columnar archive, both as `array`
+columns and as candle dicts. Uses a temporary SQLite file; run from backend/:
+
+    python scripts/bench_candle_archive.py
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.storage.candle_archive import CandleArchive, columns_to_rows
+from core.storage.models import Base, CandleCache
+from core.storage.repos import candles as candle_repo
+
+BARS = 65_000
+START = 1727740800  # 2024-10-01 00:00 UTC
+
+
+def _orm_load(db) -> list[dict]:
+    rows = (
+        db.query(CandleCache)
+        .filter(CandleCache.instrument_id == 'TQBR:SBER', CandleCache.timeframe == '1m', CandleCache.ts >= START)
+        .order_by(CandleCache.ts.asc())
+        .all()
+    )
+    return [
+        {'time': int(c.ts), 'open': float(c.open), 'high': float(c.high), 'low': float(c.low), 'close': float(c.close), 'volume': int(c.volume or 0)}
+        for c in rows
+    ]
+
+
+def _measure(label: str, fn) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = len(result['time']) if isinstance(result, dict) else len(result)
+    print(f"{label:>24} {size:>8} {elapsed_ms:>10.1f} {peak / 1_048_576:>12.1f}")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine, tables=[CandleCache.__table__])
+        sessions = sessionmaker(bind=engine)
+        candles = [
+            {'time': START + i * 60, 'open': 100 + i * 1e-3, 'high': 100.5 + i * 1e-3, 'low': 99.5 + i * 1e-3, 'close': 100.1 + i * 1e-3, 'volume': i % 500}
+            for i in range(BARS)
+        ]
+        with sessions() as db:
+            candle_repo.upsert_candles(db, instrument_id='TQBR:SBER', timeframe='1m', candles=candles)
+        archive = CandleArchive(os.path.join(tmp, 'archive'))
+        with sessions() as db:
+            started = time.perf_counter()
+            archive.sync(db, 'TQBR:SBER', '1m')
+            print(f"initial archive sync: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        print(f"{'path':>24} {'bars':>8} {'ms':>10} {'peak MiB':>12}")
+        with sessions() as db:
+            _measure('ORM rows -> dicts', lambda: _orm_load(db))
+        _measure('archive columns', lambda: archive.read('TQBR:SBER', '1m', start_ts=START))
+        _measure('archive -> dicts', lambda: columns_to_rows(archive.read('TQBR:SBER', '1m', start_ts=START)))
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+History bootstrap persistence: per-row upserts vs multi-row write-behind.
+
+Persists one day of 1m candles for a 40-ticker watchlist into a fresh SQLite
+file, first with the per-row lookup/commit path the worker used on bootstrap,
+then with `upsert_candle_rows` in `CandleWriter`-sized batches. A second pass
+re-writes the same candles (the update-on-conflict case). Run from backend/:
+
+    python scripts/bench_candle_persist.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.storage.models import Base, CandleCache
+from core.storage.repos import candles as candle_repo
+
+TICKERS = 40
+BARS_PER_TICKER = 1440
+FLUSH_ROWS = 500
+START = 1743390000  # 2025-03-31 06:00 MSK
+
+
+def _rows() -> list[dict]:
+    rows = []
+    for t in range(TICKERS):
+        for i in range(BARS_PER_TICKER):
+            close = 100.0 + t + i * 0.01
+            candle = {'time': START + i * 60, 'open': close, 'high': close + 0.5, 'low': close - 0.5, 'close': close, 'volume': 100 + i}
+            rows.append(candle_repo.candle_row(f'TQBR:T{t:03d}', '1m', candle, 'broker'))
+    return rows
+
+
+def _per_row(db, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BARS_PER_TICKER):
+        candle_repo._upsert_rows_per_row(db, rows[start:start + BARS_PER_TICKER])
+
+
+def _batched(db, rows: list[dict]) -> None:
+    for start in range(0, len(rows), FLUSH_ROWS):
+        candle_repo.upsert_candle_rows(db, rows[start:start + FLUSH_ROWS])
+
+
+def _time_ms(write, rows: list[dict]) -> tuple[float, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine, tables=[CandleCache.__table__])
+        sessions = sessionmaker(bind=engine)
+        timings = []
+        for _ in range(2):  # insert pass, then update pass
+            with sessions() as db:
+                started = time.perf_counter()
+                write(db, rows)
+                timings.append((time.perf_counter() - started) * 1000)
+        engine.dispose()
+    return timings[0], timings[1]
+
+
+def main() -> None:
+    rows = _rows()
+    print(f"{TICKERS} tickers x {BARS_PER_TICKER} bars = {len(rows)} rows")
+    print(f"{'path':>10} {'insert ms':>10} {'update ms':>10}")
+    per_row = _time_ms(_per_row, rows)
+    batched = _time_ms(_batched, rows)
+    print(f"{'per-row':>10} {per_row[0]:>10.0f} {per_row[1]:>10.0f}")
+    print(f"{'batched':>10} {batched[0]:>10.0f} {batched[1]:>10.0f}")
+    print(f"{'speedup':>10} {per_row[0] / batched[0]:>9.1f}x {per_row[1] / batched[1]:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,362 @@
+"""
+Hot-path benchmark suite with a synthetic market replay.
+
+Times the worker/API hot paths at watchlist sizes 10/50/200 over the same
+candle fixture, stores the results as JSON and compares them with a saved
+baseline, so a slowdown (e.g. a query or scan that grows with the log) shows
+up as a ratio instead of going unnoticed.
+
+Cases (one timed call = the operation over the whole watchlist):
+
+  decision_engine      DecisionEngine.evaluate on a breakout signal per ticker
+  resample             resample_candles 1m -> 5m/15m/1h, one new bar per call
+  aggregator_history   CandleAggregator.get_history per ticker
+  symbol_plan          build_symbol_plan (read-only) per ticker, SQLite
+  backtest             BacktestEngine.run (breakout, vectorized) per ticker
+  list_pending         list_signals('pending_review'), 5 pending signals and
+                       20 feedback logs per ticker, SQLite
+  signal_processor     SignalProcessor.process end-to-end, SQLite, bus on
+                       fakeredis, AI off
+
+Candles come from `apps.worker.market.MarketGenerator` replayed with a fixed
+seed (bar times are spaced 60s apart), or from a recorded fixture. A case
+whose imports fail in this environment is reported as unavailable.
+Run from backend/ (fakeredis: `pip install -e .[dev]`):
+
+    python scripts/bench_hot_paths.py                        # run, save to .bench/latest.json
+    python scripts/bench_hot_paths.py --save-baseline        # also store as .bench/baseline.json
+    python scripts/bench_hot_paths.py --compare              # exit 1 on regressions > threshold
+    python scripts/bench_hot_paths.py --record fixture.json  # write the replay for reuse
+    python scripts/bench_hot_paths.py --fixture fixture.json --only backtest,resample
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+WATCHLIST_SIZES = (10, 50, 200)
+HISTORY_BARS = 600
+REPEATS = 5
+START = 1743390000  # 2025-03-31 06:00 MSK
+BENCH_DIR = Path('.bench')
+DEFAULT_THRESHOLD = 0.25
+
+
+# ── Fixture ──────────────────────────────────────────────────────────────────
+def replay_fixture(tickers: int, bars: int, seed: int = 7) -> dict[str, list[dict]]:
+    """MarketGenerator replay: one closed candle per tick, times 60s apart."""
+    from apps.worker.market import MarketGenerator
+
+    random.seed(seed)
+    names = [f'TQBR:B{i:04d}' for i in range(tickers)]
+    generator = MarketGenerator(names)
+    out: dict[str, list[dict]] = {name: [] for name in names}
+    for i in range(bars):
+        for name, candle in generator.generate_tick().items():
+            out[name].append({**candle, 'time': START + i * 60})
+    return out
+
+
+def load_fixture(path: Path) -> dict[str, list[dict]]:
+    data = json.loads(path.read_text(encoding='utf-8'))
+    if not isinstance(data, dict) or not data:
+        raise SystemExit(f'{path}: expected {{instrument_id: [candles]}}')
+    return {str(key): list(value) for key, value in data.items()}
+
+
+def fixture_digest(fixture: dict[str, list[dict]]) -> str:
+    return hashlib.sha256(json.dumps(fixture, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _watchlist(fixture: dict[str, list[dict]], size: int) -> list[tuple[str, list[dict]]]:
+    names = sorted(fixture)
+    if not names:
+        return []
+    # Larger watchlists than the fixture reuse its histories under new tickers.
+    return [(f'{names[i % len(names)]}#{i // len(names)}' if i >= len(names) else names[i], fixture[names[i % len(names)]]) for i in range(size)]
+
+
+def _sqlite_session():
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    from core.storage.models import Base
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+# ── Cases: setup(watchlist) -> timed callable ────────────────────────────────
+def case_decision_engine(watchlist):
+    from apps.worker.decision_engine.engine import DecisionEngine
+    from apps.worker.decision_engine.types import MarketSnapshot
+    from core.storage.models import Settings
+
+    engine = DecisionEngine(Settings())
+    items = []
+    for _, candles in watchlist:
+        history = candles[-200:]
+        close = Decimal(str(history[-1]['close']))
+        signal = SimpleNamespace(side='BUY', entry=close, sl=close * Decimal('0.99'), tp=close * Decimal('1.02'), size=Decimal('1'), r=Decimal('2'), meta={})
+        items.append((signal, MarketSnapshot(candles=history, last_price=close)))
+
+    def run():
+        for signal, snapshot in items:
+            engine.evaluate(signal, snapshot)
+    return run
+
+
+def case_resample(watchlist):
+    from core.services.timeframe_engine import resample_candles
+
+    window = 300
+    state = {'end': window}
+
+    def run():
+        end = state['end'] = state['end'] + 1
+        for ticker, candles in watchlist:
+            history = candles[max(0, end - window):end] if end <= len(candles) else candles[-window:]
+            for tf in ('5m', '15m', '1h'):
+                resample_candles(history, tf, cache_key=ticker)
+    return run
+
+
+def case_aggregator_history(watchlist):
+    from apps.worker.aggregator import CandleAggregator
+
+    aggregator = CandleAggregator(frame_sec=60, history_size=HISTORY_BARS)
+    for ticker, candles in watchlist:
+        for candle in candles:
+            aggregator.on_tick({**candle, 'instrument_id': ticker}, replace=True)
+
+    def run():
+        for ticker, _ in watchlist:
+            aggregator.get_history(ticker)
+    return run
+
+
+def case_symbol_plan(watchlist):
+    from core.services.symbol_adaptive import build_symbol_plan_readonly
+    from core.storage.repos import settings as settings_repo
+
+    db = _sqlite_session()
+    settings = settings_repo.get_settings(db)
+
+    def run():
+        for ticker, candles in watchlist:
+            build_symbol_plan_readonly(db, ticker, candles, settings)
+    return run
+
+
+def case_backtest(watchlist):
+    from apps.backtest.engine import BacktestEngine
+    from core.strategy.breakout import BreakoutStrategy
+
+    engine = BacktestEngine(strategy=BreakoutStrategy(), settings=None, use_decision_engine=False, vectorized=True)
+
+    def run():
+        for ticker, candles in watchlist:
+            engine.run(ticker, candles)
+    return run
+
+
+def case_list_pending(watchlist):
+    from core.storage.models import DecisionLog, Signal
+    from core.storage.repos import signals as signals_repo
+
+    db = _sqlite_session()
+    rng = random.Random(11)
+    now_ms = int(time.time() * 1000)
+    for ticker, candles in watchlist:
+        price = float(candles[-1]['close'])
+        for i in range(5):
+            db.add(Signal(
+                id=f'sig_{uuid.uuid4().hex[:12]}', instrument_id=ticker, ts=now_ms - i * 60_000, side='BUY',
+                entry=price, sl=price * 0.99, tp=price * 1.02, size=1, r=2, status='pending_review',
+                meta={'review_readiness': {'thesis_timeframe': '15m', 'thesis_type': 'continuation', 'queue_priority': rng.randint(50, 120), 'approval_candidate': rng.random() < 0.3},
+                      'conviction_profile': {'regime': rng.choice(('trend', 'range'))}},
+                created_ts=now_ms - i * 60_000,
+            ))
+        for i in range(20):
+            db.add(DecisionLog(
+                id=f'log_{uuid.uuid4().hex[:12]}', ts=now_ms - rng.randint(0, 20) * 3_600_000, type='position_closed', message='position_closed',
+                payload={'instrument_id': ticker, 'net_pnl': rng.uniform(-50, 50), 'reason': rng.choice(('TP', 'SL')),
+                         'conviction_profile': {'thesis_timeframe': '15m', 'regime': 'trend'},
+                         'review_readiness': {'thesis_timeframe': '15m', 'thesis_type': 'continuation'}},
+            ))
+    db.commit()
+
+    def run():
+        signals_repo.list_signals(db, limit=50, status='pending_review')
+    return run
+
+
+def case_signal_processor(watchlist):
+    import fakeredis
+
+    from apps.worker.processor import SignalProcessor
+    from core.events.bus import EventBus
+    from core.storage.repos import settings as settings_repo
+    from core.strategy.breakout import BreakoutStrategy
+
+    db = _sqlite_session()
+    settings = settings_repo.get_settings(db)
+    settings.ai_mode = 'off'
+    db.commit()
+    bus = EventBus(client=fakeredis.FakeAsyncRedis(decode_responses=True))
+    processor = SignalProcessor(BreakoutStrategy())
+    loop = asyncio.new_event_loop()
+
+    async def process_all():
+        with patch('apps.worker.processor.bus', bus):
+            for ticker, candles in watchlist:
+                await processor.process(ticker, candles[-300:], db)
+
+    def run():
+        loop.run_until_complete(process_all())
+    return run
+
+
+CASES = {
+    'decision_engine': case_decision_engine,
+    'resample': case_resample,
+    'aggregator_history': case_aggregator_history,
+    'symbol_plan': case_symbol_plan,
+    'backtest': case_backtest,
+    'list_pending': case_list_pending,
+    'signal_processor': case_signal_processor,
+}
+
+
+# ── Runner / baseline ────────────────────────────────────────────────────────
+def measure(fn, repeats: int) -> dict:
+    fn()  # warm-up: imports, caches, first resample
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(samples), 3), 'min_ms': round(min(samples), 3), 'repeats': repeats}
+
+
+def run_suite(fixture, cases, sizes, repeats) -> dict:
+    results: dict[str, dict] = {}
+    for name in cases:
+        results[name] = {}
+        for size in sizes:
+            try:
+                fn = CASES[name](_watchlist(fixture, size))
+                entry = measure(fn, repeats)
+                entry['per_ticker_ms'] = round(entry['median_ms'] / size, 4)
+            except Exception as exc:
+                entry = {'unavailable': f'{type(exc).__name__}: {exc}'[:200]}
+            results[name][str(size)] = entry
+            status = entry.get('unavailable') or f"median {entry['median_ms']:.2f} ms"
+            print(f'{name:>20} {size:>5}  {status}', flush=True)
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Lines for every case/size whose median exceeds baseline by more than `threshold`."""
+    regressions = []
+    print(f"\n{'case':>20} {'size':>5} {'baseline ms':>12} {'current ms':>11} {'ratio':>7}")
+    for name, sizes in current['results'].items():
+        for size, entry in sizes.items():
+            base = baseline.get('results', {}).get(name, {}).get(size)
+            if not base or 'median_ms' not in base or 'median_ms' not in entry:
+                continue
+            ratio = entry['median_ms'] / base['median_ms'] if base['median_ms'] > 0 else 1.0
+            flag = '  REGRESSION' if ratio > 1 + threshold else ''
+            print(f"{name:>20} {size:>5} {base['median_ms']:>12.2f} {entry['median_ms']:>11.2f} {ratio:>7.2f}{flag}")
+            if flag:
+                regressions.append(f'{name}@{size}: {base["median_ms"]:.2f} -> {entry["median_ms"]:.2f} ms (x{ratio:.2f})')
+    if baseline.get('meta', {}).get('fixture') != current['meta']['fixture']:
+        print('note: baseline was recorded on a different fixture')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--only', help='comma-separated case names')
+    parser.add_argument('--sizes', default=','.join(map(str, WATCHLIST_SIZES)))
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--bars', type=int, default=HISTORY_BARS)
+    parser.add_argument('--fixture', type=Path, help='recorded {instrument_id: [candles]} JSON')
+    parser.add_argument('--record', type=Path, help='write the synthetic replay fixture and exit')
+    parser.add_argument('--out', type=Path, default=BENCH_DIR / 'latest.json')
+    parser.add_argument('--baseline', type=Path, default=BENCH_DIR / 'baseline.json')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true', help='compare with --baseline; exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed slowdown ratio (0.25 = +25%%)')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    cases = [c.strip() for c in args.only.split(',')] if args.only else list(CASES)
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f'unknown case(s): {", ".join(unknown)}; choose from {", ".join(CASES)}')
+
+    fixture = load_fixture(args.fixture) if args.fixture else replay_fixture(max(sizes), args.bars)
+    if args.record:
+        args.record.parent.mkdir(parents=True, exist_ok=True)
+        args.record.write_text(json.dumps(fixture), encoding='utf-8')
+        print(f'recorded {len(fixture)} tickers x {args.bars} bars to {args.record}')
+        return 0
+
+    # JSONB columns render as JSON on the in-memory SQLite engine.
+    patch.object(SQLiteTypeCompiler, 'visit_JSONB', SQLiteTypeCompiler.visit_JSON, create=True).start()
+    report = {
+        'meta': {
+            'ts': int(time.time()),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'fixture': fixture_digest(fixture),
+            'repeats': args.repeats,
+        },
+        'results': run_suite(fixture, cases, sizes, args.repeats),
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f'\nresults: {args.out}')
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f'baseline: {args.baseline}')
+    if args.compare:
+        if not args.baseline.exists():
+            print(f'no baseline at {args.baseline}; run with --save-baseline first')
+            return 1
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding='utf-8')), args.threshold)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
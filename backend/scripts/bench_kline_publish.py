@@ -0,0 +1,110 @@
+"""
+Redis operations per poll cycle for kline publishing, unbatched vs batched.
+
+Every cycle each instrument in the watchlist gets a changed candle and goes
+through `MarketPublisher.publish_candle`. The unbatched publisher issues one
+PUBLISH (or XADD) per candle; the batched one collects the cycle's candles
+and sends `kline_batch` events through one pipeline. Commands and round trips
+are counted on an in-process fakeredis client (`pip install -e .[dev]`).
+Run from backend/:
+
+    python scripts/bench_kline_publish.py
+"""
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+import fakeredis
+
+from apps.worker.publisher import MarketPublisher
+from core.events.bus import EventBus
+
+WATCHLIST_SIZES = (10, 50, 200, 500)
+CYCLES = 50
+START = 1743390000  # 2025-03-31 06:00 MSK
+
+
+class CountingRedis:
+    """Counts commands and network round trips issued through the bus."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.commands = 0
+        self.round_trips = 0
+
+    async def publish(self, *args, **kwargs):
+        self.commands += 1
+        self.round_trips += 1
+        return await self.inner.publish(*args, **kwargs)
+
+    async def xadd(self, *args, **kwargs):
+        self.commands += 1
+        self.round_trips += 1
+        return await self.inner.xadd(*args, **kwargs)
+
+    def pubsub(self):
+        return self.inner.pubsub()
+
+    def pipeline(self, transaction: bool = True):
+        return CountingPipeline(self, self.inner.pipeline(transaction=transaction))
+
+
+class CountingPipeline:
+    def __init__(self, owner: CountingRedis, inner):
+        self.owner = owner
+        self.inner = inner
+
+    def publish(self, *args, **kwargs):
+        self.owner.commands += 1
+        self.inner.publish(*args, **kwargs)
+
+    def xadd(self, *args, **kwargs):
+        self.owner.commands += 1
+        self.inner.xadd(*args, **kwargs)
+
+    async def execute(self):
+        self.owner.round_trips += 1
+        return await self.inner.execute()
+
+
+def _candle(instrument_id: str, cycle: int) -> SimpleNamespace:
+    close = 100.0 + cycle * 0.01
+    return SimpleNamespace(instrument_id=instrument_id, time=START + cycle * 60, open=close, high=close, low=close, close=close, volume=100 + cycle)
+
+
+async def _run(watchlist: int, backend: str, batch_window_sec: float) -> tuple[float, float, float]:
+    client = CountingRedis(fakeredis.FakeAsyncRedis(decode_responses=True))
+    bus = EventBus(client=client, backend=backend)
+    publisher = MarketPublisher(throttle_sec=0, batch_window_sec=batch_window_sec)
+    tickers = [f'TQBR:T{i:04d}' for i in range(watchlist)]
+    with patch('apps.worker.publisher.bus', bus):
+        started = time.perf_counter()
+        for cycle in range(CYCLES):
+            for ticker in tickers:
+                await publisher.publish_candle(_candle(ticker, cycle))
+            # Stands in for the window elapsing at the end of the poll cycle.
+            await publisher.flush()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        await publisher.close()
+    await client.inner.aclose()
+    return client.commands / CYCLES, client.round_trips / CYCLES, elapsed_ms / CYCLES
+
+
+async def main() -> None:
+    for backend in ('pubsub', 'streams'):
+        print(f"backend={backend}")
+        print(f"{'tickers':>8} {'unbatched cmds/rtt':>19} {'batched cmds/rtt':>17} {'unbatched ms':>13} {'batched ms':>11}")
+        for size in WATCHLIST_SIZES:
+            plain_cmds, plain_rtt, plain_ms = await _run(size, backend, 0)
+            batch_cmds, batch_rtt, batch_ms = await _run(size, backend, 0.25)
+            print(f"{size:>8} {plain_cmds:>10.0f}/{plain_rtt:<8.0f} {batch_cmds:>8.0f}/{batch_rtt:<8.0f} {plain_ms:>13.2f} {batch_ms:>11.2f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Per-cycle cost of higher-timeframe resampling vs history length.
+
+Simulates the analysis loop: every cycle one more 1m bar closes, the window
+slides and the partial bar is updated, then 3m/5m/15m/30m/1h are resampled.
+Compares the full `resample_candles` rebuild with the incremental
+`TimeframeResampler`. Run from backend/:
+
+    python scripts/bench_resample.py
+"""
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+from core.services.timeframe_engine import TimeframeResampler, resample_candles
+
+TIMEFRAMES = ('3m', '5m', '15m', '30m', '1h')
+HISTORY_SIZES = (200, 600, 2000, 5000)
+CYCLES = 100
+START = 1743390000  # 2025-03-31 06:00 MSK
+
+
+def _bars(count: int) -> list[dict]:
+    out = []
+    price = 100.0
+    for i in range(count):
+        price *= 1.0004 if i % 7 < 4 else 0.9996
+        out.append({
+            'time': START + i * 60,
+            'open': price * 0.9995,
+            'high': price * 1.001,
+            'low': price * 0.999,
+            'close': price,
+            'volume': 100 + i % 50,
+        })
+    return out
+
+
+def _per_cycle_ms(history_size: int, resample) -> float:
+    bars = _bars(history_size + CYCLES + 1)
+    resample(bars[:history_size + 1])  # warm-up: first cycle after start
+    started = time.perf_counter()
+    for cycle in range(1, CYCLES + 1):
+        window = bars[cycle:cycle + history_size + 1]
+        partial = dict(window[-1], close=window[-1]['close'] * 1.0001)
+        resample(window[:-1] + [partial])
+    return (time.perf_counter() - started) * 1000 / CYCLES
+
+
+def main() -> None:
+    print(f"{'history':>8} {'full ms/cycle':>14} {'incremental ms/cycle':>21} {'speedup':>8}")
+    for size in HISTORY_SIZES:
+        resampler = TimeframeResampler()
+
+        def full(history):
+            for tf in TIMEFRAMES:
+                resample_candles(history, tf)
+
+        def incremental(history):
+            for tf in TIMEFRAMES:
+                resampler.resample('BENCH', history, tf)
+
+        full_ms = _per_cycle_ms(size, full)
+        incremental_ms = _per_cycle_ms(size, incremental)
+        print(f"{size:>8} {full_ms:>14.3f} {incremental_ms:>21.3f} {full_ms / max(incremental_ms, 1e-9):>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+import json
+
+from core.services.decision_log_retention import archive_stats, partition_decision_log, run_decision_log_retention
+from core.storage.session import SessionLocal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert decision_log to monthly range partitions (PostgreSQL) and/or run retention now.")
+    parser.add_argument("--partition", action="store_true", help="One-off conversion; stop the worker and API first")
+    parser.add_argument("--retention", action="store_true", help="Archive expired rows now (DECISION_LOG_RETENTION_DAYS)")
+    parser.add_argument("--max-batches", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = {}
+        if args.partition:
+            result["partition"] = partition_decision_log(db)
+        if args.retention:
+            result["retention"] = run_decision_log_retention(db, max_batches=args.max_batches)
+        result["archive"] = archive_stats(db)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
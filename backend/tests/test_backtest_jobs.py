@@ -0,0 +1,184 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.backtest.engine import BacktestEngine
+from core.services import backtest_jobs as jobs_module
+from core.services.backtest_jobs import BacktestJobService, JobQueueFull, cache_key
+from core.storage.models import Base, BacktestJob
+from core.strategy.selector import StrategySelector
+
+
+def _candles(n=400, start=100.0):
+    out = []
+    price = start
+    for i in range(n):
+        close = price + (0.6 if (i // 7) % 2 == 0 else -0.5)
+        out.append({
+            'time': 1_700_000_000 + i * 60,
+            'open': price,
+            'high': max(price, close) + 0.3,
+            'low': min(price, close) - 0.3,
+            'close': close,
+            'volume': 1000 + (i % 13) * 50,
+        })
+        price = close
+    return out
+
+
+def _spec(**overrides):
+    spec = {
+        'instrument_id': 'TQBR:SBER',
+        'strategy': 'breakout',
+        'timeframe': '1m',
+        'initial_balance': 100_000.0,
+        'risk_pct': 1.0,
+        'commission_pct': 0.03,
+        'use_decision_engine': False,
+        'mode': 'single',
+        'folds': 4,
+        'strategies': None,
+        'vectorized': True,
+    }
+    spec.update(overrides)
+    return spec
+
+
+class BacktestJobServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        jsonb = patch.object(SQLiteTypeCompiler, 'visit_JSONB', SQLiteTypeCompiler.visit_JSON, create=True)
+        jsonb.start()
+        self.addCleanup(jsonb.stop)
+        engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        self.events = []
+
+        async def publish(type, data):
+            self.events.append((type, data['status'], data['progress'].get('stage')))
+
+        self.service = BacktestJobService(workers=0, queue_limit=4, session_factory=self.Session, publish=publish)
+
+    async def asyncTearDown(self):
+        await self.service.shutdown()
+
+    async def test_job_result_matches_direct_engine_run(self):
+        candles = _candles()
+        db = self.Session()
+        job = await self.service.submit(db, _spec(), candles)
+        self.assertEqual(job['status'], 'queued')
+        await self.service.wait(job['id'])
+
+        db.expire_all()
+        row = self.service.get(db, job['id'])
+        self.assertEqual(row.status, 'completed')
+        expected = BacktestEngine(strategy=StrategySelector().get('breakout'), settings=None, use_decision_engine=False, vectorized=True).run('TQBR:SBER', candles)
+        self.assertEqual(row.result['final_balance'], expected.final_balance)
+        self.assertEqual(row.result['total_trades'], expected.total_trades)
+        self.assertEqual([status for _, status, _ in self.events], ['queued', 'running', 'completed'])
+        db.close()
+
+    async def test_identical_request_is_served_from_cache(self):
+        candles = _candles()
+        db = self.Session()
+        first = await self.service.submit(db, _spec(), candles)
+        await self.service.wait(first['id'])
+
+        with patch.object(jobs_module, 'execute_backtest', side_effect=AssertionError('must not run')):
+            repeat = await self.service.submit(db, _spec(), candles)
+            changed = await self.service.submit(db, _spec(risk_pct=2.0), candles)
+        self.assertTrue(repeat['cached'])
+        self.assertEqual(repeat['id'], first['id'])
+        self.assertFalse(changed['cached'])
+        self.assertNotEqual(cache_key(_spec(), candles), cache_key(_spec(), candles[:-1]))
+        db.close()
+
+    async def test_walk_forward_reports_stage_progress(self):
+        db = self.Session()
+        job = await self.service.submit(db, _spec(mode='walk_forward', strategies=['breakout', 'mean_reversion']), _candles(600))
+        await self.service.wait(job['id'])
+
+        db.expire_all()
+        row = self.service.get(db, job['id'])
+        self.assertEqual(row.status, 'completed')
+        self.assertIn('folds', row.result['walk_forward'])
+        self.assertIn(('backtest_job', 'running', 'walk_forward'), self.events)
+        self.assertEqual(row.progress, {'stage': 'done', 'pct': 100})
+        db.close()
+
+    async def test_invalid_input_fails_job_with_message(self):
+        db = self.Session()
+        job = await self.service.submit(db, _spec(mode='walk_forward'), _candles(120))
+        await self.service.wait(job['id'])
+
+        db.expire_all()
+        row = self.service.get(db, job['id'])
+        self.assertEqual(row.status, 'failed')
+        self.assertIn('320 candles', row.error)
+        db.close()
+
+    async def test_cancel_discards_running_job_and_limits_queue(self):
+        release = asyncio.Event()
+
+        async def slow_execute(spec, candles, stage):
+            await release.wait()
+            return {}
+
+        db = self.Session()
+        with patch.object(self.service, '_execute', side_effect=slow_execute):
+            jobs = [await self.service.submit(db, _spec(risk_pct=1.0 + i / 10), _candles()) for i in range(4)]
+            with self.assertRaises(JobQueueFull):
+                await self.service.submit(db, _spec(risk_pct=5.0), _candles())
+            await asyncio.sleep(0)
+            row = await self.service.cancel(db, jobs[0]['id'])
+            self.assertEqual(row.status, 'cancelled')
+            await self.service.wait(jobs[0]['id'])
+            release.set()
+            for job in jobs[1:]:
+                await self.service.wait(job['id'])
+
+        db.expire_all()
+        self.assertEqual(db.get(BacktestJob, jobs[0]['id']).status, 'cancelled')
+        self.assertEqual(db.get(BacktestJob, jobs[0]['id']).result, None)
+        self.assertEqual(self.service.active_count(), 0)
+        db.close()
+
+
+    async def test_prune_strips_old_details_deletes_expired_and_skips_stale_cache(self):
+        candles = _candles()
+        db = self.Session()
+        first = await self.service.submit(db, _spec(), candles)
+        await self.service.wait(first['id'])
+        day_ms = 86_400_000
+        now = jobs_module.now_ms()
+        db.add(BacktestJob(id='bt_old', ts=now - 40 * day_ms, status='failed', cache_key='x', instrument_id='TQBR:SBER', strategy='breakout', finished_ts=now - 40 * day_ms))
+        db.add(BacktestJob(id='bt_running', ts=now - 40 * day_ms, status='running', cache_key='y', instrument_id='TQBR:SBER', strategy='breakout'))
+        db.commit()
+
+        env = {'BACKTEST_JOB_DETAIL_DAYS': '7', 'BACKTEST_JOB_RETENTION_DAYS': '30'}
+        with patch.dict('os.environ', env):
+            self.assertEqual(jobs_module.prune_backtest_jobs(db, now=now), {'deleted': 1, 'stripped': 0})
+            self.assertEqual(jobs_module.prune_backtest_jobs(db, now=now + 8 * day_ms), {'deleted': 0, 'stripped': 1})
+            self.assertEqual(jobs_module.prune_backtest_jobs(db, now=now + 8 * day_ms), {'deleted': 0, 'stripped': 0})
+        db.expire_all()
+        row = db.get(BacktestJob, first['id'])
+        self.assertTrue(row.result['detail_pruned'])
+        self.assertNotIn('equity_curve', row.result)
+        self.assertIn('final_balance', row.result)
+        self.assertIsNone(db.get(BacktestJob, 'bt_old'))
+        self.assertIsNotNone(db.get(BacktestJob, 'bt_running'))
+
+        with patch.dict('os.environ', env), patch.object(jobs_module, 'now_ms', return_value=now + 8 * day_ms):
+            repeat = await self.service.submit(db, _spec(), candles)
+        self.assertFalse(repeat['cached'])
+        await self.service.wait(repeat['id'])
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
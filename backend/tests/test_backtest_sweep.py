@@ -0,0 +1,89 @@
+import random
+import unittest
+from dataclasses import asdict
+
+from apps.backtest import sweep
+from apps.backtest.engine import BacktestEngine
+from apps.backtest.vectorized import CandleColumns
+from core.services.training_pool import TrainingPool
+from core.strategy.breakout import BreakoutStrategy
+from core.strategy.selector import StrategySelector
+
+
+def _candles(n: int, seed: int = 5) -> list[dict]:
+    rng = random.Random(seed)
+    price = 100.0
+    out = []
+    for i in range(n):
+        open_ = price
+        price = max(0.01, price * (1 + rng.gauss(0.0002, 0.004)))
+        out.append({
+            'time': 1_700_000_000 + i * 60,
+            'open': open_,
+            'high': max(open_, price) * 1.001,
+            'low': min(open_, price) * 0.999,
+            'close': price,
+            'volume': rng.randint(100, 3000),
+        })
+    return out
+
+
+GRID = {'lookback': [10, 20], 'sl_atr': [1.5, 2.0], 'tp_atr': [2.0, 3.0]}
+
+
+class SweepSpaceTests(unittest.TestCase):
+    def test_grid_is_full_cartesian_product(self):
+        combos = sweep.grid_combinations(GRID)
+        self.assertEqual(len(combos), 8)
+        self.assertEqual(combos[0], {'lookback': 10, 'sl_atr': 1.5, 'tp_atr': 2.0})
+
+    def test_random_search_is_seeded_and_distinct(self):
+        space = {'lookback': {'min': 10, 'max': 40, 'step': 5}, 'tp_atr': [2.0, 3.0, 4.0]}
+        first = sweep.random_combinations(space, 12, seed=7)
+        self.assertEqual(first, sweep.random_combinations(space, 12, seed=7))
+        self.assertEqual(len({tuple(sorted(c.items())) for c in first}), 12)
+        self.assertTrue(all(c['lookback'] % 5 == 0 and 10 <= c['lookback'] <= 40 for c in first))
+
+    def test_unknown_parameter_is_rejected(self):
+        with self.assertRaises(ValueError):
+            sweep.build_combinations('breakout', grid={'bb_std': [2.0]})
+
+
+class SweepEvaluationTests(unittest.TestCase):
+    def test_shared_columns_and_masks_match_plain_runs(self):
+        candles = _candles(900)
+        cols, cache = CandleColumns(candles), {}
+        for params in sweep.grid_combinations(GRID):
+            engine = BacktestEngine(strategy=BreakoutStrategy(**params), settings=None, use_decision_engine=False, vectorized=True)
+            shared = engine.run('TEST', candles, columns=cols, mask_cache=cache)
+            self.assertEqual(asdict(shared), asdict(engine.run('TEST', candles)))
+        self.assertEqual(len(cache), 2)  # one mask per lookback
+
+    def test_default_params_row_matches_direct_backtest(self):
+        candles = _candles(900)
+        result = sweep.run_sweep('TEST', candles, strategy='breakout')
+        direct = BacktestEngine(strategy=StrategySelector.create('breakout'), settings=None, use_decision_engine=False, vectorized=True).run('TEST', candles)
+        row = result['results'][0]
+        self.assertEqual(result['method'], 'default')
+        self.assertEqual(row['full']['total_return_pct'], direct.total_return_pct)
+        self.assertEqual(row['full']['total_trades'], direct.total_trades)
+        self.assertEqual(len(row['folds']), result['fold_count'])
+
+    def test_ranking_is_by_robust_score_and_pool_matches_inline(self):
+        candles = _candles(1200)
+        inline = sweep.run_sweep('TEST', candles, strategy='breakout', grid=GRID)
+        pool = TrainingPool(processes=2)
+        try:
+            pooled = sweep.run_sweep('TEST', candles, strategy='breakout', grid=GRID, pool=pool)
+        finally:
+            pool.shutdown()
+        scores = [row['robust_score'] for row in inline['results']]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual([row['rank'] for row in inline['results']], list(range(1, 9)))
+        self.assertEqual(pooled['results'], inline['results'])
+        self.assertEqual(pooled['walk_forward'], inline['walk_forward'])
+        self.assertEqual(len(inline['walk_forward']['selections']), inline['fold_count'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import random
+import unittest
+from dataclasses import asdict
+
+from apps.backtest.engine import BacktestEngine
+from apps.backtest.vectorized import CandleColumns, candidate_mask
+from core.strategy.breakout import BreakoutStrategy
+from core.strategy.mean_reversion import MeanReversionStrategy
+from core.strategy.multi import CompositeStrategy
+from core.strategy.vwap_bounce import VWAPBounceStrategy
+
+
+def _market(n: int, seed: int) -> list[dict]:
+    """Random walk with trending, ranging and flat stretches plus volume spikes."""
+    rng = random.Random(seed)
+    price = rng.uniform(20.0, 5000.0)
+    candles = []
+    drift = 0.0
+    for i in range(n):
+        if i % 400 == 0:
+            drift = rng.choice((-0.002, 0.0, 0.0015))
+        if (i // 250) % 7 == 3:
+            high = low = close = open_ = price  # flat tape: zero range bars
+        else:
+            open_ = price
+            close = max(0.01, price * (1 + drift + rng.gauss(0, 0.004)))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, 0.002)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, 0.002)))
+            price = close
+        volume = rng.randint(100, 1000) * (rng.choice((1, 1, 1, 3)))
+        candles.append({'time': 1_700_000_000 + i * 60, 'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume})
+    return candles
+
+
+_STRATEGIES = (
+    lambda: BreakoutStrategy(),
+    lambda: BreakoutStrategy(lookback=5),
+    lambda: MeanReversionStrategy(),
+    lambda: MeanReversionStrategy(bb_period=10, bb_std=1.5),
+    lambda: VWAPBounceStrategy(),
+    lambda: VWAPBounceStrategy(min_vol_ratio=1.0),
+    lambda: CompositeStrategy([BreakoutStrategy(), MeanReversionStrategy()]),
+)
+
+
+def _engine(strategy, vectorized: bool) -> BacktestEngine:
+    return BacktestEngine(strategy=strategy, risk_pct=0.7, commission_pct=0.05, use_decision_engine=False, vectorized=vectorized)
+
+
+class VectorizedBacktestParityTests(unittest.TestCase):
+    def test_results_match_reference_engine(self):
+        for seed in (1, 2, 3):
+            candles = _market(2500, seed)
+            for make in _STRATEGIES:
+                strategy = make()
+                with self.subTest(seed=seed, strategy=strategy.name):
+                    reference = asdict(_engine(strategy, False).run('TQBR:TEST', candles))
+                    vectorized = asdict(_engine(strategy, True).run('TQBR:TEST', candles))
+                    self.assertGreater(reference['total_trades'], 0)
+                    self.assertEqual(vectorized, reference)
+
+    def test_walk_forward_matches_reference_engine(self):
+        candles = _market(1800, 7)
+        strategies = [make() for make in _STRATEGIES[:6:2]]
+        reference = _engine(strategies[0], False).run_walk_forward('TQBR:TEST', candles, strategies=strategies)
+        vectorized = _engine(strategies[0], True).run_walk_forward('TQBR:TEST', candles, strategies=strategies)
+        self.assertEqual(vectorized, reference)
+
+    def test_prefilter_skips_most_bars_and_composites_are_unfiltered(self):
+        cols = CandleColumns(_market(2000, 4))
+        for strategy in (BreakoutStrategy(), MeanReversionStrategy(), VWAPBounceStrategy()):
+            mask = candidate_mask(strategy, cols, strategy.lookback)
+            self.assertLess(sum(mask), len(cols) // 2, strategy.name)
+        self.assertIsNone(candidate_mask(CompositeStrategy([BreakoutStrategy()]), cols, 20))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from core.storage.candle_archive import CandleArchive, columns_to_rows, get_candle_archive
+from core.storage.models import Base, CandleCache
+from core.storage.repos import candles as candle_repo
+
+# 2025-01-31 20:00 UTC: five-minute bars spanning the January/February boundary.
+START = 1738353600
+
+
+def _bars(count: int, *, offset: int = 0, bump: float = 0.0) -> list[dict]:
+    return [
+        {'time': START + (offset + i) * 300, 'open': 100.0 + i, 'high': 101.0 + i, 'low': 99.0 + i, 'close': 100.5 + i + bump, 'volume': 10 + i}
+        for i in range(count)
+    ]
+
+
+class CandleArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine, tables=[CandleCache.__table__])
+        self.db = sessionmaker(bind=self.engine)()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.archive = CandleArchive(self.root)
+        candle_repo.upsert_candles(self.db, instrument_id='TQBR:SBER', timeframe='5m', candles=_bars(100))
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_sync_splits_months_and_range_reads_match_candle_cache(self):
+        self.assertEqual(self.archive.sync(self.db, 'TQBR:SBER', '5m'), 100)
+        self.assertEqual(self.archive.months('TQBR:SBER', '5m'), ['2025-01', '2025-02'])
+        everything = columns_to_rows(self.archive.read('TQBR:SBER', '5m'))
+        self.assertEqual(everything, candle_repo.list_candles(self.db, 'TQBR:SBER', '5m', limit=1000))
+
+        ranged = self.archive.read('TQBR:SBER', '5m', start_ts=START + 40 * 300, end_ts=START + 59 * 300)
+        self.assertEqual(list(ranged['time']), [START + i * 300 for i in range(40, 60)])
+        newest = self.archive.read('TQBR:SBER', '5m', limit=60)
+        self.assertEqual(list(newest['close']), [100.5 + i for i in range(40, 100)])
+        self.assertEqual(len(self.archive.read('TQBR:GAZP', '5m')['time']), 0)
+
+    def test_incremental_sync_picks_up_updated_and_new_rows(self):
+        self.archive.sync(self.db, 'TQBR:SBER', '5m')
+        candle_repo.upsert_candles(self.db, instrument_id='TQBR:SBER', timeframe='5m', candles=_bars(5, offset=98, bump=1000.0))
+        self.assertEqual(self.archive.sync(self.db, 'TQBR:SBER', '5m'), 5)
+        closes = list(self.archive.read('TQBR:SBER', '5m')['close'])
+        self.assertEqual(len(closes), 103)
+        self.assertEqual(closes[97], 100.5 + 97)
+        self.assertEqual(closes[98:], [1100.5 + i for i in range(5)])
+
+    def test_sync_without_changes_leaves_month_files_alone(self):
+        self.archive.sync(self.db, 'TQBR:SBER', '5m')
+        paths = [os.path.join(self.root, '5m', 'TQBR_SBER', f'{month}.bin') for month in ('2025-01', '2025-02')]
+        before = [os.stat(path).st_ino for path in paths]
+        self.assertEqual(self.archive.sync(self.db, 'TQBR:SBER', '5m'), 0)
+        self.assertEqual([os.stat(path).st_ino for path in paths], before)
+
+        statements = []
+        event.listen(self.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        self.assertEqual(self.archive.sync(self.db, 'TQBR:SBER', '5m'), 0)
+        self.assertEqual(len(statements), 1)
+        self.assertIn('max(', statements[0])
+
+        # A row stamped below the watermark that commits late changes the window fingerprint.
+        watermark = self.archive.watermark('TQBR:SBER', '5m')
+        with patch('core.storage.repos.candles.now_utc_ms', return_value=watermark - 1000):
+            candle_repo.upsert_candles(self.db, instrument_id='TQBR:SBER', timeframe='5m', candles=_bars(1, offset=100))
+        self.assertEqual(self.archive.sync(self.db, 'TQBR:SBER', '5m'), 1)
+        self.assertEqual(len(self.archive.read('TQBR:SBER', '5m')['time']), 101)
+
+    def test_load_candle_history_uses_archive_when_configured(self):
+        expected = candle_repo.load_candle_history(self.db, 'TQBR:SBER', '5m', start_ts=START + 10 * 300)
+        with patch('core.storage.repos.candles.get_candle_archive', return_value=self.archive):
+            archived = candle_repo.load_candle_history(self.db, 'TQBR:SBER', '5m', start_ts=START + 10 * 300)
+        self.assertEqual(len(archived), 90)
+        self.assertEqual(archived, expected)
+        self.assertTrue(os.path.exists(os.path.join(self.root, '5m', 'TQBR_SBER', '_manifest.json')))
+
+    def test_corrupt_month_falls_back_to_candle_cache(self):
+        self.archive.sync(self.db, 'TQBR:SBER', '5m')
+        with open(os.path.join(self.root, '5m', 'TQBR_SBER', '2025-02.bin'), 'r+b') as fh:
+            fh.write(b'XXXX')
+        with self.assertRaises(ValueError):
+            self.archive.read('TQBR:SBER', '5m')
+        with patch('core.storage.repos.candles.get_candle_archive', return_value=self.archive):
+            self.assertEqual(len(candle_repo.load_candle_history(self.db, 'TQBR:SBER', '5m', limit=30)), 30)
+
+    def test_archive_is_disabled_without_directory(self):
+        with patch('core.config.settings.CANDLE_ARCHIVE_DIR', ''), patch.dict(os.environ, {'CANDLE_ARCHIVE_DIR': ''}):
+            self.assertIsNone(get_candle_archive())
+        with patch('core.config.settings.CANDLE_ARCHIVE_DIR', self.root):
+            self.assertIs(get_candle_archive(), get_candle_archive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import tracemalloc
+import unittest
+from collections import deque
+
+from apps.worker.aggregator import CandleAggregator
+from apps.worker.analysis_pool import pack_candles, unpack_candles
+from apps.worker.candle_store import CandleColumns, CandleHistory
+
+
+def _bar(i: int) -> dict:
+    return {
+        'time': 1_699_999_980 + i * 60,
+        'open': 100.0 + i,
+        'high': 101.5 + i,
+        'low': 99.25 + i,
+        'close': 100.5 + i,
+        'volume': 10 + i,
+    }
+
+
+def _tick(i: int, ticker: str = 'TQBR:SBER') -> dict:
+    return {'instrument_id': ticker, **_bar(i)}
+
+
+class CandleStoreTests(unittest.TestCase):
+    def test_view_matches_bounded_deque_across_compactions(self):
+        capacity = 7
+        columns = CandleColumns(capacity)
+        reference: deque = deque(maxlen=capacity)
+        for i in range(5 * capacity + 3):
+            columns.append(_bar(i))
+            reference.append(_bar(i))
+            view = columns.view()
+            self.assertEqual(len(view), len(reference))
+            self.assertEqual(view, list(reference))
+            self.assertEqual(view[-1], reference[-1])
+            self.assertEqual(view[0], reference[0])
+            self.assertEqual(view[-3:], list(reference)[-3:])
+
+    def test_view_is_stable_while_new_bars_close(self):
+        columns = CandleColumns(4)
+        for i in range(4):
+            columns.append(_bar(i))
+        snapshot = columns.view({'time': 1, 'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1})
+        expected = snapshot.to_list()[:]
+        for i in range(4, 20):
+            columns.append(_bar(i))
+        self.assertEqual(snapshot, expected)
+        self.assertEqual(snapshot.columns()['close'].tolist(), [b['close'] for b in expected[:-1]])
+
+    def test_rows_keep_legacy_types(self):
+        columns = CandleColumns(3)
+        columns.append(_bar(0))
+        row = columns.view()[0]
+        self.assertIsInstance(row['time'], int)
+        self.assertIsInstance(row['volume'], int)
+        self.assertIsInstance(row['close'], float)
+        with self.assertRaises(IndexError):
+            columns.view()[1]
+
+    def test_aggregator_history_matches_list_semantics(self):
+        agg = CandleAggregator(frame_sec=60, history_size=5)
+        self.assertEqual(agg.get_history('TQBR:SBER'), [])
+        for i in range(12):
+            agg.on_tick(_tick(i))
+        history = agg.get_history('TQBR:SBER')
+        self.assertIsInstance(history, CandleHistory)
+        self.assertEqual(agg.history_len('TQBR:SBER'), 5)
+        self.assertEqual(history, [_bar(i) for i in range(6, 12)])
+        self.assertEqual(history[-1], _bar(11))
+        self.assertEqual(unpack_candles(pack_candles(history)), history.to_list())
+
+    def test_columns_use_less_memory_than_dict_rows(self):
+        history_size = 600
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            columns = CandleColumns(history_size)
+            for i in range(history_size):
+                columns.append(_bar(i))
+            columnar = tracemalloc.get_traced_memory()[0] - before
+
+            before, _ = tracemalloc.get_traced_memory()
+            rows = deque((_bar(i) for i in range(history_size)), maxlen=history_size)
+            dict_rows = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(len(rows), len(columns))
+        self.assertLess(columnar * 2, dict_rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.worker.candle_writer import CandleWriter
+from apps.worker.db_executor import WorkerDbExecutor
+from core.storage.models import Base, CandleCache
+from core.storage.repos import candles as candle_repo
+
+
+def _bar(i: int, close: float | None = None) -> dict:
+    close = 100.0 + i if close is None else close
+    return {'time': 1_700_000_000 + i * 60, 'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 10 + i}
+
+
+class _Harness:
+    def __init__(self):
+        self.engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine, tables=[CandleCache.__table__])
+        self.sessions = sessionmaker(bind=self.engine)
+
+    def closes(self, instrument_id: str, timeframe: str = '1m') -> list[float]:
+        with self.sessions() as db:
+            return [candle['close'] for candle in candle_repo.list_candles(db, instrument_id, timeframe)]
+
+
+class UpsertCandleRowsTests(unittest.TestCase):
+    def setUp(self):
+        self.harness = _Harness()
+
+    def test_multi_row_upsert_inserts_then_updates_in_place(self):
+        with self.harness.sessions() as db:
+            self.assertEqual(candle_repo.upsert_candles(db, instrument_id='TQBR:SBER', timeframe='1m', candles=[_bar(i) for i in range(250)]), 250)
+            rows = [candle_repo.candle_row('TQBR:SBER', '1m', _bar(3, close=1.0), 'worker'), candle_repo.candle_row('TQBR:SBER', '1m', _bar(3, close=2.0), 'worker')]
+            self.assertEqual(candle_repo.upsert_candle_rows(db, rows), 1)
+            self.assertEqual(db.query(CandleCache).count(), 250)
+        closes = self.harness.closes('TQBR:SBER')
+        self.assertEqual(closes[3], 2.0)
+        self.assertEqual(closes[4], 104.0)
+
+    def test_unknown_dialect_falls_back_to_per_row_upsert(self):
+        with self.harness.sessions() as db:
+            candle_repo._upsert_rows_per_row(db, [candle_repo.candle_row('TQBR:GAZP', '1m', _bar(0), 'api')])
+            candle_repo._upsert_rows_per_row(db, [candle_repo.candle_row('TQBR:GAZP', '1m', _bar(0, close=5.0), 'api')])
+        self.assertEqual(self.harness.closes('TQBR:GAZP'), [5.0])
+
+
+class CandleWriterTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.harness = _Harness()
+        self.executor = WorkerDbExecutor(max_workers=1, session_factory=self.harness.sessions)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown()
+
+    async def test_add_is_in_memory_and_close_flushes(self):
+        writer = CandleWriter(self.executor, flush_ms=60_000, max_rows=1000)
+        writer.add('TQBR:SBER', '1m', [_bar(0), _bar(1)])
+        writer.add('TQBR:SBER', '1m', [_bar(1, close=7.0)])
+        writer.add('TQBR:GAZP', '1m', [_bar(0)], source='broker')
+        self.assertEqual(len(writer), 3)
+        self.assertEqual(self.harness.closes('TQBR:SBER'), [])
+        await writer.close()
+        self.assertEqual(self.harness.closes('TQBR:SBER'), [100.0, 7.0])
+        self.assertEqual(self.harness.closes('TQBR:GAZP'), [100.0])
+        self.assertEqual(writer.snapshot()['written'], 3)
+        self.assertEqual(writer.snapshot()['pending'], 0)
+
+    async def test_row_threshold_triggers_flush(self):
+        writer = CandleWriter(self.executor, flush_ms=60_000, max_rows=5)
+        writer.add('TQBR:SBER', '1m', [_bar(i) for i in range(5)])
+        for _ in range(50):
+            if writer.stats['flushes']:
+                break
+            await self.executor.call(lambda: None)
+        self.assertEqual(writer.stats['flushes'], 1)
+        self.assertEqual(len(self.harness.closes('TQBR:SBER')), 5)
+        await writer.close()
+
+    async def test_failed_flush_keeps_rows_for_retry(self):
+        writer = CandleWriter(self.executor, flush_ms=60_000, max_rows=1000)
+        writer.add('TQBR:SBER', '1m', [_bar(0)])
+        Base.metadata.drop_all(self.harness.engine, tables=[CandleCache.__table__])
+        with self.assertRaises(OperationalError):
+            await writer.flush()
+        self.assertEqual(len(writer), 1)
+        Base.metadata.create_all(self.harness.engine, tables=[CandleCache.__table__])
+        await writer.close()
+        self.assertEqual(self.harness.closes('TQBR:SBER'), [100.0])
+        self.assertEqual(writer.stats['errors'], 1)
+
+    async def test_pending_buffer_is_capped_while_database_is_down(self):
+        writer = CandleWriter(self.executor, flush_ms=60_000, max_rows=3, max_pending=3)
+        writer.add('TQBR:SBER', '1m', [_bar(0), _bar(1)])
+        Base.metadata.drop_all(self.harness.engine, tables=[CandleCache.__table__])
+        with self.assertRaises(OperationalError):
+            await writer.flush()
+        writer.add('TQBR:SBER', '1m', [_bar(1, close=7.0), _bar(2), _bar(3)])
+        self.assertEqual((len(writer), writer.stats['dropped']), (4, 0))
+        for _ in range(50):
+            if writer.stats['errors'] == 2:
+                break
+            await self.executor.call(lambda: None)
+        self.assertEqual((len(writer), writer.stats['errors'], writer.stats['dropped']), (3, 2, 1))
+        Base.metadata.create_all(self.harness.engine, tables=[CandleCache.__table__])
+        await writer.close()
+        self.assertEqual(self.harness.closes('TQBR:SBER'), [7.0, 102.0, 103.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
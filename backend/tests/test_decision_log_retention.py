@@ -0,0 +1,104 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.services import decision_log_retention as retention
+from core.storage.decision_log_utils import build_decision_log_row
+from core.storage.models import Base, DecisionLog, DecisionLogArchive
+
+DAY_MS = 86_400_000
+NOW_MS = 1_760_000_000_000
+
+
+class DecisionLogRetentionTests(unittest.TestCase):
+    def setUp(self):
+        jsonb = patch.object(SQLiteTypeCompiler, 'visit_JSONB', SQLiteTypeCompiler.visit_JSON, create=True)
+        jsonb.start()
+        self.addCleanup(jsonb.stop)
+        env = patch.dict(os.environ, {'DECISION_LOG_RETENTION_DAYS': '30', 'DECISION_LOG_FEEDBACK_RETENTION_DAYS': '90'})
+        env.start()
+        self.addCleanup(env.stop)
+        engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+
+    def _log(self, idx: int, age_days: int, log_type: str = 'signal_pipeline') -> None:
+        self.db.add(DecisionLog(**build_decision_log_row(
+            log_type=log_type, message=f'm{idx}', payload={'instrument_id': 'TQBR:SBER', 'idx': idx},
+            ts_ms=NOW_MS - age_days * DAY_MS - idx, log_id=f'log_{idx:03d}',
+        )))
+
+    def test_archives_expired_rows_and_keeps_feedback_longer(self):
+        for idx in range(7):
+            self._log(idx, 45)
+        self._log(10, 10)
+        self._log(11, 45, 'position_closed')
+        self._log(12, 120, 'position_closed')
+        self.db.commit()
+
+        result = retention.run_decision_log_retention(self.db, now_ms=NOW_MS, batch_size=3)
+
+        self.assertEqual(result['archived'], 8)
+        self.assertEqual(result['batches'], 3)
+        self.assertEqual(sorted(r.id for r in self.db.query(DecisionLog).all()), ['log_010', 'log_011'])
+        self.assertEqual(retention.archive_stats(self.db)['rows'], 8)
+        archived = list(retention.iter_archived_logs(self.db))
+        self.assertEqual(len(archived), 8)
+        self.assertEqual([row['ts'] for row in archived], sorted(row['ts'] for row in archived))
+        closed = list(retention.iter_archived_logs(self.db, log_type='position_closed'))
+        self.assertEqual([row['id'] for row in closed], ['log_012'])
+        self.assertEqual(closed[0]['payload']['idx'], 12)
+        self.assertEqual(retention.run_decision_log_retention(self.db, now_ms=NOW_MS)['archived'], 0)
+
+    def test_zero_days_disables_retention(self):
+        self._log(1, 1000)
+        self.db.commit()
+        with patch.dict(os.environ, {'DECISION_LOG_RETENTION_DAYS': '0', 'DECISION_LOG_FEEDBACK_RETENTION_DAYS': '0'}):
+            self.assertEqual(retention.run_decision_log_retention(self.db, now_ms=NOW_MS)['archived'], 0)
+        self.assertEqual(self.db.query(DecisionLogArchive).count(), 0)
+
+    def test_row_carries_instrument_id(self):
+        row = build_decision_log_row(log_type='rotation', message='m', payload={'incoming_instrument': 'TQBR:GAZP'})
+        self.assertEqual(row['instrument_id'], 'TQBR:GAZP')
+        self.assertIsNone(build_decision_log_row(log_type='x', message='m', payload={})['instrument_id'])
+
+    def test_month_bounds_roll_over_year(self):
+        name, start, end = retention.month_bounds(1_733_011_200_000, offset=1)  # 2024-12-01
+        self.assertEqual(name, 'decision_log_p202501')
+        self.assertEqual(end - start, 31 * DAY_MS)
+
+
+    def test_new_month_takes_over_rows_from_default_partition_before_attach(self):
+        executed = []
+
+        class _RecordingSession:
+            def execute(self, statement, params=None):
+                sql = str(statement)
+                executed.append((sql, params))
+                if 'pg_inherits' in sql:
+                    return [('decision_log_p202412',), ('decision_log_default',)]
+                return None
+
+            def commit(self):
+                executed.append(('COMMIT', None))
+
+        created = retention.ensure_monthly_partitions(_RecordingSession(), now_ms=1_733_011_200_000, months_ahead=1)  # 2024-12-01
+
+        self.assertEqual(created, ['decision_log_p202501'])
+        statements = [sql for sql, _ in executed[1:]]
+        self.assertTrue(statements[0].startswith('CREATE TABLE decision_log_p202501 (LIKE decision_log'))
+        self.assertIn('DELETE FROM decision_log_default', statements[1])
+        self.assertIn('INSERT INTO decision_log_p202501', statements[1])
+        self.assertEqual(executed[2][1], {'from_ms': 1_735_689_600_000, 'to_ms': 1_738_368_000_000})
+        self.assertTrue(statements[2].startswith('ALTER TABLE decision_log ATTACH PARTITION decision_log_p202501'))
+        self.assertEqual(statements[-1], 'COMMIT')
+
+
+if __name__ == '__main__':
+    unittest.main()
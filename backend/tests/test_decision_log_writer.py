@@ -0,0 +1,106 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.worker.db_executor import WorkerDbExecutor
+from apps.worker.decision_log_writer import DecisionLogWriter
+from core.storage import decision_log_utils
+from core.storage.decision_log_utils import append_decision_log_best_effort, build_decision_log_row
+from core.storage.models import Base, DecisionLog, TradeJournal
+
+
+def _row(idx: int, log_type: str = 'signal_pipeline') -> dict:
+    return build_decision_log_row(log_type=log_type, message=f'm{idx}', payload={'instrument_id': 'TQBR:SBER', 'idx': idx}, ts_ms=1_700_000_000_000 + idx)
+
+
+class DecisionLogWriterTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        jsonb = patch.object(SQLiteTypeCompiler, 'visit_JSONB', SQLiteTypeCompiler.visit_JSON, create=True)
+        jsonb.start()
+        self.addCleanup(jsonb.stop)
+        engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.sessions = sessionmaker(bind=engine)
+        self.executor = WorkerDbExecutor(max_workers=1, session_factory=self.sessions)
+
+    async def asyncTearDown(self):
+        decision_log_utils.set_decision_log_sink(None)
+        self.executor.shutdown()
+
+    def _stored(self) -> list[DecisionLog]:
+        with self.sessions() as db:
+            return db.query(DecisionLog).order_by(DecisionLog.ts).all()
+
+    async def test_submit_buffers_until_flush(self):
+        writer = DecisionLogWriter(self.executor, self.sessions, flush_ms=60_000, max_rows=1000)
+        for idx in range(250):
+            self.assertTrue(writer.submit(_row(idx)))
+        self.assertEqual(self._stored(), [])
+        self.assertEqual(writer.snapshot()['pending'], 250)
+        self.assertEqual(await writer.flush(), 250)
+        stored = self._stored()
+        self.assertEqual(len(stored), 250)
+        self.assertEqual(stored[0].instrument_id, 'TQBR:SBER')
+        snapshot = writer.snapshot()
+        self.assertEqual((snapshot['pending'], snapshot['written'], snapshot['flushes']), (0, 250, 1))
+
+    async def test_size_threshold_wakes_flush_task(self):
+        writer = DecisionLogWriter(self.executor, self.sessions, flush_ms=60_000, max_rows=5)
+        writer.start()
+        for idx in range(5):
+            append_decision_log_best_effort(log_type='signal_pipeline', message='m', payload={'idx': idx})
+        for _ in range(50):
+            if len(self._stored()) == 5:
+                break
+            await asyncio.sleep(0.02)
+        self.assertEqual(len(self._stored()), 5)
+        await writer.close()
+        self.assertIsNone(decision_log_utils._sink)
+
+    async def test_write_through_type_inserts_only_that_row(self):
+        writer = DecisionLogWriter(self.executor, self.sessions, flush_ms=60_000, max_rows=1000)
+        writer.start()
+        append_decision_log_best_effort(log_type='signal_pipeline', message='before', payload={'instrument_id': 'TQBR:SBER'})
+        ok = append_decision_log_best_effort(log_type='position_closed', message='closed', payload={
+            'instrument_id': 'TQBR:SBER', 'side': 'BUY', 'entry_price': 100.0, 'close_price': 101.0, 'qty': 10,
+            'opened_ts': 1_700_000_000_000, 'closed_ts': 1_700_000_300_000, 'net_pnl': 10.0,
+        })
+        self.assertTrue(ok)
+        self.assertEqual([log.message for log in self._stored()], ['closed'])
+        self.assertEqual(writer.snapshot()['pending'], 1)
+        with self.sessions() as db:
+            self.assertEqual(db.query(TradeJournal).count(), 1)
+        await writer.close()
+        self.assertEqual(sorted(log.message for log in self._stored()), ['before', 'closed'])
+
+    async def test_full_buffer_drops_oldest_without_touching_the_database(self):
+        def broken_session():
+            raise OperationalError('INSERT', {}, Exception('db down'))
+
+        writer = DecisionLogWriter(self.executor, broken_session, flush_ms=60_000, max_rows=2, max_pending=4)
+        for idx in range(6):
+            self.assertTrue(writer.submit(_row(idx)))
+        snapshot = writer.snapshot()
+        self.assertEqual((snapshot['pending'], snapshot['dropped'], snapshot['overflows'], snapshot['flushes']), (4, 2, 2, 0))
+        self.assertEqual(snapshot['loss_bound']['max_rows'], 4)
+
+        await writer.flush()
+        snapshot = writer.snapshot()
+        self.assertEqual((snapshot['pending'], snapshot['errors'], snapshot['retried']), (4, 1, 4))
+        self.assertFalse(writer.submit(_row(6, 'trade_filled'), urgent=True))
+        snapshot = writer.snapshot()
+        self.assertEqual((snapshot['pending'], snapshot['dropped']), (4, 3))
+
+        writer._session_factory = self.sessions
+        await writer.flush()
+        self.assertEqual([log.payload['idx'] for log in self._stored()], [3, 4, 5, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
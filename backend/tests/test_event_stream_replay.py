@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import patch
+
+import orjson
+
+from apps.api.sse_hub import SSEHub, SSESubscriber
+from apps.api.routers.stream import replay_frames
+from core.events.bus import EventBus, stream_id_key
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover - optional dev dependency
+    fakeredis = None
+
+
+def _data(frame: str) -> dict:
+    return orjson.loads(frame.split('data: ', 1)[1])['data']
+
+
+class ResumeDedupTests(unittest.IsolatedAsyncioTestCase):
+    async def test_live_frames_already_replayed_are_skipped(self):
+        hub = SSEHub()
+        hub._ensure_started = lambda: None
+        client = hub.register()
+        for seq in range(1, 5):
+            hub.dispatch(orjson.dumps({'type': 'signal_updated', 'data': {'seq': seq}}).decode(), f'1700000000000-{seq}')
+        client.resume_after = stream_id_key('1700000000000-2')
+        frames = []
+        while (frame := await client.next(timeout=0)) is not None:
+            frames.append(frame)
+        self.assertEqual([_data(frame)['seq'] for frame in frames], [3, 4])
+        self.assertTrue(frames[0].startswith('id: 1700000000000-3\nevent: signal_updated\n'))
+
+    def test_stream_id_key_orders_numerically(self):
+        self.assertLess(stream_id_key('999-5'), stream_id_key('1000-0'))
+        with self.assertRaises(ValueError):
+            stream_id_key('not-an-id')
+
+
+@unittest.skipUnless(fakeredis is not None, 'fakeredis not installed')
+class StreamsBackendTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.bus = EventBus(client=fakeredis.FakeAsyncRedis(decode_responses=True), backend='streams')
+
+    async def asyncTearDown(self):
+        await self.bus.redis.aclose()
+
+    async def _publish(self, count: int, start: int = 0) -> list[str]:
+        return [await self.bus.publish('trade_filled', {'seq': start + i}) for i in range(count)]
+
+    async def test_publish_appends_increasing_ids_and_replays_the_gap(self):
+        ids = await self._publish(5)
+        self.assertEqual(ids, sorted(ids, key=stream_id_key))
+        entries, complete = await self.bus.replay_events(ids[1], limit=100)
+        self.assertTrue(complete)
+        self.assertEqual([event_id for event_id, _ in entries], ids[2:])
+        self.assertEqual(orjson.loads(entries[0][1])['type'], 'trade_filled')
+        self.assertEqual(await self.bus.replay_events(ids[-1], limit=100), ([], True))
+        self.assertEqual(await self.bus.latest_event_id(), ids[-1])
+
+    async def test_trimmed_or_oversized_gaps_are_incomplete(self):
+        ids = await self._publish(5)
+        self.assertEqual(await self.bus.replay_events(ids[0], limit=2), ([], False))
+        self.assertEqual(await self.bus.replay_events('garbage', limit=100), ([], False))
+        ms, _, seq = ids[-1].partition('-')
+        self.assertEqual(await self.bus.replay_events(f'{int(ms) + 60_000}-{seq}', limit=100), ([], False))
+        await self.bus.redis.xtrim(self.bus.stream_key, maxlen=2, approximate=False)
+        self.assertEqual(await self.bus.replay_events(ids[0], limit=100), ([], False))
+
+    async def test_replay_frames_sets_resume_point_or_requests_resync(self):
+        ids = await self._publish(4)
+        with patch('apps.api.routers.stream.bus', self.bus):
+            subscriber = SSESubscriber()
+            frames = [frame async for frame in replay_frames(subscriber, ids[1])]
+            self.assertEqual([_data(frame)['seq'] for frame in frames], [2, 3])
+            self.assertEqual(subscriber.resume_after, stream_id_key(ids[-1]))
+
+            stale = SSESubscriber()
+            frames = [frame async for frame in replay_frames(stale, '1-0')]
+        self.assertEqual(len(frames), 1)
+        self.assertTrue(frames[0].startswith('event: resync\n'))
+        self.assertIsNone(stale.resume_after)
+
+
+if __name__ == '__main__':
+    unittest.main()
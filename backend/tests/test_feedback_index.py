@@ -0,0 +1,120 @@
+import random
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.orm import sessionmaker
+
+from core.storage.models import Base, DecisionLog
+from core.storage.repos import signals as signals_repo
+from core.storage.repos.feedback_index import FeedbackIndex, feedback_index_for, reset_feedback_indexes
+
+
+_INSTRUMENTS = ('TQBR:SBER', 'TQBR:GAZP', 'TQBR:LKOH')
+_TIMEFRAMES = ('5m', '15m')
+_TYPES = ('continuation', 'timeframe_signal')
+_REGIMES = ('trend', 'range')
+_BIASES = (
+    signals_repo._execution_feedback_bonus,
+    signals_repo._outcome_feedback_bonus,
+    signals_repo._symbol_thesis_learning_bias,
+    signals_repo._regime_aware_learning_bias,
+    signals_repo._instrument_fatigue_bias,
+    signals_repo._early_failure_cluster_bias,
+    signals_repo._thesis_reentry_bias,
+)
+
+
+def _payload(rng: random.Random, row_type: str) -> dict:
+    tf, thesis_type, regime = rng.choice(_TIMEFRAMES), rng.choice(_TYPES), rng.choice(_REGIMES)
+    payload = {'instrument_id': rng.choice(_INSTRUMENTS)}
+    if row_type == 'trade_filled':
+        payload['execution_quality_seed'] = {
+            'thesis_timeframe': tf,
+            'fill_quality_status': rng.choice(('ok', 'anomaly', '')),
+            'review_readiness': {'thesis_type': thesis_type},
+            'conviction_profile': {'regime': regime},
+        }
+    else:
+        payload.update({
+            'conviction_profile': {'thesis_timeframe': tf, 'regime': regime},
+            'review_readiness': {'thesis_timeframe': tf, 'thesis_type': thesis_type},
+            'exit_diagnostics': {'edge_decay_state': rng.choice(('early_failure', 'mature')), 'bars_held': rng.randint(0, 4)},
+            'net_pnl': rng.uniform(-50, 50),
+            'reason': rng.choice(('TP', 'SL', 'THESIS_DECAY', 'TIME_STOP')),
+            'adaptive_exit': {'notes': [rng.choice(('continuation hold', 'trail'))]},
+        })
+    return payload
+
+
+def _signal(instrument_id: str, tf: str, thesis_type: str, regime: str) -> SimpleNamespace:
+    return SimpleNamespace(instrument_id=instrument_id, meta={
+        'review_readiness': {'thesis_timeframe': tf, 'thesis_type': thesis_type, 'selection_reason': 'requested'},
+        'conviction_profile': {'regime': regime},
+    })
+
+
+class FeedbackIndexTests(unittest.TestCase):
+    def setUp(self):
+        # decision_log.payload is JSONB; render it as JSON on the in-memory SQLite engine.
+        jsonb_patch = patch.object(SQLiteTypeCompiler, 'visit_JSONB', SQLiteTypeCompiler.visit_JSON, create=True)
+        jsonb_patch.start()
+        self.addCleanup(jsonb_patch.stop)
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine, tables=[Base.metadata.tables['decision_log']])
+        self.db = sessionmaker(bind=self.engine)()
+        self.now_ms = int(time.time() * 1000)
+        reset_feedback_indexes()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+        reset_feedback_indexes()
+
+    def _add_logs(self, count: int, seed: int, *, max_age_hours: float = 30) -> None:
+        rng = random.Random(seed)
+        for i in range(count):
+            row_type = rng.choice(('trade_filled', 'position_closed', 'signal_created'))
+            self.db.add(DecisionLog(
+                id=f'log_{seed}_{i}',
+                ts=self.now_ms - int(rng.uniform(0, max_age_hours) * 3_600_000),
+                type=row_type,
+                message=row_type,
+                payload=_payload(rng, row_type),
+            ))
+        self.db.commit()
+
+    def _assert_parity(self, index: FeedbackIndex) -> None:
+        for instrument_id in _INSTRUMENTS:
+            for tf in _TIMEFRAMES:
+                for thesis_type in _TYPES:
+                    for regime in _REGIMES:
+                        signal = _signal(instrument_id, tf, thesis_type, regime)
+                        for bias in _BIASES:
+                            self.assertEqual(bias(self.db, signal, index=index), bias(self.db, signal), (bias.__name__, instrument_id, tf, thesis_type, regime))
+
+    def test_indexed_biases_match_per_query_biases(self):
+        self._add_logs(300, seed=1)
+        index = feedback_index_for(self.db)
+        self.assertIsNotNone(index)
+        self._assert_parity(index)
+
+    def test_sync_picks_up_new_logs_incrementally(self):
+        self._add_logs(80, seed=2)
+        index = feedback_index_for(self.db)
+        before = len(index)
+        self._add_logs(40, seed=3, max_age_hours=0.01)
+        self.assertIs(feedback_index_for(self.db), index)
+        self.assertGreater(len(index), before)
+        self.assertEqual(index.sync(self.db), 0)
+        self._assert_parity(index)
+
+    def test_sessions_without_bind_fall_back_to_queries(self):
+        self.assertIsNone(feedback_index_for(object()))
+
+
+if __name__ == '__main__':
+    unittest.main()
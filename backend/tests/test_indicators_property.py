@@ -11,6 +11,7 @@ Properties tested:
   - calc_bollinger: upper ≥ mid ≥ lower
   - calc_vwap: close to weighted mean
   - DecisionEngine.evaluate: never raises for valid signals
+  - streaming IndicatorState: parity with the full-recompute functions
 
 Run: python -m unittest tests.test_indicators_property -v
 """
@@ -47,7 +48,7 @@ for _mod in ["redis", "redis.asyncio", "structlog", "grpc", "prometheus_client",
              "tinkoff", "tinkoff.invest", "httpx"]:
     sys.modules.setdefault(_mod, types.ModuleType(_mod))
 
-from apps.worker.decision_engine import indicators
+from apps.worker.decision_engine import indicators, streaming
 
 _skip_no_pydantic = unittest.skipUnless(_HAS_PYDANTIC, "pydantic required")
 
@@ -402,9 +403,9 @@ class TestDecisionEngineNeverRaises(unittest.TestCase):
             vols   = [rng.uniform(5000, 20000) for _ in closes]
 
             candles_list = [
-                {"time": i*60, "open": h-0.5, "high": h, "low": l, "close": c,
+                {"time": i*60, "open": h-0.5, "high": h, "low": lo, "close": c,
                  "volume": v}
-                for i, (h, l, c, v) in enumerate(zip(highs, lows, closes, vols))
+                for i, (h, lo, c, v) in enumerate(zip(highs, lows, closes, vols))
             ]
             snap  = MarketSnapshot(candles=candles_list, last_price=closes[-1])
             entry = closes[-1]
@@ -420,8 +421,12 @@ class TestDecisionEngineNeverRaises(unittest.TestCase):
             sig = FakeSig()
             sl_dist = abs(entry - sl)
             tp_dist = abs(tp - entry)
-            sig.side = side; sig.entry = entry; sig.sl = sl; sig.tp = tp
-            sig.size = rng.randint(1, 100); sig.instrument_id = "TQBR:SBER"
+            sig.side = side
+            sig.entry = entry
+            sig.sl = sl
+            sig.tp = tp
+            sig.size = rng.randint(1, 100)
+            sig.instrument_id = "TQBR:SBER"
             sig.r = round(tp_dist / sl_dist, 2) if sl_dist > 0 else 1.0
             sig.reason = "property test"
 
@@ -463,8 +468,12 @@ class TestDecisionEngineNeverRaises(unittest.TestCase):
         for tp_mult in [1.01, 1.1, 2.0, 5.0, 50.0]:
             with self.subTest(tp_mult=tp_mult):
                 class _Sig:
-                    side="BUY"; entry=100.0; sl=99.0
-                    size=10; instrument_id="TQBR:SBER"; reason="test"
+                    side = "BUY"
+                    entry = 100.0
+                    sl = 99.0
+                    size = 10
+                    instrument_id = "TQBR:SBER"
+                    reason = "test"
                 s = _Sig()
                 s.tp = 100.0 + tp_mult
                 s.r  = round(tp_mult / 1.0, 2)
@@ -475,3 +484,145 @@ class TestDecisionEngineNeverRaises(unittest.TestCase):
                 except Exception as e:
                     self.fail(f"DE raised for tp_mult={tp_mult}: {e}")
 
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# P7-03-G  Streaming indicator state — parity with full recompute
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def _reference(highs, lows, closes, volumes) -> dict:
+    """Full-recompute values in the same shape as IndicatorState.snapshot()."""
+    return {
+        "ema_34": indicators.calc_ema(closes, 34),
+        "ema_50": indicators.calc_ema(closes, 50),
+        "ema_50_prev": indicators.calc_ema(closes[:-1], 50),
+        "rsi_14": indicators.calc_rsi(closes, 14),
+        "atr_14": indicators.calc_atr(highs, lows, closes, 14),
+        "macd": indicators.calc_macd(closes),
+        "bollinger": indicators.calc_bollinger(closes, 20, 2.0),
+        "stochastic": indicators.calc_stochastic(highs, lows, closes, 14, 3),
+        "volume_ratio": indicators.calc_volume_ratio(volumes, 20),
+        "vwap": indicators.calc_vwap(highs, lows, closes, volumes),
+    }
+
+
+class TestStreamingIndicatorParity(unittest.TestCase):
+
+    def _assert_close(self, got, want, rel, label):
+        if want is None:
+            self.assertIsNone(got, label)
+            return
+        self.assertIsNotNone(got, label)
+        got_t = tuple(got) if isinstance(got, (list, tuple)) else (got,)
+        want_t = tuple(want) if isinstance(want, (list, tuple)) else (want,)
+        for g, w in zip(got_t, want_t):
+            self.assertLessEqual(abs(g - w), rel * max(1.0, abs(w)), f"{label}: {g} != {w}")
+
+    def _check_series(self, n, seed, window, rel, peek):
+        highs, lows, closes, volumes = _gen_candles(n, seed)
+        state = streaming.IndicatorState(window=window)
+        for i in range(n - 1):
+            state.update({"time": i * 60, "high": highs[i], "low": lows[i], "close": closes[i], "volume": volumes[i]})
+            if peek:
+                j = i + 1
+                snap = state.snapshot({"time": j * 60, "high": highs[j], "low": lows[j], "close": closes[j], "volume": volumes[j]})
+                lo = max(0, j + 1 - (window + 1))
+                sl = slice(lo, j + 1)
+            else:
+                snap = state.snapshot()
+                lo = max(0, i + 1 - window)
+                sl = slice(lo, i + 1)
+            want = _reference(highs[sl], lows[sl], closes[sl], volumes[sl])
+            self.assertEqual(snap["bars"], sl.stop - sl.start)
+            for key, value in want.items():
+                self._assert_close(snap[key], value, rel, f"seed={seed} bar={i} peek={peek} {key}")
+
+    def test_committed_matches_reference_before_window_rolls(self):
+        for seed in range(15):
+            with self.subTest(seed=seed):
+                self._check_series(120, seed, window=600, rel=1e-9, peek=False)
+
+    def test_peek_matches_reference_before_window_rolls(self):
+        for seed in range(15):
+            with self.subTest(seed=seed):
+                self._check_series(120, seed, window=600, rel=1e-9, peek=True)
+
+    def test_rolled_window_within_tolerance(self):
+        """Evicted bars only leave a decayed seed term in the recursive indicators."""
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self._check_series(700, seed, window=400, rel=1e-3, peek=True)
+
+    def test_peek_does_not_mutate_state(self):
+        highs, lows, closes, volumes = _gen_candles(80, 7)
+        state = streaming.IndicatorState()
+        for i in range(79):
+            state.update({"time": i, "high": highs[i], "low": lows[i], "close": closes[i], "volume": volumes[i]})
+        before = state.snapshot()
+        for price in (closes[-1] * 0.9, closes[-1] * 1.1):
+            state.snapshot({"time": 79, "high": price, "low": price, "close": price, "volume": 1.0})
+        self.assertEqual(state.snapshot(), before)
+
+    def test_aggregator_snapshot_matches_history(self):
+        from apps.worker.aggregator import CandleAggregator
+
+        highs, lows, closes, volumes = _gen_candles(260, 11)
+        agg = CandleAggregator(frame_sec=60, history_size=200)
+        for i in range(260):
+            agg.on_tick({"instrument_id": "TQBR:SBER", "time": i * 60, "open": closes[i],
+                         "high": highs[i], "low": lows[i], "close": closes[i], "volume": volumes[i]})
+        history = agg.get_history("TQBR:SBER")
+        snap = streaming.matching_snapshot(agg.indicator_snapshot("TQBR:SBER"), history)
+        self.assertIsNotNone(snap)
+        want = _reference(
+            [c["high"] for c in history], [c["low"] for c in history],
+            [c["close"] for c in history], [float(c["volume"]) for c in history],
+        )
+        for key in ("rsi_14", "atr_14", "bollinger", "stochastic", "volume_ratio", "vwap"):
+            self._assert_close(snap[key], want[key], 1e-6, key)
+
+    def test_matching_snapshot_rejects_other_windows(self):
+        candles = [{"time": i, "close": 1.0} for i in range(5)]
+        self.assertIsNone(streaming.matching_snapshot({"bars": 4, "last_time": 4}, candles))
+        self.assertIsNone(streaming.matching_snapshot({"bars": 5, "last_time": 3}, candles))
+        self.assertIsNotNone(streaming.matching_snapshot({"bars": 5, "last_time": 4}, candles))
+
+    @_skip_no_pydantic
+    def test_decision_engine_same_result_with_streaming_snapshot(self):
+        try:
+            from apps.worker.decision_engine.engine import DecisionEngine
+            from apps.worker.decision_engine.types import MarketSnapshot
+            from unittest.mock import patch
+        except Exception as e:
+            self.skipTest(f"DE not importable: {e}")
+            return
+
+        highs, lows, closes, volumes = _gen_candles(120, 5)
+        candles = [
+            {"time": i * 60, "open": c, "high": h, "low": lo, "close": c, "volume": v}
+            for i, (h, lo, c, v) in enumerate(zip(highs, lows, closes, volumes))
+        ]
+        state = streaming.IndicatorState()
+        for candle in candles[:-1]:
+            state.update(candle)
+        payload = state.snapshot(candles[-1])
+
+        class _Sig:
+            side = "BUY"
+            size = 10
+            instrument_id = "TQBR:SBER"
+            reason = "parity"
+        sig = _Sig()
+        sig.entry = closes[-1]
+        sig.sl = closes[-1] * 0.98
+        sig.tp = closes[-1] * 1.04
+        sig.r = 2.0
+
+        engine = DecisionEngine(TestDecisionEngineNeverRaises()._make_settings(3))
+        with patch("apps.worker.decision_engine.rules.check_session", return_value=None):
+            plain = engine.evaluate(sig, MarketSnapshot(candles=candles, last_price=closes[-1]))
+            fast = engine.evaluate(sig, MarketSnapshot(candles=candles, last_price=closes[-1], indicators=payload))
+        self.assertEqual(fast.metrics.get("indicator_source"), "streaming")
+        self.assertEqual(plain.decision, fast.decision)
+        self.assertEqual(plain.score_pct, fast.score_pct)
@@ -0,0 +1,41 @@
+import unittest
+
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from core.metrics import instrument_db_engine, instrument_tier, record_poll_request, record_stage_timings
+
+
+def _count(name, **labels):
+    return REGISTRY.get_sample_value(f'{name}_count', labels) or 0.0
+
+
+class LatencyMetricsTests(unittest.TestCase):
+    def test_stage_timings_are_observed_per_stage_and_tier(self):
+        before_ai = _count('trading_pipeline_stage_seconds', stage='decision_flow.ai', tier='tail')
+        before_total = _count('trading_pipeline_stage_seconds', stage='total', tier='tail')
+        record_stage_timings({'total_ms': 120, 'decision_flow': {'ai_ms': 80, 'provider': 'skip'}, 'cached': True}, 'tail')
+        self.assertEqual(_count('trading_pipeline_stage_seconds', stage='decision_flow.ai', tier='tail'), before_ai + 1)
+        self.assertEqual(_count('trading_pipeline_stage_seconds', stage='total', tier='tail'), before_total + 1)
+        self.assertIsNone(REGISTRY.get_sample_value('trading_pipeline_stage_seconds_count', {'stage': 'decision_flow.provider', 'tier': 'tail'}))
+
+    def test_poll_requests_are_labelled_by_tier_and_outcome(self):
+        tier = instrument_tier('TQBR:SBER', {'TQBR:SBER'})
+        before = _count('trading_poll_request_seconds', tier='core', outcome='error')
+        record_poll_request(tier, 0.2, ok=False)
+        self.assertEqual(tier, 'core')
+        self.assertEqual(instrument_tier('TQBR:AFLT', {'TQBR:SBER'}), 'tail')
+        self.assertEqual(_count('trading_poll_request_seconds', tier='core', outcome='error'), before + 1)
+
+    def test_db_engine_queries_are_timed_by_operation(self):
+        engine = create_engine('sqlite://')
+        instrument_db_engine(engine)
+        instrument_db_engine(engine)  # idempotent: one observation per statement
+        before = _count('trading_db_query_seconds', operation='select')
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        self.assertEqual(_count('trading_db_query_seconds', operation='select'), before + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import orjson
+
+from apps.worker.publisher import MarketPublisher
+from core.events.bus import EventBus
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover - optional dev dependency
+    fakeredis = None
+
+
+def _candle(instrument_id: str, close: float, time: int = 1700000000) -> SimpleNamespace:
+    return SimpleNamespace(instrument_id=instrument_id, time=time, open=close, high=close, low=close, close=close, volume=10)
+
+
+class _RecordingBus:
+    def __init__(self):
+        self.single: list[tuple[str, dict]] = []
+        self.batches: list[list[tuple[str, dict]]] = []
+        self.delivered: list[str] = []
+        self.gate: asyncio.Event | None = None
+
+    async def publish(self, type: str, data: dict):
+        self.single.append((type, data))
+
+    async def publish_many(self, events):
+        self.batches.append(list(events))
+        if self.gate is not None:
+            await self.gate.wait()
+        self.delivered.extend(item['instrument_id'] for _, data in events for item in data['items'])
+        return [1] * len(events)
+
+
+class MarketPublisherBatchTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.bus = _RecordingBus()
+        bus_patch = patch('apps.worker.publisher.bus', self.bus)
+        bus_patch.start()
+        self.addCleanup(bus_patch.stop)
+
+    async def test_unbatched_mode_publishes_one_kline_per_candle(self):
+        publisher = MarketPublisher(throttle_sec=0, batch_window_sec=0)
+        await publisher.publish_candle(_candle('TQBR:SBER', 100.0))
+        await publisher.publish_candle(_candle('TQBR:GAZP', 150.0))
+        self.assertEqual([type for type, _ in self.bus.single], ['kline', 'kline'])
+        self.assertEqual(self.bus.batches, [])
+
+    async def test_window_collects_latest_candle_per_instrument_into_one_batch(self):
+        publisher = MarketPublisher(throttle_sec=0, batch_window_sec=60)
+        await publisher.publish_candle(_candle('TQBR:SBER', 100.0))
+        await publisher.publish_candle(_candle('TQBR:GAZP', 150.0))
+        await publisher.publish_candle(_candle('TQBR:SBER', 101.0))
+        self.assertEqual(await publisher.flush(), 2)
+        self.assertEqual(self.bus.single, [])
+        [[(event_type, data)]] = self.bus.batches
+        self.assertEqual(event_type, 'kline_batch')
+        self.assertEqual(data['tf'], '1m')
+        self.assertEqual({item['instrument_id']: item['candle']['close'] for item in data['items']}, {'TQBR:SBER': 101.0, 'TQBR:GAZP': 150.0})
+        await publisher.close()
+
+    async def test_throttle_and_heartbeat_apply_before_batching(self):
+        publisher = MarketPublisher(throttle_sec=60, batch_window_sec=60)
+        await publisher.publish_candle(_candle('TQBR:SBER', 100.0))
+        await publisher.publish_candle(_candle('TQBR:SBER', 105.0))
+        await publisher.close()
+        [[(_, data)]] = self.bus.batches
+        self.assertEqual([item['candle']['close'] for item in data['items']], [100.0])
+
+        publisher = MarketPublisher(throttle_sec=0, heartbeat_sec=60, batch_window_sec=60)
+        await publisher.publish_candle(_candle('TQBR:GAZP', 150.0))
+        await publisher.publish_candle(_candle('TQBR:GAZP', 150.0))
+        await publisher.publish_candle(_candle('TQBR:GAZP', 150.0))
+        # The first repeat is a heartbeat; the next one falls inside heartbeat_sec and is dropped.
+        self.assertEqual(await publisher.flush(), 1)
+        self.assertTrue(self.bus.batches[-1][0][1]['items'][0]['heartbeat'])
+
+    async def test_large_batches_are_split(self):
+        publisher = MarketPublisher(throttle_sec=0, batch_window_sec=60)
+        publisher.MAX_BATCH_ITEMS = 3
+        for i in range(7):
+            await publisher.publish_candle(_candle(f'TQBR:T{i}', 100.0 + i))
+        await publisher.close()
+        self.assertEqual([len(data['items']) for _, data in self.bus.batches[0]], [3, 3, 1])
+
+    async def test_flush_task_fires_after_window(self):
+        publisher = MarketPublisher(throttle_sec=0, batch_window_sec=0.01)
+        await publisher.publish_candle(_candle('TQBR:SBER', 100.0))
+        await publisher._flush_task
+        self.assertEqual(len(self.bus.batches), 1)
+
+    async def test_candles_queued_during_publish_get_a_follow_up_flush(self):
+        self.bus.gate = asyncio.Event()
+        publisher = MarketPublisher(throttle_sec=0, batch_window_sec=0.01)
+        await publisher.publish_candle(_candle('TQBR:SBER', 100.0))
+        task = publisher._flush_task
+        while not self.bus.batches:
+            await asyncio.sleep(0.005)
+        await publisher.publish_candle(_candle('TQBR:GAZP', 150.0))
+        self.assertIs(publisher._flush_task, task)
+        self.bus.gate.set()
+        await task
+        self.assertEqual([[item['instrument_id'] for _, data in batch for item in data['items']] for batch in self.bus.batches], [['TQBR:SBER'], ['TQBR:GAZP']])
+
+    async def test_close_waits_for_in_flight_batch(self):
+        self.bus.gate = asyncio.Event()
+        publisher = MarketPublisher(throttle_sec=0, batch_window_sec=0.01)
+        await publisher.publish_candle(_candle('TQBR:SBER', 100.0))
+        while not self.bus.batches:
+            await asyncio.sleep(0.005)
+        await publisher.publish_candle(_candle('TQBR:GAZP', 150.0))
+        closing = asyncio.create_task(publisher.close())
+        await asyncio.sleep(0.02)
+        self.assertFalse(closing.done())
+        self.bus.gate.set()
+        await closing
+        self.assertEqual(self.bus.delivered, ['TQBR:SBER', 'TQBR:GAZP'])
+
+
+@unittest.skipUnless(fakeredis is not None, 'fakeredis not installed')
+class PublishManyTests(unittest.IsolatedAsyncioTestCase):
+    async def test_streams_backend_appends_each_event(self):
+        bus = EventBus(client=fakeredis.FakeAsyncRedis(decode_responses=True), backend='streams')
+        try:
+            ids = await bus.publish_many([('kline_batch', {'items': [1]}), ('kline_batch', {'items': [2]})])
+            self.assertEqual(len(ids), 2)
+            entries = await bus.read_events('0-0', block_ms=0)
+            self.assertEqual([orjson.loads(raw)['data']['items'] for _, raw in entries], [[1], [2]])
+            self.assertEqual(await bus.publish_many([]), [])
+        finally:
+            await bus.redis.aclose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from types import SimpleNamespace
 
+import numpy as np
+
 from core.ml.attribution import build_ml_attribution_report_from_entities
 
 
@@ -96,6 +98,33 @@ class MLAttributionTests(unittest.TestCase):
         self.assertEqual(payload['breakdowns']['close_reason']['TP'], 1)
         self.assertEqual(payload['recent_rows'][0]['signal_id'], 'sig_pending')
 
+    def test_active_model_scores_all_signals_in_one_batch(self):
+        class _Vectorizer:
+            def transform(self, rows):
+                return rows
+
+        class _Model:
+            calls = 0
+
+            def predict_proba(self, rows):
+                _Model.calls += 1
+                return np.array([[0.2, 0.8] if row['side'] == 'BUY' else [0.7, 0.3] for row in rows])
+
+        def _signal(signal_id, side, created_ts, status):
+            return SimpleNamespace(
+                id=signal_id, instrument_id='TQBR:SBER', side=side, entry=100.0, sl=99.0, tp=102.0, size=10.0,
+                created_ts=created_ts, status=status, meta={'final_decision': 'TAKE', 'decision': {'decision': 'TAKE'}},
+            )
+
+        signals = [_signal('sig_buy', 'BUY', 1710000000000, 'executed'), _signal('sig_sell', 'SELL', 1710000100000, 'rejected')]
+        payload = build_ml_attribution_report_from_entities(signals, [], active_artifact={'vectorizer': _Vectorizer(), 'model': _Model()})
+
+        self.assertEqual(_Model.calls, 1)
+        self.assertEqual(payload['active_model']['scored'], 2)
+        self.assertEqual(payload['active_model']['avg_probability_by_stage'], {'trade_filled': 0.8, 'take_not_filled': 0.3})
+        self.assertEqual({row['signal_id']: row['active_model_probability'] for row in payload['recent_rows']}, {'sig_buy': 0.8, 'sig_sell': 0.3})
+        self.assertIsNone(build_ml_attribution_report_from_entities(signals, [])['active_model'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,9 @@
 import unittest
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from core.ml.runtime import evaluate_ml_overlay
+from core.ml.registry import ModelCache
+from core.ml.runtime import evaluate_ml_overlay, train_ml_models
 
 
 class MLRuntimeTests(unittest.TestCase):
@@ -50,5 +51,65 @@ class MLRuntimeTests(unittest.TestCase):
         self.assertEqual(overlay.action, 'veto')
 
 
+class ModelCacheTests(unittest.TestCase):
+    def test_artifacts_load_once_per_run_and_swap_on_activate(self):
+        cache = ModelCache(active_ttl_sec=60)
+        loads = []
+
+        def loader(path):
+            loads.append(path)
+            return {'path': path}
+
+        old_run = SimpleNamespace(id='ml_old', target='trade_outcome', artifact_path='old.joblib')
+        new_run = SimpleNamespace(id='ml_new', target='trade_outcome', artifact_path='new.joblib')
+        for _ in range(3):
+            self.assertEqual(cache.get(old_run, loader=loader), {'path': 'old.joblib'})
+        self.assertEqual(loads, ['old.joblib'])
+        self.assertEqual(cache.stats()['hit_rate'], round(2 / 3, 4))
+
+        cache.activate('trade_outcome', 'ml_new')
+        self.assertEqual(cache.get(new_run, loader=loader), {'path': 'new.joblib'})
+        self.assertEqual(cache.stats()['cached_runs'], ['ml_new'])
+        self.assertIsNone(cache.get(None, loader=loader))
+
+    def test_active_runs_are_cached_until_activate(self):
+        cache = ModelCache(active_ttl_sec=60)
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            return {'trade_outcome': SimpleNamespace(id='ml_a', artifact_path='a'), 'take_fill': None}
+
+        first = cache.active_runs('engine', fetch)
+        self.assertIs(cache.active_runs('engine', fetch), first)
+        self.assertEqual(first['trade_outcome'].id, 'ml_a')
+        self.assertIsNone(first['take_fill'])
+        cache.activate('take_fill', 'ml_b')
+        cache.active_runs('engine', fetch)
+        cache.active_runs(None, fetch)
+        self.assertEqual(len(fetches), 3)
+
+    def test_training_swaps_cached_model_only_after_commit(self):
+        cache = ModelCache(active_ttl_sec=60)
+        cache.get(SimpleNamespace(id='ml_old', target='trade_outcome', artifact_path='old'), loader=lambda path: {'path': path})
+        artifact = SimpleNamespace(target='trade_outcome', model_type='logistic_regression', vectorizer=None, model=None, feature_names=[], metrics={}, params={})
+        db = MagicMock()
+        db.commit.side_effect = RuntimeError('commit failed')
+        settings = SimpleNamespace(ml_enabled=True, ml_lookback_days=30, ml_min_training_samples=10)
+        with patch('core.ml.runtime.model_cache', cache), \
+                patch('core.ml.runtime.build_training_datasets', return_value={'trade_outcome': SimpleNamespace(rows=[], to_payload=lambda limit: {})}), \
+                patch('core.ml.runtime.train_classifier', return_value=artifact), \
+                patch('core.ml.runtime.save_artifact', return_value='new'), \
+                patch('core.ml.runtime.append_decision_log_best_effort'):
+            with self.assertRaises(RuntimeError):
+                train_ml_models(db, settings)
+            self.assertEqual(cache.stats()['cached_runs'], ['ml_old'])
+
+            db.commit.side_effect = None
+            db.query.return_value.filter.return_value.all.return_value = []
+            train_ml_models(db, settings)
+            self.assertEqual(cache.stats()['cached_runs'], [])
+
+
 if __name__ == '__main__':
     unittest.main()
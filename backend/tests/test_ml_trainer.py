@@ -1,7 +1,7 @@
 import unittest
 
 from core.ml.dataset import TrainingDataset, TrainingRow
-from core.ml.trainer import predict_probability, train_classifier
+from core.ml.trainer import predict_probabilities, predict_probability, train_classifier
 
 
 class MLTrainerTests(unittest.TestCase):
@@ -35,6 +35,13 @@ class MLTrainerTests(unittest.TestCase):
         })
         self.assertGreater(proba_good, proba_bad)
 
+        batch = [dict(row.features) for row in rows[:9]]
+        self.assertEqual(
+            [round(p, 12) for p in predict_probabilities(artifact, batch)],
+            [round(predict_probability(artifact, features), 12) for features in batch],
+        )
+        self.assertEqual(predict_probabilities(artifact, []), [])
+
 
 if __name__ == '__main__':
     unittest.main()
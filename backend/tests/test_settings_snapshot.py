@@ -0,0 +1,67 @@
+import pickle
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.models import schemas
+from core.storage.models import Base
+from core.storage.repos import settings as settings_repo
+
+
+class SettingsSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(self.engine, tables=[Base.metadata.tables['settings']])
+        self.db = sessionmaker(bind=self.engine)()
+        settings_repo.invalidate_settings_snapshot()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+        settings_repo.invalidate_settings_snapshot()
+
+    def test_snapshot_is_cached_and_read_only(self):
+        first = settings_repo.get_settings_snapshot(self.db)
+        self.assertIsInstance(first, settings_repo.SettingsSnapshot)
+        with patch.object(settings_repo, 'get_settings', side_effect=AssertionError('db read')):
+            second = settings_repo.get_settings_snapshot(self.db)
+        self.assertIs(second, first)
+        self.assertEqual(first.version, int(first.updated_ts or 0))
+        self.assertEqual(getattr(first, 'no_such_setting', 'fallback'), 'fallback')
+        with self.assertRaises(AttributeError):
+            first.bot_enabled = True
+        clone = pickle.loads(pickle.dumps(first))
+        self.assertEqual(clone.as_dict(), first.as_dict())
+
+    def test_update_refreshes_snapshot_and_invalidation_drops_stale_versions(self):
+        before = settings_repo.get_settings_snapshot(self.db)
+        payload = settings_repo.get_settings(self.db)
+        current = schemas.RiskSettings.model_validate(payload, from_attributes=True).model_dump()
+        current['risk_per_trade_pct'] = float(current.get('risk_per_trade_pct') or 0.25) + 0.5
+        updated = settings_repo.update_settings(self.db, schemas.RiskSettings(**current))
+
+        after = settings_repo.get_settings_snapshot(self.db)
+        self.assertIsNot(after, before)
+        self.assertEqual(after.risk_per_trade_pct, updated.risk_per_trade_pct)
+
+        self.assertEqual(settings_repo.invalidate_settings_snapshot(after.version), 0)
+        self.assertEqual(settings_repo.invalidate_settings_snapshot(after.version + 1), 1)
+        self.assertIsNot(settings_repo.get_settings_snapshot(self.db), after)
+
+    def test_ttl_expiry_reloads(self):
+        first = settings_repo.get_settings_snapshot(self.db)
+        with patch.object(settings_repo, '_SNAPSHOT_TTL_SEC', 0.0):
+            self.assertIsNot(settings_repo.get_settings_snapshot(self.db), first)
+
+    def test_non_orm_rows_pass_through_uncached(self):
+        row = SimpleNamespace(bot_enabled=True)
+        with patch.object(settings_repo, 'get_settings', return_value=row):
+            self.assertIs(settings_repo.get_settings_snapshot(self.db), row)
+            self.assertIs(settings_repo.get_settings_snapshot(self.db), row)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import orjson
+
+from apps.api.sse_hub import SSEHub
+
+
+def _event(event_type: str, data: dict) -> str:
+    return orjson.dumps({'type': event_type, 'ts': 1, 'data': data}).decode()
+
+
+def _kline(instrument_id: str, close: float) -> str:
+    return _event('kline', {'instrument_id': instrument_id, 'tf': '1m', 'candle': {'close': close}})
+
+
+class SSEHubTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.hub = SSEHub(max_pending=4)
+        # Fan-out is exercised through dispatch(); no Redis subscriber in these tests.
+        self.hub._ensure_started = lambda: None
+
+    async def _drain(self, client) -> list[str]:
+        frames = []
+        while (frame := await client.next(timeout=0)) is not None:
+            frames.append(frame)
+        return frames
+
+    async def test_every_client_receives_each_event_once(self):
+        first, second = self.hub.register(), self.hub.register()
+        raw = _event('signal_created', {'id': 's1'})
+        self.hub.dispatch(raw)
+        expected = [f'event: signal_created\ndata: {raw}\n\n']
+        self.assertEqual(await self._drain(first), expected)
+        self.assertEqual(await self._drain(second), expected)
+        self.hub.unregister(second)
+        self.hub.dispatch(raw)
+        self.assertEqual(len(await self._drain(first)), 1)
+        self.assertEqual(self.hub.stats()['clients'], 1)
+
+    async def test_klines_coalesce_to_latest_per_instrument(self):
+        client = self.hub.register()
+        self.hub.dispatch(_kline('TQBR:SBER', 100.0))
+        self.hub.dispatch(_event('order_updated', {'id': 'o1'}))
+        self.hub.dispatch(_kline('TQBR:GAZP', 150.0))
+        self.hub.dispatch(_kline('TQBR:SBER', 101.0))
+        frames = await self._drain(client)
+        self.assertEqual(len(frames), 3)
+        self.assertIn('101.0', frames[0])
+        self.assertTrue(frames[1].startswith('event: order_updated'))
+        self.assertIn('TQBR:GAZP', frames[2])
+        self.assertEqual(client.dropped, 0)
+
+    async def test_slow_client_drops_oldest_frames(self):
+        client = self.hub.register()
+        for i in range(7):
+            self.hub.dispatch(_event('decision_log', {'i': i}))
+        frames = await self._drain(client)
+        self.assertEqual([orjson.loads(frame.split('data: ', 1)[1])['data']['i'] for frame in frames], [3, 4, 5, 6])
+        self.assertEqual(client.dropped, 3)
+
+    async def test_waiting_client_wakes_on_push_and_skips_malformed(self):
+        client = self.hub.register()
+        self.assertIsNone(await client.next(timeout=0.01))
+        self.hub.dispatch('not json')
+        self.assertEqual(self.hub.malformed, 1)
+        self.hub.dispatch(_event('trade_filled', {}))
+        self.assertTrue((await client.next(timeout=1.0)).startswith('event: trade_filled'))
+
+
+if __name__ == '__main__':
+    unittest.main()
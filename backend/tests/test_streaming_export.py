@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+import tracemalloc
+import unittest
+import zipfile
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.routers import trades as trades_router
+from core.services.streaming_export import ZipStream, csv_chunks, iter_rows, json_array_chunks, jsonl_chunks, stream_with_session
+from core.storage.models import Base, DecisionLog, TradeJournal
+
+
+class StreamingWriterTests(unittest.TestCase):
+    def test_json_array_matches_json_dumps(self):
+        rows = [{'a': 1, 'nested': {'b': [1, 2], 'text': 'line\nbreak'}}, {'a': 2, 'nested': {}}]
+        self.assertEqual(''.join(json_array_chunks(rows)), json.dumps(rows, ensure_ascii=False, indent=2))
+        self.assertEqual(''.join(json_array_chunks([])), json.dumps([], indent=2))
+
+    def test_csv_chunks_match_dict_writer(self):
+        rows = [{'a': i, 'b': f'v{i}', 'extra': 'x'} for i in range(2000)]
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=['a', 'b'], extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+        chunks = list(csv_chunks(rows, ['a', 'b']))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), buf.getvalue())
+
+    def test_zip_stream_round_trips(self):
+        stream = ZipStream(chunk_bytes=1024)
+        rows = [{'i': i, 'payload': 'x' * (i % 50)} for i in range(5000)]
+        data = b''.join([
+            *stream.entry('rows.jsonl', jsonl_chunks(rows)),
+            *stream.entry('empty.json', json_array_chunks([])),
+            *stream.close(),
+        ])
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertEqual(zf.namelist(), ['rows.jsonl', 'empty.json'])
+            self.assertIsNone(zf.testzip())
+            self.assertEqual([json.loads(line) for line in zf.read('rows.jsonl').decode().splitlines()], rows)
+
+
+class StreamingQueryTests(unittest.TestCase):
+    def setUp(self):
+        jsonb = patch.object(SQLiteTypeCompiler, 'visit_JSONB', SQLiteTypeCompiler.visit_JSON, create=True)
+        jsonb.start()
+        self.addCleanup(jsonb.stop)
+        engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+
+    def _seed_logs(self, start: int, stop: int, blob: str) -> None:
+        db = self.Session()
+        db.bulk_insert_mappings(DecisionLog, [
+            {'id': f'log_{i:06d}', 'ts': i, 'type': 'signal_pipeline', 'message': 'm', 'payload': {'i': i, 'blob': blob}}
+            for i in range(start, stop)
+        ])
+        db.commit()
+        db.close()
+
+    def _export_peak(self) -> tuple[int, int]:
+        def build(db):
+            stream = ZipStream()
+            yield from stream.entry('decision_log.jsonl', jsonl_chunks(iter_rows(db.query(DecisionLog).order_by(DecisionLog.ts), ['id', 'ts', 'payload'])))
+            yield from stream.close()
+
+        tracemalloc.start()
+        try:
+            total = 0
+            for chunk in stream_with_session(build, session_factory=self.Session):
+                total += len(chunk)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return total, peak
+
+    def test_zipped_log_export_memory_does_not_grow_with_rows(self):
+        blob = 'r' * 1500
+        self._seed_logs(0, 200, blob)
+        self._export_peak()  # warm statement caches and lazy imports outside the measurement
+        self._seed_logs(200, 2000, blob)
+        small_total, small_peak = self._export_peak()
+        self._seed_logs(2000, 8000, blob)
+        large_total, large_peak = self._export_peak()
+        self.assertGreater(large_total, small_total)
+        added_bytes = 6000 * len(blob)
+        self.assertLess(large_peak - small_peak, added_bytes / 20)
+        self.assertLess(large_peak, 8000 * len(blob) / 6)
+
+    def test_trades_csv_streams_whole_journal(self):
+        db = self.Session()
+        db.add_all([
+            TradeJournal(id=f'log_{i:05d}', close_ts=1_700_000_000_000 + i, opened_ts=1_700_000_000_000, instrument_id='TQBR:SBER', side='BUY',
+                         entry_price=100.0, close_price=101.0, qty=1, realized_pnl=1.0, duration_sec=i, extra={})
+            for i in range(2500)
+        ])
+        db.commit()
+        data = b''.join(trades_router.iter_trades_csv(db)).decode()
+        rows = list(csv.DictReader(io.StringIO(data)))
+        self.assertEqual(len(rows), 2500)
+        self.assertEqual(rows[0]['closed_ts'], str(1_700_000_000_000 + 2499))
+        self.assertEqual(rows[0]['realized_pnl'], '1.0')
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
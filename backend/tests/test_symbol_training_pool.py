@@ -0,0 +1,133 @@
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.orm import sessionmaker
+
+from core.services import symbol_adaptive
+from core.services.training_pool import TrainingPool
+from core.storage.models import Base, SymbolProfile, SymbolTrainingRun
+from core.storage.repos.candles import upsert_candles
+
+
+def _candles(n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    price = rng.uniform(50.0, 500.0)
+    now = 1_700_000_000
+    out = []
+    for i in range(n):
+        open_ = price
+        price = max(0.01, price * (1 + rng.gauss(0.0002, 0.004)))
+        out.append({
+            'time': now + i * 60,
+            'open': open_,
+            'high': max(open_, price) * 1.001,
+            'low': min(open_, price) * 0.999,
+            'close': price,
+            'volume': rng.randint(100, 3000),
+        })
+    return out
+
+
+class WalkForwardPoolTests(unittest.TestCase):
+    def test_pooled_walk_forward_matches_serial(self):
+        candles = _candles(1500, seed=3)
+        serial = symbol_adaptive._walk_forward_validate('TQBR:SBER', candles)
+        pool = TrainingPool(processes=2)
+        try:
+            pooled = symbol_adaptive._walk_forward_validate('TQBR:SBER', candles, pool=pool)
+        finally:
+            pool.shutdown()
+        self.assertTrue(serial['available'])
+        self.assertEqual(pooled, serial)
+
+    def test_short_history_is_unavailable_without_jobs(self):
+        plan = symbol_adaptive._walk_forward_plan('TQBR:SBER', _candles(100, seed=1))
+        self.assertFalse(plan['available'])
+        self.assertEqual(symbol_adaptive._walk_forward_result('TQBR:SBER', plan, {}), {'available': False, 'reason': 'not_enough_candles', 'candles_used': 100})
+
+
+class BulkTrainingTests(unittest.TestCase):
+    def setUp(self):
+        jsonb = patch.object(SQLiteTypeCompiler, 'visit_JSONB', SQLiteTypeCompiler.visit_JSON, create=True)
+        jsonb.start()
+        self.addCleanup(jsonb.stop)
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.commits = 0
+
+        def _count(_session):
+            self.commits += 1
+
+        self.Session = sessionmaker(bind=engine)
+        event.listen(self.Session, 'after_commit', _count)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = Path(tmp.name) / 'profiles.json'
+        store = patch.object(symbol_adaptive, '_json_store_path', return_value=self.store)
+        store.start()
+        self.addCleanup(store.stop)
+        archive = patch('core.storage.repos.candles.get_candle_archive', return_value=None)
+        archive.start()
+        self.addCleanup(archive.stop)
+
+    def _seed(self, ids: list[str]):
+        db = self.Session()
+        now = int(time.time())
+        for seed, instrument_id in enumerate(ids[:2]):
+            bars = _candles(900, seed=seed)
+            for bar in bars:
+                bar['time'] += now - bars[-1]['time']
+            upsert_candles(db, instrument_id=instrument_id, timeframe='1m', candles=bars)
+        upsert_candles(db, instrument_id='TQBR:THIN', timeframe='1m', candles=_candles(50, seed=9))
+        for instrument_id in ids:
+            symbol_adaptive._ensure_profile_row(db, instrument_id)
+        self.commits = 0
+        return db
+
+    def test_bulk_training_writes_runs_in_one_commit(self):
+        ids = ['TQBR:SBER', 'TQBR:GAZP', 'TQBR:THIN']
+        db = self._seed(ids)
+
+        result = symbol_adaptive.train_symbol_profiles_bulk(db, ids, source='test', min_candles=320, pool=TrainingPool(processes=0))
+
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(result['skipped'], ['TQBR:THIN'])
+        self.assertEqual([item['instrument_id'] for item in result['items']], ids[:2])
+        runs = db.query(SymbolTrainingRun).order_by(SymbolTrainingRun.instrument_id).all()
+        self.assertEqual([run.instrument_id for run in runs], ['TQBR:GAZP', 'TQBR:SBER'])
+        self.assertTrue(all(run.mode == 'offline_walk_forward' for run in runs))
+        profile = db.query(SymbolProfile).filter(SymbolProfile.instrument_id == 'TQBR:SBER').one()
+        self.assertEqual(profile.source, 'offline_training')
+        self.assertIn('TQBR:SBER', self.store.read_text(encoding='utf-8'))
+        db.close()
+
+    def test_failed_finish_does_not_commit_half_merged_profile(self):
+        ids = ['TQBR:SBER', 'TQBR:GAZP', 'TQBR:THIN']
+        db = self._seed(ids)
+        real_training_run = symbol_adaptive._training_run
+
+        def flaky_training_run(instrument_id, **kwargs):
+            if instrument_id == 'TQBR:GAZP':
+                raise RuntimeError('boom')
+            return real_training_run(instrument_id, **kwargs)
+
+        with patch.object(symbol_adaptive, '_training_run', side_effect=flaky_training_run):
+            result = symbol_adaptive.train_symbol_profiles_bulk(db, ids, source='test', min_candles=320, pool=TrainingPool(processes=0))
+
+        self.assertEqual({item['instrument_id']: item.get('error') for item in result['items']}, {'TQBR:SBER': None, 'TQBR:GAZP': 'boom'})
+        self.assertEqual([run.instrument_id for run in db.query(SymbolTrainingRun).all()], ['TQBR:SBER'])
+        db.expire_all()
+        sources = dict(db.query(SymbolProfile.instrument_id, SymbolProfile.source).all())
+        self.assertEqual(sources['TQBR:SBER'], 'offline_training')
+        self.assertNotEqual(sources['TQBR:GAZP'], 'offline_training')
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.broker.tbank.adapter import TBankGrpcAdapter
+from apps.worker.db_executor import WorkerDbExecutor
+from core.execution.tbank import TBankExecutionEngine
+from core.storage.models import AccountSnapshot, Base, Position, Signal
+
+
+class _Adapter:
+    normalize_signal_qty_to_lots = TBankGrpcAdapter.normalize_signal_qty_to_lots
+
+    def __init__(self):
+        self.ensure_instrument_tradable = AsyncMock(return_value={'uid': 'uid-sber', 'lot': 10, 'short_enabled': True})
+        self.post_market_order = AsyncMock(return_value={'orderId': 'broker-1'})
+        self.wait_for_terminal_order_state = AsyncMock(return_value={
+            'orderId': 'broker-1',
+            'executionReportStatus': 'EXECUTION_REPORT_STATUS_FILL',
+            'lotsExecuted': 1,
+            'executedOrderPrice': {'units': 101, 'nano': 0},
+        })
+        self.get_portfolio = AsyncMock(return_value={'totalAmountPortfolio': {'units': 1000}, 'totalAmountCurrencies': {'units': 900}, 'positions': []})
+
+
+class TBankExecutionDbCallTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        jsonb = patch.object(SQLiteTypeCompiler, 'visit_JSONB', SQLiteTypeCompiler.visit_JSON, create=True)
+        jsonb.start()
+        self.addCleanup(jsonb.stop)
+        engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add(Signal(id='sig_1', instrument_id='TQBR:SBER', ts=1, side='BUY', entry=Decimal(100), sl=Decimal(99), tp=Decimal(103), size=Decimal(10), r=Decimal(1), status='approved', meta={}))
+        self.db.commit()
+        self.executor = WorkerDbExecutor(max_workers=1, session_factory=lambda: self.db)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown()
+        self.db.close()
+
+    async def test_db_sections_run_through_db_call(self):
+        engine = object.__new__(TBankExecutionEngine)
+        engine.db = self.db
+        engine.account_id = 'acc'
+        engine.risk = SimpleNamespace(check_new_signal=lambda _signal: (True, None))
+        engine.adapter = _Adapter()
+        calls: list[str] = []
+
+        async def db_call(fn, *args, **kwargs):
+            calls.append(fn.__name__)
+            return await self.executor.call(fn, *args, **kwargs)
+
+        publish = AsyncMock()
+        with patch('core.execution.tbank.bus', SimpleNamespace(publish=publish)), patch('core.execution.tbank.append_decision_log_best_effort'):
+            await engine.execute_approved_signal('sig_1', db_call=db_call)
+
+        self.assertEqual(calls, ['_check_approved_signal', '_record_fill', '_save_snapshot'])
+        self.assertEqual([call.args[0] for call in publish.await_args_list], ['orders_updated', 'positions_updated', 'signal_updated', 'trade_filled'])
+        self.assertEqual(self.db.get(Signal, 'sig_1').status, 'executed')
+        self.assertEqual(float(self.db.query(Position).one().qty), 10.0)
+        self.assertEqual(self.db.query(AccountSnapshot).count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+MarketDataStream against a local fake gRPC server: subscribe / unsubscribe over
+the live stream, reconnect markers and candle conversion.
+"""
+import asyncio
+import unittest
+
+try:
+    import grpc
+    from apps.broker.tbank import adapter as tbank_adapter
+    from apps.broker.tbank.adapter import TBankGrpcAdapter
+
+    tbank_adapter._load_grpc_modules()
+    marketdata_pb2 = tbank_adapter.marketdata_pb2
+    marketdata_pb2_grpc = tbank_adapter.marketdata_pb2_grpc
+    common_pb2 = tbank_adapter.common_pb2
+    _GRPC_OK = True
+except Exception:  # pragma: no cover - depends on installed grpc/protobuf
+    _GRPC_OK = False
+
+
+if _GRPC_OK:
+    class _FakeMarketDataStream(marketdata_pb2_grpc.MarketDataStreamServiceServicer):
+        def __init__(self, *, drop_first: bool = False):
+            self.requests: list = []
+            self.calls = 0
+            self.drop_first = drop_first
+
+        async def MarketDataStream(self, request_iterator, context):
+            self.calls += 1
+            call_no = self.calls
+            async for req in request_iterator:
+                self.requests.append(req)
+                sub = req.subscribe_candles_request
+                if sub.subscription_action != marketdata_pb2.SUBSCRIPTION_ACTION_SUBSCRIBE:
+                    continue
+                for inst in sub.instruments:
+                    candle = marketdata_pb2.Candle(
+                        instrument_uid=inst.instrument_id,
+                        volume=10 * call_no,
+                        open=common_pb2.Quotation(units=100, nano=0),
+                        high=common_pb2.Quotation(units=101, nano=500_000_000),
+                        low=common_pb2.Quotation(units=99, nano=0),
+                        close=common_pb2.Quotation(units=101, nano=0),
+                    )
+                    candle.time.seconds = 1_700_000_040
+                    yield marketdata_pb2.MarketDataResponse(candle=candle)
+                if self.drop_first and call_no == 1:
+                    await context.abort(grpc.StatusCode.UNAVAILABLE, "drop")
+
+
+@unittest.skipUnless(_GRPC_OK, "grpc / generated T-Bank stubs unavailable")
+class TBankMarketStreamTests(unittest.IsolatedAsyncioTestCase):
+    async def _start(self, servicer):
+        server = grpc.aio.server()
+        marketdata_pb2_grpc.add_MarketDataStreamServiceServicer_to_server(servicer, server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        self.addAsyncCleanup(server.stop, None)
+
+        adapter = TBankGrpcAdapter(token="test-token", account_id="acc")
+        adapter._stream_mode = "grpc"
+        adapter._channel = grpc.aio.insecure_channel(f"127.0.0.1:{port}")
+        adapter._instrument_cache = {
+            "TQBR:SBER": {"uid": "uid-sber"},
+            "TQBR:GAZP": {"uid": "uid-gazp"},
+        }
+        self.addAsyncCleanup(adapter.close)
+        return adapter
+
+    async def test_dynamic_subscribe_and_unsubscribe(self):
+        servicer = _FakeMarketDataStream()
+        adapter = await self._start(servicer)
+        control: asyncio.Queue = asyncio.Queue()
+        stream = adapter.stream_marketdata(["TQBR:SBER"], control=control, rest_fallback=False)
+
+        connected = await asyncio.wait_for(stream.__anext__(), 5)
+        self.assertEqual(connected["event_type"], "stream_connected")
+        self.assertFalse(connected["reconnect"])
+        self.assertEqual(connected["instrument_ids"], ["TQBR:SBER"])
+
+        candle = await asyncio.wait_for(stream.__anext__(), 5)
+        self.assertEqual(candle["instrument_id"], "TQBR:SBER")
+        self.assertEqual(candle["time"], 1_700_000_040)
+        self.assertEqual(str(candle["high"]), "101.5")
+        self.assertEqual(candle["volume"], 10)
+
+        control.put_nowait(("subscribe", ["TQBR:GAZP"]))
+        candle = await asyncio.wait_for(stream.__anext__(), 5)
+        self.assertEqual(candle["instrument_id"], "TQBR:GAZP")
+
+        control.put_nowait(("unsubscribe", ["TQBR:SBER"]))
+        for _ in range(50):
+            if len(servicer.requests) >= 3:
+                break
+            await asyncio.sleep(0.02)
+        await stream.aclose()
+
+        last = servicer.requests[-1].subscribe_candles_request
+        self.assertEqual(last.subscription_action, marketdata_pb2.SUBSCRIPTION_ACTION_UNSUBSCRIBE)
+        self.assertEqual([i.instrument_id for i in last.instruments], ["uid-sber"])
+
+    async def test_reconnect_resubscribes_and_marks_reconnect(self):
+        servicer = _FakeMarketDataStream(drop_first=True)
+        adapter = await self._start(servicer)
+        control: asyncio.Queue = asyncio.Queue()
+        stream = adapter.stream_marketdata(["TQBR:SBER", "TQBR:GAZP"], control=control, rest_fallback=False)
+
+        events = []
+        while len([e for e in events if e.get("event_type") == "stream_connected"]) < 2:
+            events.append(await asyncio.wait_for(stream.__anext__(), 10))
+        events.append(await asyncio.wait_for(stream.__anext__(), 5))
+        await stream.aclose()
+
+        markers = [e for e in events if e.get("event_type") == "stream_connected"]
+        self.assertEqual([m["reconnect"] for m in markers], [False, True])
+        self.assertEqual(sorted(markers[1]["instrument_ids"]), ["TQBR:GAZP", "TQBR:SBER"])
+        self.assertEqual(events[-1]["volume"], 20)
+        resubscribe = servicer.requests[-1].subscribe_candles_request
+        self.assertEqual(sorted(i.instrument_id for i in resubscribe.instruments), ["uid-gazp", "uid-sber"])
+
+
+if __name__ == "__main__":
+    unittest.main()
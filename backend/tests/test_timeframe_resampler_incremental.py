@@ -0,0 +1,94 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from apps.worker.aggregator import CandleAggregator
+from core.services.timeframe_engine import TimeframeResampler, resample_candles
+
+_TIMEFRAMES = ('3m', '5m', '15m', '30m', '1h')
+# 2025-03-31 06:00 MSK, in epoch seconds as the worker aggregator stores it.
+_START = 1743390000
+
+
+def _bars(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    out = []
+    ts = _START
+    price = 100.0
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.02:
+            ts += 60 * rng.randint(300, 900)  # overnight / session break
+        elif roll < 0.25:
+            ts += 60 * rng.randint(2, 4)  # illiquid minutes without trades
+        else:
+            ts += 60
+        price *= 1 + rng.uniform(-0.002, 0.002)
+        out.append({
+            'time': ts,
+            'open': round(price * (1 + rng.uniform(-0.001, 0.001)), 4),
+            'high': round(price * 1.002, 4),
+            'low': round(price * 0.998, 4),
+            'close': round(price, 4),
+            'volume': rng.randint(1, 500),
+        })
+    return out
+
+
+class IncrementalResamplerTests(unittest.TestCase):
+    def test_sliding_window_matches_full_resample(self):
+        for seed in range(2):
+            bars = _bars(600, seed)
+            resampler = TimeframeResampler()
+            rng = random.Random(seed)
+            end = 40
+            while end <= len(bars):
+                history = bars[max(0, end - 240):end]
+                # The aggregator's partial bar changes between cycles without a new timestamp.
+                partial = dict(history[-1], close=round(history[-1]['close'] * 1.0005, 4), volume=history[-1]['volume'] + 1)
+                for current in (history[:-1] + [partial], history):
+                    for tf in _TIMEFRAMES:
+                        self.assertEqual(
+                            resampler.resample('TQBR:SBER', current, tf),
+                            resample_candles(current, tf),
+                            f'seed={seed} end={end} tf={tf}',
+                        )
+                end += rng.choice((1, 1, 3, 9, 17))
+
+    def test_unrelated_series_under_same_key_resets(self):
+        resampler = TimeframeResampler()
+        first = _bars(300, 1)
+        second = _bars(300, 2)
+        for tf in _TIMEFRAMES:
+            self.assertEqual(resampler.resample('X', first, tf), resample_candles(first, tf))
+            self.assertEqual(resampler.resample('X', second, tf), resample_candles(second, tf))
+            self.assertEqual(resampler.resample('X', first[:10], tf), resample_candles(first[:10], tf))
+
+    def test_aggregator_history_is_resampled_incrementally(self):
+        bars = _bars(400, 5)
+        aggregator = CandleAggregator(frame_sec=60, history_size=200)
+        resampler = TimeframeResampler()
+        for bar in bars[:250]:
+            aggregator.on_tick({'instrument_id': 'TQBR:SBER', **bar})
+        resampler.resample('TQBR:SBER', aggregator.get_history('TQBR:SBER'), '15m')
+        expected = []
+        got = []
+        with patch('core.services.timeframe_engine.resample_candles', side_effect=AssertionError('full resample')):
+            for bar in bars[250:]:
+                aggregator.on_tick({'instrument_id': 'TQBR:SBER', **bar})
+                history = aggregator.get_history('TQBR:SBER')
+                got.append(resampler.resample('TQBR:SBER', history, '15m'))
+                expected.append(history.to_list())
+        self.assertEqual(got, [resample_candles(h, '15m') for h in expected])
+
+    def test_unsorted_input_falls_back_to_full_resample(self):
+        bars = _bars(120, 3)
+        shuffled = list(bars)
+        random.Random(0).shuffle(shuffled)
+        resampler = TimeframeResampler()
+        self.assertEqual(resampler.resample('X', shuffled, '5m'), resample_candles(bars, '5m'))
+        self.assertEqual(resample_candles(bars, '5m', cache_key='X'), resample_candles(bars, '5m'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -46,7 +46,7 @@ class TimeframeThesisSelectionTests(unittest.TestCase):
         )
         base_history = [{'_tf': '1m', 'time': i, 'open': 100, 'high': 101, 'low': 99, 'close': 100.5, 'volume': 1000} for i in range(40)]
 
-        def _fake_resample(candles, tf):
+        def _fake_resample(candles, tf, **_kwargs):
             return [{'_tf': tf, 'time': i, 'open': 100, 'high': 101, 'low': 99, 'close': 100.5, 'volume': 1000} for i in range(20)]
 
         with patch('apps.worker.processor_support.resample_candles', side_effect=_fake_resample), \
@@ -84,7 +84,7 @@ class TimeframeThesisSelectionTests(unittest.TestCase):
         )
         base_history = [{'_tf': '1m', 'time': i, 'open': 100, 'high': 101, 'low': 99, 'close': 100.5, 'volume': 1000} for i in range(40)]
 
-        def _fake_resample(candles, tf):
+        def _fake_resample(candles, tf, **_kwargs):
             return [{'_tf': tf, 'time': i, 'open': 100, 'high': 101, 'low': 99, 'close': 100.5, 'volume': 1000} for i in range(20)]
 
         with patch('apps.worker.processor_support.resample_candles', side_effect=_fake_resample):
@@ -113,7 +113,7 @@ class TimeframeThesisSelectionTests(unittest.TestCase):
         )
         base_history = [{'_tf': '1m', 'time': i, 'open': 100, 'high': 101, 'low': 99, 'close': 100.5, 'volume': 1000} for i in range(40)]
 
-        def _fake_resample(candles, tf):
+        def _fake_resample(candles, tf, **_kwargs):
             return [{'_tf': tf, 'time': i, 'open': 100, 'high': 101, 'low': 99, 'close': 100.5 + (0.2 if tf == '15m' else 0.0), 'volume': 1000} for i in range(20)]
 
         with patch('apps.worker.processor_support.resample_candles', side_effect=_fake_resample), \
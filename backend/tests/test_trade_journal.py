@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.routers import trades as trades_router
+from core.storage import decision_log_utils
+from core.storage.models import Base, DecisionLog, Trade, TradeJournal
+from core.storage.repos import trade_journal
+
+
+def _close_log(idx: int, *, instrument='TQBR:SBER', pnl=10.0, strategy='breakout', ts=None) -> DecisionLog:
+    closed_ts = ts or 1_700_000_000_000 + idx * 60_000
+    return DecisionLog(
+        id=f'log_{idx:04d}',
+        ts=closed_ts,
+        type='position_closed',
+        message='closed',
+        payload={
+            'instrument_id': instrument,
+            'opened_order_id': f'ord_{idx:04d}',
+            'closed_order_id': f'cls_{idx:04d}',
+            'strategy_name': strategy,
+            'reason': 'TP' if pnl > 0 else 'SL',
+            'close_price': 101.0,
+            'qty': 10,
+            'opened_ts': closed_ts - 300_000,
+            'closed_ts': closed_ts,
+            'net_pnl': pnl,
+            'fees_est': 0.5,
+        },
+    )
+
+
+class TradeJournalTests(unittest.TestCase):
+    def setUp(self):
+        jsonb = patch.object(SQLiteTypeCompiler, 'visit_JSONB', SQLiteTypeCompiler.visit_JSON, create=True)
+        jsonb.start()
+        self.addCleanup(jsonb.stop)
+        engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        self.db = self.Session()
+        self.addCleanup(self.db.close)
+
+    def _seed(self, count: int) -> list[DecisionLog]:
+        logs = []
+        for idx in range(count):
+            log = _close_log(idx, instrument='TQBR:SBER' if idx % 2 else 'TQBR:GAZP', pnl=10.0 if idx % 3 else -5.0)
+            self.db.add(log)
+            self.db.add(Trade(trade_id=f'trd_{idx:04d}', instrument_id=log.payload['instrument_id'], ts=log.payload['opened_ts'], side='BUY', price=100.0, qty=10, order_id=f'ord_{idx:04d}'))
+            logs.append(log)
+        self.db.commit()
+        return logs
+
+    def test_row_matches_entry_rebuilt_from_log(self):
+        [log] = self._seed(1)
+        row = trade_journal.record_closed_position(self.db, log)
+        self.db.commit()
+        expected = trade_journal.normalize_closed_entry(trade_journal.build_closed_entry(self.db, log))
+        self.assertEqual(trade_journal.entry_from_row(row), expected)
+        self.assertEqual(row.side, 'BUY')
+        self.assertEqual(float(row.entry_price), 100.0)
+
+    def test_incomplete_close_is_not_materialized(self):
+        log = _close_log(1)
+        log.payload = {**log.payload, 'close_price': 0}
+        self.db.add(log)
+        self.db.commit()
+        self.assertIsNone(trade_journal.record_closed_position(self.db, log))
+        self.assertEqual(self.db.query(TradeJournal).count(), 0)
+
+    def test_backfill_is_idempotent(self):
+        self._seed(7)
+        self.assertEqual(trade_journal.backfill_trade_journal(self.db, batch_size=3), {'scanned': 7, 'stored': 7})
+        self.assertEqual(trade_journal.backfill_trade_journal(self.db), {'scanned': 0, 'stored': 0})
+
+    def test_cursor_pages_cover_filtered_journal_once(self):
+        self._seed(25)
+        trade_journal.backfill_trade_journal(self.db)
+        seen, cursor = [], None
+        while True:
+            page = trades_router.build_trades_payload(self.db, limit=4, cursor=cursor, instrument='TQBR:SBER', outcome='profit')
+            seen.extend(item['id'] for item in page['items'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        expected = [f'log_{i:04d}' for i in reversed(range(25)) if i % 2 and i % 3]
+        self.assertEqual(seen, expected)
+        self.assertEqual(page['total'], len(expected))
+        offset_page = trades_router.build_trades_payload(self.db, limit=4, offset=4, instrument='TQBR:SBER', outcome='profit')
+        self.assertEqual([item['id'] for item in offset_page['items']], expected[4:8])
+        with self.assertRaises(ValueError):
+            trade_journal.list_journal(self.db, cursor='bogus')
+
+    def test_stats_aggregate_in_sql(self):
+        self._seed(6)
+        trade_journal.backfill_trade_journal(self.db)
+        stats = trades_router.build_trade_stats_payload(self.db)
+        self.assertEqual(stats['total_trades'], 6)
+        self.assertEqual(stats['wins_count'], 4)
+        self.assertEqual(stats['losses_count'], 2)
+        self.assertEqual(stats['total_pnl'], 30.0)
+        self.assertEqual(stats['profit_factor'], 4.0)
+        self.assertEqual(stats['avg_duration_sec'], 300)
+
+    def test_best_effort_append_materializes_closed_position(self):
+        with patch.object(decision_log_utils, 'SessionLocal', self.Session):
+            decision_log_utils.append_decision_log_best_effort(log_type='position_closed', message='closed', payload=_close_log(3).payload)
+        self.db.expire_all()
+        rows = self.db.query(TradeJournal).all()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].instrument_id, 'TQBR:SBER')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from types import SimpleNamespace
+
+from apps.worker.analysis_pool import AnalysisPool, pack_candles, unpack_candles
+from apps.worker.processor_support import _run_strategy_timeframe_search
+from core.strategy.selector import StrategySelector
+
+
+def _candles(n: int = 400, start: int = 1_700_000_000) -> list[dict]:
+    out = []
+    price = 100.0
+    for i in range(n):
+        price = price * 1.001 if i % 10 < 7 else price * 0.9995
+        out.append({
+            'time': start + i * 60,
+            'open': price * 0.999,
+            'high': price * 1.002,
+            'low': price * 0.998,
+            'close': price,
+            'volume': 1000 + i,
+        })
+    return out
+
+
+def _stable(signal: dict) -> dict:
+    return {k: v for k, v in signal.items() if k not in {'id', 'ts'}}
+
+
+class AnalysisPoolTests(unittest.IsolatedAsyncioTestCase):
+    def test_pack_roundtrip_is_lossless_for_ohlcv(self):
+        candles = _candles(50)
+        self.assertEqual(unpack_candles(pack_candles(candles)), candles)
+
+    async def test_pooled_search_matches_inline_search(self):
+        strategy = StrategySelector().get('breakout,mean_reversion')
+        candles = _candles()
+        settings = SimpleNamespace(higher_timeframe='15m', bot_enabled=True)
+        plan = {'analysis_timeframe': '5m', 'confirmation_timeframe': '15m', 'regime': 'expansion_trend'}
+
+        expected = _run_strategy_timeframe_search(strategy, 'TQBR:SBER', candles, plan, settings)
+        self.assertIsNotNone(expected[0])
+        self.assertEqual(expected[2]['selected_timeframe'], '5m')
+
+        pool = AnalysisPool(processes=1)
+        try:
+            pooled = await pool.strategy_search(strategy, 'TQBR:SBER', candles, plan, settings)
+        finally:
+            pool.shutdown()
+        inline = await AnalysisPool(processes=0).strategy_search(strategy, 'TQBR:SBER', candles, plan, settings)
+
+        for got in (pooled, inline):
+            # Signal id / ts are generated per analyze() call.
+            self.assertEqual(_stable(got[0]), _stable(expected[0]))
+            self.assertEqual(got[2], expected[2])
+            self.assertEqual(
+                [(c['time'], c['close']) for c in got[1]],
+                [(c['time'], c['close']) for c in expected[1]],
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from apps.worker.db_executor import WorkerDbExecutor
+
+
+class _FakeSession:
+    def __init__(self):
+        self.closed = False
+        self.rolled_back = False
+        self.threads: list[str] = []
+
+    def query_slow(self, delay: float) -> str:
+        self.threads.append(threading.current_thread().name)
+        time.sleep(delay)
+        return 'rows'
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+class WorkerDbExecutorTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.sessions: list[_FakeSession] = []
+
+        def factory():
+            session = _FakeSession()
+            self.sessions.append(session)
+            return session
+
+        self.executor = WorkerDbExecutor(max_workers=2, session_factory=factory)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown()
+
+    async def test_run_uses_pool_thread_and_closes_session(self):
+        result = await self.executor.run(lambda db: db.query_slow(0.0))
+
+        self.assertEqual(result, 'rows')
+        session = self.sessions[0]
+        self.assertTrue(session.closed)
+        self.assertFalse(session.rolled_back)
+        self.assertTrue(session.threads[0].startswith('worker-db'))
+
+    async def test_run_rolls_back_on_error(self):
+        def boom(db):
+            raise RuntimeError('db down')
+
+        with self.assertRaises(RuntimeError):
+            await self.executor.run(boom)
+        self.assertTrue(self.sessions[0].rolled_back)
+        self.assertTrue(self.sessions[0].closed)
+        self.assertEqual(self.executor.snapshot()['errors'], 1)
+
+    async def test_session_context_closes_and_rolls_back(self):
+        with self.assertRaises(ValueError):
+            async with self.executor.session() as db:
+                await self.executor.call(db.query_slow, 0.0)
+                raise ValueError('stop')
+        self.assertTrue(self.sessions[0].rolled_back)
+        self.assertTrue(self.sessions[0].closed)
+
+    async def test_blocking_query_does_not_stall_event_loop(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        try:
+            await self.executor.run(lambda db: db.query_slow(0.2))
+        finally:
+            task.cancel()
+        # A query on the loop thread would have allowed zero ticks.
+        self.assertGreaterEqual(ticks, 5)
+        self.assertGreaterEqual(self.executor.snapshot()['max_call_ms'], 150)
+
+    async def test_stats_count_every_concurrent_call(self):
+        executor = WorkerDbExecutor(max_workers=4)
+        try:
+            await asyncio.gather(*(executor.call(time.sleep, 0) for _ in range(200)))
+        finally:
+            executor.shutdown()
+        self.assertEqual(executor.snapshot()['calls'], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
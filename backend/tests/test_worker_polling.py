@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+
+from apps.worker.polling import PollingScheduler, RateLimitBudget
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class PollingSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_runs_requests_concurrently_up_to_limit(self):
+        scheduler = PollingScheduler(max_concurrency=3, reserve=0)
+        active = 0
+        peak = 0
+
+        async def fetch(ticker):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return ticker.lower()
+
+        tickers = [f'TQBR:T{i}' for i in range(10)]
+        stats = await scheduler.run(tickers, fetch)
+
+        self.assertEqual(peak, 3)
+        self.assertEqual(stats.peak_in_flight, 3)
+        self.assertEqual(stats.requested, 10)
+        self.assertEqual(stats.results['TQBR:T4'], 'tqbr:t4')
+
+    async def test_fetch_errors_are_collected_per_ticker(self):
+        scheduler = PollingScheduler(max_concurrency=2, reserve=0)
+
+        async def fetch(ticker):
+            if ticker == 'TQBR:BAD':
+                raise RuntimeError('boom')
+            return 'ok'
+
+        stats = await scheduler.run(['TQBR:SBER', 'TQBR:BAD', 'TQBR:GAZP'], fetch)
+
+        self.assertIsInstance(stats.results['TQBR:BAD'], RuntimeError)
+        self.assertEqual(stats.results['TQBR:GAZP'], 'ok')
+
+    async def test_orders_high_priority_then_stalest_first(self):
+        ordered = PollingScheduler.order(
+            ['TQBR:ROSN', 'TQBR:NVTK', 'TQBR:SBER', 'TQBR:GAZP'],
+            high_priority={'TQBR:SBER', 'TQBR:GAZP'},
+            last_ok={'TQBR:SBER': 50.0, 'TQBR:GAZP': 10.0, 'TQBR:ROSN': 30.0},
+        )
+        self.assertEqual(ordered, ['TQBR:GAZP', 'TQBR:SBER', 'TQBR:NVTK', 'TQBR:ROSN'])
+
+    async def test_concurrency_shrinks_with_remaining_budget(self):
+        clock = _Clock()
+        scheduler = PollingScheduler(max_concurrency=8, reserve=5, clock=clock)
+        self.assertEqual(scheduler.concurrency_for(RateLimitBudget()), 8)
+        self.assertEqual(scheduler.concurrency_for(RateLimitBudget(remaining=100, reset_sec=30, observed_monotonic=clock.now)), 8)
+        self.assertEqual(scheduler.concurrency_for(RateLimitBudget(remaining=8, reset_sec=30, observed_monotonic=clock.now)), 3)
+        self.assertEqual(scheduler.concurrency_for(RateLimitBudget(remaining=2, reset_sec=30, observed_monotonic=clock.now)), 1)
+        # Window already reset -> the stale header no longer limits us.
+        self.assertEqual(scheduler.concurrency_for(RateLimitBudget(remaining=2, reset_sec=30, observed_monotonic=clock.now - 60)), 8)
+
+    async def test_waits_for_reset_when_budget_is_exhausted(self):
+        clock = _Clock()
+        budget = {'remaining': '3', 'reset_sec': '4', 'observed_monotonic': clock.now}
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            clock.now += delay
+
+        async def fetch(ticker):
+            budget['remaining'] = '50'
+            budget['observed_monotonic'] = clock.now
+            return ticker
+
+        scheduler = PollingScheduler(max_concurrency=4, reserve=5, budget_fn=lambda: dict(budget), clock=clock, sleep=fake_sleep)
+        stats = await scheduler.run(['TQBR:SBER', 'TQBR:GAZP'], fetch)
+
+        self.assertEqual(sleeps, [4.0])
+        self.assertEqual(stats.throttled_waits, 1)
+        self.assertEqual(stats.concurrency_limit, 1)
+        self.assertEqual(stats.budget_remaining_start, 3)
+        self.assertEqual(stats.budget_remaining_end, 50)
+        self.assertEqual(stats.requested, 2)
+
+    async def test_stops_early_on_shutdown(self):
+        scheduler = PollingScheduler(max_concurrency=1, reserve=0)
+        seen: list[str] = []
+
+        async def fetch(ticker):
+            seen.append(ticker)
+
+        stats = await scheduler.run(['A', 'B', 'C'], fetch, should_stop=lambda: len(seen) >= 1)
+        self.assertEqual(seen, ['A'])
+        self.assertEqual(stats.requested, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
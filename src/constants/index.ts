@@ -32,7 +32,9 @@ export const EVENTS = {
     TRADE_FILLED: 'trade_filled',
     BOT_STATUS: 'bot_status',
     KLINE: 'kline',
+    KLINE_BATCH: 'kline_batch',
     HEARTBEAT: 'heartbeat',
+    RESYNC: 'resync',
 } as const;
 
 export const QUERY_KEYS = {
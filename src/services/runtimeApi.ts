@@ -42,11 +42,15 @@ export function buildBrowserUrl(path: string): string {
   return new URL(joined, window.location.origin).toString();
 }
 
-export function getStreamUrl(token?: string | null): string {
+export function getStreamUrl(token?: string | null, lastEventId?: string | null): string {
   const url = new URL(buildBrowserUrl('stream'));
   if (token) {
     url.searchParams.set('token', token);
   }
+  if (lastEventId) {
+    // EventSource only sends Last-Event-ID on its own reconnects; forced reconnects resume through the query.
+    url.searchParams.set('last_event_id', lastEventId);
+  }
   return url.toString();
 }
 
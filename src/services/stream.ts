@@ -22,6 +22,7 @@ class StreamService {
     private lastActivityAt = 0;
     private reconnectScheduled = false;
     private lastInvalidationAt: Partial<Record<string, number>> = {};
+    private lastEventId: string | null = null;
 
     setQueryClient(client: QueryClient) {
         this.queryClient = client;
@@ -50,7 +51,7 @@ class StreamService {
         this.reconnectScheduled = false;
         this.lastActivityAt = Date.now();
 
-        this.eventSource = new EventSource(getStreamUrl(authToken));
+        this.eventSource = new EventSource(getStreamUrl(authToken, this.lastEventId));
 
         this.eventSource.onopen = () => {
             const store = useAppStore.getState();
@@ -81,6 +82,9 @@ class StreamService {
         eventTypes.forEach((eventType) => {
             this.eventSource?.addEventListener(eventType, (e: MessageEvent) => {
                 this.lastActivityAt = Date.now();
+                if (e.lastEventId) {
+                    this.lastEventId = e.lastEventId;
+                }
 
                 if (eventType === EVENTS.HEARTBEAT) {
                     if (useAppStore.getState().connectionStatus !== 'connected') {
@@ -94,6 +98,12 @@ class StreamService {
                     if (useAppStore.getState().connectionStatus !== 'connected') {
                         useAppStore.getState().setConnectionStatus('connected');
                     }
+                    if (eventType === EVENTS.KLINE_BATCH) {
+                        // Worker batching mode: unpack into the per-instrument kline events handlers expect.
+                        const items = Array.isArray(payload?.data?.items) ? payload.data.items : [];
+                        items.forEach((item: any) => this.dispatch(EVENTS.KLINE, { type: EVENTS.KLINE, ts: payload.ts, data: item }));
+                        return;
+                    }
                     this.dispatch(eventType, payload);
                 } catch (err) {
                     if (import.meta.env.DEV) {
@@ -107,6 +117,7 @@ class StreamService {
     disconnect(preserveIntentionalClose = false) {
         if (!preserveIntentionalClose) {
             this.intentionalClose = true;
+            this.lastEventId = null;
         }
         this.clearReconnectTimer();
         this.stopWatchdog();
@@ -240,6 +251,11 @@ class StreamService {
             case EVENTS.KLINE:
                 invalidateUi(['ui', 'dashboard'], 10_000);
                 break;
+            case EVENTS.RESYNC:
+                // The server could not replay the gap since our last event id: reload everything.
+                this.lastInvalidationAt = {};
+                this.queryClient.invalidateQueries();
+                break;
             default:
                 break;
         }